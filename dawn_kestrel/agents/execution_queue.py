@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import logging
 import uuid
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
 from typing import Any
 
 from dawn_kestrel.core.result import Err, Ok, Result
 from dawn_kestrel.reliability.queue_worker import InMemoryTaskQueue, Task, WorkerPool
 
+logger = logging.getLogger(__name__)
+
+# Size of the process-wide pool returned by get_shared_execution_queue()
+SHARED_POOL_DEFAULT_WORKERS = 8
+
 
 @dataclass
 class AgentExecutionJob:
@@ -22,81 +30,419 @@ class AgentExecutionBatchResult:
     errors_by_index: dict[int, str]
 
 
+@dataclass
+class _Batch:
+    """Bookkeeping for one run_jobs call on the shared pool."""
+
+    jobs: list[AgentExecutionJob]
+    execute: Callable[[AgentExecutionJob], Awaitable[str]]
+    remaining: int
+    done: asyncio.Future[None]
+    completed_by_index: dict[int, str] = field(default_factory=dict)
+    errors_by_index: dict[int, str] = field(default_factory=dict)
+    running: set[asyncio.Future[str]] = field(default_factory=set)
+    abandoned: bool = False
+
+    def finish_one(self) -> None:
+        self.remaining -= 1
+        if self.remaining <= 0 and not self.done.done():
+            self.done.set_result(None)
+
+
+@dataclass
+class _JobContext:
+    """The job a coroutine runs under (see _current_job)."""
+
+    queue: InMemoryAgentExecutionQueue
+    active: bool = True
+    # Nested run_jobs calls the job is waiting on; while > 0 the job has
+    # given up its execution slot
+    nested: int = 0
+
+
+# Set while a job's execute() runs, so a nested run_jobs call can tell it is
+# made from inside a job of the same queue
+_current_job: contextvars.ContextVar[_JobContext | None] = contextvars.ContextVar(
+    "agent_execution_job", default=None
+)
+
+
+class _ExecutionSlots:
+    """Bounds the jobs executing at once across top-level and nested batches."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_use >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_use += 1
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        # Waiters re-check the limit, so waking all of them is safe
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+@dataclass
+class _CallerSlots:
+    """Jobs a caller may have queued or running at once."""
+
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
 class InMemoryAgentExecutionQueue:
+    """Runs batches of agent jobs on a long-lived queue and worker pool.
+
+    The queue and its ``max_workers`` workers are created on first use and
+    shared by every ``run_jobs`` call, so concurrent batches (from any
+    number of callers) are bounded by one global limit. Each caller can
+    additionally be held to a quota of jobs in flight at once; a caller's
+    further jobs wait outside the queue and never hold a worker.
+
+    A job may itself call ``run_jobs`` (nested fan-out). Its jobs then run
+    inline rather than through the queue, which could otherwise fill up
+    with parents waiting on children that no worker is free to run. The
+    parent gives up its execution slot while it waits, so ``max_workers``
+    still bounds the jobs actually executing. Nested jobs count against
+    their parent's caller quota slot, not their own.
+
+    Idle workers block on the queue, and each batch waits on a future
+    resolved by its last job. The pool is rebuilt when used from a
+    different event loop; ``close`` stops the workers.
+    """
+
     def __init__(
         self,
         max_workers: int = 4,
         poll_interval: float = 0.05,
         timeout_seconds: float = 300.0,
+        default_caller_quota: int | None = None,
     ) -> None:
+        """Initialize the execution queue.
+
+        Args:
+            max_workers: Jobs running at once across all callers.
+            poll_interval: Poll interval for queues that cannot block.
+            timeout_seconds: Default time limit for one run_jobs batch.
+            default_caller_quota: Jobs one caller may have in flight at once
+                (None = limited only by max_workers).
+        """
         self.max_workers = max(1, max_workers)
         self.poll_interval = poll_interval
         self.timeout_seconds = timeout_seconds
+        self.default_caller_quota = default_caller_quota
+        self._queue: InMemoryTaskQueue | None = None
+        self._pool: WorkerPool | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batches: dict[str, _Batch] = {}
+        self._caller_slots: dict[Hashable, _CallerSlots] = {}
+        # Queue task ID -> caller semaphore to release once the task is handled
+        self._held_slots: dict[str, asyncio.Semaphore] = {}
+        self._slots = _ExecutionSlots(self.max_workers)
 
-    async def run_jobs(
-        self,
-        jobs: list[AgentExecutionJob],
-        execute: Callable[[AgentExecutionJob], Awaitable[str]],
-    ) -> AgentExecutionBatchResult:
-        queue = InMemoryTaskQueue()
-        completed_by_index: list[str | None] = [None] * len(jobs)
-        errors_by_index: dict[int, str] = {}
-        results_lock = asyncio.Lock()
+    async def _ensure_pool(self) -> InMemoryTaskQueue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._pool is None or self._loop is not loop:
+            queue = InMemoryTaskQueue()
+            pool = WorkerPool(
+                queue=queue,
+                processor=self._process_task,
+                num_workers=self.max_workers,
+                poll_interval=self.poll_interval,
+            )
+            await pool.start()
+            self._queue, self._pool, self._loop = queue, pool, loop
+            self._caller_slots.clear()
+            self._held_slots.clear()
+            self._slots = _ExecutionSlots(self.max_workers)
+        return self._queue
+
+    async def resize(self, max_workers: int) -> None:
+        """Change the number of workers.
+
+        When shrinking, removed workers finish their current job first (this
+        waits for them).
+        """
+        self.max_workers = max(1, max_workers)
+        self._slots.resize(self.max_workers)
+        if self._pool is not None and self._loop is asyncio.get_running_loop():
+            await self._pool.resize(self.max_workers, drain=True)
+        logger.info(f"Agent execution pool resized to {self.max_workers} workers")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pool size, jobs executing, batches in progress and callers with jobs in flight."""
+        return {
+            "max_workers": self.max_workers,
+            "running_jobs": self._slots.in_use,
+            "active_batches": len(self._batches),
+            "active_callers": len(self._caller_slots),
+        }
+
+    async def close(self) -> None:
+        """Stop the shared workers (they restart on the next run_jobs)."""
+        pool, self._pool, self._queue, self._loop = self._pool, None, None, None
+        if pool is not None:
+            await pool.stop()
 
-        async def process_task(task: Task) -> Result[Any]:
-            index = int(task.payload["index"])
-            job = jobs[index]
+    def _acquire_caller(self, caller: Hashable | None, quota: int | None) -> _CallerSlots | None:
+        quota = self.default_caller_quota if quota is None else quota
+        if quota is None:
+            return None
+        if caller is None:
+            # Without an identity the quota applies to this batch alone
+            return _CallerSlots(asyncio.Semaphore(max(1, quota)), users=1)
+        slots = self._caller_slots.get(caller)
+        if slots is None:
+            slots = self._caller_slots[caller] = _CallerSlots(asyncio.Semaphore(max(1, quota)))
+        slots.users += 1
+        return slots
 
+    def _release_caller(self, caller: Hashable | None, slots: _CallerSlots | None) -> None:
+        if slots is None:
+            return
+        slots.users -= 1
+        if caller is not None and slots.users == 0 and self._caller_slots.get(caller) is slots:
+            del self._caller_slots[caller]
+
+    async def _process_task(self, task: Task) -> Result[Any]:
+        held = self._held_slots.pop(task.id, None)
+        try:
+            batch = self._batches.get(task.payload["batch_id"])
+            if batch is None or batch.abandoned:
+                return Err("agent execution batch was abandoned", code="BATCH_ABANDONED")
+
+            job = batch.jobs[int(task.payload["position"])]
+            slots = self._slots
+            await slots.acquire()
+            context = _JobContext(self)
+            token = _current_job.set(context)
             try:
-                result_task_id = await execute(job)
-            except Exception as exc:
-                async with results_lock:
-                    errors_by_index[index] = str(exc)
-                return Err(str(exc), code="AGENT_EXECUTION_FAILED")
+                job_future = asyncio.ensure_future(batch.execute(job))
+            finally:
+                _current_job.reset(token)
+            batch.running.add(job_future)
+            try:
+                await asyncio.wait({job_future})
+            except asyncio.CancelledError:
+                job_future.cancel()
+                raise
+            finally:
+                context.active = False
+                if context.nested == 0:
+                    slots.release()
+                batch.running.discard(job_future)
+                batch.finish_one()
+        finally:
+            if held is not None:
+                held.release()
 
-            async with results_lock:
-                completed_by_index[index] = result_task_id
-            return Ok(result_task_id)
+        if job_future.cancelled():
+            return Err("agent execution cancelled", code="AGENT_EXECUTION_CANCELLED")
+        exc = job_future.exception()
+        if exc is not None:
+            batch.errors_by_index[job.index] = str(exc)
+            return Err(str(exc), code="AGENT_EXECUTION_FAILED")
 
-        for job in jobs:
+        result_task_id = job_future.result()
+        batch.completed_by_index[job.index] = result_task_id
+        return Ok(result_task_id)
+
+    async def _feed(
+        self,
+        queue: InMemoryTaskQueue,
+        batch_id: str,
+        batch: _Batch,
+        slots: _CallerSlots | None,
+        queue_task_ids: list[str],
+    ) -> None:
+        """Enqueue a batch's jobs, each once the caller has a free slot."""
+        for position, job in enumerate(batch.jobs):
+            if slots is not None:
+                await slots.semaphore.acquire()
             queue_task = Task(
                 id=f"agent_exec_{uuid.uuid4().hex[:12]}",
                 type="agent_execution",
-                payload={"index": job.index},
+                payload={"batch_id": batch_id, "position": position},
             )
+            if slots is not None:
+                self._held_slots[queue_task.id] = slots.semaphore
             enqueue_result = await queue.enqueue(queue_task)
             if enqueue_result.is_err():
+                if slots is not None:
+                    self._held_slots.pop(queue_task.id, None)
+                    slots.semaphore.release()
                 enqueue_err = enqueue_result
                 if isinstance(enqueue_err, Err):
-                    errors_by_index[job.index] = str(enqueue_err.error)
+                    batch.errors_by_index[job.index] = str(enqueue_err.error)
                 else:
-                    errors_by_index[job.index] = "failed to enqueue agent execution job"
-
-        workers = min(self.max_workers, max(1, len(jobs)))
-        pool = WorkerPool(
-            queue=queue,
-            processor=process_task,
-            num_workers=workers,
-            poll_interval=self.poll_interval,
+                    batch.errors_by_index[job.index] = "failed to enqueue agent execution job"
+                batch.finish_one()
+            else:
+                queue_task_ids.append(queue_task.id)
+
+    async def run_jobs(
+        self,
+        jobs: list[AgentExecutionJob],
+        execute: Callable[[AgentExecutionJob], Awaitable[str]],
+        caller: Hashable | None = None,
+        quota: int | None = None,
+        timeout_seconds: float | None = None,
+    ) -> AgentExecutionBatchResult:
+        """Run jobs on the shared workers and wait for all of them.
+
+        Args:
+            jobs: Jobs to run.
+            execute: Coroutine function running one job, returning its task ID.
+            caller: Identity the caller quota is tracked under (e.g. the
+                orchestrator); batches with the same caller share its quota.
+            quota: Jobs the caller may have in flight at once (default:
+                default_caller_quota). Applies from the caller's first
+                batch until it has no jobs in flight.
+            timeout_seconds: Time limit for the batch (default: timeout_seconds).
+
+        Returns:
+            Completed task IDs (in job order) and errors by job index.
+        """
+        if not jobs:
+            return AgentExecutionBatchResult(completed_task_ids=[], errors_by_index={})
+        timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+
+        parent = _current_job.get()
+        if parent is not None and parent.queue is self and parent.active:
+            return await self._run_nested(parent, jobs, execute, timeout)
+
+        queue = await self._ensure_pool()
+        batch_id = uuid.uuid4().hex
+        batch = _Batch(
+            jobs=jobs,
+            execute=execute,
+            remaining=len(jobs),
+            done=asyncio.get_running_loop().create_future(),
         )
+        self._batches[batch_id] = batch
+        queue_task_ids: list[str] = []
+        slots = self._acquire_caller(caller, quota)
+        feeder = asyncio.ensure_future(self._feed(queue, batch_id, batch, slots, queue_task_ids))
 
-        await pool.start()
         try:
-            completion = await pool.wait_for_completion(timeout=self.timeout_seconds)
-            if completion.is_err():
-                completion_error = (
-                    str(completion.error)
-                    if isinstance(completion, Err)
-                    else "agent execution queue timed out"
-                )
+            try:
+                await asyncio.wait_for(asyncio.shield(batch.done), timeout=timeout)
+            except asyncio.TimeoutError:
                 for job in jobs:
-                    if completed_by_index[job.index] is None and job.index not in errors_by_index:
-                        errors_by_index[job.index] = completion_error
+                    if (
+                        job.index not in batch.completed_by_index
+                        and job.index not in batch.errors_by_index
+                    ):
+                        batch.errors_by_index[job.index] = "Timeout waiting for completion"
         finally:
-            await pool.stop()
+            # Jobs not yet queued are dropped, queued ones are skipped and
+            # running ones are cancelled
+            feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+            batch.abandoned = True
+            self._batches.pop(batch_id, None)
+            for job_future in list(batch.running):
+                job_future.cancel()
+            for task_id in queue_task_ids:
+                await queue.remove_task(task_id)
+            self._release_caller(caller, slots)
 
-        completed_task_ids = [task_id for task_id in completed_by_index if task_id is not None]
+        completed_task_ids = [
+            batch.completed_by_index[job.index]
+            for job in jobs
+            if job.index in batch.completed_by_index
+        ]
         return AgentExecutionBatchResult(
             completed_task_ids=completed_task_ids,
+            errors_by_index=dict(batch.errors_by_index),
+        )
+
+    async def _run_nested(
+        self,
+        parent: _JobContext,
+        jobs: list[AgentExecutionJob],
+        execute: Callable[[AgentExecutionJob], Awaitable[str]],
+        timeout: float,
+    ) -> AgentExecutionBatchResult:
+        """Run a batch started from inside a job, inline on execution slots."""
+        slots = self._slots
+        completed_by_index: dict[int, str] = {}
+        errors_by_index: dict[int, str] = {}
+
+        async def run_one(job: AgentExecutionJob) -> None:
+            await slots.acquire()
+            context = _JobContext(self)
+            _current_job.set(context)
+            try:
+                completed_by_index[job.index] = await execute(job)
+            except Exception as e:
+                errors_by_index[job.index] = str(e)
+            finally:
+                context.active = False
+                if context.nested == 0:
+                    slots.release()
+
+        # Give up the parent's slot while it waits, so its children can run
+        parent.nested += 1
+        if parent.nested == 1:
+            slots.release()
+        running = [asyncio.ensure_future(run_one(job)) for job in jobs]
+        try:
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for job_future in pending:
+                job_future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            for job_future in running:
+                job_future.cancel()
+            parent.nested -= 1
+            # A parent whose job was already given up has no slot to take back
+            if parent.nested == 0 and parent.active:
+                await slots.acquire()
+
+        for job in jobs:
+            if job.index not in completed_by_index and job.index not in errors_by_index:
+                errors_by_index[job.index] = "Timeout waiting for completion"
+        return AgentExecutionBatchResult(
+            completed_task_ids=[
+                completed_by_index[job.index] for job in jobs if job.index in completed_by_index
+            ],
             errors_by_index=errors_by_index,
         )
+
+
+_shared_queue: InMemoryAgentExecutionQueue | None = None
+
+
+def get_shared_execution_queue() -> InMemoryAgentExecutionQueue:
+    """Get the process-wide agent execution pool (created on first use)."""
+    global _shared_queue
+    if _shared_queue is None:
+        _shared_queue = InMemoryAgentExecutionQueue(max_workers=SHARED_POOL_DEFAULT_WORKERS)
+    return _shared_queue
+
+
+def set_shared_execution_queue(queue: InMemoryAgentExecutionQueue | None) -> None:
+    """Replace the process-wide agent execution pool (None restores the default)."""
+    global _shared_queue
+    _shared_queue = queue
@@ -28,6 +28,7 @@ from dawn_kestrel.agents.workflow import (
 )
 from dawn_kestrel.core.event_bus import Events, bus
 from dawn_kestrel.prompts.loader import load_prompt
+from dawn_kestrel.utils.json_parser import extract_json_object
 
 from dawn_kestrel.ai_session import AISession
 
@@ -149,7 +150,7 @@ class FSMOrchestrator:
         try:
             response = await self.ai_session.process_message(
                 user_message=prompt,
-                options={"temperature": 0.3, "disable_tools": True},
+                options={"temperature": 0.3, "disable_tools": True, "json_output": True},
             )
             response_text = response.text or ""
 
@@ -251,7 +252,11 @@ class FSMOrchestrator:
         )
 
         try:
-            reasoning_options: dict[str, Any] = {"temperature": 0.3, "disable_tools": True}
+            reasoning_options: dict[str, Any] = {
+                "temperature": 0.3,
+                "disable_tools": True,
+                "json_output": ReasonOutput,
+            }
             if options:
                 reasoning_options.update(options)
             response = await self.ai_session.process_message(
@@ -370,7 +375,7 @@ class FSMOrchestrator:
         try:
             response = await self.ai_session.process_message(
                 user_message=prompt,
-                options={"temperature": 0.2, "disable_tools": True},
+                options={"temperature": 0.2, "disable_tools": True, "json_output": ActOutput},
             )
             response_text = response.text or ""
             parsed = self._extract_json(response_text)
@@ -464,7 +469,7 @@ class FSMOrchestrator:
         try:
             response = await self.ai_session.process_message(
                 user_message=prompt,
-                options={"temperature": 0.3, "disable_tools": True},
+                options={"temperature": 0.3, "disable_tools": True, "json_output": True},
             )
             response_text = response.text or ""
 
@@ -585,7 +590,7 @@ class FSMOrchestrator:
         try:
             response = await self.ai_session.process_message(
                 user_message=prompt,
-                options={"temperature": 0.3, "disable_tools": True},
+                options={"temperature": 0.3, "disable_tools": True, "json_output": True},
             )
             response_text = response.text or ""
 
@@ -754,7 +759,7 @@ class FSMOrchestrator:
         try:
             response = await self.ai_session.process_message(
                 user_message=prompt,
-                options={"temperature": 0.3, "disable_tools": True},
+                options={"temperature": 0.3, "disable_tools": True, "json_output": True},
             )
             response_text = response.text or ""
 
@@ -949,7 +954,7 @@ class FSMOrchestrator:
     def _extract_json(self, text: str) -> dict[str, Any] | None:
         """Extract JSON from LLM response text.
 
-        Handles markdown code blocks and raw JSON.
+        Handles markdown code blocks, raw JSON and surrounding prose.
 
         Args:
             text: Response text that may contain JSON
@@ -957,35 +962,4 @@ class FSMOrchestrator:
         Returns:
             Parsed dict or None if parsing fails
         """
-        if not text:
-            return None
-
-        # Try to extract JSON from markdown code blocks
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            if end > start:
-                json_str = text[start:end].strip()
-            else:
-                json_str = text[start:].strip()
-        elif "```" in text:
-            # Handle plain code blocks
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            if end > start:
-                json_str = text[start:end].strip()
-            else:
-                json_str = text[start:].strip()
-        else:
-            # Try to find raw JSON
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end > start:
-                json_str = text[start : end + 1]
-            else:
-                return None
-
-        try:
-            return cast(dict[str, Any], json.loads(json_str))
-        except json.JSONDecodeError:
-            return None
+        return extract_json_object(text)
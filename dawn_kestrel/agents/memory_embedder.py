@@ -2,13 +2,79 @@
 
 from __future__ import annotations
 
+import array
+import asyncio
+import hashlib
 import logging
 import os
+import re
+from pathlib import Path
+from typing import Any
 
 from dawn_kestrel.core.config import SDKConfig
 
 logger = logging.getLogger(__name__)
 
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np  # type: ignore[import-not-found]
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by model and content hash
+
+    Each entry is a raw float32 vector at
+    ``<cache_dir>/<model>/<hash[:2]>/<hash>.f32``, so a model change never
+    returns stale vectors and entries need no parsing to load.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Initialize cache
+
+        Args:
+            cache_dir: Root directory for cached embeddings
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, model: str, text: str) -> Path:
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        model_dir = re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+        return self.cache_dir / model_dir / digest[:2] / f"{digest}.f32"
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        """Get a cached embedding, or None if not cached"""
+        try:
+            data = self._path(model, text).read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        vector = array.array("f")
+        try:
+            vector.frombytes(data)
+        except ValueError:
+            # Torn write
+            self.misses += 1
+            return None
+        self.hits += 1
+        return vector.tolist()
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        """Store an embedding"""
+        path = self._path(model, text)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(array.array("f", embedding).tobytes())
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to cache embedding at {path}: {e}")
+
 
 class MemoryEmbedder:
     """Memory embedder interface for generating vector embeddings
@@ -18,20 +84,46 @@ class MemoryEmbedder:
     - OpenAI embeddings (requires OPENAI_API_KEY)
     - Local models (sentence-transformers, optional dependency)
 
-    All embeddings are normalized to 1536 dimensions (OpenAI text-embedding-3-small standard).
+    Mock and OpenAI embeddings have 1536 dimensions (OpenAI
+    text-embedding-3-small standard); local models keep their native
+    dimension (see ``dimension``).
+
+    ``embed_batch`` sends one provider request per ``batch_size`` texts,
+    skipping duplicates and texts found in the on-disk cache.
     """
 
     EMBEDDING_DIMENSION = 1536
-
-    def __init__(self, config: SDKConfig | None = None) -> None:
+    OPENAI_MODEL = "text-embedding-3-small"
+    DEFAULT_LOCAL_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(
+        self,
+        config: SDKConfig | None = None,
+        cache_dir: Path | None = None,
+        batch_size: int = 256,
+    ) -> None:
         """Initialize memory embedder
 
         Args:
             config: SDK configuration with embedding settings
+            cache_dir: Directory for the embedding cache (default:
+                ``<storage_path>/embedding_cache`` when the config sets a
+                storage path, otherwise no disk cache)
+            batch_size: Maximum texts per provider request
         """
         self.config = config or SDKConfig()
         self.embedding_strategy = self._determine_strategy()
         self._validate_strategy()
+        self.batch_size = batch_size
+
+        if cache_dir is None:
+            cache_dir = getattr(self.config, "embedding_cache_dir", None)
+        if cache_dir is None and self.config.storage_path is not None:
+            cache_dir = Path(self.config.storage_path) / "embedding_cache"
+        self.cache = EmbeddingCache(Path(cache_dir)) if cache_dir is not None else None
+
+        self._openai_client: Any = None
+        self._local_model: Any = None
 
     def _determine_strategy(self) -> str:
         """Determine embedding strategy from config or environment
@@ -71,6 +163,22 @@ class MemoryEmbedder:
                     "OPENAI_API_KEY environment variable is required for OpenAI embeddings"
                 )
 
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model producing embeddings (part of the cache key)"""
+        if self.embedding_strategy == "openai":
+            return f"openai-{self.OPENAI_MODEL}-{self.EMBEDDING_DIMENSION}"
+        if self.embedding_strategy == "local":
+            return f"local-{self._local_model_name()}"
+        return f"mock-{self.EMBEDDING_DIMENSION}"
+
+    @property
+    def dimension(self) -> int:
+        """Embedding dimension (loads the model for the local strategy)"""
+        if self.embedding_strategy == "local":
+            return int(self._get_local_model().get_sentence_embedding_dimension())
+        return self.EMBEDDING_DIMENSION
+
     async def embed(self, text: str) -> list[float]:
         """Generate embedding for text
 
@@ -78,43 +186,70 @@ class MemoryEmbedder:
             text: Input text to embed
 
         Returns:
-            List of floats representing the embedding vector (1536 dimensions)
+            List of floats representing the embedding vector
         """
-        if not text or not text.strip():
-            logger.warning("Attempted to embed empty text, returning zero vector")
-            return [0.0] * self.EMBEDDING_DIMENSION
-
-        logger.debug(f"Generating embedding for text: {text[:100]}...")
-
-        if self.embedding_strategy == "mock":
-            return await self._mock_embed(text)
-        elif self.embedding_strategy == "openai":
-            return await self._openai_embed(text)
-        elif self.embedding_strategy == "local":
-            return await self._local_embed(text)
-        else:
-            raise ValueError(f"Unknown embedding strategy: {self.embedding_strategy}")
+        return (await self.embed_batch([text]))[0]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts
 
+        Empty texts map to a zero vector, duplicate texts are embedded once
+        and cached texts are not sent to the provider at all.
+
         Args:
             texts: List of input texts to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in input order
         """
         logger.debug(f"Generating batch embeddings for {len(texts)} texts")
 
-        # Process in parallel for efficiency
-        embeddings = [await self.embed(text) for text in texts]
-        return embeddings
+        resolved: dict[str, list[float]] = {}
+        pending: list[str] = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                continue
+            cached = self.cache.get(self.model_id, text) if self.cache else None
+            if cached is not None:
+                resolved[text] = cached
+            else:
+                pending.append(text)
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start : start + self.batch_size]
+            embeddings = await self._embed_uncached(chunk)
+            for text, embedding in zip(chunk, embeddings):
+                resolved[text] = embedding
+                if self.cache:
+                    self.cache.put(self.model_id, text, embedding)
+
+        results = []
+        for text in texts:
+            embedding = resolved.get(text)
+            if embedding is None:
+                logger.warning("Attempted to embed empty text, returning zero vector")
+                embedding = [0.0] * self.dimension
+            results.append(embedding)
+        return results
+
+    async def _embed_uncached(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with one provider request"""
+        if self.embedding_strategy == "mock":
+            return [self._mock_embed(text) for text in texts]
+        elif self.embedding_strategy == "openai":
+            return await self._openai_embed(texts)
+        elif self.embedding_strategy == "local":
+            return await self._local_embed(texts)
+        else:
+            raise ValueError(f"Unknown embedding strategy: {self.embedding_strategy}")
 
-    async def _mock_embed(self, text: str) -> list[float]:
+    def _mock_embed(self, text: str) -> list[float]:
         """Generate mock embedding for testing
 
         Mock embeddings are deterministic based on text content,
         making them suitable for unit tests without external dependencies.
+        Each hex digit of the text's MD5 hash maps to a float in [-1, 1];
+        the 32 values repeat across all dimensions.
 
         Args:
             text: Input text
@@ -122,109 +257,108 @@ class MemoryEmbedder:
         Returns:
             Mock embedding vector (1536 dimensions)
         """
-        # Create deterministic but pseudo-random-like embedding
-        # based on text content hash
-        import hashlib
-
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-
-        # Convert hex hash to normalized float values
-        embedding = []
-        for i in range(self.EMBEDDING_DIMENSION):
-            # Use different parts of hash for each dimension
-            char_index = i % len(text_hash)
-            hash_char = text_hash[char_index]
-
-            # Convert hex char to normalized float [-1, 1]
-            float_val = (int(hash_char, 16) / 15.0) * 2 - 1
-            embedding.append(float_val)
-
-        logger.debug(f"Generated mock embedding (strategy={self.embedding_strategy})")
-        return embedding
+        digest = hashlib.md5(text.encode()).hexdigest()
+        repeats = -(-self.EMBEDDING_DIMENSION // len(digest))
+
+        if NUMPY_AVAILABLE:
+            packed = np.frombuffer(bytes.fromhex(digest), dtype=np.uint8)
+            nibbles = np.stack([packed >> 4, packed & 0x0F], axis=1).ravel()
+            values = nibbles.astype(np.float64) / 15.0 * 2 - 1
+            return np.tile(values, repeats)[: self.EMBEDDING_DIMENSION].tolist()
+
+        values = [(int(c, 16) / 15.0) * 2 - 1 for c in digest]
+        return (values * repeats)[: self.EMBEDDING_DIMENSION]
+
+    def _get_openai_client(self) -> Any:
+        """Get the shared OpenAI client, creating it on first use"""
+        if self._openai_client is None:
+            try:
+                import openai  # type: ignore[import-not-found]
+            except ImportError:
+                raise ImportError(
+                    "OpenAI package is required for OpenAI embeddings. Install with: pip install openai"
+                )
+            self._openai_client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai_client
 
-    async def _openai_embed(self, text: str) -> list[float]:
-        """Generate embedding using OpenAI API
+    async def _openai_embed(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings using OpenAI API
 
         Args:
-            text: Input text
+            texts: Input texts (one request)
 
         Returns:
-            OpenAI embedding vector (1536 dimensions)
+            OpenAI embedding vectors (1536 dimensions)
         """
+        client = self._get_openai_client()
         try:
-            import openai  # type: ignore[import-not-found]
-
-            client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
             response = await client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text,
+                model=self.OPENAI_MODEL,
+                input=texts,
                 dimensions=self.EMBEDDING_DIMENSION,
             )
+        except Exception as e:
+            logger.error(f"OpenAI embedding failed: {e}")
+            raise
 
-            embedding = response.data[0].embedding
+        # The API may return items out of order; each carries its input index
+        data = sorted(response.data, key=lambda item: item.index)
+        embeddings = [list(item.embedding) for item in data]
 
+        for embedding in embeddings:
             if len(embedding) != self.EMBEDDING_DIMENSION:
                 logger.warning(
                     f"OpenAI returned {len(embedding)} dimensions, expected {self.EMBEDDING_DIMENSION}"
                 )
+                break
 
-            logger.debug(f"Generated OpenAI embedding (strategy={self.embedding_strategy})")
-            return embedding
+        logger.debug(f"Generated {len(embeddings)} OpenAI embeddings in one request")
+        return embeddings
 
-        except ImportError:
-            raise ImportError(
-                "OpenAI package is required for OpenAI embeddings. Install with: pip install openai"
-            )
-        except Exception as e:
-            logger.error(f"OpenAI embedding failed: {e}")
-            raise
+    def _local_model_name(self) -> str:
+        return getattr(self.config, "local_embedding_model", None) or self.DEFAULT_LOCAL_MODEL
 
-    async def _local_embed(self, text: str) -> list[float]:
-        """Generate embedding using local model (sentence-transformers)
+    def _get_local_model(self) -> Any:
+        """Get the local model, loading it on first use"""
+        if self._local_model is None:
+            try:
+                from sentence_transformers import (  # type: ignore[import-not-found]
+                    SentenceTransformer,
+                )
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers package is required for local embeddings. "
+                    "Install with: pip install sentence-transformers"
+                )
+            model_name = self._local_model_name()
+            logger.info(f"Loading local model: {model_name}")
+            self._local_model = SentenceTransformer(model_name)
+        return self._local_model
+
+    async def _local_embed(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings using local model (sentence-transformers)
+
+        Runs the batch encode off the event loop. Vectors keep the model's
+        native dimension.
 
         Args:
-            text: Input text
+            texts: Input texts
 
         Returns:
-            Local model embedding vector (normalized to 1536 dimensions)
+            Local model embedding vectors
         """
+        model = self._get_local_model()
         try:
-            import numpy as np  # type: ignore[import-not-found]
-            from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
-
-            # Load model (cached after first load)
-            if not hasattr(self, "_local_model"):
-                model_name = getattr(self.config, "local_embedding_model", "all-MiniLM-L6-v2")
-                logger.info(f"Loading local model: {model_name}")
-                self._local_model = SentenceTransformer(model_name)
-
-            # Generate embedding
-            embedding = self._local_model.encode(text, convert_to_numpy=True)
-
-            # Normalize to 1536 dimensions
-            # If smaller: pad with zeros
-            # If larger: truncate
-            if len(embedding) < self.EMBEDDING_DIMENSION:
-                padding = np.zeros(self.EMBEDDING_DIMENSION - len(embedding))
-                embedding = np.concatenate([embedding, padding])
-            elif len(embedding) > self.EMBEDDING_DIMENSION:
-                embedding = embedding[: self.EMBEDDING_DIMENSION]
-
-            embedding = embedding.tolist()
-
-            logger.debug(f"Generated local embedding (strategy={self.embedding_strategy})")
-            return embedding
-
-        except ImportError:
-            raise ImportError(
-                "sentence-transformers package is required for local embeddings. "
-                "Install with: pip install sentence-transformers"
+            embeddings = await asyncio.to_thread(
+                model.encode, texts, batch_size=self.batch_size, convert_to_numpy=True
             )
         except Exception as e:
             logger.error(f"Local embedding failed: {e}")
             raise
 
+        logger.debug(f"Generated {len(texts)} local embeddings")
+        return embeddings.tolist()
+
     def get_strategy(self) -> str:
         """Get current embedding strategy
 
@@ -233,14 +367,24 @@ class MemoryEmbedder:
         """
         return self.embedding_strategy
 
+    async def close(self) -> None:
+        """Close the shared provider client"""
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
+
 
-def create_memory_embedder(config: SDKConfig | None = None) -> MemoryEmbedder:
+def create_memory_embedder(
+    config: SDKConfig | None = None,
+    cache_dir: Path | None = None,
+) -> MemoryEmbedder:
     """Factory function to create memory embedder
 
     Args:
         config: Optional SDK configuration
+        cache_dir: Optional directory for the on-disk embedding cache
 
     Returns:
         MemoryEmbedder instance
     """
-    return MemoryEmbedder(config=config)
+    return MemoryEmbedder(config=config, cache_dir=cache_dir)
@@ -0,0 +1,485 @@
+"""OpenCode Python - Vector index for memory search
+
+Nearest-neighbour index over memory embeddings, one per session.
+
+Layout under ``<index_dir>/<session_id>/``:
+- ``vectors.f32``: row-major float32 matrix of L2-normalised embeddings,
+  appended to on insert and memory-mapped for scoring
+- ``rows.jsonl``: append-only log of ``{"op": "add", "id", "row"}`` and
+  ``{"op": "del", "id"}`` records mapping rows to memory ids
+- ``meta.json``: embedding dimension
+- ``hnsw.bin``: approximate index, only above ``ann_threshold`` live rows;
+  saved every ``ann_save_interval`` mutations and on ``flush``, and
+  rebuilt on open if it lags behind the rows log
+
+Small stores are scored brute-force with one matrix-vector product. Above
+the threshold an HNSW graph (hnswlib, optional) is built once and then
+updated incrementally; deletes are tombstones in both modes, so neither
+inserts nor deletes require a rebuild. ``compact`` drops tombstoned rows
+when they pile up.
+
+Requires numpy; hnswlib is optional and only used above the threshold.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np  # type: ignore[import-not-found]
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    pass
+
+HNSWLIB_AVAILABLE = False
+try:
+    import hnswlib  # type: ignore[import-not-found]
+
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class SessionVectorIndex:
+    """Vector index for the memories of one session"""
+
+    def __init__(
+        self,
+        path: Path,
+        ann_threshold: int = 20000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
+        ann_save_interval: int = 1000,
+    ) -> None:
+        """Open (or create) the index stored at path
+
+        Args:
+            path: Directory holding this session's index files
+            ann_threshold: Live row count above which HNSW is used
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size
+            ann_save_interval: Mutations after which the HNSW index is due
+                to be saved (see ``ann_save_due``)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "numpy is required for memory vector search. Install with: pip install numpy"
+            )
+
+        self.path = path
+        self.ann_threshold = ann_threshold
+        self._hnsw_m = hnsw_m
+        self._hnsw_ef_construction = hnsw_ef_construction
+        self._hnsw_ef_search = hnsw_ef_search
+        self.ann_save_interval = ann_save_interval
+
+        self._vectors_path = path / "vectors.f32"
+        self._rows_path = path / "rows.jsonl"
+        self._meta_path = path / "meta.json"
+        self._hnsw_path = path / "hnsw.bin"
+
+        self.dimension: int | None = None
+        self._row_ids: list[str | None] = []
+        self._id_rows: dict[str, int] = {}
+        self._matrix: Any = None
+        self._matrix_rows = 0
+        self._ann: Any = None
+        self._ann_unsaved = 0
+        # Guards the HNSW index while flush saves it from a worker thread
+        self._ann_lock = threading.Lock()
+
+        self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self) -> None:
+        if self._meta_path.exists():
+            self.dimension = json.loads(self._meta_path.read_text())["dimension"]
+        if self._rows_path.exists():
+            with self._rows_path.open("rb") as f:
+                good_bytes = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn tail from a crash mid-append: cut it so later
+                        # appends start on a fresh line
+                        logger.warning(f"Truncating torn tail of {self._rows_path}")
+                        f.close()
+                        with self._rows_path.open("r+b") as out:
+                            out.truncate(good_bytes)
+                        break
+                    good_bytes += len(line)
+                    if record["op"] == "add":
+                        row = record["row"]
+                        while len(self._row_ids) <= row:
+                            self._row_ids.append(None)
+                        self._row_ids[row] = record["id"]
+                        self._id_rows[record["id"]] = row
+                    elif record["op"] == "del":
+                        row = self._id_rows.pop(record["id"], None)
+                        if row is not None:
+                            self._row_ids[row] = None
+
+        if self.dimension is not None and self._vectors_path.exists():
+            # Only rows whose mapping was logged are valid
+            stored = self._vectors_path.stat().st_size // (4 * self.dimension)
+            if stored < len(self._row_ids):
+                for row in range(stored, len(self._row_ids)):
+                    memory_id = self._row_ids[row]
+                    if memory_id is not None:
+                        self._id_rows.pop(memory_id, None)
+                del self._row_ids[stored:]
+            elif stored > len(self._row_ids):
+                with self._vectors_path.open("r+b") as f:
+                    f.truncate(len(self._row_ids) * 4 * self.dimension)
+
+        if len(self._id_rows) >= self.ann_threshold:
+            self._load_or_build_ann()
+
+    def _append_rows_log(self, records: list[dict[str, Any]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._rows_path.open("a") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+
+    def _matrix_view(self) -> Any:
+        """Memory-mapped view of all stored rows, remapped after appends."""
+        rows = len(self._row_ids)
+        if self._matrix is None or self._matrix_rows != rows:
+            self._matrix = (
+                np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+                if rows and self.dimension
+                else np.zeros((0, self.dimension or 0), dtype=np.float32)
+            )
+            self._matrix_rows = rows
+        return self._matrix
+
+    def create(self) -> None:
+        """Create the (empty) index files so the session counts as indexed"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._rows_path.touch()
+
+    # -- mutation ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._id_rows)
+
+    def __contains__(self, memory_id: object) -> bool:
+        return memory_id in self._id_rows
+
+    def add(self, memory_id: str, embedding: list[float] | Any) -> None:
+        """Insert or replace the vector for a memory
+
+        Args:
+            memory_id: Memory ID
+            embedding: Embedding vector
+        """
+        self.add_many([(memory_id, embedding)])
+
+    def add_many(self, items: list[tuple[str, list[float] | Any]]) -> None:
+        """Insert or replace vectors for several memories in one append
+
+        Args:
+            items: (memory_id, embedding) pairs
+        """
+        if not items:
+            return
+
+        vectors = np.asarray([embedding for _, embedding in items], dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be one-dimensional vectors of equal length")
+        if self.dimension is None:
+            self.dimension = int(vectors.shape[1])
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._meta_path.write_text(json.dumps({"dimension": self.dimension}))
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match index dimension "
+                f"{self.dimension}"
+            )
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        replaced = [memory_id for memory_id, _ in items if memory_id in self._id_rows]
+        if replaced:
+            self.delete_many(replaced)
+
+        first_row = len(self._row_ids)
+        with self._vectors_path.open("ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+        records = []
+        for offset, (memory_id, _) in enumerate(items):
+            row = first_row + offset
+            self._row_ids.append(memory_id)
+            self._id_rows[memory_id] = row
+            records.append({"op": "add", "id": memory_id, "row": row})
+        self._append_rows_log(records)
+
+        if self._ann is not None:
+            with self._ann_lock:
+                self._ann_add(vectors, list(range(first_row, first_row + len(items))))
+            self._ann_unsaved += len(items)
+        elif len(self._id_rows) >= self.ann_threshold:
+            self._load_or_build_ann()
+
+    def delete(self, memory_id: str) -> bool:
+        """Remove a memory's vector
+
+        Args:
+            memory_id: Memory ID
+
+        Returns:
+            True if the memory was indexed
+        """
+        return self.delete_many([memory_id]) > 0
+
+    def delete_many(self, memory_ids: list[str]) -> int:
+        """Remove vectors for several memories
+
+        Args:
+            memory_ids: Memory IDs
+
+        Returns:
+            Number of memories that were indexed
+        """
+        records = []
+        for memory_id in memory_ids:
+            row = self._id_rows.pop(memory_id, None)
+            if row is None:
+                continue
+            self._row_ids[row] = None
+            records.append({"op": "del", "id": memory_id})
+            if self._ann is not None:
+                with self._ann_lock:
+                    self._ann.mark_deleted(row)
+                self._ann_unsaved += 1
+        if records:
+            self._append_rows_log(records)
+        return len(records)
+
+    @property
+    def ann_save_due(self) -> bool:
+        """Whether enough HNSW mutations are unsaved that ``flush`` should run"""
+        return self._ann_unsaved >= self.ann_save_interval
+
+    def flush(self) -> None:
+        """Save the HNSW index if it has unsaved mutations
+
+        Blocking and O(index); call through ``asyncio.to_thread`` from async code.
+        """
+        if self._ann is not None and self._ann_unsaved:
+            self._save_ann()
+
+    # -- approximate index -------------------------------------------------
+
+    def _load_or_build_ann(self) -> None:
+        if not HNSWLIB_AVAILABLE:
+            if self._ann is None:
+                logger.info(
+                    f"hnswlib not installed; using brute-force search for {len(self)} memories"
+                )
+            return
+
+        ann = hnswlib.Index(space="ip", dim=self.dimension)
+        if self._hnsw_path.exists():
+            try:
+                ann.load_index(str(self._hnsw_path), max_elements=len(self._row_ids))
+                if ann.get_current_count() == len(self._row_ids):
+                    # Deletes since the last save are only in the rows log
+                    for row, memory_id in enumerate(self._row_ids):
+                        if memory_id is None:
+                            try:
+                                ann.mark_deleted(row)
+                            except RuntimeError:
+                                pass  # already deleted in the saved index
+                    ann.set_ef(self._hnsw_ef_search)
+                    self._ann = ann
+                    return
+            except Exception as e:
+                logger.warning(f"Discarding unreadable HNSW index at {self._hnsw_path}: {e}")
+            ann = hnswlib.Index(space="ip", dim=self.dimension)
+
+        ann.init_index(
+            max_elements=max(len(self._row_ids), 1024),
+            ef_construction=self._hnsw_ef_construction,
+            M=self._hnsw_m,
+            allow_replace_deleted=False,
+        )
+        ann.set_ef(self._hnsw_ef_search)
+        self._ann = ann
+
+        matrix = self._matrix_view()
+        live = [row for row, memory_id in enumerate(self._row_ids) if memory_id is not None]
+        dead = [row for row, memory_id in enumerate(self._row_ids) if memory_id is None]
+        # Add every row so labels stay equal to row numbers, then tombstone the dead ones
+        self._ann_add(np.asarray(matrix), list(range(len(self._row_ids))))
+        for row in dead:
+            self._ann.mark_deleted(row)
+        logger.info(f"Built HNSW index over {len(live)} memories at {self.path}")
+        self._save_ann()
+
+    def _ann_add(self, vectors: Any, rows: list[int]) -> None:
+        needed = self._ann.get_current_count() + len(rows)
+        if needed > self._ann.get_max_elements():
+            self._ann.resize_index(max(needed, self._ann.get_max_elements() * 2))
+        self._ann.add_items(vectors, np.asarray(rows))
+
+    def _save_ann(self) -> None:
+        with self._ann_lock:
+            self._ann_unsaved = 0
+            self._ann.save_index(str(self._hnsw_path))
+
+    # -- query -------------------------------------------------------------
+
+    def search(self, embedding: list[float] | Any, k: int) -> list[tuple[str, float]]:
+        """Find the k memories most similar to an embedding
+
+        Args:
+            embedding: Query embedding
+            k: Number of results
+
+        Returns:
+            (memory_id, cosine similarity) pairs, most similar first
+        """
+        live = len(self._id_rows)
+        if k <= 0 or live == 0:
+            return []
+        k = min(k, live)
+
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError(
+                f"Query dimension {query.shape} does not match index dimension {self.dimension}"
+            )
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if self._ann is not None:
+            with self._ann_lock:
+                self._ann.set_ef(max(self._hnsw_ef_search, k))
+                labels, distances = self._ann.knn_query(query, k=k)
+            return [
+                (self._row_ids[int(row)], 1.0 - float(distance))
+                for row, distance in zip(labels[0], distances[0])
+                if self._row_ids[int(row)] is not None
+            ]
+
+        scores = self._matrix_view() @ query
+        if live < len(self._row_ids):
+            dead = np.fromiter(
+                (memory_id is None for memory_id in self._row_ids),
+                dtype=bool,
+                count=len(self._row_ids),
+            )
+            scores = np.where(dead, -np.inf, scores)
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (self._row_ids[int(row)], float(scores[row]))
+            for row in top
+            if self._row_ids[int(row)] is not None
+        ]
+
+    def compact(self) -> int:
+        """Rewrite the index without tombstoned rows
+
+        Returns:
+            Number of rows dropped
+        """
+        dead = len(self._row_ids) - len(self._id_rows)
+        if dead == 0:
+            return 0
+
+        matrix = self._matrix_view()
+        live_rows = [row for row, memory_id in enumerate(self._row_ids) if memory_id is not None]
+        live_ids = [self._row_ids[row] for row in live_rows]
+        vectors = np.array(matrix[live_rows], dtype=np.float32)
+
+        tmp_vectors = self._vectors_path.with_suffix(".f32.tmp")
+        tmp_rows = self._rows_path.with_suffix(".jsonl.tmp")
+        tmp_vectors.write_bytes(vectors.tobytes())
+        tmp_rows.write_text(
+            "".join(
+                json.dumps({"op": "add", "id": memory_id, "row": row}) + "\n"
+                for row, memory_id in enumerate(live_ids)
+            )
+        )
+        self._matrix = None
+        tmp_vectors.replace(self._vectors_path)
+        tmp_rows.replace(self._rows_path)
+        self._hnsw_path.unlink(missing_ok=True)
+
+        self._row_ids = list(live_ids)
+        self._id_rows = {memory_id: row for row, memory_id in enumerate(live_ids)}
+        self._ann = None
+        if len(self._id_rows) >= self.ann_threshold:
+            self._load_or_build_ann()
+        return dead
+
+    @property
+    def tombstones(self) -> int:
+        """Number of deleted rows still occupying space"""
+        return len(self._row_ids) - len(self._id_rows)
+
+    @property
+    def approximate(self) -> bool:
+        """Whether searches go through the HNSW index"""
+        return self._ann is not None
+
+
+class MemoryVectorIndex:
+    """Per-session vector indexes under a common directory"""
+
+    def __init__(self, index_dir: Path, ann_threshold: int = 20000) -> None:
+        """Initialize the index collection
+
+        Args:
+            index_dir: Directory holding one subdirectory per session
+            ann_threshold: Live row count above which HNSW is used
+        """
+        self.index_dir = index_dir
+        self.ann_threshold = ann_threshold
+        self._sessions: dict[str, SessionVectorIndex] = {}
+
+    def flush(self) -> None:
+        """Save every open session's pending HNSW changes (blocking)"""
+        for index in list(self._sessions.values()):
+            index.flush()
+
+    def exists(self, session_id: str) -> bool:
+        """Whether an index has been written for a session"""
+        return session_id in self._sessions or (self.index_dir / session_id / "rows.jsonl").exists()
+
+    def session(self, session_id: str) -> SessionVectorIndex:
+        """Get (opening if needed) the index for a session"""
+        index = self._sessions.get(session_id)
+        if index is None:
+            index = SessionVectorIndex(
+                self.index_dir / session_id, ann_threshold=self.ann_threshold
+            )
+            self._sessions[session_id] = index
+        return index
+
+    def drop(self, session_id: str) -> None:
+        """Delete a session's index files"""
+        self._sessions.pop(session_id, None)
+        path = self.index_dir / session_id
+        if path.exists():
+            for child in path.iterdir():
+                child.unlink()
+            path.rmdir()
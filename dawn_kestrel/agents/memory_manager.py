@@ -2,24 +2,61 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from dawn_kestrel.agents.memory_index import (
+    NUMPY_AVAILABLE,
+    MemoryVectorIndex,
+    SessionVectorIndex,
+)
 from dawn_kestrel.core.models import Memory
 from dawn_kestrel.storage.memory_storage import MemoryStorage
 
+if TYPE_CHECKING:
+    from dawn_kestrel.agents.memory_embedder import MemoryEmbedder
+
 logger = logging.getLogger(__name__)
 
 
 class MemoryManager:
-    """Manager for memory operations with storage integration"""
+    """Manager for memory operations with storage integration
+
+    With an embedder, memories are embedded on store and ``search`` with a
+    query is a nearest-neighbour lookup in a per-session vector index (see
+    ``memory_index``) instead of a scan of every stored memory. Without
+    one, queries fall back to a case-insensitive substring filter.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        embedder: MemoryEmbedder | None = None,
+        ann_threshold: int = 20000,
+    ) -> None:
+        """Initialize memory manager with base directory
 
-    def __init__(self, base_dir: Path) -> None:
-        """Initialize memory manager with base directory"""
+        Args:
+            base_dir: Base storage directory
+            embedder: Embedder used for semantic search (None = substring search)
+            ann_threshold: Memories per session above which search is approximate
+        """
         self.storage = MemoryStorage(base_dir)
+        self.embedder = embedder
+        self.index: MemoryVectorIndex | None = None
+        if embedder is not None:
+            if NUMPY_AVAILABLE:
+                self.index = MemoryVectorIndex(
+                    self.storage.storage_dir / "memory_index", ann_threshold=ann_threshold
+                )
+            else:
+                logger.warning("numpy not installed; memory search falls back to substring match")
+        self._index_locks: dict[str, asyncio.Lock] = {}
+        self._dimension: int | None = None
 
     async def store(
         self,
@@ -30,6 +67,9 @@ class MemoryManager:
     ) -> Memory:
         """Store a new memory entry"""
         memory_id = str(uuid.uuid4())
+        if embedding is None and self.index is not None and self.embedder is not None:
+            embedding = await self.embedder.embed(content)
+            self._dimension = len(embedding)
         memory = Memory(
             id=memory_id,
             session_id=session_id,
@@ -39,6 +79,15 @@ class MemoryManager:
             created=datetime.now().timestamp(),
         )
         await self.storage.store_memory(memory)
+        if self.index is not None and embedding is not None:
+            # A fresh rebuild reads storage, so it already includes this memory
+            if not await self._ensure_index(session_id):
+                index = self.index.session(session_id)
+                try:
+                    index.add(memory_id, embedding)
+                except ValueError as e:
+                    logger.warning(f"Memory {memory_id} not indexed: {e}")
+                await self._flush_if_due(index)
         logger.debug(f"Stored memory {memory_id} for session {session_id}")
         return memory
 
@@ -59,9 +108,19 @@ class MemoryManager:
     ) -> list[Memory]:
         """Search memories in a session
 
-        For now, returns all memories with optional filtering by content.
-        Future implementations will add semantic search with embeddings.
+        Without a query, returns all memories, newest first. With a query
+        and an embedder, returns memories ranked by embedding similarity
+        (only the matched memories are read from storage); otherwise
+        filters by case-insensitive substring.
         """
+        if query and self.index is not None and self.embedder is not None:
+            try:
+                return await self._semantic_search(session_id, query, limit, offset)
+            except ValueError as e:
+                logger.warning(
+                    f"Semantic search failed for session {session_id}, using substring match: {e}"
+                )
+
         memories = await self.storage.list_memories(session_id)
 
         # Apply content filter if query provided
@@ -79,6 +138,105 @@ class MemoryManager:
         logger.debug(f"Found {len(memories)} memories for session {session_id}")
         return memories
 
+    async def _semantic_search(
+        self,
+        session_id: str,
+        query: str,
+        limit: int | None,
+        offset: int,
+    ) -> list[Memory]:
+        assert self.index is not None and self.embedder is not None
+        query_embedding = await self.embedder.embed(query)
+        self._dimension = len(query_embedding)
+        await self._ensure_index(session_id)
+        index = self.index.session(session_id)
+
+        k = len(index) if limit is None or limit <= 0 else offset + limit
+        hits = index.search(query_embedding, k)[offset:]
+
+        memories = await asyncio.gather(
+            *(self.storage.get_memory(session_id, memory_id) for memory_id, _ in hits)
+        )
+        results = [m for m in memories if m is not None]
+        logger.debug(f"Found {len(results)} memories for session {session_id} (semantic)")
+        return results
+
+    async def _embedder_dimension(self) -> int:
+        """Dimension of the vectors the embedder currently produces"""
+        assert self.embedder is not None
+        if self._dimension is None:
+            # Loads the model for local embedders
+            dimension = await asyncio.to_thread(getattr, self.embedder, "dimension", None)
+            if dimension is None:
+                dimension = len(await self.embedder.embed(" "))
+            self._dimension = int(dimension)
+        return self._dimension
+
+    def _index_current(self, session_id: str, dimension: int) -> bool:
+        assert self.index is not None
+        if not self.index.exists(session_id):
+            return False
+        indexed = self.index.session(session_id).dimension
+        return indexed is None or indexed == dimension
+
+    async def _ensure_index(self, session_id: str) -> bool:
+        """Build a session's index from storage when it is missing or stale
+
+        Covers memories stored before the index existed; memories without an
+        embedding are embedded now. An index whose dimension differs from the
+        embedder's (e.g. after switching embedding models) is rebuilt.
+
+        Returns:
+            True if the index was rebuilt by this call
+        """
+        assert self.index is not None and self.embedder is not None
+        dimension = await self._embedder_dimension()
+        if self._index_current(session_id, dimension):
+            return False
+        lock = self._index_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            if self._index_current(session_id, dimension):
+                return False
+            await self.rebuild_index(session_id)
+            return True
+
+    async def _flush_if_due(self, index: SessionVectorIndex) -> None:
+        if index.ann_save_due:
+            await asyncio.to_thread(index.flush)
+
+    async def close(self) -> None:
+        """Persist pending vector index changes"""
+        if self.index is not None:
+            await asyncio.to_thread(self.index.flush)
+
+    async def rebuild_index(self, session_id: str) -> int:
+        """Rebuild a session's vector index from stored memories
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Number of memories indexed
+        """
+        if self.index is None or self.embedder is None:
+            return 0
+        dimension = await self._embedder_dimension()
+        memories = await self.storage.list_memories(session_id)
+        # Embeddings from another model (or padded to another size) are redone
+        missing = [
+            m for m in memories if m.embedding is None or len(m.embedding) != dimension
+        ]
+        embedded = await self.embedder.embed_batch([m.content for m in missing])
+        fresh = {m.id: embedding for m, embedding in zip(missing, embedded)}
+        items = [(m.id, fresh.get(m.id, m.embedding)) for m in memories]
+
+        self.index.drop(session_id)
+        index = self.index.session(session_id)
+        index.create()
+        index.add_many(items)
+        logger.info(f"Rebuilt memory index for session {session_id}: {len(items)} memories")
+        return len(items)
+
     async def delete(
         self,
         session_id: str,
@@ -86,6 +244,12 @@ class MemoryManager:
     ) -> bool:
         """Delete a memory by ID"""
         deleted = await self.storage.delete_memory(session_id, memory_id)
+        if self.index is not None and self.index.exists(session_id):
+            index = self.index.session(session_id)
+            index.delete(memory_id)
+            if index.tombstones > max(1024, len(index)):
+                index.compact()
+            await self._flush_if_due(index)
         if deleted:
             logger.debug(f"Deleted memory {memory_id} from session {session_id}")
         else:
@@ -15,6 +15,7 @@ from typing import Any, cast
 from dawn_kestrel.agents.execution_queue import (
     AgentExecutionJob,
     InMemoryAgentExecutionQueue,
+    get_shared_execution_queue,
 )
 from dawn_kestrel.agents.runtime import AgentRuntime
 from dawn_kestrel.core.agent_task import AgentTask, TaskStatus, create_agent_task
@@ -53,6 +54,70 @@ class TaskResult:
     """Completion timestamp (epoch seconds)"""
 
 
+class _TaskTable(dict[str, AgentTask]):
+    """Task map that indexes active tasks and children by parent.
+
+    Entries are indexed on insertion. Tasks only leave the active state, so
+    the active index is pruned lazily as tasks are read back.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Insertion-ordered sets of task IDs
+        self._active: dict[str, None] = {}
+        self._children: dict[str, dict[str, None]] = {}
+
+    def __setitem__(self, task_id: str, task: AgentTask) -> None:
+        if task_id in self:
+            self._unindex(task_id, self[task_id])
+        super().__setitem__(task_id, task)
+        if task.is_active():
+            self._active[task_id] = None
+        if task.parent_id is not None:
+            self._children.setdefault(task.parent_id, {})[task_id] = None
+
+    def __delitem__(self, task_id: str) -> None:
+        task = self[task_id]
+        super().__delitem__(task_id)
+        self._unindex(task_id, task)
+
+    def pop(self, task_id: str, *default: Any) -> Any:  # type: ignore[override]
+        if task_id not in self:
+            return super().pop(task_id, *default)
+        task = self[task_id]
+        del self[task_id]
+        return task
+
+    def clear(self) -> None:
+        super().clear()
+        self._active.clear()
+        self._children.clear()
+
+    def _unindex(self, task_id: str, task: AgentTask) -> None:
+        self._active.pop(task_id, None)
+        siblings = self._children.get(task.parent_id) if task.parent_id is not None else None
+        if siblings is not None:
+            siblings.pop(task_id, None)
+            if not siblings:
+                del self._children[task.parent_id]  # type: ignore[arg-type]
+
+    def active(self) -> list[AgentTask]:
+        tasks = []
+        finished = []
+        for task_id in self._active:
+            task = self[task_id]
+            if task.is_active():
+                tasks.append(task)
+            else:
+                finished.append(task_id)
+        for task_id in finished:
+            del self._active[task_id]
+        return tasks
+
+    def children(self, parent_id: str) -> list[AgentTask]:
+        return [self[task_id] for task_id in self._children.get(parent_id, ())]
+
+
 class AgentOrchestrator:
     """
     Coordinate multiple agents with delegation and parallel execution.
@@ -68,6 +133,8 @@ class AgentOrchestrator:
     - Event emission for task lifecycle
     - Integration with AgentRuntime for execution
     - In-memory tracking (no external queue required)
+    - Parallel runs share a process-wide execution pool, with this
+      orchestrator's concurrency limited by max_parallel_workers
     """
 
     def __init__(
@@ -75,20 +142,25 @@ class AgentOrchestrator:
         agent_runtime: AgentRuntime,
         max_parallel_workers: int = 4,
         parallel_queue_timeout_seconds: float = 300.0,
+        execution_queue: InMemoryAgentExecutionQueue | None = None,
     ) -> None:
         """
         Initialize AgentOrchestrator.
 
         Args:
             agent_runtime: AgentRuntime instance for task execution
+            max_parallel_workers: Quota of this orchestrator's agents running
+                in parallel at once
+            parallel_queue_timeout_seconds: Time limit for one parallel run
+            execution_queue: Pool running parallel agents (default: the
+                process-wide pool from get_shared_execution_queue)
         """
         self.agent_runtime = agent_runtime
-        self._parallel_executor = InMemoryAgentExecutionQueue(
-            max_workers=max_parallel_workers,
-            timeout_seconds=parallel_queue_timeout_seconds,
-        )
+        self._parallel_executor = execution_queue or get_shared_execution_queue()
+        self._parallel_quota = max(1, max_parallel_workers)
+        self._parallel_timeout = parallel_queue_timeout_seconds
 
-        self._tasks: dict[str, AgentTask] = {}
+        self._tasks = _TaskTable()
         self._results: dict[str, TaskResult] = {}
         self._task_lock = Lock()
 
@@ -334,7 +406,13 @@ class AgentOrchestrator:
                 session=session,
             )
 
-        batch_result = await self._parallel_executor.run_jobs(jobs=jobs, execute=_execute)
+        batch_result = await self._parallel_executor.run_jobs(
+            jobs=jobs,
+            execute=_execute,
+            caller=self,
+            quota=self._parallel_quota,
+            timeout_seconds=self._parallel_timeout,
+        )
         task_ids.extend(batch_result.completed_task_ids)
 
         for index, error in batch_result.errors_by_index.items():
@@ -409,7 +487,7 @@ class AgentOrchestrator:
             List of active tasks
         """
         with self._task_lock:
-            return [t for t in self._tasks.values() if t.is_active()]
+            return self._tasks.active()
 
     def get_child_tasks(self, parent_id: str) -> list[AgentTask]:
         """
@@ -422,7 +500,7 @@ class AgentOrchestrator:
             List of child tasks
         """
         with self._task_lock:
-            return [t for t in self._tasks.values() if t.parent_id == parent_id]
+            return self._tasks.children(parent_id)
 
     def list_tasks(self, status_filter: TaskStatus | None = None) -> list[AgentTask]:
         """
@@ -494,12 +572,16 @@ def create_agent_orchestrator(
     agent_runtime: AgentRuntime,
     max_parallel_workers: int = 4,
     parallel_queue_timeout_seconds: float = 300.0,
+    execution_queue: InMemoryAgentExecutionQueue | None = None,
 ) -> AgentOrchestrator:
     """
     Factory function to create AgentOrchestrator.
 
     Args:
         agent_runtime: AgentRuntime instance for task execution
+        max_parallel_workers: Quota of agents running in parallel at once
+        parallel_queue_timeout_seconds: Time limit for one parallel run
+        execution_queue: Pool running parallel agents (default: shared pool)
 
     Returns:
         New AgentOrchestrator instance
@@ -508,4 +590,5 @@ def create_agent_orchestrator(
         agent_runtime=agent_runtime,
         max_parallel_workers=max_parallel_workers,
         parallel_queue_timeout_seconds=parallel_queue_timeout_seconds,
+        execution_queue=execution_queue,
     )
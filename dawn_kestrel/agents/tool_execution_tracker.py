@@ -7,17 +7,24 @@ query capabilities and event emission.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
+from dawn_kestrel.core import json_codec
 from dawn_kestrel.core.event_bus import Events, bus
 from dawn_kestrel.core.models import ToolState
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class ToolExecutionTracker:
     """Track and persist tool executions
@@ -105,31 +112,19 @@ class ToolExecutionTracker:
         Returns:
             Updated execution record or None if not found
         """
-        session_id = None
-
-        session_dirs = [d for d in self.storage_dir.iterdir() if d.is_dir()]
-        for session_dir in session_dirs:
-            execution_file = session_dir / f"{execution_id}.json"
-            if execution_file.exists():
-                session_id = session_dir.name
-                break
-
-        if not session_id:
+        found = await self._find_record(execution_id)
+        if found is None:
             logger.warning(f"Execution record not found: {execution_id}")
             return None
 
-        execution_file = self.storage_dir / session_id / f"{execution_id}.json"
+        session_id, record = found
         try:
-            with open(execution_file) as f:
-                record = json.load(f)
-
             record["state"] = state.model_dump(mode="json")
             if end_time:
                 record["end_time"] = end_time
             record["updated_at"] = datetime.now().timestamp()
 
-            with open(execution_file, "w") as f:
-                json.dump(record, f, indent=2)
+            await self.persist(record)
 
             if state.status == "completed":
                 await bus.publish(
@@ -213,13 +208,28 @@ class ToolExecutionTracker:
         Returns:
             Execution record or None if not found
         """
+        found = await self._find_record(execution_id)
+        return found[1] if found else None
+
+    async def _find_record(self, execution_id: str) -> tuple[str, dict[str, Any]] | None:
+        """Locate an execution record by ID
+
+        Args:
+            execution_id: Execution identifier
+
+        Returns:
+            (session_id, record) tuple or None if not found
+        """
+        if not self.storage_dir.exists():
+            return None
+
         session_dirs = [d for d in self.storage_dir.iterdir() if d.is_dir()]
         for session_dir in session_dirs:
             execution_file = session_dir / f"{execution_id}.json"
             if execution_file.exists():
                 try:
                     with open(execution_file) as f:
-                        return json.load(f)
+                        return session_dir.name, json.load(f)
                 except Exception as e:
                     logger.warning(f"Failed to read execution file {execution_file}: {e}")
                     return None
@@ -239,19 +249,364 @@ class ToolExecutionTracker:
         session_dir.mkdir(parents=True, exist_ok=True)
 
         execution_file = session_dir / f"{execution_id}.json"
-        with open(execution_file, "w") as f:
-            json.dump(record, f, indent=2)
+        execution_file.write_bytes(json_codec.dumps_bytes(record))
 
         logger.debug(f"Persisted execution record: {execution_file}")
 
 
-def create_tool_tracker(base_dir: Path) -> ToolExecutionTracker:
+class AppendOnlyToolExecutionTracker(ToolExecutionTracker):
+    """Tool execution tracker backed by append-only segment files
+
+    Records are appended as compact JSON lines to per-session segment files
+    under storage/tool_execution_log/{session_id}/{segment}-{generation}.jsonl.
+    Updates append a new version of the record; the newest version wins.
+
+    Appends are buffered in memory and written in groups every
+    ``flush_interval`` seconds with one fsync per touched segment. An
+    in-memory ``execution_id -> (session_id, segment, offset, length)`` index
+    serves lookups and history queries with seek-based reads, and sealed
+    segments whose records were mostly superseded are compacted in the
+    background.
+
+    All disk I/O runs on a single dedicated worker thread, so writes, reads
+    and compaction are applied in submission order without blocking the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        flush_interval: float = 0.05,
+        fsync: bool = True,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        compact_min_dead_bytes: int = 1024 * 1024,
+    ) -> None:
+        """Initialize AppendOnlyToolExecutionTracker
+
+        Args:
+            base_dir: Base directory for storage (typically project root)
+            flush_interval: Seconds to batch appends before a group write
+            fsync: Whether each group write is fsynced
+            segment_max_bytes: Size at which the active segment is sealed
+            compact_min_dead_bytes: Superseded bytes in sealed segments that
+                trigger a background compaction for a session
+        """
+        super().__init__(base_dir)
+        self.storage_dir = base_dir / "storage" / "tool_execution_log"
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_min_dead_bytes = compact_min_dead_bytes
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-exec-log")
+        self._index: dict[str, tuple[str, str, int, int]] = {}
+        self._session_ids: dict[str, set[str]] = {}
+        # session_id -> segment name -> [total_bytes, live_bytes]
+        self._segments: dict[str, dict[str, list[int]]] = {}
+        self._active: dict[str, str] = {}
+        self._pending: dict[str, list[tuple[str, bytes]]] = {}
+        self._compacting: set[str] = set()
+        # Referenced until done so they are not garbage-collected mid-run
+        self._compaction_tasks: set[asyncio.Task[None]] = set()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._loading: asyncio.Future[None] | None = None
+
+    async def persist(self, record: dict[str, Any]) -> None:
+        """Append an execution record to its session's active segment
+
+        Args:
+            record: Execution record dictionary
+        """
+        await self._ensure_loaded()
+        session_id = record["session_id"]
+        line = json_codec.dumps_bytes(record) + b"\n"
+
+        segment = self._active.get(session_id)
+        segments = self._segments.setdefault(session_id, {})
+        if segment is None or segments[segment][0] >= self.segment_max_bytes:
+            segment = self._next_segment_name(session_id)
+            self._active[session_id] = segment
+            segments[segment] = [0, 0]
+
+        offset = segments[segment][0]
+        segments[segment][0] += len(line)
+        self._set_location(record["id"], (session_id, segment, offset, len(line)))
+        self._pending.setdefault(session_id, []).append((segment, line))
+
+        if self.flush_interval <= 0:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write all buffered records to disk as one group"""
+        self._flush_task = None
+        batch = self._take_pending()
+        if batch:
+            await self._run(self._write_batch, batch)
+        self._maybe_compact()
+
+    async def close(self) -> None:
+        """Flush buffered records and stop the I/O worker"""
+        await self.flush()
+        if self._compaction_tasks:
+            await asyncio.gather(*self._compaction_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+    async def get_execution_history(
+        self,
+        session_id: str,
+        tool_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get execution history for a session
+
+        Args:
+            session_id: Session identifier
+            tool_id: Optional filter by specific tool
+            limit: Optional maximum number of records to return
+
+        Returns:
+            List of execution records sorted by timestamp (newest first)
+        """
+        await self._ensure_loaded()
+        locations = [self._index[eid] for eid in self._session_ids.get(session_id, ())]
+        executions = await self._read_locations(locations)
+
+        if tool_id:
+            executions = [r for r in executions if r.get("tool_id") == tool_id]
+        executions.sort(key=lambda x: x.get("start_time") or 0, reverse=True)
+
+        if limit:
+            executions = executions[:limit]
+
+        return executions
+
+    async def _find_record(self, execution_id: str) -> tuple[str, dict[str, Any]] | None:
+        await self._ensure_loaded()
+        location = self._index.get(execution_id)
+        if location is None:
+            return None
+        records = await self._read_locations([location])
+        return (location[0], records[0]) if records else None
+
+    async def _read_locations(
+        self, locations: list[tuple[str, str, int, int]]
+    ) -> list[dict[str, Any]]:
+        if not locations:
+            return []
+        # Reads queue behind the group write on the same worker thread
+        batch = self._take_pending()
+        if batch:
+            await self._run(self._write_batch, batch)
+        return await self._run(self._read_sync, locations)
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.flush_interval)
+        finally:
+            if self._flush_task is asyncio.current_task():
+                await self.flush()
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load())
+        await self._loading
+
+    async def _load(self) -> None:
+        entries, sizes = await self._run(self._scan_sync)
+        for session_id, segment_sizes in sizes.items():
+            segments = self._segments.setdefault(session_id, {})
+            for name, size in segment_sizes.items():
+                segments[name] = [size, 0]
+            if segment_sizes:
+                self._active[session_id] = max(segment_sizes, key=_segment_key)
+        for execution_id, location in entries:
+            self._set_location(execution_id, location)
+
+    def _set_location(self, execution_id: str, location: tuple[str, str, int, int]) -> None:
+        session_id, segment, _, length = location
+        previous = self._index.get(execution_id)
+        if previous is not None:
+            self._segments[previous[0]][previous[1]][1] -= previous[3]
+        self._segments[session_id][segment][1] += length
+        self._index[execution_id] = location
+        self._session_ids.setdefault(session_id, set()).add(execution_id)
+
+    def _next_segment_name(self, session_id: str) -> str:
+        existing = self._segments.get(session_id, {})
+        next_number = max((_segment_key(name)[0] for name in existing), default=-1) + 1
+        return f"{next_number:06d}-0.jsonl"
+
+    def _take_pending(self) -> dict[str, list[tuple[str, bytes]]]:
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _write_batch(self, batch: dict[str, list[tuple[str, bytes]]]) -> None:
+        for session_id, lines in batch.items():
+            session_dir = self.storage_dir / session_id
+            session_dir.mkdir(parents=True, exist_ok=True)
+            by_segment: dict[str, list[bytes]] = {}
+            for segment, line in lines:
+                by_segment.setdefault(segment, []).append(line)
+            for segment, segment_lines in by_segment.items():
+                with open(session_dir / segment, "ab") as f:
+                    f.write(b"".join(segment_lines))
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+
+    def _read_sync(self, locations: list[tuple[str, str, int, int]]) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        by_segment: dict[tuple[str, str], list[tuple[int, int]]] = {}
+        for session_id, segment, offset, length in locations:
+            by_segment.setdefault((session_id, segment), []).append((offset, length))
+        for (session_id, segment), spans in by_segment.items():
+            path = self.storage_dir / session_id / segment
+            try:
+                with open(path, "rb") as f:
+                    for offset, length in sorted(spans):
+                        f.seek(offset)
+                        records.append(json_codec.loads(f.read(length)))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Failed to read execution segment {path}: {e}")
+        return records
+
+    def _scan_sync(
+        self,
+    ) -> tuple[list[tuple[str, tuple[str, str, int, int]]], dict[str, dict[str, int]]]:
+        """Scan existing segments in order to rebuild the index"""
+        entries: list[tuple[str, tuple[str, str, int, int]]] = []
+        sizes: dict[str, dict[str, int]] = {}
+        if not self.storage_dir.exists():
+            return entries, sizes
+        for session_dir in self.storage_dir.iterdir():
+            if not session_dir.is_dir():
+                continue
+            session_id = session_dir.name
+            segment_sizes = sizes.setdefault(session_id, {})
+            for path in sorted(session_dir.glob("*.jsonl"), key=lambda p: _segment_key(p.name)):
+                offset = 0
+                with open(path, "r+b") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # Torn final write from a crash: drop it so appends stay aligned
+                            f.truncate(offset)
+                            break
+                        try:
+                            record = json_codec.loads(line)
+                            entries.append(
+                                (record["id"], (session_id, path.name, offset, len(line)))
+                            )
+                        except (json.JSONDecodeError, KeyError):
+                            pass
+                        offset += len(line)
+                segment_sizes[path.name] = offset
+        return entries, sizes
+
+    def _maybe_compact(self) -> None:
+        for session_id, segments in self._segments.items():
+            if session_id in self._compacting:
+                continue
+            active = self._active.get(session_id)
+            sealed = [name for name in segments if name != active]
+            dead = sum(segments[name][0] - segments[name][1] for name in sealed)
+            if sealed and dead >= self.compact_min_dead_bytes:
+                self._compacting.add(session_id)
+                task = asyncio.create_task(self._compact(session_id, sealed))
+                self._compaction_tasks.add(task)
+                task.add_done_callback(self._compaction_tasks.discard)
+
+    async def _compact(self, session_id: str, sealed: list[str]) -> None:
+        """Rewrite live records of sealed segments into one new segment"""
+        try:
+            sealed_set = set(sealed)
+            live = sorted(
+                (
+                    (eid, loc)
+                    for eid, loc in self._index.items()
+                    if loc[0] == session_id and loc[1] in sealed_set
+                ),
+                key=lambda item: (_segment_key(item[1][1]), item[1][2]),
+            )
+            last_number, last_generation = _segment_key(max(sealed, key=_segment_key))
+            target = f"{last_number:06d}-{last_generation + 1}.jsonl"
+
+            moved = await self._run(self._compact_sync, session_id, live, target)
+
+            segments = self._segments[session_id]
+            segments[target] = [sum(length for _, _, length in moved), 0]
+            for (execution_id, old_location), (_, new_offset, length) in zip(live, moved):
+                if self._index.get(execution_id) == old_location:
+                    self._set_location(execution_id, (session_id, target, new_offset, length))
+            for name in sealed:
+                segments.pop(name, None)
+
+            # Queued after any read that still points at the old segments
+            await self._run(self._remove_segments, session_id, sealed)
+            logger.debug(f"Compacted {len(sealed)} execution segments for {session_id}")
+        except Exception as e:
+            logger.error(f"Failed to compact execution segments for {session_id}: {e}")
+        finally:
+            self._compacting.discard(session_id)
+
+    def _compact_sync(
+        self,
+        session_id: str,
+        live: list[tuple[str, tuple[str, str, int, int]]],
+        target: str,
+    ) -> list[tuple[str, int, int]]:
+        session_dir = self.storage_dir / session_id
+        tmp_path = session_dir / (target + ".tmp")
+        moved: list[tuple[str, int, int]] = []
+        offset = 0
+        with open(tmp_path, "wb") as out:
+            handles: dict[str, Any] = {}
+            try:
+                for execution_id, (_, segment, old_offset, length) in live:
+                    src = handles.get(segment)
+                    if src is None:
+                        src = handles[segment] = open(session_dir / segment, "rb")
+                    src.seek(old_offset)
+                    out.write(src.read(length))
+                    moved.append((execution_id, offset, length))
+                    offset += length
+            finally:
+                for handle in handles.values():
+                    handle.close()
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, session_dir / target)
+        return moved
+
+    def _remove_segments(self, session_id: str, names: list[str]) -> None:
+        for name in names:
+            try:
+                (self.storage_dir / session_id / name).unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _segment_key(name: str) -> tuple[int, int]:
+    """Sort key (segment number, generation) for a segment file name"""
+    number, _, generation = name.split(".", 1)[0].partition("-")
+    return int(number), int(generation or 0)
+
+
+def create_tool_tracker(base_dir: Path, append_only: bool = False) -> ToolExecutionTracker:
     """Factory function to create ToolExecutionTracker
 
     Args:
         base_dir: Base directory for storage
+        append_only: Use the append-only segment log backend
 
     Returns:
         ToolExecutionTracker instance
     """
+    if append_only:
+        return AppendOnlyToolExecutionTracker(base_dir)
     return ToolExecutionTracker(base_dir)
@@ -11,7 +11,7 @@ import asyncio
 import logging
 import time
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -28,13 +28,17 @@ from .core.models import (
     ToolPart,
     ToolState,
 )
+from .core.part_records import MessageRecord
 from .core.provider_config import ProviderConfig
 from .core.settings import settings
+from .core.tokenizer import count_tokens
 from .providers import ProviderID, get_provider
 from .providers.base import ModelInfo, StreamEvent
 from .providers.base import TokenUsage as ProviderTokenUsage
+from .session.compaction import BackgroundCompactor
 from .tools import create_builtin_registry
 from .tools.framework import ToolRegistry
+from .utils.json_parser import IncrementalJSONParser
 
 if TYPE_CHECKING:
     pass
@@ -57,6 +61,7 @@ class AISession:
         provider_config: ProviderConfig | None = None,
         session_lifecycle: SessionLifecycleProtocol | None = None,
         base_dir: Path | None = None,
+        compactor: BackgroundCompactor | None = None,
     ) -> None:
         self.session = session
         self.provider_id = provider_id
@@ -65,6 +70,10 @@ class AISession:
         self.provider_config = provider_config
         self.session_lifecycle = session_lifecycle
         self.base_dir = base_dir
+        # Compacts history in the background after each turn; the history
+        # sent to the model is then its summary plus the newer messages.
+        # Must read the storage the session manager writes to.
+        self.compactor = compactor
 
         api_key_value = api_key or settings.get_api_key_for_provider(provider_id)
 
@@ -106,12 +115,21 @@ class AISession:
         return self.model_info
 
     async def process_stream(
-        self, events: AsyncIterator[StreamEvent]
+        self,
+        events: AsyncIterator[StreamEvent],
+        json_parser: IncrementalJSONParser | None = None,
+        prompt_tokens: int = 0,
     ) -> tuple[list[Part], TokenUsage]:
         """Process stream events and create message parts.
         
         Tool calls are collected during streaming and executed in parallel
         after all events are received for better performance.
+
+        When a json_parser is given, text deltas are fed into it. Once the
+        first top-level JSON object closes or violates the expected schema,
+        the provider stream is closed so no further output is generated.
+        The provider's finish event never arrives in that case, so usage is
+        estimated from prompt_tokens and the output streamed so far.
         """
         parts: list[Part] = []
         tool_input: dict[str, Any] | None = None
@@ -120,6 +138,7 @@ class AISession:
         
         # Collect tool calls for parallel execution
         pending_tool_calls: list[tuple[str, dict[str, Any], str]] = []  # (tool_name, tool_input, call_id)
+        streamed_text: list[str] = []
 
         async for event in events:
             if event.event_type == "finish":
@@ -160,6 +179,20 @@ class AISession:
                             time={"created": event.timestamp},
                         )
                     )
+                streamed_text.append(delta_text)
+                if json_parser is not None and json_parser.feed(delta_text):
+                    logger.debug("Structured output complete, closing the provider stream")
+                    usage = TokenUsage(
+                        input=prompt_tokens,
+                        output=count_tokens("".join(streamed_text)),
+                        reasoning=0,
+                        cache_read=0,
+                        cache_write=0,
+                    )
+                    aclose = getattr(events, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+                    break
 
             elif event.event_type == "tool-call":
                 tool_name = event.data.get("tool", "")
@@ -314,7 +347,10 @@ class AISession:
 
         Args:
             user_message: The user's message text
-            options: Additional options (temperature, top_p, etc.)
+            options: Additional options (temperature, top_p, etc.).
+                ``json_output`` requests structured output: ``True`` stops the
+                stream once the first JSON object closes, a pydantic model
+                class additionally validates fields as they stream in.
 
         Returns:
             The assistant's response message
@@ -323,6 +359,9 @@ class AISession:
         if options:
             logger.debug(f"[{self.session.slug}] LLM Options: {options}")
 
+        summary: str | None = None
+        messages: Sequence[Message | MessageRecord]
+
         # Create user message
         user_msg = Message(
             id=f"{self.session.id}_{self.session.message_counter}",
@@ -342,7 +381,13 @@ class AISession:
                 user_msg_id = user_msg.id
                 if hasattr(result, "error"):
                     logger.error(f"Failed to add user message: {result.error}")
-            messages = await self.session_manager.list_messages(self.session.id)
+            if self.compactor:
+                view = await self.compactor.get_view(self.session.id)
+                summary = view.summary
+                # Stored data is trusted: records skip pydantic validation
+                messages = [MessageRecord.from_dict(data) for data in view.messages]
+            else:
+                messages = await self.session_manager.list_messages(self.session.id)
         else:
             user_msg_id = user_msg.id
             messages = [user_msg]
@@ -351,11 +396,17 @@ class AISession:
         if self.session_lifecycle:
             await self.session_lifecycle.emit_message_added(user_msg.model_dump())
         # Build LLM messages (convert to provider format)
-        llm_messages = self._build_llm_messages(messages)
+        llm_messages = self._build_llm_messages(messages, summary)
 
         provider_options = dict(options or {})
         disable_tools = bool(provider_options.pop("disable_tools", False))
         tools = [] if disable_tools else self._get_tool_definitions()
+        json_output = provider_options.pop("json_output", None)
+        json_parser: IncrementalJSONParser | None = None
+        if json_output:
+            json_parser = IncrementalJSONParser(
+                model=json_output if isinstance(json_output, type) else None
+            )
 
         # Call provider stream
         if self.provider:
@@ -363,7 +414,14 @@ class AISession:
             stream = self.provider.stream(model_info, llm_messages, tools, provider_options)
 
             # Process stream and create parts
-            parts, tokens = await self.process_stream(stream)
+            prompt_tokens = 0
+            if json_parser is not None:
+                prompt_tokens = sum(
+                    count_tokens(str(m.get("content", ""))) for m in llm_messages
+                )
+            parts, tokens = await self.process_stream(
+                stream, json_parser=json_parser, prompt_tokens=prompt_tokens
+            )
         else:
             parts = []
 
@@ -383,6 +441,8 @@ class AISession:
 
         # Create assistant message
         assistant_message = await self.create_assistant_message(user_msg_id, parts, tokens, cost)
+        if self.compactor and self.session_manager:
+            self.compactor.schedule(self.session.id)
 
         # Increment session message counter
         self.session.message_counter += 1
@@ -399,9 +459,20 @@ class AISession:
 
         return int(time.time() * 1000)
 
-    def _build_llm_messages(self, messages: list[Message]) -> list[dict[str, Any]]:
-        """Build LLM-format messages from OpenCode messages"""
+    def _build_llm_messages(
+        self, messages: Sequence[Message | MessageRecord], summary: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Build LLM-format messages from OpenCode messages
+
+        Args:
+            messages: Messages (models or stored records) to send
+            summary: Summary of compacted earlier history, sent first
+        """
         llm_messages = []
+        if summary:
+            llm_messages.append(
+                {"role": "user", "content": f"Summary of the conversation so far:\n{summary}"}
+            )
 
         for msg in messages:
             if msg.role == "user":
@@ -410,7 +481,7 @@ class AISession:
             elif msg.role == "assistant":
                 assistant_content = ""
                 for part in msg.parts:
-                    if isinstance(part, TextPart) and hasattr(part, "text"):
+                    if part.part_type == "text":
                         assistant_content += part.text
                 llm_messages.append({"role": "assistant", "content": assistant_content})
 
@@ -0,0 +1,138 @@
+"""
+Benchmark script for UnitOfWork commit performance.
+
+Measures:
+- Per-entity commit (one awaited repository call and file write per entity)
+- Batched commit (one journaled Storage.write_many for the whole transaction)
+- Average, median, p95, p99 commit times for a turn with many parts
+"""
+
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+
+from dawn_kestrel.benchmarks import BenchmarkRunner
+from dawn_kestrel.core import models
+from dawn_kestrel.core.repositories import (
+    MessageRepositoryImpl,
+    PartRepositoryImpl,
+    SessionRepositoryImpl,
+)
+from dawn_kestrel.core.unit_of_work import UnitOfWorkImpl
+from dawn_kestrel.storage.store import MessageStorage, PartStorage, SessionStorage
+
+
+def _make_turn(
+    turn: int, parts_per_turn: int
+) -> tuple[models.Session, models.Message, list[models.TextPart]]:
+    """Build one session, message and its parts for a benchmark iteration."""
+    session = models.Session(
+        id=f"session_{turn}",
+        slug=f"session_{turn}",
+        project_id="bench-project",
+        directory="/tmp/bench",
+        title=f"Session {turn}",
+        version="1.0",
+    )
+    message = models.Message(
+        id=f"message_{turn}",
+        session_id=session.id,
+        role="assistant",
+        text="benchmark",
+    )
+    parts = [
+        models.TextPart(
+            id=f"part_{turn}_{i}",
+            session_id=session.id,
+            message_id=message.id,
+            part_type="text",
+            text="x" * 200,
+        )
+        for i in range(parts_per_turn)
+    ]
+    return session, message, parts
+
+
+def _make_uow(base_dir: Path, batched: bool) -> UnitOfWorkImpl:
+    session_storage = SessionStorage(base_dir)
+    return UnitOfWorkImpl(
+        SessionRepositoryImpl(session_storage, "bench-project"),
+        MessageRepositoryImpl(MessageStorage(base_dir)),
+        PartRepositoryImpl(PartStorage(base_dir)),
+        storage=session_storage if batched else None,
+    )
+
+
+async def _commit_turn(uow: UnitOfWorkImpl, turn: int, parts_per_turn: int) -> None:
+    session, message, parts = _make_turn(turn, parts_per_turn)
+    await uow.begin()
+    await uow.register_session(session)
+    await uow.register_message(message)
+    for part in parts:
+        await uow.register_part(message.id, part)
+    result = await uow.commit()
+    if result.is_err():
+        raise RuntimeError(str(result))
+
+
+def run_unit_of_work_benchmark(iterations: int = 50, parts_per_turn: int = 30) -> BenchmarkRunner:
+    """Run UnitOfWork commit benchmarks.
+
+    Args:
+        iterations: Number of benchmark iterations per commit path
+        parts_per_turn: Number of parts registered in each transaction
+
+    Returns:
+        BenchmarkRunner with results
+    """
+    runner = BenchmarkRunner(report_name="unit_of_work_commit_benchmark")
+    base_dir = Path(tempfile.mkdtemp(prefix="dk-uow-bench-"))
+
+    try:
+        print("\nUnitOfWork Commit Benchmark:")
+        for metric_name, batched in (("per_entity_commit", False), ("batched_commit", True)):
+            uow = _make_uow(base_dir / metric_name, batched)
+            counter = iter(range(iterations))
+
+            result = runner.add_benchmark(
+                benchmark_name="unit_of_work_commit",
+                metric_name=metric_name,
+                func=lambda: asyncio.run(_commit_turn(uow, next(counter), parts_per_turn)),
+                iterations=iterations,
+                unit="s",
+                memory_created=parts_per_turn + 2,
+            )
+            print(f"  {result}")
+        print(f"  Parts per turn: {parts_per_turn}")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    return runner
+
+
+def main() -> None:
+    """Run UnitOfWork commit benchmarks and save results."""
+    iterations = 50
+    parts_per_turn = 30
+
+    print("Running UnitOfWork commit benchmarks...")
+    print(f"Iterations: {iterations}")
+    print(f"Parts per turn: {parts_per_turn}")
+    print()
+
+    runner = run_unit_of_work_benchmark(iterations, parts_per_turn)
+
+    # Save results
+    results_dir = Path(__file__).parent.parent.parent / "benchmarks"
+    results_file = results_dir / "unit_of_work_commit_results.json"
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+
+    runner.save_report(results_file)
+    runner.print_summary()
+
+    print(f"\nResults saved to: {results_file}")
+
+
+if __name__ == "__main__":
+    main()
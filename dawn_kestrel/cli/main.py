@@ -328,6 +328,36 @@ def import_session(import_path: str, project_id: str | None) -> None:
     run_async(_import())
 
 
+@click.command()
+@click.option("--project-id", "-p", type=click.STRING, help="Only rebuild this project")
+def rebuild_session_index(project_id: str | None) -> None:
+    """Rebuild the parent/child session index used for fork trees"""
+
+    async def _rebuild() -> None:
+        from dawn_kestrel.core.settings import settings
+        from dawn_kestrel.storage.store import SessionStorage
+
+        session_storage = SessionStorage(settings.storage_dir_path())
+
+        if project_id:
+            project_ids = [project_id]
+        else:
+            sessions_dir = session_storage.storage_dir / "session"
+            project_ids = (
+                sorted(p.name for p in sessions_dir.iterdir() if p.is_dir())
+                if sessions_dir.exists()
+                else []
+            )
+
+        for pid in project_ids:
+            parents = await session_storage.rebuild_child_index(pid)
+            console.print(f"[dim]  {pid}: {parents} parent sessions indexed[/dim]")
+
+        console.print("[green]Session index rebuilt[/green]")
+
+    run_async(_rebuild())
+
+
 @click.command()
 def tui() -> None:
     """TUI command is unavailable."""
@@ -338,5 +368,6 @@ cast(Any, cli).add_command(list_sessions)
 cast(Any, cli).add_command(run)
 cast(Any, cli).add_command(export_session)
 cast(Any, cli).add_command(import_session)
+cast(Any, cli).add_command(rebuild_session_index)
 cast(Any, cli).add_command(tui)
 cast(Any, cli).add_command(connect)
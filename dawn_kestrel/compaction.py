@@ -12,16 +12,11 @@ import uuid
 from typing import Any, cast
 
 from .core.models import (
-    AgentPart,
     CompactionPart,
-    FilePart,
     Message,
     PatchPart,
     ReasoningPart,
-    RetryPart,
     Session,
-    SnapshotPart,
-    SubtaskPart,
     TextPart,
     ToolPart,
 )
@@ -29,14 +24,16 @@ from .core.models import (
     Message as MessageModel,
 )
 from .core.settings import settings
+from .core.tokenizer import Tokenizer, count_message_tokens, preload_tokenizer
 
 logger = logging.getLogger(__name__)
 
 
 class SessionCompactor:
-    def __init__(self, session_id: str, model_limit: int):
+    def __init__(self, session_id: str, model_limit: int, tokenizer: Tokenizer | None = None):
         self.session_id = session_id
         self.model_limit = model_limit
+        self.tokenizer = tokenizer
         self.last_compaction_tokens = 0
         self.total_compactions = 0
 
@@ -54,13 +51,18 @@ class SessionCompactor:
 
         storage_dir = settings.storage_dir_path()
 
+        if self.tokenizer is None:
+            # Load the vocabulary off the event loop before counting
+            await preload_tokenizer()
+
         message_storage = MessageStorage(storage_dir)
         part_storage = PartStorage(storage_dir)
 
         message_repo = MessageRepositoryImpl(message_storage)
         part_repo = PartRepositoryImpl(part_storage)
 
-        if not await self.check_overflow(len(messages), messages):
+        total_tokens = sum(self._count_message_tokens(msg) for msg in messages)
+        if not await self.check_overflow(total_tokens, messages):
             logger.info("No overflow detected, skipping compaction")
             return None
 
@@ -132,22 +134,8 @@ class SessionCompactor:
         return summary_id
 
     def _count_message_tokens(self, msg: MessageModel) -> int:
-        """Count total tokens in message"""
-        total = 0
-
-        for part in msg.parts:
-            part_type = part.part_type
-
-            if isinstance(part, (TextPart, ReasoningPart)):
-                total += len(part.text or "")
-            elif isinstance(part, (ToolPart, SnapshotPart, PatchPart, AgentPart, SubtaskPart)):
-                total += 50
-            elif isinstance(part, FilePart):
-                total += 100
-            elif isinstance(part, RetryPart):
-                total += 25
-
-        return total
+        """Count total tokens in message (cached in the message's metadata)"""
+        return count_message_tokens(msg, self.tokenizer)
 
     def _generate_summary(self, messages: list[MessageModel]) -> str:
         """Generate session summary for compaction"""
@@ -1,9 +1,15 @@
 """OpenCode Python - Context pipeline (file scanning, ignore rules, git integration)"""
 from __future__ import annotations
 
+import asyncio
+import ctypes
+import ctypes.util
 import logging
+import os
 import re
+import struct
 import subprocess
+import sys
 from pathlib import Path
 
 from dawn_kestrel.core.models import FileInfo
@@ -11,8 +17,63 @@ from dawn_kestrel.core.models import FileInfo
 logger = logging.getLogger(__name__)
 
 
+def glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore-style glob to a regex over POSIX relative paths
+
+    ``**/`` matches any number of leading directories, a trailing ``/**``
+    everything below a directory, ``*`` and ``?`` never cross ``/``.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def gitignore_to_globs(lines: list[str]) -> list[str]:
+    """Convert .gitignore lines to globs for ``glob_to_regex``
+
+    Supports comments, anchored (``/x``) and unanchored patterns and
+    directory-only (``x/``) patterns; negations (``!x``) are skipped.
+    """
+    globs = []
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith("#") or line.startswith("!"):
+            continue
+        directory = line.endswith("/")
+        line = line.strip("/") if directory else line
+        anchored = raw.strip().startswith("/") or "/" in line
+        glob = line.lstrip("/") if anchored else f"**/{line}"
+        globs.append(f"{glob}/**")
+        if not directory:
+            globs.append(glob)
+    return globs
+
+
 class IgnoreRules:
-    """Predefined ignore patterns matching TypeScript OpenCode"""
+    """Predefined ignore patterns matching TypeScript OpenCode
+
+    All patterns are compiled once per class into a single regex, so
+    ``match_file`` is one match call regardless of the number of rules.
+    """
 
     FOLDERS = {
         "node_modules",
@@ -60,6 +121,24 @@ class IgnoreRules:
         "**/.nyc_output/**",
     ]
 
+    _compiled: dict[type, re.Pattern[str]] = {}
+
+    @classmethod
+    def compile(cls, extra_globs: list[str] | None = None) -> re.Pattern[str]:
+        """Compile folder and file rules (plus extra globs) into one regex"""
+        folders = "|".join(re.escape(folder) for folder in sorted(cls.FOLDERS))
+        alternatives = [f"(?:.*/)?(?:{folders})/.*"]
+        alternatives.extend(glob_to_regex(glob) for glob in [*cls.FILES, *(extra_globs or [])])
+        return re.compile("(?:" + "|".join(alternatives) + r")\Z")
+
+    @classmethod
+    def matcher(cls) -> re.Pattern[str]:
+        """The compiled matcher for this class's rules (built once)"""
+        matcher = cls._compiled.get(cls)
+        if matcher is None:
+            matcher = cls._compiled[cls] = cls.compile()
+        return matcher
+
     @classmethod
     def match_folder(cls, path: str) -> bool:
         """Check if path matches a folder to ignore"""
@@ -72,76 +151,295 @@ class IgnoreRules:
     @classmethod
     def match_file(cls, path: str) -> bool:
         """Check if path matches a file pattern to ignore"""
-        parts = Path(path).parts
-        filename = parts[-1]
-
-        # Check extension patterns
-        for pattern in cls.FILES:
-            if re.match(pattern.replace("*", ".*"), filename):
-                return True
+        return cls.matcher().match(Path(path).as_posix()) is not None
+
+
+class _Inotify:
+    """Minimal non-blocking inotify reader (Linux, via ctypes)
+
+    Events are drained on demand rather than by a background thread.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if sys.platform != "linux" or not libc_name:
+            raise OSError("inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, str] = {}
+
+    def add_watch(self, path: str, rel_dir: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+        self.watches[wd] = rel_dir
+
+    def read_events(self) -> list[tuple[str | None, int, str]]:
+        """Drain pending events as (watched rel_dir or None, mask, name)"""
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                rel_dir = self.watches.get(wd)
+                if mask & self.IN_IGNORED:
+                    self.watches.pop(wd, None)
+                events.append((rel_dir, mask, name))
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class FileIndex:
+    """Incrementally maintained index of the files under a directory
+
+    Built once by walking the tree (skipping hidden entries, IgnoreRules
+    and the root ``.gitignore``), then kept fresh:
+
+    - inotify (Linux): each directory is watched and pending create,
+      delete and move events are applied on ``refresh``.
+    - mtime fallback: ``refresh`` stats every indexed directory and
+      re-lists only those whose mtime changed (directory mtimes change
+      exactly when entries are added, removed or renamed).
+
+    Lookups (``__contains__``) are set membership; ``files`` is rebuilt
+    only after a change.
+    """
+
+    def __init__(self, directory: Path, use_inotify: bool = True) -> None:
+        """Initialize index (call ``build`` before use)
 
-        # Check if in ignored folder
-        for part in parts[:-1]:
-            if part in cls.FOLDERS:
-                return True
+        Args:
+            directory: Root directory to index
+            use_inotify: Use inotify when available (else mtime polling)
+        """
+        self.directory = Path(directory).absolute()
+        self.use_inotify = use_inotify
+        # rel_dir ("" for root) -> (mtime_ns, file names, subdirectory names)
+        self._dirs: dict[str, tuple[int, set[str], set[str]]] = {}
+        self._files: set[str] = set()
+        self._sorted: list[str] | None = None
+        self._inotify: _Inotify | None = None
+        self._ignore = IgnoreRules.matcher()
+
+    @property
+    def mode(self) -> str:
+        """Change tracking backend: ``inotify`` or ``mtime``"""
+        return "inotify" if self._inotify is not None else "mtime"
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @property
+    def files(self) -> list[str]:
+        """Sorted relative paths of all indexed files"""
+        if self._sorted is None:
+            self._sorted = sorted(self._files)
+        return self._sorted
+
+    def _ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if name.startswith("."):
+            return True
+        if is_dir:
+            return name in IgnoreRules.FOLDERS or self._ignore.match(rel_path + "/") is not None
+        return self._ignore.match(rel_path) is not None
+
+    def build(self) -> None:
+        """(Re)build the index from scratch"""
+        self.close()
+        gitignore = self.directory / ".gitignore"
+        globs = gitignore_to_globs(gitignore.read_text().splitlines()) if gitignore.exists() else []
+        self._ignore = IgnoreRules.compile(globs) if globs else IgnoreRules.matcher()
+
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except OSError as e:
+                logger.debug(f"inotify unavailable, using mtime scans: {e}")
+
+        self._dirs.clear()
+        self._files.clear()
+        self._sorted = None
+        self._scan_tree("")
+
+    def _scan_tree(self, rel_root: str) -> None:
+        stack = [rel_root]
+        while stack:
+            stack.extend(self._scan_dir(stack.pop()))
+
+    def _scan_dir(self, rel_dir: str) -> list[str]:
+        """(Re)list one directory; returns subdirectories not yet indexed"""
+        path = self.directory / rel_dir if rel_dir else self.directory
+        old = self._dirs.get(rel_dir)
+        if self._inotify is not None and old is None:
+            try:
+                self._inotify.add_watch(str(path), rel_dir)
+            except OSError as e:
+                # e.g. max_user_watches exhausted: degrade to polling
+                logger.warning(f"{e}; falling back to mtime scans")
+                self._inotify.close()
+                self._inotify = None
+        try:
+            mtime = path.stat().st_mtime_ns
+            entries = list(os.scandir(path))
+        except OSError:
+            self._drop_dir(rel_dir)
+            return []
 
-        return False
+        files: set[str] = set()
+        subdirs: set[str] = set()
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if self._ignored(rel_path, entry.name, is_dir):
+                continue
+            (subdirs if is_dir else files).add(entry.name)
+
+        old_files = old[1] if old else set()
+        old_subdirs = old[2] if old else set()
+        for name in old_files - files:
+            self._files.discard(f"{rel_dir}/{name}" if rel_dir else name)
+        for name in files - old_files:
+            self._files.add(f"{rel_dir}/{name}" if rel_dir else name)
+        for name in old_subdirs - subdirs:
+            self._drop_dir(f"{rel_dir}/{name}" if rel_dir else name)
+        if files != old_files:
+            self._sorted = None
+
+        self._dirs[rel_dir] = (mtime, files, subdirs)
+        return [f"{rel_dir}/{name}" if rel_dir else name for name in subdirs - old_subdirs]
+
+    def _drop_dir(self, rel_dir: str) -> None:
+        prefix = rel_dir + "/"
+        for key in [d for d in self._dirs if d == rel_dir or d.startswith(prefix)]:
+            _, files, _ = self._dirs.pop(key)
+            for name in files:
+                self._files.discard(f"{key}/{name}" if key else name)
+        self._sorted = None
+
+    def refresh(self) -> None:
+        """Apply changes made since the last refresh"""
+        if self._inotify is not None:
+            changed: set[str] = set()
+            for rel_dir, mask, _name in self._inotify.read_events():
+                if mask & _Inotify.IN_Q_OVERFLOW:
+                    logger.info("inotify queue overflow; rebuilding file index")
+                    self.build()
+                    return
+                if rel_dir is not None and rel_dir in self._dirs:
+                    changed.add(rel_dir)
+            for rel_dir in sorted(changed):
+                if rel_dir in self._dirs:
+                    self._scan_tree_from(rel_dir)
+            return
+
+        for rel_dir in sorted(self._dirs):
+            state = self._dirs.get(rel_dir)
+            if state is None:
+                continue
+            path = self.directory / rel_dir if rel_dir else self.directory
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                self._drop_dir(rel_dir)
+                continue
+            if mtime != state[0]:
+                self._scan_tree_from(rel_dir)
+
+    def _scan_tree_from(self, rel_dir: str) -> None:
+        stack = self._scan_dir(rel_dir)
+        while stack:
+            stack.extend(self._scan_dir(stack.pop()))
+
+    def close(self) -> None:
+        """Release the inotify descriptor"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
 
 
 class FileScanner:
-    """Repository scanner using Ripgrep"""
+    """Repository scanner backed by an incremental FileIndex"""
 
-    def __init__(self, directory: Path):
+    def __init__(self, directory: Path, use_inotify: bool = True):
         """Initialize scanner
 
         Args:
             directory: Directory to scan
+            use_inotify: Watch for changes with inotify when available
         """
         self.directory = Path(directory).absolute()
-        self._cache: list[str] | None = None
+        self._index = FileIndex(self.directory, use_inotify=use_inotify)
+        self._built = False
         self._cache_time: float | None = None
+        self._lock = asyncio.Lock()
 
     def _get_timestamp(self) -> float:
         import time
         return time.time()
 
     async def scan_files(self, force_refresh: bool = False) -> list[str]:
-        """Scan all files in directory using Ripgrep
+        """List all files in the directory
+
+        The first call (or ``force_refresh``) builds the index off the event
+        loop; later calls only apply changes made since the previous call.
 
         Args:
-            force_refresh: Force re-scan even if cached
+            force_refresh: Rebuild the index from scratch
 
         Returns:
             List of file paths relative to directory
         """
-        # Check cache
-        if not force_refresh and self._cache is not None:
-            return self._cache
-
-        logger.debug(f"Scanning directory: {self.directory}")
-
-        try:
-            # Run ripgrep with --files flag
-            result = subprocess.run(
-                ["rg", "--files", "--glob", "!.git/*"],
-                cwd=self.directory,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"Ripgrep failed: {result.stderr}")
-
-            # Parse output
-            files = result.stdout.strip().split("\n")
-            self._cache = files
+        async with self._lock:
+            if force_refresh or not self._built:
+                logger.debug(f"Indexing directory: {self.directory}")
+                await asyncio.to_thread(self._index.build)
+                self._built = True
+            else:
+                await asyncio.to_thread(self._index.refresh)
             self._cache_time = self._get_timestamp()
-            return files
+            return list(self._index.files)
 
-        except FileNotFoundError:
-            logger.warning("Ripgrep not found - directory not a git repo")
-            return []
+    def close(self) -> None:
+        """Stop watching the directory"""
+        self._index.close()
 
     async def list_files(
         self,
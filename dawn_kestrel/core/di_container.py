@@ -78,9 +78,14 @@ class Container(containers.DeclarativeContainer):
     tool_cache_max_size = providers.Factory(
         lambda: container.config.tool_cache_max_size() or 500,
     )
+    tool_cache_dir = providers.Factory(
+        lambda: container.config.tool_cache_dir(),
+    )
     tool_cache = providers.Singleton(
         ToolResultCache,
         max_size=tool_cache_max_size,
+        persist_dir=tool_cache_dir,
+        root=project_dir,
     )
 
 
@@ -210,6 +215,7 @@ def configure_container(
     agent_registry_persistence_enabled: bool = False,
     skill_max_char_budget: int | None = None,
     tool_cache_max_size: int | None = None,
+    tool_cache_dir: Path | None = None,
 ) -> Container:
     """
     Configure the global DI container with runtime values.
@@ -226,6 +232,8 @@ def configure_container(
         agent_registry_persistence_enabled: Enable agent registry persistence
         skill_max_char_budget: Optional max character budget for skills
         tool_cache_max_size: Optional max size for tool result cache (default: 500)
+        tool_cache_dir: Optional directory for the persistent tool result cache
+            (default: in-memory only)
 
     Returns:
         Configured Container instance
@@ -246,6 +254,7 @@ def configure_container(
     container.config.set("agent_registry_persistence_enabled", agent_registry_persistence_enabled)
     container.config.set("skill_max_char_budget", skill_max_char_budget)
     container.config.set("tool_cache_max_size", tool_cache_max_size)
+    container.config.set("tool_cache_dir", tool_cache_dir)
 
     # Register lifecycle hooks
     Container.register_lifecycle(container)
@@ -267,3 +276,4 @@ def reset_container() -> None:
     container.config.set("agent_registry_persistence_enabled", False)
     container.config.set("skill_max_char_budget", None)
     container.config.set("tool_cache_max_size", None)
+    container.config.set("tool_cache_dir", None)
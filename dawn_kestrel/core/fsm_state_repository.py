@@ -2,15 +2,25 @@
 
 This module defines FSM state repository protocol and implementation that wraps
 storage layer and returns Result types for explicit error handling.
+
+BufferedFSMStateRepository is a write-behind variant for FSM-heavy workflows:
+rapid transitions of the same FSM are coalesced in memory and written in
+periodic batches instead of one file write per transition.
 """
 
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+import asyncio
+import logging
+from typing import Literal, Protocol, runtime_checkable
 
 from dawn_kestrel.core.result import Err, Ok, Result
 from dawn_kestrel.storage.store import SessionStorage
 
+logger = logging.getLogger(__name__)
+
+FSMStateDurability = Literal["buffered", "flush", "fsync"]
+
 
 @runtime_checkable
 class FSMStateRepository(Protocol):
@@ -85,3 +95,137 @@ class FSMStateRepositoryImpl:
             return Ok(None)
         except Exception as e:
             return Err(f"Failed to persist FSM state: {e}", code="STORAGE_ERROR")
+
+
+class BufferedFSMStateRepository(FSMStateRepositoryImpl):
+    """Write-behind FSM state repository.
+
+    ``set_state`` records the state in memory; repeated transitions of the
+    same FSM before the next flush are coalesced into one write. Dirty
+    states are written as one ``Storage.write_many`` batch every
+    ``flush_interval`` seconds, or as soon as ``max_pending`` FSMs are
+    dirty. ``get_state`` reads through the buffer, so callers always see
+    the latest state. Call ``close`` (or use ``async with``) on shutdown to
+    flush what is still buffered.
+
+    Durability modes:
+        - "buffered": set_state returns immediately; states written within
+          the last ``flush_interval`` are lost if the process dies
+        - "flush": set_state waits until its state is written (concurrent
+          calls share one batch)
+        - "fsync": like "flush", and the batch is fsynced before returning
+    """
+
+    def __init__(
+        self,
+        storage: SessionStorage,
+        flush_interval: float = 0.05,
+        max_pending: int = 256,
+        durability: FSMStateDurability = "buffered",
+    ):
+        """Initialize repository with storage backend.
+
+        Args:
+            storage: SessionStorage instance to use for data persistence.
+            flush_interval: Seconds between background flushes.
+            max_pending: Number of dirty FSMs that triggers an early flush.
+            durability: "buffered", "flush" or "fsync" (see class docstring).
+        """
+        if durability not in ("buffered", "flush", "fsync"):
+            raise ValueError(f"Unknown durability mode: {durability}")
+        super().__init__(storage)
+        self._flush_interval = flush_interval
+        self._max_pending = max(1, max_pending)
+        self._durability = durability
+        self._pending: dict[str, str] = {}
+        self._inflight: dict[str, str] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+        self._closed = False
+        self.stats = {"set_calls": 0, "coalesced": 0, "flushes": 0, "states_written": 0}
+
+    @property
+    def pending_count(self) -> int:
+        """Number of FSM states waiting to be written."""
+        return len(self._pending)
+
+    async def get_state(self, fsm_id: str) -> Result[str]:
+        """Get current state for FSM by ID (buffered states first)."""
+        state = self._pending.get(fsm_id)
+        if state is None:
+            state = self._inflight.get(fsm_id)
+        if state is not None:
+            return Ok(state)
+        return await super().get_state(fsm_id)
+
+    async def set_state(self, fsm_id: str, state: str) -> Result[None]:
+        """Buffer current state for FSM (see durability modes)."""
+        if self._closed:
+            return Err("Failed to persist FSM state: repository is closed", code="CLOSED")
+
+        self.stats["set_calls"] += 1
+        if fsm_id in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[fsm_id] = state
+
+        if self._durability != "buffered" or len(self._pending) >= self._max_pending:
+            return await self.flush()
+        self._schedule()
+        return Ok(None)
+
+    async def flush(self) -> Result[None]:
+        """Write all buffered states as one batch.
+
+        On failure the states stay buffered (unless superseded) and are
+        retried by the next flush.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return Ok(None)
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            try:
+                await self._storage.write_many(
+                    [(["fsm_state", fsm_id], {"state": state}) for fsm_id, state in batch.items()],
+                    durable=self._durability == "fsync",
+                )
+            except Exception as e:
+                for fsm_id, state in batch.items():
+                    self._pending.setdefault(fsm_id, state)
+                if not self._closed:
+                    self._schedule()
+                return Err(f"Failed to persist FSM state: {e}", code="STORAGE_ERROR")
+            finally:
+                self._inflight = {}
+
+            self.stats["flushes"] += 1
+            self.stats["states_written"] += len(batch)
+            return Ok(None)
+
+    async def close(self) -> Result[None]:
+        """Stop background flushing and write what is still buffered."""
+        self._closed = True
+        timer, self._timer = self._timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        return await self.flush()
+
+    async def __aenter__(self) -> BufferedFSMStateRepository:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        result = await self.close()
+        if result.is_err():
+            logger.error(f"FSM states not persisted on close: {result.error}")
+
+    def _schedule(self) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        # States set while this flush runs start a new timer
+        self._timer = None
+        result = await self.flush()
+        if result.is_err():
+            logger.warning(result.error)
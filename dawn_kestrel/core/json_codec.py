@@ -0,0 +1,225 @@
+"""Pluggable JSON codec for hot serialization paths.
+
+Storage records, tool cache entries and streamed provider frames are all
+JSON. The stdlib encoder is several times slower than orjson and was also
+pretty-printing every persisted record. This module provides:
+- JSONCodec protocol, so callers can plug in any encoder
+- OrjsonCodec, used when orjson is installed (optional dependency)
+- StdlibCodec, the ``json`` module fallback
+- dumps/dumps_bytes/loads helpers over the process-wide codec
+
+Both codecs emit compact UTF-8 (no ASCII escaping) and accept ``str`` or
+``bytes`` input. Decode errors are ``json.JSONDecodeError`` for either
+backend (orjson's error subclasses it).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+from collections.abc import Callable
+from typing import Any, Protocol, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # type: ignore[import-not-found]
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+@runtime_checkable
+class JSONCodec(Protocol):
+    """Encodes and decodes JSON."""
+
+    @property
+    def name(self) -> str:
+        """Backend identifier."""
+        ...
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool = False,
+        indent: bool = False,
+        default: Callable[[Any], Any] | None = None,
+    ) -> bytes:
+        """Encode obj as UTF-8 JSON bytes."""
+        ...
+
+    def loads(self, data: str | bytes | bytearray | memoryview) -> Any:
+        """Decode JSON text or bytes."""
+        ...
+
+
+# =============================================================================
+# Implementations
+# =============================================================================
+
+
+def _stdlib_default(default: Callable[[Any], Any] | None) -> Callable[[Any], Any]:
+    """Encode dataclass instances as orjson does, then defer to ``default``."""
+
+    def encode(obj: Any) -> Any:
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+        if default is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default(obj)
+
+    return encode
+
+
+class StdlibCodec:
+    """JSON via the standard library ``json`` module.
+
+    Dataclass instances are encoded like orjson does (as field dicts).
+    """
+
+    name = "stdlib"
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool = False,
+        indent: bool = False,
+        default: Callable[[Any], Any] | None = None,
+    ) -> bytes:
+        return json.dumps(
+            obj,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+            ensure_ascii=False,
+            default=_stdlib_default(default),
+        ).encode()
+
+    def loads(self, data: str | bytes | bytearray | memoryview) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """JSON via orjson.
+
+    Values orjson rejects (e.g. integers beyond 64 bits) are encoded with
+    the stdlib instead of failing.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if not ORJSON_AVAILABLE:
+            raise ImportError("orjson is not installed. Install with: pip install orjson")
+        self._fallback = StdlibCodec()
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool = False,
+        indent: bool = False,
+        default: Callable[[Any], Any] | None = None,
+    ) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            return self._fallback.dumps(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+    def loads(self, data: str | bytes | bytearray | memoryview) -> Any:
+        return orjson.loads(data)
+
+
+# =============================================================================
+# Default codec
+# =============================================================================
+
+
+_default_codec: JSONCodec | None = None
+
+
+def load_codec(name: str = "auto") -> JSONCodec:
+    """Load a codec by name.
+
+    Args:
+        name: "orjson", "stdlib" or "auto" (orjson when installed)
+
+    Returns:
+        JSONCodec instance
+    """
+    if name == "stdlib" or (name == "auto" and not ORJSON_AVAILABLE):
+        return StdlibCodec()
+    if name in ("auto", "orjson"):
+        return OrjsonCodec()
+    raise ValueError(f"Unknown JSON codec: {name}")
+
+
+def get_codec() -> JSONCodec:
+    """Get the process-wide codec (orjson when installed)."""
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = load_codec()
+    return _default_codec
+
+
+def set_codec(codec: JSONCodec | None) -> None:
+    """Replace the process-wide codec (None restores the default)."""
+    global _default_codec
+    _default_codec = codec
+
+
+def dumps_bytes(
+    obj: Any,
+    *,
+    sort_keys: bool = False,
+    indent: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Encode obj as compact UTF-8 JSON bytes with the process-wide codec."""
+    return get_codec().dumps(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+
+def dumps(
+    obj: Any,
+    *,
+    sort_keys: bool = False,
+    indent: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    """Encode obj as a compact JSON string with the process-wide codec."""
+    return dumps_bytes(obj, sort_keys=sort_keys, indent=indent, default=default).decode()
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode JSON text or bytes with the process-wide codec."""
+    return get_codec().loads(data)
+
+
+__all__ = [
+    "ORJSON_AVAILABLE",
+    "JSONDecodeError",
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    "load_codec",
+    "get_codec",
+    "set_codec",
+    "dumps",
+    "dumps_bytes",
+    "loads",
+]
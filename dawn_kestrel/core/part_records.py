@@ -0,0 +1,271 @@
+"""Compact in-memory representation of stored messages and parts.
+
+Validating stored history into the pydantic models in ``core.models`` on
+every context build dominates the cost for sessions with thousands of
+parts. ``AISession`` builds the LLM context from the compacted view
+(``BackgroundCompactor.get_view``) with the records here instead: slotted
+dataclasses with the same fields, in the same order, as the models, whose
+``from_dict`` trusts stored data (already validated when it was written)
+and only checks that required fields are present.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Union
+
+
+class _Record:
+    """Shared dict loading for record dataclasses."""
+
+    __slots__ = ()
+
+    _field_names: ClassVar[tuple[str, ...]] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Any:
+        """Build a record from stored data without validation (extra keys are ignored)."""
+        return cls(**{name: data[name] for name in cls._field_names if name in data})
+
+
+def _record(cls: type) -> type:
+    cls = dataclass(slots=True, kw_only=True)(cls)
+    cls._field_names = tuple(f.name for f in fields(cls))
+    return cls
+
+
+# =============================================================================
+# Part records
+# =============================================================================
+
+
+@_record
+class ToolStateRecord(_Record):
+    """Tool execution state"""
+
+    status: str
+    input: dict[str, Any] = field(default_factory=dict)
+    output: str | None = None
+    title: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    time_start: float | None = None
+    time_end: float | None = None
+    error: str | None = None
+
+
+@_record
+class TextPartRecord(_Record):
+    """Text content part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "text"
+    text: str
+    time: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None
+    synthetic: bool | None = None
+    ignored: bool | None = None
+
+
+@_record
+class FilePartRecord(_Record):
+    """File attachment part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "file"
+    url: str
+    mime: str
+    filename: str | None = None
+    source: dict[str, Any] | None = None
+
+
+@_record
+class ToolPartRecord(_Record):
+    """Tool execution part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "tool"
+    tool: str
+    call_id: str | None = None
+    state: ToolStateRecord
+    source: dict[str, Any] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ToolPartRecord:
+        record = super(ToolPartRecord, cls).from_dict(data)
+        if isinstance(record.state, dict):
+            record.state = ToolStateRecord.from_dict(record.state)
+        return record
+
+
+@_record
+class ReasoningPartRecord(_Record):
+    """LLM reasoning/thinking part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "reasoning"
+    text: str
+    time: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None
+
+
+@_record
+class SnapshotPartRecord(_Record):
+    """Git snapshot part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "snapshot"
+    snapshot: str
+
+
+@_record
+class PatchPartRecord(_Record):
+    """File patch summary part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "patch"
+    hash: str
+    files: list[str]
+
+
+@_record
+class AgentPartRecord(_Record):
+    """Agent delegation part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "agent"
+    name: str
+    source: dict[str, Any] | None = None
+
+
+@_record
+class SubtaskPartRecord(_Record):
+    """Subtask invocation part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "subtask"
+    category: str
+
+
+@_record
+class RetryPartRecord(_Record):
+    """Retry attempt part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "retry"
+    attempt: int
+
+
+@_record
+class CompactionPartRecord(_Record):
+    """Session compaction marker part"""
+
+    id: str
+    session_id: str
+    message_id: str
+    part_type: str = "compaction"
+    auto: bool
+
+
+PartRecord = Union[
+    TextPartRecord,
+    FilePartRecord,
+    ToolPartRecord,
+    ReasoningPartRecord,
+    SnapshotPartRecord,
+    PatchPartRecord,
+    AgentPartRecord,
+    SubtaskPartRecord,
+    RetryPartRecord,
+    CompactionPartRecord,
+]
+
+PART_RECORD_TYPES: dict[str, type] = {
+    "text": TextPartRecord,
+    "file": FilePartRecord,
+    "tool": ToolPartRecord,
+    "reasoning": ReasoningPartRecord,
+    "snapshot": SnapshotPartRecord,
+    "patch": PatchPartRecord,
+    "agent": AgentPartRecord,
+    "subtask": SubtaskPartRecord,
+    "retry": RetryPartRecord,
+    "compaction": CompactionPartRecord,
+}
+
+
+def part_record_from_dict(data: dict[str, Any]) -> PartRecord:
+    """Build the record for a stored part dict.
+
+    Raises:
+        ValueError: Unknown part_type
+    """
+    record_type = PART_RECORD_TYPES.get(data.get("part_type"))  # type: ignore[arg-type]
+    if record_type is None:
+        raise ValueError(f"Unknown part_type: {data.get('part_type')}")
+    return record_type.from_dict(data)
+
+
+# =============================================================================
+# Message records
+# =============================================================================
+
+
+@_record
+class MessageRecord(_Record):
+    """Message container with part records"""
+
+    id: str
+    session_id: str
+    role: str
+    time: dict[str, Any] = field(default_factory=dict)
+    text: str = ""
+    parts: list[PartRecord] = field(default_factory=list)
+    summary: dict[str, Any] | None = None
+    token_usage: dict[str, Any] | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MessageRecord:
+        record = super(MessageRecord, cls).from_dict(data)
+        record.parts = [
+            part if isinstance(part, _Record) else part_record_from_dict(part)
+            for part in record.parts
+        ]
+        return record
+
+
+__all__ = [
+    "ToolStateRecord",
+    "TextPartRecord",
+    "FilePartRecord",
+    "ToolPartRecord",
+    "ReasoningPartRecord",
+    "SnapshotPartRecord",
+    "PatchPartRecord",
+    "AgentPartRecord",
+    "SubtaskPartRecord",
+    "RetryPartRecord",
+    "CompactionPartRecord",
+    "PartRecord",
+    "PART_RECORD_TYPES",
+    "MessageRecord",
+    "part_record_from_dict",
+]
@@ -233,6 +233,16 @@ class SessionRepositoryImpl:
         except Exception as e:
             return Err(f"Failed to create session: {e}", code="STORAGE_ERROR")
 
+    async def create_many(self, sessions: list[Session]) -> Result[list[Session]]:
+        """Create several sessions in one all-or-nothing storage batch."""
+        try:
+            entries = [self._storage.session_entry(session) for session in sessions]
+            entries += self._storage.child_index_entries(sessions)
+            await self._storage.write_many(entries)
+            return Ok(sessions)
+        except Exception as e:
+            return Err(f"Failed to create sessions: {e}", code="STORAGE_ERROR")
+
     async def update(self, session: Session) -> Result[Session]:
         """Update existing session."""
         try:
@@ -293,6 +303,16 @@ class MessageRepositoryImpl:
         except Exception as e:
             return Err(f"Failed to create message: {e}", code="STORAGE_ERROR")
 
+    async def create_many(self, messages: list[Message]) -> Result[list[Message]]:
+        """Create several messages in one all-or-nothing storage batch."""
+        try:
+            await self._storage.write_many(
+                [self._storage.message_entry(message.session_id, message) for message in messages]
+            )
+            return Ok(messages)
+        except Exception as e:
+            return Err(f"Failed to create messages: {e}", code="STORAGE_ERROR")
+
     async def list_by_session(self, session_id: str, reverse: bool = True) -> Result[list[Message]]:
         """List all messages for a session."""
         try:
@@ -338,6 +358,16 @@ class PartRepositoryImpl:
         except Exception as e:
             return Err(f"Failed to create part: {e}", code="STORAGE_ERROR")
 
+    async def create_many(self, parts: list[tuple[str, Part]]) -> Result[list[Part]]:
+        """Create several (message_id, part) pairs in one all-or-nothing storage batch."""
+        try:
+            await self._storage.write_many(
+                [self._storage.part_entry(message_id, part) for message_id, part in parts]
+            )
+            return Ok([part for _, part in parts])
+        except Exception as e:
+            return Err(f"Failed to create parts: {e}", code="STORAGE_ERROR")
+
     async def update(self, message_id: str, part: Part) -> Result[Part]:
         """Update existing part."""
         try:
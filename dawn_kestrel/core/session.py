@@ -160,8 +160,9 @@ class SessionManager:
 
             message_storage = MessageStorage(self.storage.base_dir)
 
-            for message in messages:
-                await message_storage.create_message(session_id, message)
+            await message_storage.write_many(
+                [message_storage.message_entry(session_id, message) for message in messages]
+            )
 
             logger.info(f"Created {len(messages)} messages in session {session_id}")
 
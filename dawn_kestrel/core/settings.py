@@ -80,7 +80,12 @@ class Settings(pydantic_settings.BaseSettings):
     # Rate limiting / Provider Bus settings
     redis_url: str | None = None
     rate_limit_backend: str = "local"  # "local" or "redis"
+    # Tokens each process leases from Redis per round trip (0 = one call per request)
+    rate_limit_lease_size: int = 0
+    rate_limit_lease_ttl: float = 5.0
     # Session settings
+    # tiktoken encoding for token accounting ("estimate" = offline estimator)
+    tokenizer_encoding: str = Field(default="cl100k_base", alias="TOKENIZER_ENCODING")
     session_compaction_tokens: int = Field(default=20000, alias="SESSION_COMPACTION_TOKENS")
     session_compaction_protected_tokens: int = Field(
         default=40000, alias="SESSION_COMPACTION_PROTECTED_TOKENS"
@@ -12,6 +12,7 @@ from typing import Any, Protocol, runtime_checkable
 
 from dawn_kestrel.core.models import Message, Part, Session
 from dawn_kestrel.core.result import Err, Ok, Result
+from dawn_kestrel.storage.store import MessageStorage, PartStorage, SessionStorage, Storage
 
 
 @runtime_checkable
@@ -113,6 +114,13 @@ class UnitOfWorkImpl:
     repository operation fails during commit, the entire transaction fails
     and no partial changes are persisted.
 
+    When constructed with a ``storage``, commit writes every pending session,
+    message and part (plus the parent/child session index) as a single
+    journaled ``Storage.write_many`` batch: either all records become
+    visible or none do, and files are written concurrently off the event
+    loop. Without a storage, each entity is persisted through its
+    repository in turn.
+
     Thread Safety:
         This implementation is not thread-safe. For concurrent access, use
         synchronization primitives or a thread-safe implementation.
@@ -135,6 +143,8 @@ class UnitOfWorkImpl:
         session_repo: Any,
         message_repo: Any,
         part_repo: Any,
+        storage: Storage | None = None,
+        concurrency: int = 8,
     ):
         """Initialize UnitOfWork with repositories.
 
@@ -142,10 +152,14 @@ class UnitOfWorkImpl:
             session_repo: SessionRepository for session operations.
             message_repo: MessageRepository for message operations.
             part_repo: PartRepository for part operations.
+            storage: Optional storage enabling the single-batch commit path.
+            concurrency: Maximum parallel file writes in the batch path.
         """
         self._session_repo = session_repo
         self._message_repo = message_repo
         self._part_repo = part_repo
+        self._storage = storage
+        self._concurrency = concurrency
         self._in_transaction = False
         self._pending_sessions: list[Session] = []
         self._pending_messages: list[Message] = []
@@ -167,6 +181,16 @@ class UnitOfWorkImpl:
         if not self._in_transaction:
             return Err("No transaction in progress", code="TRANSACTION_ERROR")
 
+        if self._storage is not None:
+            batch_result = await self._commit_batch(self._storage)
+            if batch_result.is_err():
+                return batch_result
+            self._in_transaction = False
+            self._pending_sessions.clear()
+            self._pending_messages.clear()
+            self._pending_parts.clear()
+            return Ok(None)
+
         # Commit all pending entities
         for session in self._pending_sessions:
             result = await self._session_repo.create(session)
@@ -190,6 +214,23 @@ class UnitOfWorkImpl:
         self._pending_parts.clear()
         return Ok(None)
 
+    async def _commit_batch(self, storage: Storage) -> Result[None]:
+        """Persist all pending entities as one all-or-nothing storage batch."""
+        entries = [SessionStorage.session_entry(session) for session in self._pending_sessions]
+        entries += [
+            MessageStorage.message_entry(message.session_id, message)
+            for message in self._pending_messages
+        ]
+        entries += [
+            PartStorage.part_entry(message_id, part) for message_id, part in self._pending_parts
+        ]
+        entries += SessionStorage.child_index_entries(self._pending_sessions)
+        try:
+            await storage.write_many(entries, concurrency=self._concurrency)
+        except Exception as e:
+            return Err(f"Failed to commit transaction: {e}", code="STORAGE_ERROR")
+        return Ok(None)
+
     async def rollback(self) -> Result[None]:
         """Rollback all pending changes."""
         if not self._in_transaction:
@@ -219,7 +219,6 @@ class DelegationEngine:
             queue=queue,
             processor=process_child_task,
             num_workers=max_workers,
-            poll_interval=0.05,
         )
 
         # Enqueue all children
@@ -3,135 +3,114 @@
 from __future__ import annotations
 
 import logging
-import subprocess
+from collections.abc import Iterable
 from pathlib import Path
 
 from dawn_kestrel.core.security import SecurityError, validate_git_hash
+from dawn_kestrel.git.service import GitError, GitService
 
 logger = logging.getLogger(__name__)
 
 
 class GitCommands:
-    """Git command execution for snapshots"""
+    """Git command execution for snapshots
+
+    All commands run asynchronously through a GitService; file contents are
+    read through its persistent cat-file process.
+    """
 
     def __init__(self, snapshot_dir: Path):
         """Initialize with snapshot directory"""
         self.snapshot_dir = snapshot_dir
         self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.git = GitService(snapshot_dir)
 
-    def _run_git(self, *args: str) -> subprocess.CompletedProcess[str]:
+    async def _run_git(self, *args: str, env: dict[str, str] | None = None) -> str:
         """Helper to run git command"""
-        full_cmd = ["git"] + list(args)
-
-        result = subprocess.run(
-            full_cmd, check=True, cwd=self.snapshot_dir, capture_output=True, text=True
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Git command failed: {' '.join(args)}: {result.stderr}")
-
-        return result
-
-    def get_root_commit(self) -> str:
-        """Get current root commit hash"""
-        result = self._run_git("rev-parse", "HEAD")
-        return result.stdout.strip()
-
-    def write_tree(self) -> str:
-        """Write tree object and return hash"""
-        result = self._run_git("add", ".")
-
-        if result.returncode != 0:
-            raise RuntimeError(f"git add failed: {result.stderr}")
-
-        result = self._run_git("write-tree", "--porcelain")
-
-        if result.returncode != 0:
-            raise RuntimeError(f"git write-tree failed: {result.stderr}")
-
-        return result.stdout.strip()
+        try:
+            return await self.git.run(*args, env=env)
+        except GitError as e:
+            raise RuntimeError(f"Git command failed: {' '.join(args)}: {e.stderr}") from e
 
-    def get_changed_files(self, hash_value: str) -> list[str]:
-        """Get list of changed files for a snapshot"""
+    @staticmethod
+    def _validate(*hashes: str) -> list[str]:
         try:
-            validated_hash = validate_git_hash(hash_value)
+            return [validate_git_hash(h) for h in hashes]
         except SecurityError as e:
             raise ValueError(f"Invalid git hash: {e}")
 
-        result = self._run_git("diff", "--name-only", validated_hash)
-
-        if result.returncode != 0:
-            raise RuntimeError(f"git diff failed: {result.stderr}")
+    async def get_root_commit(self) -> str:
+        """Get current root commit hash"""
+        return (await self._run_git("rev-parse", "HEAD")).strip()
 
-        files = result.stdout.strip().split("\n")
-        return [f for f in files if f]
+    async def write_tree(self, paths: Iterable[str] | None = None) -> str:
+        """Write tree object and return hash
 
-    def get_diff(self, from_hash: str, to_hash: str) -> str:
-        """Get full diff between two snapshots"""
+        Args:
+            paths: Paths changed since the last tree, if known (default: all)
+        """
         try:
-            from_validated = validate_git_hash(from_hash)
-            to_validated = validate_git_hash(to_hash)
-        except SecurityError as e:
-            raise ValueError(f"Invalid git hash: {e}")
-
-        result = self._run_git("diff", from_validated, to_validated)
+            return await self.git.write_snapshot_tree(paths)
+        except GitError as e:
+            raise RuntimeError(f"git write-tree failed: {e.stderr}") from e
 
-        if result.returncode != 0:
-            raise RuntimeError(f"git diff failed: {result.stderr}")
+    async def get_changed_files(self, hash_value: str) -> list[str]:
+        """Get list of changed files for a snapshot"""
+        (validated_hash,) = self._validate(hash_value)
 
-        return result.stdout
+        await self.git.update_snapshot_index()
+        output = await self._run_git(
+            "diff-index", "--cached", "--name-only", validated_hash, env=await self.git.index_env()
+        )
+        return [f for f in output.split("\n") if f]
 
-    def checkout_files(self, hash_value: str) -> None:
-        """Checkout files from a snapshot"""
-        try:
-            validated_hash = validate_git_hash(hash_value)
-        except SecurityError as e:
-            raise ValueError(f"Invalid git hash: {e}")
+    async def get_diff(self, from_hash: str, to_hash: str) -> str:
+        """Get full diff between two snapshots"""
+        from_validated, to_validated = self._validate(from_hash, to_hash)
+        return await self._run_git("diff", from_validated, to_validated)
 
-        result = self._run_git("read-tree", validated_hash, "--checkout-index", "-a", "-f")
+    async def get_file(self, hash_value: str, path: str) -> bytes | None:
+        """Get a file's content in a snapshot (None if absent)"""
+        (validated_hash,) = self._validate(hash_value)
+        return await self.git.read_blob(validated_hash, path)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"git read-tree failed: {result.stderr}")
+    async def checkout_files(self, hash_value: str) -> None:
+        """Checkout files from a snapshot"""
+        (validated_hash,) = self._validate(hash_value)
 
-        self._run_git("checkout-index", "-f")
+        try:
+            await self.git.checkout_tree(validated_hash)
+        except GitError as e:
+            raise RuntimeError(f"git read-tree failed: {e.stderr}") from e
 
         logger.info(f"Checked out files from snapshot: {hash_value}")
 
-    def get_diff_stats(self, from_hash: str, to_hash: str) -> dict[str, dict[str, int]]:
+    async def get_diff_stats(self, from_hash: str, to_hash: str) -> dict[str, dict[str, int]]:
         """Get diff statistics"""
-        try:
-            from_validated = validate_git_hash(from_hash)
-            to_validated = validate_git_hash(to_hash)
-        except SecurityError as e:
-            raise ValueError(f"Invalid git hash: {e}")
-
-        result = self._run_git("diff", "--numstat", from_validated, to_validated)
+        from_validated, to_validated = self._validate(from_hash, to_hash)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"git diff --numstat failed: {result.stderr}")
+        output = await self._run_git("diff", "--numstat", from_validated, to_validated)
 
-        # Parse stats
+        # Parse stats: "<additions>\t<deletions>\t<path>", "-" for binary files
         stats: dict[str, dict[str, int]] = {}
-        for line in result.stdout.strip().split("\n"):
-            if not line:
+        for line in output.split("\n"):
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
                 continue
-            parts = line.split()
-            if len(parts) >= 5:
-                filename = parts[4]
-                additions = int(parts[0])
-                deletions = int(parts[1])
-                stats[filename] = {
-                    "additions": additions,
-                    "deletions": deletions,
-                }
+            additions, deletions, filename = parts
+            stats[filename] = {
+                "additions": int(additions) if additions.isdigit() else 0,
+                "deletions": int(deletions) if deletions.isdigit() else 0,
+            }
 
         return stats
 
-    def cleanup(self, days: int = 7) -> None:
+    async def cleanup(self, days: int = 7) -> None:
         """Clean up old snapshots"""
-        result = self._run_git("gc", "--prune", f"--expire={days}d")
-
-        if result.returncode != 0:
-            raise RuntimeError(f"git gc failed: {result.stderr}")
+        await self._run_git("gc", f"--prune={days}.days.ago")
 
         logger.info(f"Cleaned up snapshots older than {days} days")
+
+    async def close(self) -> None:
+        """Stop the persistent git processes"""
+        await self.git.close()
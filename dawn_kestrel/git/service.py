@@ -0,0 +1,293 @@
+"""OpenCode Python - Async git service
+
+Runs git without blocking the event loop and keeps long-lived
+``git cat-file --batch`` / ``--batch-check`` processes per repository, so
+reading a blob or checking an object costs one pipe round trip instead of
+a fork/exec.
+
+Snapshot trees are built through a private index file (never the user's
+staging area). The index keeps stat information between snapshots, so git
+only re-hashes files that changed, and callers that know which paths
+changed can update just those entries.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INDEX_NAME = "dk-snapshot-index"
+
+
+class GitError(RuntimeError):
+    """A git command failed"""
+
+    def __init__(self, args: Sequence[str], returncode: int, stderr: str):
+        self.args_list = list(args)
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"git {' '.join(args)} failed ({returncode}): {stderr.strip()}")
+
+
+@dataclass(frozen=True)
+class GitObject:
+    """Object header returned by cat-file"""
+
+    sha: str
+    type: str
+    size: int
+
+
+class _BatchProcess:
+    """A persistent ``git cat-file --batch[-check]`` process
+
+    Requests are serialized; the process is (re)started lazily, including
+    after it exits or when used from a different event loop.
+    """
+
+    def __init__(self, service: GitService, mode: str):
+        self._service = service
+        self._mode = mode
+        self._proc: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    def _bind_loop(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._lock is None:
+            self._discard()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _ensure(self) -> asyncio.subprocess.Process:
+        if self._proc is None or self._proc.returncode is not None:
+            self._proc = await asyncio.create_subprocess_exec(
+                *self._service.command("cat-file", self._mode),
+                cwd=self._service.cwd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            self._service.stats["processes_started"] += 1
+        return self._proc
+
+    async def query(self, spec: str) -> tuple[GitObject | None, bytes | None]:
+        if "\n" in spec:
+            raise ValueError("object spec must not contain newlines")
+        async with self._bind_loop():
+            for attempt in (0, 1):
+                proc = await self._ensure()
+                assert proc.stdin is not None and proc.stdout is not None
+                try:
+                    proc.stdin.write(spec.encode() + b"\n")
+                    await proc.stdin.drain()
+                    header = await proc.stdout.readline()
+                    if not header:
+                        raise ConnectionResetError("cat-file exited")
+                    fields = header.decode().split()
+                    if len(fields) != 3 or fields[1] == "missing":
+                        return None, None
+                    obj = GitObject(sha=fields[0], type=fields[1], size=int(fields[2]))
+                    if self._mode != "--batch":
+                        return obj, None
+                    data = await proc.stdout.readexactly(obj.size + 1)
+                    return obj, data[:-1]
+                except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                    self._discard()
+                    if attempt:
+                        raise
+        return None, None
+
+    def _discard(self) -> None:
+        if self._proc is not None and self._proc.returncode is None:
+            try:
+                self._proc.kill()
+            except ProcessLookupError:
+                pass
+        self._proc = None
+
+    async def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            proc.kill()
+            return
+        assert proc.stdin is not None
+        proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+
+
+class GitService:
+    """Async git access for one repository"""
+
+    def __init__(
+        self,
+        cwd: Path,
+        git_dir: Path | None = None,
+        work_tree: Path | None = None,
+        index_file: Path | None = None,
+    ):
+        """Initialize service
+
+        Args:
+            cwd: Directory git runs in (the work tree unless given separately)
+            git_dir: Explicit repository directory (``--git-dir``)
+            work_tree: Explicit work tree (``--work-tree``)
+            index_file: Private snapshot index (default: inside the git dir)
+        """
+        self.cwd = Path(work_tree or cwd)
+        self.git_dir = Path(git_dir) if git_dir else None
+        self.work_tree = Path(work_tree) if work_tree else None
+        self._index_file = Path(index_file) if index_file else None
+        self._index_lock = asyncio.Lock()
+        self._batch = _BatchProcess(self, "--batch")
+        self._batch_check = _BatchProcess(self, "--batch-check")
+        self.stats = {"commands": 0, "processes_started": 0, "objects_read": 0}
+
+    def command(self, *args: str) -> list[str]:
+        """Full argv for a git command against this repository"""
+        cmd = ["git"]
+        if self.git_dir is not None:
+            cmd += ["--git-dir", str(self.git_dir)]
+        if self.work_tree is not None:
+            cmd += ["--work-tree", str(self.work_tree)]
+        return cmd + list(args)
+
+    async def run(
+        self,
+        *args: str,
+        input: bytes | None = None,
+        env: dict[str, str] | None = None,
+        check: bool = True,
+    ) -> str:
+        """Run a git command and return its stdout
+
+        Raises:
+            GitError: The command exited non-zero (with ``check``)
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *self.command(*args),
+            cwd=self.cwd,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, **env} if env else None,
+        )
+        stdout, stderr = await proc.communicate(input)
+        self.stats["commands"] += 1
+        if check and proc.returncode != 0:
+            raise GitError(args, proc.returncode or 0, stderr.decode(errors="replace"))
+        return stdout.decode(errors="replace")
+
+    # -- objects ------------------------------------------------------------
+
+    async def object_info(self, spec: str) -> GitObject | None:
+        """Resolve an object (e.g. ``<tree>:<path>``) without reading it"""
+        obj, _ = await self._batch_check.query(spec)
+        return obj
+
+    async def read_object(self, spec: str) -> tuple[GitObject, bytes] | None:
+        """Read an object's type and content, or None if it does not exist"""
+        obj, data = await self._batch.query(spec)
+        if obj is None or data is None:
+            return None
+        self.stats["objects_read"] += 1
+        return obj, data
+
+    async def read_blob(self, tree_ish: str, path: str) -> bytes | None:
+        """Content of a file in a tree or commit, or None if absent or not a file"""
+        result = await self.read_object(f"{tree_ish}:{path}")
+        if result is None or result[0].type != "blob":
+            return None
+        return result[1]
+
+    # -- snapshot index -----------------------------------------------------
+
+    async def index_file(self) -> Path:
+        """Path of the private snapshot index"""
+        if self._index_file is None:
+            git_dir = self.git_dir
+            if git_dir is None:
+                git_dir = Path((await self.run("rev-parse", "--absolute-git-dir")).strip())
+            self._index_file = git_dir / SNAPSHOT_INDEX_NAME
+        return self._index_file
+
+    async def index_env(self) -> dict[str, str]:
+        """Environment selecting the private snapshot index"""
+        return {"GIT_INDEX_FILE": str(await self.index_file())}
+
+    async def update_snapshot_index(self, paths: Iterable[str] | None = None) -> None:
+        """Bring the private index up to date with the work tree
+
+        Args:
+            paths: Paths known to have changed (files or directories). When
+                None, or on first use, the whole tree is scanned; git skips
+                files whose stat data is unchanged since the last snapshot.
+        """
+        async with self._index_lock:
+            index_file = await self.index_file()
+            env = {"GIT_INDEX_FILE": str(index_file)}
+            if paths is None or not index_file.exists():
+                await self.run("add", "--all", "--", ".", env=env)
+                return
+
+            directories: list[str] = []
+            files: list[str] = []
+            missing: list[str] = []
+            for path in paths:
+                target = self.cwd / path
+                if target.is_dir():
+                    directories.append(path)
+                elif target.exists() or target.is_symlink():
+                    files.append(path)
+                else:
+                    missing.append(path)
+            if directories:
+                await self.run("add", "--all", "--", *directories, env=env)
+            if missing:
+                # A deleted path may have been a file or a whole directory;
+                # paths that were never tracked are ignored
+                await self.run(
+                    "rm", "-r", "--cached", "--ignore-unmatch", "--quiet", "--", *missing, env=env
+                )
+            if files:
+                await self.run(
+                    "update-index",
+                    "--add",
+                    "--remove",
+                    "-z",
+                    "--stdin",
+                    input=b"".join(p.encode() + b"\0" for p in files),
+                    env=env,
+                )
+
+    async def write_snapshot_tree(self, paths: Iterable[str] | None = None) -> str:
+        """Update the private index and write it as a tree
+
+        Returns:
+            Tree hash
+        """
+        await self.update_snapshot_index(paths)
+        return (await self.run("write-tree", env=await self.index_env())).strip()
+
+    async def checkout_tree(self, tree_ish: str) -> None:
+        """Overwrite work tree files with a tree's content (via the private index)"""
+        async with self._index_lock:
+            env = await self.index_env()
+            await self.run("read-tree", tree_ish, env=env)
+            await self.run("checkout-index", "--all", "--force", env=env)
+
+    async def close(self) -> None:
+        """Stop the persistent cat-file processes"""
+        await self._batch.close()
+        await self._batch_check.close()
@@ -3,6 +3,11 @@
 Provider-agnostic LLM client with policy-driven execution controls.
 """
 
+from .adaptive_concurrency import (
+    AIMDConcurrencyLimiter,
+    ProviderSignal,
+    classify_provider_error,
+)
 from .bulkhead import (
     Bulkhead,
     BulkheadImpl,
@@ -43,6 +48,7 @@ from .rate_limiter import (
     RateLimiter,
     RateLimiterImpl,
     TokenBucket,
+    TokenReservation,
 )
 from .reliability import (
     LLMReliability,
@@ -56,6 +62,9 @@ from .retry import (
 )
 
 __all__ = [
+    "AIMDConcurrencyLimiter",
+    "ProviderSignal",
+    "classify_provider_error",
     "LLMClient",
     "LLMProviderProtocol",
     "LLMRequestOptions",
@@ -67,6 +76,7 @@ __all__ = [
     "RateLimiter",
     "RateLimiterImpl",
     "TokenBucket",
+    "TokenReservation",
     "CircuitBreaker",
     "CircuitBreakerImpl",
     "CircuitState",
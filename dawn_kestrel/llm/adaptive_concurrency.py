@@ -0,0 +1,328 @@
+"""Adaptive (AIMD) concurrency control for provider calls.
+
+A fixed concurrency limit is either too conservative, leaving provider
+capacity unused, or too aggressive, causing 429 storms whose backoff
+destroys tail latency. The limiter here tunes itself the way TCP
+congestion control does:
+
+- Additive increase: after a full window of healthy calls (one success per
+  slot of the current limit) the limit grows by one.
+- Multiplicative decrease: a rate limit, a timeout or a latency spike
+  well above the running baseline cuts the limit by a constant factor.
+  Decreases are rate limited so one burst of failures from a single window
+  of in-flight calls only counts once.
+
+Call outcomes are reported as structured ``ProviderSignal`` values,
+produced from exceptions by ``classify_provider_error``.
+
+This module provides:
+- ProviderSignal enum of call outcomes
+- classify_provider_error to map exceptions to signals
+- AIMDConcurrencyLimiter, an awaitable slot limiter with an adaptive limit
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import deque
+from enum import Enum
+from typing import Any
+
+import httpx
+
+from dawn_kestrel.core.exceptions import ErrorCategory, OpenCodeError, ProviderRateLimitError
+from dawn_kestrel.core.http_client import HTTPClientError
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# ProviderSignal
+# =============================================================================
+
+
+class ProviderSignal(str, Enum):
+    """Outcome of a provider call, as seen by the concurrency controller."""
+
+    SUCCESS = "success"
+    RATE_LIMITED = "rate_limited"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+RATE_LIMIT_STATUS_CODES = frozenset({429, 503})
+
+# Provider-specific rate limit codes (Z.AI uses 1302)
+RATE_LIMIT_ERROR_CODES = frozenset({"429", "1302"})
+
+# Whole-phrase rate limit marker for untyped errors ("rate limit", "rate-limited")
+_RATE_LIMIT_TEXT = re.compile(r"\brate[ _-]?limit", re.IGNORECASE)
+
+
+def classify_provider_error(error: BaseException) -> ProviderSignal:
+    """Classify an exception raised by a provider call.
+
+    Typed errors (ProviderRateLimitError, HTTP status errors, timeouts,
+    categorized OpenCodeErrors) are classified by type; providers raise
+    ProviderRateLimitError for their own rate limit codes. Untyped
+    exceptions only count as rate limited when the message says
+    "rate limit" in so many words - numbers in the text are ignored.
+
+    Args:
+        error: Exception raised by the provider call.
+
+    Returns:
+        ProviderSignal for the controller.
+    """
+    if isinstance(error, HTTPClientError) and error.status_code is not None:
+        # Carries every failed status, not only rate limits
+        if error.status_code in RATE_LIMIT_STATUS_CODES:
+            return ProviderSignal.RATE_LIMITED
+        return ProviderSignal.ERROR
+    if isinstance(error, ProviderRateLimitError):
+        return ProviderSignal.RATE_LIMITED
+    if isinstance(error, (TimeoutError, httpx.TimeoutException)):
+        return ProviderSignal.TIMEOUT
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code in RATE_LIMIT_STATUS_CODES:
+            return ProviderSignal.RATE_LIMITED
+        return ProviderSignal.ERROR
+    if isinstance(error, OpenCodeError):
+        if error.category == ErrorCategory.RATE_LIMIT:
+            return ProviderSignal.RATE_LIMITED
+        if error.category == ErrorCategory.TIMEOUT:
+            return ProviderSignal.TIMEOUT
+        if error.error_code in RATE_LIMIT_ERROR_CODES:
+            return ProviderSignal.RATE_LIMITED
+
+    if _RATE_LIMIT_TEXT.search(str(error)):
+        return ProviderSignal.RATE_LIMITED
+    return ProviderSignal.ERROR
+
+
+def retry_after_of(error: BaseException) -> float | None:
+    """Retry-After hint carried by a rate limit error, if any."""
+    retry_after = getattr(error, "retry_after", None)
+    if isinstance(retry_after, (int, float)) and retry_after > 0:
+        return float(retry_after)
+    if isinstance(error, httpx.HTTPStatusError):
+        header = error.response.headers.get("retry-after")
+        try:
+            return float(header) if header else None
+        except ValueError:
+            return None
+    return None
+
+
+# =============================================================================
+# AIMDConcurrencyLimiter
+# =============================================================================
+
+
+class AIMDConcurrencyLimiter:
+    """Concurrency limiter whose limit adapts to provider feedback.
+
+    Used as an async context manager in place of a semaphore; outcomes are
+    fed back with ``record``. Waiters are admitted in FIFO order.
+
+    Thread safety:
+        NOT thread-safe. Designed for async single-process use.
+
+    Example:
+        limiter = AIMDConcurrencyLimiter(initial_limit=5, max_limit=20)
+
+        async with limiter:
+            start = time.monotonic()
+            try:
+                result = await call_provider()
+            except Exception as e:
+                limiter.record(classify_provider_error(e), time.monotonic() - start)
+                raise
+            limiter.record(ProviderSignal.SUCCESS, time.monotonic() - start)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        decrease_factor: float = 0.5,
+        latency_spike_factor: float = 3.0,
+        latency_smoothing: float = 0.1,
+        decrease_cooldown: float = 1.0,
+        warmup_samples: int = 10,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit.
+            min_limit: Floor the limit never drops below.
+            max_limit: Ceiling the limit never grows past (default 4x initial).
+            decrease_factor: Multiplier applied on congestion signals.
+            latency_spike_factor: A success slower than this multiple of the
+                latency baseline counts as congestion.
+            latency_smoothing: EWMA weight of each new latency sample.
+            decrease_cooldown: Minimum seconds between two decreases.
+            warmup_samples: Successes needed before latency spikes count.
+        """
+        self._min_limit = max(1, min_limit)
+        self._max_limit = max(max_limit or initial_limit * 4, self._min_limit)
+        self._limit = float(min(max(initial_limit, self._min_limit), self._max_limit))
+        self._decrease_factor = decrease_factor
+        self._latency_spike_factor = latency_spike_factor
+        self._latency_smoothing = latency_smoothing
+        self._decrease_cooldown = decrease_cooldown
+        self._warmup_samples = warmup_samples
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._window_successes = 0
+        self._latency_ewma: float | None = None
+        self._samples = 0
+        self._last_decrease = -math.inf
+
+        self._stats: dict[str, int] = {
+            "increases": 0,
+            "decreases": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "latency_spikes": 0,
+            "errors": 0,
+        }
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a slot under the current limit."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over as we were cancelled: give it back.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Release a slot and admit waiters that now fit under the limit."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self) -> AIMDConcurrencyLimiter:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+    def record(self, signal: ProviderSignal, latency: float | None = None) -> None:
+        """Feed a call outcome back into the controller.
+
+        Args:
+            signal: Outcome of the call.
+            latency: Seconds the call took (time to first event for streams).
+        """
+        if signal == ProviderSignal.SUCCESS:
+            if latency is not None and self._is_latency_spike(latency):
+                self._stats["latency_spikes"] += 1
+                self._decrease("latency spike")
+                return
+            self._window_successes += 1
+            if self._window_successes >= self.limit:
+                self._window_successes = 0
+                self._increase()
+        elif signal == ProviderSignal.RATE_LIMITED:
+            self._stats["rate_limited"] += 1
+            self._decrease("rate limited")
+        elif signal == ProviderSignal.TIMEOUT:
+            self._stats["timeouts"] += 1
+            self._decrease("timeout")
+        else:
+            self._stats["errors"] += 1
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        baseline = self._latency_ewma
+        self._samples += 1
+        if baseline is None:
+            self._latency_ewma = latency
+            return False
+        spike = (
+            self._samples > self._warmup_samples
+            and latency > baseline * self._latency_spike_factor
+        )
+        if not spike:
+            # Spikes are kept out of the baseline so it tracks healthy latency.
+            self._latency_ewma = baseline + self._latency_smoothing * (latency - baseline)
+        return spike
+
+    def _increase(self) -> None:
+        if self._limit >= self._max_limit:
+            return
+        self._limit = min(self._limit + 1, float(self._max_limit))
+        self._stats["increases"] += 1
+        self._wake_waiters()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        self._window_successes = 0
+        if now - self._last_decrease < self._decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self._min_limit), math.floor(self._limit * self._decrease_factor))
+        if self.limit < previous:
+            self._stats["decreases"] += 1
+            logger.info(f"Concurrency limit {previous} -> {self.limit} ({reason})")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get controller state for metrics.
+
+        Returns:
+            Dictionary with the current limit, bounds, in-flight and queued
+            counts, latency baseline and adjustment counters.
+        """
+        return {
+            "limit": self.limit,
+            "min_limit": self._min_limit,
+            "max_limit": self._max_limit,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for w in self._waiters if not w.done()),
+            "latency_ewma_ms": (
+                round(self._latency_ewma * 1000, 2) if self._latency_ewma is not None else None
+            ),
+            **self._stats,
+        }
+
+
+__all__ = [
+    "ProviderSignal",
+    "classify_provider_error",
+    "retry_after_of",
+    "AIMDConcurrencyLimiter",
+]
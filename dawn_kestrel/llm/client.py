@@ -524,16 +524,13 @@ class LLMClient:
         async def acquire_rate_limit():
             if _global_rate_limiter is None:
                 return
-            while True:
-                acquire_result = await _global_rate_limiter.try_acquire(
-                    resource=str(self.provider_id),
-                    tokens=1,
-                )
-                if acquire_result.is_ok():
-                    return
-                backoff = 1.0
-                logger.debug("Rate limit wait for %s, waiting %.1fs...", self.provider_id, backoff)
-                await asyncio.sleep(backoff)
+            # Waits in FIFO order and wakes exactly when a token is available.
+            acquire_result = await _global_rate_limiter.acquire(
+                resource=str(self.provider_id),
+                tokens=1,
+            )
+            if acquire_result.is_err():
+                raise RuntimeError(cast(Any, acquire_result).error)
 
         async def execute_with_limits():
             if _global_concurrency_semaphore is not None:
@@ -2,6 +2,13 @@
 
 Optional module - only available when redis[hiredis] is installed.
 Provides distributed rate limiting for multi-process/multi-instance deployments.
+
+Two modes are supported:
+- Per-request (default): every request runs the Lua token bucket in Redis.
+- Leased (``lease_size > 0``): a process leases a block of tokens from the
+  Redis bucket in one round trip and spends them locally. Unused tokens are
+  returned to Redis when the lease expires, so the global limit stays
+  approximately enforced while Redis sees a fraction of the traffic.
 """
 
 from __future__ import annotations
@@ -74,11 +81,96 @@ return {allowed, tostring(wait_time), tostring(tokens)}
 """
 
 
+LEASE_TOKENS_LUA = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local minimum = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local ttl = tonumber(ARGV[6])
+
+local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+local tokens = tonumber(bucket[1])
+local last_refill = tonumber(bucket[2])
+
+if tokens == nil then
+    tokens = capacity
+    last_refill = now
+end
+
+local elapsed = math.max(0, now - last_refill)
+tokens = math.min(capacity, tokens + elapsed * refill_rate)
+
+local granted = 0
+local wait_time = 0
+
+if tokens >= requested then
+    granted = requested
+elseif tokens >= minimum then
+    granted = math.floor(tokens)
+else
+    wait_time = (minimum - tokens) / refill_rate
+end
+
+tokens = tokens - granted
+
+redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
+redis.call('EXPIRE', key, ttl)
+
+return {tostring(granted), tostring(wait_time), tostring(tokens)}
+"""
+
+
+RETURN_TOKENS_LUA = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local returned = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local ttl = tonumber(ARGV[5])
+
+local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+local tokens = tonumber(bucket[1])
+local last_refill = tonumber(bucket[2])
+
+if tokens == nil then
+    return tostring(capacity)
+end
+
+local elapsed = math.max(0, now - last_refill)
+tokens = math.min(capacity, tokens + elapsed * refill_rate + returned)
+
+redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
+redis.call('EXPIRE', key, ttl)
+
+return tostring(tokens)
+"""
+
+
+class _Lease:
+    """Block of tokens leased from Redis and spent locally."""
+
+    __slots__ = ("tokens", "expires_at", "timer")
+
+    def __init__(self, tokens: float, expires_at: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.timer: asyncio.TimerHandle | None = None
+
+
 class RedisRateLimitTracker:
     """Distributed rate limiter using Redis.
 
     Uses Lua scripts for atomic token bucket operations.
     Falls back to local tracking when Redis is unavailable.
+
+    With ``lease_size > 0`` each process leases up to ``lease_size`` tokens
+    per round trip and serves requests from the lease until it runs out or
+    ``lease_ttl`` seconds pass, at which point unused tokens go back to the
+    shared bucket. Larger leases mean fewer Redis calls but more tokens held
+    idle by one process; keep ``lease_size`` well below the per-minute limit
+    divided by the number of processes.
     """
 
     def __init__(
@@ -88,6 +180,8 @@ class RedisRateLimitTracker:
         default_limit: ProviderRateLimit | None = None,
         key_prefix: str = "dk:ratelimit:",
         fallback_on_error: bool = True,
+        lease_size: int = 0,
+        lease_ttl: float = 5.0,
     ):
         if not REDIS_AVAILABLE:
             raise ImportError(
@@ -123,6 +217,21 @@ class RedisRateLimitTracker:
         self._429_last_time: dict[str, float] = {}
         self._lock = asyncio.Lock()
 
+        self._lease_size = lease_size
+        self._lease_ttl = lease_ttl
+        self._leases: dict[str, _Lease] = {}
+        self._lease_lock = asyncio.Lock()
+        self._lease_sha: str | None = None
+        self._return_sha: str | None = None
+        self._expiry_tasks: set[asyncio.Task[None]] = set()
+        self._lease_stats: dict[str, float] = {
+            "redis_calls": 0,
+            "local_grants": 0,
+            "leases_granted": 0,
+            "tokens_leased": 0,
+            "tokens_returned": 0,
+        }
+
     def _get_limit(self, key: str) -> ProviderRateLimit:
         return self._limits.get(key, self._default)
 
@@ -149,11 +258,24 @@ class RedisRateLimitTracker:
                 return None
         return self._script_sha
 
+    async def _load_lease_scripts(self, client: redis.Redis) -> bool:
+        if self._lease_sha is None or self._return_sha is None:
+            try:
+                self._lease_sha = await client.script_load(LEASE_TOKENS_LUA)
+                self._return_sha = await client.script_load(RETURN_TOKENS_LUA)
+            except Exception as e:
+                logger.error(f"Failed to load lease Lua scripts: {e}")
+                return False
+        return True
+
     async def check_allowed(self, key: str, cost: int = 1) -> Result[tuple[bool, float]]:
         """Check if request is allowed with distributed coordination."""
         if not self._redis_available or not self._fallback_on_error:
             return await self._local_fallback.check_allowed(key, cost)
 
+        if self._lease_size > 0:
+            return await self._check_allowed_leased(key, cost)
+
         try:
             client = await self._get_redis()
             if client is None:
@@ -193,6 +315,126 @@ class RedisRateLimitTracker:
             self._redis_available = False
             return await self._local_fallback.check_allowed(key, cost)
 
+    async def _check_allowed_leased(self, key: str, cost: int) -> Result[tuple[bool, float]]:
+        """Serve the request from the local lease, leasing a new block if needed."""
+        async with self._lease_lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at <= time.monotonic():
+                await self._return_lease(key, lease)
+                lease = None
+
+            if lease is not None and lease.tokens >= cost:
+                lease.tokens -= cost
+                self._lease_stats["local_grants"] += 1
+                return Ok((True, 0.0))
+
+            try:
+                client = await self._get_redis()
+                if client is None or not await self._load_lease_scripts(client):
+                    return await self._local_fallback.check_allowed(key, cost)
+
+                limit = self._get_limit(key)
+                held = lease.tokens if lease is not None else 0.0
+                # Never ask for more than the whole bucket, or a lease could never be granted.
+                minimum = max(cost - held, 0)
+                requested = min(max(self._lease_size, cost) - held, limit.requests_per_minute)
+                requested = max(requested, minimum)
+                self._lease_stats["redis_calls"] += 1
+                result = await client.evalsha(
+                    self._lease_sha,
+                    1,
+                    self._redis_key(key),
+                    limit.requests_per_minute,
+                    limit.requests_per_minute / 60.0,
+                    requested,
+                    minimum,
+                    time.time(),
+                    3600,
+                )
+            except Exception as e:
+                logger.warning(f"Redis error, falling back to local: {e}")
+                self._redis_available = False
+                return await self._local_fallback.check_allowed(key, cost)
+
+            granted = float(result[0])
+            wait_time = float(result[1])
+            if granted + held < cost:
+                return Ok((False, wait_time + random.uniform(*limit.jitter_range)))
+
+            if lease is None:
+                lease = _Lease(tokens=0.0, expires_at=time.monotonic() + self._lease_ttl)
+                lease.timer = asyncio.get_running_loop().call_later(
+                    self._lease_ttl, self._schedule_expiry, key, lease
+                )
+                self._leases[key] = lease
+            lease.tokens += granted - cost
+            self._lease_stats["leases_granted"] += 1
+            self._lease_stats["tokens_leased"] += granted
+            return Ok((True, 0.0))
+
+    def _schedule_expiry(self, key: str, lease: _Lease) -> None:
+        task = asyncio.ensure_future(self._expire_lease(key, lease))
+        self._expiry_tasks.add(task)
+        task.add_done_callback(self._expiry_tasks.discard)
+
+    async def _expire_lease(self, key: str, lease: _Lease) -> None:
+        async with self._lease_lock:
+            if self._leases.get(key) is lease:
+                await self._return_lease(key, lease)
+
+    async def _return_lease(self, key: str, lease: _Lease) -> None:
+        """Drop a lease and give its unused tokens back to the shared bucket.
+
+        Must be called with ``_lease_lock`` held.
+        """
+        if self._leases.get(key) is lease:
+            del self._leases[key]
+        if lease.timer is not None:
+            lease.timer.cancel()
+            lease.timer = None
+
+        unused = int(lease.tokens)
+        lease.tokens = 0.0
+        if unused <= 0 or not self._redis_available:
+            return
+        try:
+            client = await self._get_redis()
+            if client is None or not await self._load_lease_scripts(client):
+                return
+            limit = self._get_limit(key)
+            self._lease_stats["redis_calls"] += 1
+            await client.evalsha(
+                self._return_sha,
+                1,
+                self._redis_key(key),
+                limit.requests_per_minute,
+                limit.requests_per_minute / 60.0,
+                unused,
+                time.time(),
+                3600,
+            )
+            self._lease_stats["tokens_returned"] += unused
+        except Exception as e:
+            logger.warning(f"Failed to return {unused} leased tokens for {key}: {e}")
+
+    async def release_leases(self) -> None:
+        """Return all unused leased tokens to Redis immediately."""
+        async with self._lease_lock:
+            for key, lease in list(self._leases.items()):
+                await self._return_lease(key, lease)
+
+    def get_lease_stats(self) -> dict[str, float]:
+        """Get lease-mode statistics.
+
+        Returns:
+            Dictionary with Redis round trips, locally served requests,
+            leases granted and tokens leased/returned.
+        """
+        stats = dict(self._lease_stats)
+        stats["active_leases"] = len(self._leases)
+        stats["tokens_held"] = sum(lease.tokens for lease in self._leases.values())
+        return stats
+
     async def record_429(self, key: str, retry_after: float) -> None:
         """Record 429 for circuit breaker tracking."""
         async with self._lock:
@@ -214,6 +456,11 @@ class RedisRateLimitTracker:
             self._429_counts.pop(key, None)
             self._429_last_time.pop(key, None)
 
+        async with self._lease_lock:
+            lease = self._leases.pop(key, None)
+            if lease is not None and lease.timer is not None:
+                lease.timer.cancel()
+
         if self._redis_available:
             try:
                 client = await self._get_redis()
@@ -229,7 +476,8 @@ class RedisRateLimitTracker:
         return self._429_counts.get(key, 0)
 
     async def close(self) -> None:
-        """Close Redis connection."""
+        """Close Redis connection, returning any leased tokens first."""
+        await self.release_leases()
         if self._redis:
             await self._redis.aclose()
             self._redis = None
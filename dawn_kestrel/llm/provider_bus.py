@@ -7,7 +7,11 @@ across sessions, agents, and provider instances.
 Key features:
 - Global singleton for cross-session coordination
 - Shared rate limit tracking per provider
-- Concurrency control via per-provider semaphores
+- Adaptive (AIMD) per-provider concurrency limits that grow while calls
+  stay healthy and shrink on 429s, timeouts or latency spikes
+- Tokens-per-minute budgeting: providers reserve an estimate with
+  ``reserve_tokens`` before each call and settle it with
+  ``reconcile_tokens`` once the usage is known
 - 429 handling with automatic backoff
 - Event emission for observability
 - Support for both local and Redis-backed rate limiters
@@ -22,6 +26,7 @@ Example:
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import time
 from collections.abc import AsyncIterator, Awaitable, Callable
@@ -29,6 +34,12 @@ from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from dawn_kestrel.core.event_bus import Events, bus
 from dawn_kestrel.core.result import Err, Ok, Result
+from dawn_kestrel.llm.adaptive_concurrency import (
+    AIMDConcurrencyLimiter,
+    ProviderSignal,
+    classify_provider_error,
+    retry_after_of,
+)
 from dawn_kestrel.llm.provider_limits import (
     PROVIDER_LIMITS,
     LocalRateLimitTracker,
@@ -37,6 +48,7 @@ from dawn_kestrel.llm.provider_limits import (
     create_rate_limit_tracker,
     get_provider_limit,
 )
+from dawn_kestrel.llm.rate_limiter import RateLimiterImpl, TokenReservation
 
 if TYPE_CHECKING:
     pass
@@ -47,6 +59,57 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Output budget assumed when the request does not set max_tokens.
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1024
+
+# Rough characters-per-token ratio for estimating prompt size up front.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_request_tokens(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None = None,
+    max_output_tokens: int | None = None,
+) -> int:
+    """Estimate input + output tokens for a request before sending it.
+
+    The estimate only has to be close: it is reconciled against the
+    provider-reported usage once the call finishes.
+
+    Args:
+        messages: Chat messages to send.
+        tools: Tool definitions to send.
+        max_output_tokens: Requested output limit, if any.
+
+    Returns:
+        Estimated total token cost.
+    """
+    chars = len(json.dumps(messages, default=str))
+    if tools:
+        chars += len(json.dumps(tools, default=str))
+    output = max_output_tokens if max_output_tokens else DEFAULT_OUTPUT_TOKEN_ESTIMATE
+    return chars // CHARS_PER_TOKEN + output
+
+
+def usage_total_tokens(usage: dict[str, Any] | None) -> int | None:
+    """Total input + output tokens from a finish event's usage payload.
+
+    Args:
+        usage: ``usage`` dict from a finish StreamEvent.
+
+    Returns:
+        Token total, or None if the payload carries no counts.
+    """
+    if not usage:
+        return None
+    if "total_tokens" in usage:
+        return int(usage["total_tokens"])
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt is None and completion is None:
+        return None
+    return int(prompt or 0) + int(completion or 0)
+
 
 class ProviderBus:
     """Singleton bus that coordinates all provider API calls.
@@ -56,7 +119,7 @@ class ProviderBus:
 
     Features:
     - Shared rate limit state (local or Redis-backed)
-    - Per-provider concurrency control via semaphores
+    - Per-provider adaptive concurrency control (AIMD)
     - Automatic 429 handling with backoff
     - Event emission for monitoring
 
@@ -72,6 +135,7 @@ class ProviderBus:
         rate_tracker: RateLimitTracker | None = None,
         backend: str = "local",
         redis_url: str | None = None,
+        provider_limits: dict[str, ProviderRateLimit] | None = None,
     ) -> None:
         """Initialize the provider bus.
 
@@ -79,14 +143,26 @@ class ProviderBus:
             rate_tracker: Optional custom rate tracker. If None, creates one.
             backend: "local" for in-memory, "redis" for distributed.
             redis_url: Redis URL (required if backend="redis").
+            provider_limits: Per-provider limits overriding PROVIDER_LIMITS.
         """
+        self._provider_limits = provider_limits
+
         if rate_tracker is not None:
             self._rate_tracker = rate_tracker
         else:
-            self._rate_tracker = create_rate_limit_tracker(backend=backend, redis_url=redis_url)
+            self._rate_tracker = create_rate_limit_tracker(
+                backend=backend,
+                redis_url=redis_url,
+                lease_size=settings.rate_limit_lease_size,
+                lease_ttl=settings.rate_limit_lease_ttl,
+            )
+
+        # Per-provider adaptive concurrency limiters
+        self._limiters: dict[str, AIMDConcurrencyLimiter] = {}
 
-        # Per-provider semaphores for concurrency control
-        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # Per-provider tokens-per-minute buckets (reserve, then reconcile)
+        self._token_limiter = RateLimiterImpl()
+        self._token_limited: set[str] = set()
 
         # Track active requests per provider for monitoring
         self._active_requests: dict[str, int] = {}
@@ -98,6 +174,9 @@ class ProviderBus:
             "rate_limited_requests": 0,
             "429_errors": 0,
             "total_wait_time_ms": 0,
+            "tokens_reserved": 0,
+            "tokens_used": 0,
+            "token_wait_time_ms": 0,
         }
 
         # Lock for atomic updates
@@ -134,19 +213,113 @@ class ProviderBus:
         """
         cls._instance = None
 
-    def _get_semaphore(self, provider_id: str) -> asyncio.Semaphore:
-        """Get or create semaphore for provider.
+    def _get_limit(self, provider_id: str) -> ProviderRateLimit:
+        """Get the rate limit configuration for a provider.
+
+        Args:
+            provider_id: Provider identifier.
+
+        Returns:
+            ProviderRateLimit for the provider.
+        """
+        if self._provider_limits is not None:
+            return self._provider_limits.get(provider_id, ProviderRateLimit())
+        return get_provider_limit(provider_id)
+
+    async def reserve_tokens(
+        self,
+        provider_id: str,
+        estimated_tokens: int,
+        timeout: float | None = None,
+    ) -> Result[TokenReservation | None]:
+        """Reserve estimated tokens against the provider's per-minute budget.
+
+        Waits until the estimate fits within the provider's tokens-per-minute
+        quota. The reservation must be settled with ``reconcile_tokens`` once
+        the actual usage is known.
+
+        Args:
+            provider_id: Provider identifier.
+            estimated_tokens: Estimated input + output tokens of the call.
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Result with the reservation, Ok(None) if the provider has no
+            token budget, or Err on timeout.
+        """
+        provider_key = provider_id.lower().replace("-", "_")
+        limit = self._get_limit(provider_key)
+        if limit.tokens_per_minute <= 0:
+            return Ok(None)
+
+        if provider_key not in self._token_limited:
+            self._token_limiter.set_limit(
+                provider_key,
+                capacity=limit.tokens_per_minute,
+                refill_rate=limit.tokens_per_minute / 60.0,
+                window_seconds=60,
+            )
+            self._token_limited.add(provider_key)
+
+        start = time.monotonic()
+        result = await self._token_limiter.reserve(provider_key, estimated_tokens, timeout)
+        waited_ms = int((time.monotonic() - start) * 1000)
+        if result.is_err():
+            return Err(
+                f"Token budget wait timed out for {provider_key}",
+                code="RATE_LIMIT_EXCEEDED",
+                retryable=True,
+            )
+
+        async with self._lock:
+            self._stats["tokens_reserved"] += estimated_tokens
+            self._stats["token_wait_time_ms"] += waited_ms
+        if waited_ms:
+            await self._emit_request_event(
+                provider_key,
+                "rate_limited",
+                {"wait_seconds": waited_ms / 1000, "estimated_tokens": estimated_tokens},
+            )
+        return Ok(result.unwrap())
+
+    async def reconcile_tokens(
+        self,
+        reservation: TokenReservation | None,
+        actual_tokens: int | None,
+    ) -> None:
+        """Settle a token reservation against actual usage.
+
+        Args:
+            reservation: Reservation from ``reserve_tokens`` (None is a no-op).
+            actual_tokens: Tokens the call consumed; None keeps the estimate.
+        """
+        if reservation is None or reservation.settled:
+            return
+        if actual_tokens is None:
+            actual_tokens = reservation.estimated
+        await self._token_limiter.reconcile(reservation, actual_tokens)
+        async with self._lock:
+            self._stats["tokens_used"] += actual_tokens
+
+    def _get_limiter(self, provider_id: str) -> AIMDConcurrencyLimiter:
+        """Get or create the adaptive concurrency limiter for provider.
+
+        The configured ``concurrent_requests`` is the starting point; the
+        limiter may grow up to ``max_concurrent_requests`` (default 4x).
 
         Args:
             provider_id: Provider identifier.
 
         Returns:
-            Semaphore for the provider.
+            Concurrency limiter for the provider.
         """
-        if provider_id not in self._semaphores:
-            limit = get_provider_limit(provider_id)
-            self._semaphores[provider_id] = asyncio.Semaphore(limit.concurrent_requests)
-        return self._semaphores[provider_id]
+        if provider_id not in self._limiters:
+            limit = self._get_limit(provider_id)
+            self._limiters[provider_id] = AIMDConcurrencyLimiter(
+                initial_limit=limit.concurrent_requests,
+                max_limit=limit.max_concurrent_requests or None,
+            )
+        return self._limiters[provider_id]
 
     async def _emit_request_event(
         self,
@@ -167,6 +340,9 @@ class ProviderBus:
             "timestamp": time.time(),
             "active_requests": self._active_requests.get(provider_id, 0),
         }
+        limiter = self._limiters.get(provider_id)
+        if limiter is not None:
+            event_data["concurrency_limit"] = limiter.limit
         if data:
             event_data.update(data)
         await bus.publish(Events.PROVIDER_REQUEST_QUEUED, event_data)
@@ -191,13 +367,13 @@ class ProviderBus:
             Result containing the operation result or an error.
         """
         provider_key = provider_id.lower().replace("-", "_")
-        semaphore = self._get_semaphore(provider_key)
-        limit = get_provider_limit(provider_key)
+        limiter = self._get_limiter(provider_key)
+        limit = self._get_limit(provider_key)
 
         async with self._lock:
             self._stats["total_requests"] += 1
 
-        # Check rate limit before acquiring semaphore
+        # Check rate limit before acquiring a concurrency slot
         check_result = await self._rate_tracker.check_allowed(provider_key)
         if check_result.is_err():
             return Err(
@@ -220,8 +396,8 @@ class ProviderBus:
             )
             await asyncio.sleep(wait_seconds)
 
-        # Acquire semaphore for concurrency control
-        async with semaphore:
+        # Acquire a slot under the adaptive concurrency limit
+        async with limiter:
             async with self._lock:
                 self._active_requests[provider_key] = self._active_requests.get(provider_key, 0) + 1
 
@@ -231,28 +407,29 @@ class ProviderBus:
                 # Execute with 429 retry handling
                 last_error: Exception | None = None
                 for attempt in range(max_429_retries + 1):
+                    started = time.monotonic()
                     try:
                         result = await operation()
 
+                        limiter.record(ProviderSignal.SUCCESS, time.monotonic() - started)
                         async with self._lock:
                             self._stats["successful_requests"] += 1
 
                         return Ok(result)
 
                     except Exception as e:
-                        error_str = str(e).lower()
-                        is_429 = (
-                            "rate limit" in error_str
-                            or "1302" in error_str  # Z.AI rate limit code
-                            or "429" in error_str
-                        )
-
-                        if is_429 and attempt < max_429_retries:
+                        signal = classify_provider_error(e)
+                        limiter.record(signal, time.monotonic() - started)
+
+                        if signal == ProviderSignal.RATE_LIMITED and attempt < max_429_retries:
                             async with self._lock:
                                 self._stats["429_errors"] += 1
 
                             # Record 429 for circuit breaker tracking
-                            backoff = limit.calculate_backoff_with_jitter(attempt)
+                            backoff = max(
+                                limit.calculate_backoff_with_jitter(attempt),
+                                retry_after_of(e) or 0.0,
+                            )
                             await self._rate_tracker.record_429(provider_key, backoff)
 
                             logger.warning(
@@ -306,8 +483,8 @@ class ProviderBus:
             Result containing each stream event or an error.
         """
         provider_key = provider_id.lower().replace("-", "_")
-        semaphore = self._get_semaphore(provider_key)
-        limit = get_provider_limit(provider_key)
+        limiter = self._get_limiter(provider_key)
+        limit = self._get_limit(provider_key)
 
         async with self._lock:
             self._stats["total_requests"] += 1
@@ -335,26 +512,33 @@ class ProviderBus:
             )
             await asyncio.sleep(wait_seconds)
 
-        # Acquire semaphore and stream
-        async with semaphore:
+        # Acquire a concurrency slot and stream
+        async with limiter:
             async with self._lock:
                 self._active_requests[provider_key] = self._active_requests.get(provider_key, 0) + 1
 
             await self._emit_request_event(provider_key, "started")
 
+            started = time.monotonic()
+            # Time to first event is the latency signal; total duration
+            # depends on output length.
+            first_event_latency: float | None = None
             try:
                 stream = await operation()
                 async for item in stream:
+                    if first_event_latency is None:
+                        first_event_latency = time.monotonic() - started
                     yield Ok(item)
 
+                limiter.record(ProviderSignal.SUCCESS, first_event_latency)
                 async with self._lock:
                     self._stats["successful_requests"] += 1
 
             except Exception as e:
-                error_str = str(e).lower()
-                is_429 = "rate limit" in error_str or "1302" in error_str or "429" in error_str
+                signal = classify_provider_error(e)
+                limiter.record(signal, time.monotonic() - started)
 
-                if is_429:
+                if signal == ProviderSignal.RATE_LIMITED:
                     async with self._lock:
                         self._stats["429_errors"] += 1
 
@@ -388,6 +572,9 @@ class ProviderBus:
         async with self._lock:
             stats = self._stats.copy()
             stats["active_requests"] = dict(self._active_requests)
+            stats["concurrency_limits"] = {
+                provider_key: limiter.limit for provider_key, limiter in self._limiters.items()
+            }
             return stats
 
     async def get_provider_stats(self, provider_id: str) -> dict[str, Any]:
@@ -400,11 +587,16 @@ class ProviderBus:
             Dictionary with provider-specific statistics.
         """
         provider_key = provider_id.lower().replace("-", "_")
+        limit = self._get_limit(provider_key)
+        limiter = self._get_limiter(provider_key)
         async with self._lock:
             return {
                 "active_requests": self._active_requests.get(provider_key, 0),
-                "concurrent_limit": get_provider_limit(provider_key).concurrent_requests,
-                "requests_per_minute": get_provider_limit(provider_key).requests_per_minute,
+                "concurrent_limit": limiter.limit,
+                "configured_concurrent_limit": limit.concurrent_requests,
+                "requests_per_minute": limit.requests_per_minute,
+                "tokens_per_minute": limit.tokens_per_minute,
+                "concurrency": limiter.get_stats(),
             }
 
     async def reset_rate_limits(self, provider_id: str | None = None) -> None:
@@ -416,11 +608,13 @@ class ProviderBus:
         if provider_id:
             provider_key = provider_id.lower().replace("-", "_")
             await self._rate_tracker.reset(provider_key)
+            self._token_limited.discard(provider_key)
             logger.info(f"Reset rate limits for {provider_key}")
         else:
             # Reset all known providers
             for provider_key in PROVIDER_LIMITS:
                 await self._rate_tracker.reset(provider_key)
+            self._token_limited.clear()
             logger.info("Reset rate limits for all providers")
 
 
@@ -431,4 +625,6 @@ provider_bus = ProviderBus.get_instance()
 __all__ = [
     "ProviderBus",
     "provider_bus",
+    "estimate_request_tokens",
+    "usage_total_tokens",
 ]
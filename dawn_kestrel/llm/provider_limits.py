@@ -28,7 +28,10 @@ class ProviderRateLimit:
     Attributes:
         requests_per_minute: Max requests per minute (conservative for multi-process).
         tokens_per_minute: Max tokens per minute (if applicable).
-        concurrent_requests: Max concurrent in-flight requests.
+        concurrent_requests: Initial max concurrent in-flight requests. The
+            ProviderBus adapts this at runtime (AIMD).
+        max_concurrent_requests: Ceiling for the adaptive concurrency limit
+            (0 = four times concurrent_requests).
         retry_after_multiplier: Multiplier for Retry-After header (safety buffer).
         jitter_range: (min, max) random jitter in seconds for backoff.
         backoff_base: Base seconds for exponential backoff.
@@ -38,6 +41,7 @@ class ProviderRateLimit:
     requests_per_minute: int = 60
     tokens_per_minute: int = 100000
     concurrent_requests: int = 5
+    max_concurrent_requests: int = 0
     retry_after_multiplier: float = 1.5
     jitter_range: tuple[float, float] = (0.1, 0.5)
     backoff_base: float = 1.0
@@ -241,6 +245,8 @@ class LocalRateLimitTracker:
 def create_rate_limit_tracker(
     backend: str = "local",
     redis_url: str | None = None,
+    lease_size: int = 0,
+    lease_ttl: float = 5.0,
     **kwargs,
 ) -> RateLimitTracker:
     """Factory for creating rate limit trackers.
@@ -248,6 +254,8 @@ def create_rate_limit_tracker(
     Args:
         backend: "local" for in-memory, "redis" for distributed.
         redis_url: Redis connection URL (required if backend="redis").
+        lease_size: Tokens leased per Redis round trip (redis only, 0 disables).
+        lease_ttl: Seconds before unused leased tokens are returned (redis only).
         **kwargs: Additional arguments for the tracker.
 
     Returns:
@@ -263,7 +271,9 @@ def create_rate_limit_tracker(
         try:
             from dawn_kestrel.llm.distributed_limiter import RedisRateLimitTracker
 
-            return RedisRateLimitTracker(redis_url=redis_url, **kwargs)
+            return RedisRateLimitTracker(
+                redis_url=redis_url, lease_size=lease_size, lease_ttl=lease_ttl, **kwargs
+            )
         except ImportError:
             logger.warning(
                 "Redis backend requested but redis package not installed. "
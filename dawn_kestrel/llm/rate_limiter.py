@@ -12,13 +12,19 @@ This module provides:
 - RateLimiter protocol for rate limiter interface
 - TokenBucket implementation using token bucket algorithm
 - RateLimiterImpl with per-resource limits
+- TokenReservation for reserve-then-reconcile budgeting (e.g. LLM
+  tokens per minute, where the real cost is only known afterwards)
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Protocol, runtime_checkable
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol, cast, runtime_checkable
 
 from dawn_kestrel.core.result import Err, Ok, Result
 
@@ -104,10 +110,17 @@ class TokenBucket:
 
     Implements token bucket algorithm:
     - Bucket has fixed capacity
-    - Tokens refill at constant rate
+    - Tokens refill continuously at a constant rate (fractional tokens
+      accumulate, measured on a monotonic clock)
     - Requests consume tokens
     - Empty bucket = rate limited
 
+    ``try_acquire`` fails fast when the bucket is empty. ``acquire`` waits
+    instead: waiters are served strictly in FIFO order and the bucket arms
+    a single timer for the exact moment the head waiter's tokens will be
+    available, so nobody polls and a burst of small requests cannot starve
+    a large one queued ahead of them.
+
     Thread safety:
         NOT thread-safe (documented limitation).
         Suitable for single-process use (async rate limiting).
@@ -121,13 +134,19 @@ class TokenBucket:
 
         # Try to acquire token
         result = await bucket.try_acquire('api_endpoint', tokens=1)
+
+        # Or wait (FIFO) until the token is available
+        result = await bucket.acquire('api_endpoint', tokens=1, timeout=5.0)
     """
 
+    REFILL_HISTORY_SIZE = 128
+
     def __init__(
         self,
         capacity: int = 10,
         refill_rate: float = 1,
         window_seconds: int = 60,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """Initialize token bucket.
 
@@ -135,14 +154,31 @@ class TokenBucket:
             capacity: Maximum tokens in bucket.
             refill_rate: Tokens added per second.
             window_seconds: Time window for request tracking.
+            clock: Monotonic clock returning seconds (injectable for tests).
         """
         self._capacity = capacity
         self._refill_rate = refill_rate
         self._window_seconds = window_seconds
-        self._tokens: int = capacity  # Start with full bucket
-        self._last_refill_time = datetime.now()
-        self._request_times: list[datetime] = []  # Track request timestamps
-        self._refills: list[datetime] = []  # Track refills
+        self._clock = clock
+        self._tokens: float = capacity  # Start with full bucket
+        self._last_refill_time: float = clock()
+        self._request_times: deque[float] = deque()  # Track request timestamps
+        self._refills: deque[float] = deque(maxlen=self.REFILL_HISTORY_SIZE)
+        self._waiters: deque[tuple[int, asyncio.Future[None]]] = deque()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill, capped at capacity."""
+        elapsed = now - self._last_refill_time
+        if elapsed > 0:
+            self._tokens = min(self._tokens + elapsed * self._refill_rate, self._capacity)
+            self._last_refill_time = now
+            self._refills.append(now)
+
+        # Remove expired requests from tracking
+        cutoff = now - self._window_seconds
+        while self._request_times and self._request_times[0] <= cutoff:
+            self._request_times.popleft()
 
     async def _refill_tokens(self) -> None:
         """Refill tokens based on time elapsed.
@@ -150,28 +186,51 @@ class TokenBucket:
         Calculates elapsed time since last refill and adds
         tokens proportionally, respecting capacity limit.
         """
-        now = datetime.now()
-        elapsed = (now - self._last_refill_time).total_seconds()
-
-        # Calculate tokens to add
-        tokens_to_add = int(elapsed * self._refill_rate)
-
-        # Add tokens, respecting capacity
-        self._tokens = min(self._tokens + tokens_to_add, self._capacity)
-        self._last_refill_time = now
-        self._refills.append(now)
-
-        # Remove expired requests from tracking
-        self._request_times = [
-            t for t in self._request_times if (now - t).total_seconds() < self._window_seconds
-        ]
+        self._refill(self._clock())
+
+    def _take(self, tokens: int) -> None:
+        self._tokens -= tokens
+        self._request_times.append(self._clock())
+
+    def _has(self, tokens: int) -> bool:
+        # Tolerate float error from computing the wake-up time as deficit / rate.
+        return self._tokens + 1e-9 >= tokens
+
+    def _wake_waiters(self) -> None:
+        """Grant tokens to queued waiters in order and arm the next wake-up."""
+        self._wakeup = None
+        self._refill(self._clock())
+
+        while self._waiters:
+            tokens, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if not self._has(tokens):
+                break
+            self._waiters.popleft()
+            self._take(tokens)
+            waiter.set_result(None)
+
+        if self._waiters and self._refill_rate > 0:
+            tokens, waiter = self._waiters[0]
+            delay = max(0.0, (tokens - self._tokens) / self._refill_rate)
+            self._wakeup = waiter.get_loop().call_later(delay, self._wake_waiters)
+
+    def _reschedule(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wake_waiters()
 
     async def try_acquire(
         self,
         resource: str,
         tokens: int = 1,
     ) -> Result[bool]:
-        """Try to acquire tokens from bucket.
+        """Try to acquire tokens from bucket without waiting.
+
+        Fails while other callers are queued in ``acquire`` so that
+        non-blocking callers cannot jump the queue.
 
         Args:
             resource: Resource identifier (for tracking).
@@ -180,31 +239,83 @@ class TokenBucket:
         Returns:
             Result[bool]: Ok(True) if tokens available, Err if not.
         """
-        # Check if enough tokens available
-        if self._tokens >= tokens:
-            # Record request timestamp
-            self._request_times.append(datetime.now())
+        if not self._waiters:
+            self._refill(self._clock())
+            if self._has(tokens):
+                self._take(tokens)
+                return Ok(True)
 
-            # Deduct tokens
-            self._tokens -= tokens
-            return Ok(True)
+        return Err(
+            f"Not enough tokens for {resource}: need {tokens}, have {self._tokens:.2f}",
+            code="RATE_LIMIT_EXCEEDED",
+        )
 
-        # Try refill first
-        await self._refill_tokens()
+    async def acquire(
+        self,
+        resource: str,
+        tokens: int = 1,
+        timeout: float | None = None,
+    ) -> Result[bool]:
+        """Acquire tokens, waiting in FIFO order until they are available.
 
-        # Check again after refill
-        if self._tokens >= tokens:
-            # Record request timestamp
-            self._request_times.append(datetime.now())
+        Args:
+            resource: Resource identifier (for tracking).
+            tokens: Number of tokens needed.
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
 
-            # Deduct tokens
-            self._tokens -= tokens
-            return Ok(True)
+        Returns:
+            Result[bool]: Ok(True) once tokens are granted, Err if the request
+            can never be satisfied or the timeout expires.
+        """
+        if tokens > self._capacity:
+            return Err(
+                f"Request for {resource} exceeds bucket capacity: need {tokens}, "
+                f"capacity {self._capacity}",
+                code="RATE_LIMIT_EXCEEDED",
+            )
 
-        return Err(
-            f"Not enough tokens for {resource}: need {tokens}, have {self._tokens}",
-            code="RATE_LIMIT_EXCEEDED",
-        )
+        result = await self.try_acquire(resource, tokens)
+        if result.is_ok():
+            return result
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append((tokens, waiter))
+        if len(self._waiters) == 1:
+            self._reschedule()
+
+        try:
+            if timeout is None:
+                await waiter
+            else:
+                await asyncio.wait_for(waiter, timeout)
+        except (asyncio.CancelledError, TimeoutError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted in the same tick the caller gave up: hand the tokens back.
+                self._tokens = min(self._tokens + tokens, self._capacity)
+            self._reschedule()
+            if isinstance(e, TimeoutError):
+                return Err(
+                    f"Timed out after {timeout}s waiting for {tokens} tokens for {resource}",
+                    code="RATE_LIMIT_EXCEEDED",
+                )
+            raise
+
+        return Ok(True)
+
+    def adjust(self, tokens: float) -> None:
+        """Debit (positive) or credit (negative) tokens outside of acquire.
+
+        Used to reconcile a reservation against actual usage. A debit may
+        leave the bucket in deficit, which later waiters pay off before
+        being admitted; a credit is capped at capacity and may wake waiters.
+
+        Args:
+            tokens: Tokens to remove from the bucket; negative to return them.
+        """
+        self._refill(self._clock())
+        self._tokens = min(self._tokens - tokens, self._capacity)
+        if self._waiters:
+            self._reschedule()
 
     async def release(self, resource: str) -> Result[None]:
         """Release tokens back to bucket (no-op for simple impl).
@@ -233,15 +344,30 @@ class TokenBucket:
         Returns:
             Result[int]: Ok with request count.
         """
-        # Remove expired requests from tracking
-        now = datetime.now()
-        self._request_times = [
-            t for t in self._request_times if (now - t).total_seconds() < self._window_seconds
-        ]
-
+        self._refill(self._clock())
         return Ok(len(self._request_times))
 
 
+# =============================================================================
+# TokenReservation
+# =============================================================================
+
+
+@dataclass
+class TokenReservation:
+    """Tokens reserved ahead of a call whose exact cost is only known later.
+
+    Attributes:
+        resource: Resource the tokens were reserved against.
+        estimated: Number of tokens reserved.
+        settled: Whether the reservation has been reconciled.
+    """
+
+    resource: str
+    estimated: int
+    settled: bool = False
+
+
 # =============================================================================
 # RateLimiterImpl
 # =============================================================================
@@ -350,6 +476,83 @@ class RateLimiterImpl:
         bucket = self._get_or_create_bucket(resource)
         return await bucket.try_acquire(resource, tokens)
 
+    async def acquire(
+        self,
+        resource: str,
+        tokens: int = 1,
+        timeout: float | None = None,
+    ) -> Result[bool]:
+        """Acquire tokens for resource, waiting in FIFO order if necessary.
+
+        Args:
+            resource: Resource identifier.
+            tokens: Number of tokens needed.
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Result[bool]: Ok(True) once granted, Err on timeout or if the
+            request exceeds the bucket capacity.
+        """
+        bucket = self._get_or_create_bucket(resource)
+        return await bucket.acquire(resource, tokens, timeout=timeout)
+
+    async def reserve(
+        self,
+        resource: str,
+        tokens: int,
+        timeout: float | None = None,
+    ) -> Result[TokenReservation]:
+        """Reserve an estimated token cost before a call.
+
+        Waits (FIFO) until the estimate fits. Estimates larger than the
+        bucket capacity are admitted once the bucket is full and leave it in
+        deficit for the remainder, so oversized calls cannot block forever.
+
+        Args:
+            resource: Resource identifier.
+            tokens: Estimated token cost of the call.
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            Result[TokenReservation]: Ok with the reservation to reconcile
+            later, Err on timeout.
+        """
+        bucket = self._get_or_create_bucket(resource)
+        tokens = max(0, tokens)
+        admitted = min(tokens, bucket._capacity)
+        if admitted > 0:
+            result = await bucket.acquire(resource, admitted, timeout=timeout)
+            if result.is_err():
+                return cast(Result[TokenReservation], result)
+        if tokens > admitted:
+            bucket.adjust(tokens - admitted)
+        return Ok(TokenReservation(resource=resource, estimated=tokens))
+
+    async def reconcile(
+        self,
+        reservation: TokenReservation,
+        actual_tokens: int,
+    ) -> Result[None]:
+        """Settle a reservation against the tokens actually used.
+
+        Unused tokens are returned to the bucket; overruns are debited.
+        Reconciling the same reservation twice is a no-op.
+
+        Args:
+            reservation: Reservation returned by ``reserve``.
+            actual_tokens: Tokens the call actually consumed.
+
+        Returns:
+            Result[None]: Ok on success.
+        """
+        if reservation.settled:
+            return Ok(None)
+        reservation.settled = True
+        delta = actual_tokens - reservation.estimated
+        if delta:
+            self._get_or_create_bucket(reservation.resource).adjust(delta)
+        return Ok(None)
+
     async def release(self, resource: str) -> Result[None]:
         """Release tokens for resource.
 
@@ -402,5 +605,6 @@ class RateLimiterImpl:
 __all__ = [
     "RateLimiter",
     "TokenBucket",
+    "TokenReservation",
     "RateLimiterImpl",
 ]
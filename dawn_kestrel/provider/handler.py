@@ -5,6 +5,7 @@ import logging
 from collections.abc import AsyncGenerator, Callable
 
 from . import BaseProvider, UsageInfo
+from .sse import ChunkSplitter
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +32,11 @@ class StreamChunkHandler:
     ) -> AsyncGenerator[str, None]:
         """
         Process streaming response, yielding converted chunks
+
+        Chunks are split at the byte level and only newly received bytes are
+        scanned, so parsing is linear in the stream size.
         """
-        decoder = "utf-8"
+        splitter = ChunkSplitter(self.separator)
 
         async for raw_value in response_stream:
             # Apply binary decoder if available (e.g., AWS Bedrock)
@@ -40,16 +44,7 @@ class StreamChunkHandler:
             if not value:
                 continue
 
-            # Decode and add to buffer
-            text = value.decode(decoder, errors='ignore')
-            self.buffer += text
-
-            # Split by separator and process complete chunks
-            parts = self.buffer.split(self.separator)
-            self.buffer = parts.pop() or ""  # Keep incomplete part
-
-            # Process each complete chunk
-            for part in parts:
+            for part in splitter.feed(value):
                 part = part.strip()
                 if not part:
                     continue
@@ -68,6 +63,9 @@ class StreamChunkHandler:
                 else:
                     yield part
 
+        # Keep the incomplete tail for inspection, as before
+        self.buffer = splitter.flush() or ""
+
     def get_final_usage(self) -> UsageInfo | None:
         """Return accumulated usage after stream completes"""
         return self._accumulated_usage
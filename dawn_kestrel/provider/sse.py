@@ -0,0 +1,105 @@
+"""OpenCode Python - Incremental stream chunk parsing
+
+Splits a byte stream into separator-delimited chunks in linear time:
+bytes are buffered as bytes and only newly appended data is scanned for
+the separator, so a chunk spread over many network reads is never
+re-split or re-decoded. Separators are ASCII, which never occurs inside a
+multi-byte UTF-8 sequence, so every complete chunk decodes on its own and
+characters straddling read boundaries are preserved.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+SSE_DONE = "[DONE]"
+
+
+class ChunkSplitter:
+    """Incrementally splits bytes on a separator"""
+
+    def __init__(self, separator: str | bytes = b"\n"):
+        self.separator = separator.encode() if isinstance(separator, str) else separator
+        if not self.separator:
+            raise ValueError("separator must not be empty")
+        self._buffer = bytearray()
+        # Offset from which the buffer has not been searched yet
+        self._scanned = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes not yet forming a complete chunk"""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> list[str]:
+        """Add bytes, returning the chunks they complete (decoded)"""
+        buffer = self._buffer
+        buffer += data
+        sep = self.separator
+        chunks = []
+        start = 0
+        # A separator may straddle the previous read boundary
+        search = max(self._scanned - len(sep) + 1, 0)
+        while True:
+            index = buffer.find(sep, search)
+            if index < 0:
+                break
+            chunks.append(buffer[start:index].decode("utf-8", errors="replace"))
+            start = search = index + len(sep)
+        if start:
+            del buffer[:start]
+        self._scanned = len(buffer)
+        return chunks
+
+    def flush(self) -> str | None:
+        """Return the trailing incomplete chunk at end of stream, if any"""
+        if not self._buffer:
+            return None
+        rest = self._buffer.decode("utf-8", errors="replace")
+        self._buffer.clear()
+        self._scanned = 0
+        return rest
+
+
+async def iter_chunks(
+    byte_stream: AsyncIterable[bytes],
+    separator: str | bytes = b"\n",
+) -> AsyncIterator[str]:
+    """Yield separator-delimited chunks from a byte stream, including the trailing one"""
+    splitter = ChunkSplitter(separator)
+    async for data in byte_stream:
+        for chunk in splitter.feed(data):
+            yield chunk
+    rest = splitter.flush()
+    if rest is not None:
+        yield rest
+
+
+async def iter_sse_data(
+    byte_stream: AsyncIterable[bytes],
+    allow_raw_json: bool = False,
+) -> AsyncIterator[str]:
+    """Yield the payload of each SSE ``data:`` line
+
+    Comment, ``event:``/``id:`` and blank lines and the ``[DONE]`` sentinel
+    are skipped. With ``allow_raw_json``, bare lines starting with ``{``
+    (sent by some OpenAI-compatible servers, e.g. for errors) are yielded
+    as well.
+
+    Args:
+        byte_stream: Response body, e.g. ``response.aiter_bytes()``
+        allow_raw_json: Also yield bare JSON object lines
+
+    Yields:
+        Payload strings, one per data line
+    """
+    async for line in iter_chunks(byte_stream, b"\n"):
+        line = line.rstrip("\r")
+        if line.startswith("data:"):
+            data = line[6:] if line.startswith("data: ") else line[5:]
+            if data and data != SSE_DONE:
+                yield data
+        elif allow_raw_json and line.startswith("{"):
+            yield line
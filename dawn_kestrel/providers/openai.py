@@ -14,6 +14,8 @@ from typing import Any
 
 import httpx
 
+from ..core import json_codec
+from ..provider.sse import iter_sse_data
 from .base import (
     ModelCapabilities,
     ModelCost,
@@ -127,63 +129,57 @@ class OpenAIProvider:
             )
 
             async with client.stream("POST", url=url, json=payload, timeout=600.0) as response:
-                async for line in response.aiter_lines():
-                    if line.strip():
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str == "[DONE]":
-                                continue
-
-                            try:
-                                chunk = json.loads(data_str)
-                                delta = chunk.get("choices", [{}])[0].get("delta", {})
-                                content = delta.get("content", {})
-                                finish_reason = chunk.get("finish_reason")
-                                tool_calls = chunk.get("tool_calls", [])
-
-                                if "content" in delta:
+                async for data_str in iter_sse_data(response.aiter_bytes()):
+                    try:
+                        chunk = json_codec.loads(data_str)
+                        delta = chunk.get("choices", [{}])[0].get("delta", {})
+                        content = delta.get("content", {})
+                        finish_reason = chunk.get("finish_reason")
+                        tool_calls = chunk.get("tool_calls", [])
+
+                        if "content" in delta:
+                            yield StreamEvent(
+                                event_type="text-delta",
+                                data={"delta": content},
+                                timestamp=0
+                            )
+
+                        if "tool_calls" in chunk:
+                            for tool_call in tool_calls:
+                                tool_name = tool_call.get("function", "")
+                                arguments = tool_call.get("arguments", "{}")
+                                tool_input = json.loads(arguments) if isinstance(arguments, str) else arguments
+                                yield StreamEvent(
+                                    event_type="tool-call",
+                                    data={
+                                        "tool": tool_name,
+                                        "input": tool_input
+                                    },
+                                    timestamp=0
+                                )
+
+                            for tool_call in tool_calls:
+                                function = tool_call.get("function", "")
+                                result = tool_call.get("result")
+                                if result.get("type") == "tool_use":
+                                    tool_output = result.get("content", "")
                                     yield StreamEvent(
-                                        event_type="text-delta",
-                                        data={"delta": content},
+                                        event_type="tool-result",
+                                        data={
+                                            "output": tool_output
+                                        },
                                         timestamp=0
                                     )
 
-                                if "tool_calls" in chunk:
-                                    for tool_call in tool_calls:
-                                        tool_name = tool_call.get("function", "")
-                                        arguments = tool_call.get("arguments", "{}")
-                                        tool_input = json.loads(arguments) if isinstance(arguments, str) else arguments
-                                        yield StreamEvent(
-                                            event_type="tool-call",
-                                            data={
-                                                "tool": tool_name,
-                                                "input": tool_input
-                                            },
-                                            timestamp=0
-                                        )
-
-                                    for tool_call in tool_calls:
-                                        function = tool_call.get("function", "")
-                                        result = tool_call.get("result")
-                                        if result.get("type") == "tool_use":
-                                            tool_output = result.get("content", "")
-                                            yield StreamEvent(
-                                                event_type="tool-result",
-                                                data={
-                                                    "output": tool_output
-                                                },
-                                                timestamp=0
-                                            )
-
-                                if finish_reason in ["stop", "length", "content_filter"]:
-                                    yield StreamEvent(
-                                        event_type="finish",
-                                        data={"finish_reason": finish_reason},
-                                        timestamp=0
-                                    )
-                                    break
-                            except json.JSONDecodeError as e:
-                                logger.error(f"Failed to parse chunk: {e}")
+                        if finish_reason in ["stop", "length", "content_filter"]:
+                            yield StreamEvent(
+                                event_type="finish",
+                                data={"finish_reason": finish_reason},
+                                timestamp=0
+                            )
+                            break
+                    except json.JSONDecodeError as e:
+                        logger.error(f"Failed to parse chunk: {e}")
 
     def count_tokens(self, response: dict) -> TokenUsage:
         usage = response.get("usage", {})
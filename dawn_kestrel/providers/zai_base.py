@@ -16,8 +16,10 @@ from collections.abc import AsyncIterator
 from decimal import Decimal
 from typing import Any
 
+from ..core import json_codec
 from ..core.exceptions import ProviderRateLimitError
 from ..core.http_client import HTTPClientWrapper
+from ..provider.sse import iter_sse_data
 from .base import (
     ModelInfo,
     StreamEvent,
@@ -83,10 +85,13 @@ class ZAIBaseProvider(ABC):
             payload["tools"] = tools
 
         # Check rate limit via provider bus before making the request
-        provider_key = str(model.provider_id).lower().replace("-", "_").replace(".", "_")
+        # Match the provider_limits keys ("z.ai" -> "zai", "zai-coding-plan" -> "zai_coding_plan")
+        provider_id = getattr(model.provider_id, "value", model.provider_id)
+        provider_key = str(provider_id).lower().replace("-", "_").replace(".", "")
         # Lazy import to avoid circular dependency
-        from ..llm.provider_bus import ProviderBus
-        rate_tracker = ProviderBus.get_instance()._rate_tracker
+        from ..llm.provider_bus import ProviderBus, estimate_request_tokens, usage_total_tokens
+        provider_bus = ProviderBus.get_instance()
+        rate_tracker = provider_bus._rate_tracker
         check_result = await rate_tracker.check_allowed(provider_key)
         if check_result.is_ok():
             allowed, wait_seconds = check_result.unwrap()
@@ -94,113 +99,123 @@ class ZAIBaseProvider(ABC):
                 logger.info(f"Rate limit reached for {provider_key}, waiting {wait_seconds:.2f}s")
                 await asyncio.sleep(wait_seconds)
 
-        yield StreamEvent(event_type="start", data={"model": model.id}, timestamp=0)
-
-        stream_iterator = await self.http_client.stream(
-            method="POST", url=url, json=payload, headers=headers, timeout=600.0
+        # Reserve the estimated token cost against the tokens-per-minute budget
+        reserve_result = await provider_bus.reserve_tokens(
+            provider_key,
+            estimate_request_tokens(
+                messages, tools, options.get("max_tokens") if options else None
+            ),
         )
-
-        async for response_stream_context in stream_iterator:
-            async with response_stream_context as response:
-                async for line in response.aiter_lines():
-                    if not line.strip():
-                        continue
-
-                    data_str = None
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        if data_str == "[DONE]":
-                            continue
-                    elif line.startswith("{"):
-                        data_str = line
-
-                    if not data_str:
-                        continue
-
-                    try:
-                        chunk = json.loads(data_str)
-                        if "error" in chunk:
-                            error_data = chunk["error"]
-                            # Parse error structure - Z.AI returns {"error": {"code": N, "message": "..."}}
-                            if isinstance(error_data, dict):
-                                error_code = error_data.get("code")
-                                error_msg = error_data.get("message", str(error_data))
-                                retry_after = error_data.get("retry_after")
-                            else:
-                                # Fallback: error is a string, code might be at top level
-                                error_code = chunk.get("code")
-                                error_msg = str(error_data)
-                                retry_after = chunk.get("retry_after")
-
-                            logger.error(f"Z.AI error: code={error_code}, message={error_msg}")
-
-                            # Z.AI rate limit error code is 1302
-                            if error_code == 1302:
-                                # Record 429 for tracking in provider bus
-                                backoff = float(retry_after) if retry_after else 1.0
-                                await rate_tracker.record_429(provider_key, backoff)
-                                raise ProviderRateLimitError(
-                                    error_msg,
-                                    provider="z.ai",
-                                    retry_after=backoff,
-                                    error_code=error_code,
-                                )
-                            raise Exception(f"Z.AI API error (code={error_code}): {error_msg}")
-
-                        choice = chunk.get("choices", [{}])[0]
-                        delta = choice.get("delta", {})
-                        finish_reason = choice.get("finish_reason")
-                        content = delta.get("content")
-
-                        if isinstance(content, str) and content:
-                            yield StreamEvent(
-                                event_type="text-delta", data={"delta": content}, timestamp=0
-                            )
-
-                        tool_calls = delta.get("tool_calls", [])
-                        if tool_calls:
-                            for tool_call in tool_calls:
-                                function = tool_call.get("function", {})
-                                tool_name = function.get("name", "")
-                                arguments = function.get("arguments", "{}")
-                                tool_input = (
-                                    json.loads(arguments)
-                                    if isinstance(arguments, str)
-                                    else arguments
+        reservation = reserve_result.unwrap() if reserve_result.is_ok() else None
+
+        # Tokens reported by the finish chunk; received tracks whether the
+        # provider produced anything before the stream ended
+        reported_tokens: int | None = None
+        received = False
+        try:
+            yield StreamEvent(event_type="start", data={"model": model.id}, timestamp=0)
+
+            stream_iterator = await self.http_client.stream(
+                method="POST", url=url, json=payload, headers=headers, timeout=600.0
+            )
+
+            async for response_stream_context in stream_iterator:
+                async with response_stream_context as response:
+                    async for data_str in iter_sse_data(response.aiter_bytes(), allow_raw_json=True):
+                        try:
+                            chunk = json_codec.loads(data_str)
+                            if "error" in chunk:
+                                error_data = chunk["error"]
+                                # Parse error structure - Z.AI returns {"error": {"code": N, "message": "..."}}
+                                if isinstance(error_data, dict):
+                                    error_code = error_data.get("code")
+                                    error_msg = error_data.get("message", str(error_data))
+                                    retry_after = error_data.get("retry_after")
+                                else:
+                                    # Fallback: error is a string, code might be at top level
+                                    error_code = chunk.get("code")
+                                    error_msg = str(error_data)
+                                    retry_after = chunk.get("retry_after")
+
+                                logger.error(f"Z.AI error: code={error_code}, message={error_msg}")
+
+                                # Z.AI rate limit error code is 1302
+                                if str(error_code) == "1302":
+                                    # Record 429 for tracking in provider bus
+                                    backoff = float(retry_after) if retry_after else 1.0
+                                    await rate_tracker.record_429(provider_key, backoff)
+                                    raise ProviderRateLimitError(
+                                        error_msg,
+                                        provider="z.ai",
+                                        retry_after=backoff,
+                                        error_code=error_code,
+                                    )
+                                raise Exception(f"Z.AI API error (code={error_code}): {error_msg}")
+
+                            received = True
+                            choice = chunk.get("choices", [{}])[0]
+                            delta = choice.get("delta", {})
+                            finish_reason = choice.get("finish_reason")
+                            content = delta.get("content")
+
+                            if isinstance(content, str) and content:
+                                yield StreamEvent(
+                                    event_type="text-delta", data={"delta": content}, timestamp=0
                                 )
+
+                            tool_calls = delta.get("tool_calls", [])
+                            if tool_calls:
+                                for tool_call in tool_calls:
+                                    function = tool_call.get("function", {})
+                                    tool_name = function.get("name", "")
+                                    arguments = function.get("arguments", "{}")
+                                    tool_input = (
+                                        json.loads(arguments)
+                                        if isinstance(arguments, str)
+                                        else arguments
+                                    )
+                                    yield StreamEvent(
+                                        event_type="tool-call",
+                                        data={"tool": tool_name, "input": tool_input},
+                                        timestamp=0,
+                                    )
+
+                            if finish_reason:
+                                # Extract usage data from the finish chunk
+                                # OpenAI-compatible APIs may include usage at chunk level
+                                usage_data = chunk.get("usage", {})
+                                finish_data: dict[str, Any] = {"finish_reason": finish_reason}
+                                if usage_data:
+                                    finish_data["usage"] = {
+                                        "prompt_tokens": usage_data.get("prompt_tokens", 0),
+                                        "completion_tokens": usage_data.get("completion_tokens", 0),
+                                        "reasoning_tokens": usage_data.get(
+                                            "completion_tokens_details", {}
+                                        ).get("reasoning_tokens", 0),
+                                        "cache_read_tokens": usage_data.get(
+                                            "prompt_tokens_details", {}
+                                        ).get("cached_tokens", 0),
+                                        "cache_write_tokens": 0,
+                                    }
+                                reported_tokens = usage_total_tokens(usage_data)
+                                await provider_bus.reconcile_tokens(reservation, reported_tokens)
                                 yield StreamEvent(
-                                    event_type="tool-call",
-                                    data={"tool": tool_name, "input": tool_input},
+                                    event_type="finish",
+                                    data=finish_data,
                                     timestamp=0,
                                 )
-
-                        if finish_reason:
-                            # Extract usage data from the finish chunk
-                            # OpenAI-compatible APIs may include usage at chunk level
-                            usage_data = chunk.get("usage", {})
-                            finish_data: dict[str, Any] = {"finish_reason": finish_reason}
-                            if usage_data:
-                                finish_data["usage"] = {
-                                    "prompt_tokens": usage_data.get("prompt_tokens", 0),
-                                    "completion_tokens": usage_data.get("completion_tokens", 0),
-                                    "reasoning_tokens": usage_data.get(
-                                        "completion_tokens_details", {}
-                                    ).get("reasoning_tokens", 0),
-                                    "cache_read_tokens": usage_data.get(
-                                        "prompt_tokens_details", {}
-                                    ).get("cached_tokens", 0),
-                                    "cache_write_tokens": 0,
-                                }
-                            yield StreamEvent(
-                                event_type="finish",
-                                data=finish_data,
-                                timestamp=0,
-                            )
-                            break
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse chunk: {e}")
-                    except ProviderRateLimitError:
-                        raise  # Re-raise rate limit errors without catching
+                                break
+                        except json.JSONDecodeError as e:
+                            logger.error(f"Failed to parse chunk: {e}")
+                        except ProviderRateLimitError:
+                            raise  # Re-raise rate limit errors without catching
+        finally:
+            # Settle on every exit (errors, transport failures, early close):
+            # nothing generated means nothing was consumed, otherwise keep
+            # the estimate when the provider never reported usage
+            if reported_tokens is None and not received:
+                reported_tokens = 0
+            await provider_bus.reconcile_tokens(reservation, reported_tokens)
 
     def count_tokens(self, response: dict[str, Any]) -> TokenUsage:
         """Count tokens from API response."""
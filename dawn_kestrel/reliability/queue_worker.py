@@ -6,20 +6,35 @@ This module provides:
 - InMemoryTaskQueue: asyncio.Queue-based task queue with status tracking
 - AsyncWorker: Worker that processes tasks from queue
 - WorkerPool: Pool of concurrent workers
+- ProcessTaskRunner: Runs CPU-bound work on task payloads in worker processes
+
+Workers block on the queue and wake as soon as a task is enqueued, and
+WorkerPool.wait_for_completion wakes when the last task finishes; neither
+polls. Queues without ``get``/``task_done``/``join`` fall back to polling
+every ``poll_interval`` seconds.
+
+A WorkerPool in ``"process"`` mode runs a plain function on each task's
+payload in a process pool, so CPU-heavy work (redaction of large outputs,
+diff parsing, embedding math) does not stall the event loop. Payloads and
+results cross the process boundary as compact JSON bytes.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import multiprocessing
 import uuid
 from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Literal, Protocol, cast, runtime_checkable
 
 from pydantic import BaseModel, Field
 
+from dawn_kestrel.core import json_codec
 from dawn_kestrel.core.result import Err, Ok, Result
 
 logger = logging.getLogger(__name__)
@@ -154,6 +169,10 @@ class InMemoryTaskQueue:
     Provides FIFO ordering with task status tracking.
     All tasks are stored in memory with their status.
 
+    Consumers that process tasks (AsyncWorker) take them with ``get`` and
+    report them with ``task_done``; ``join`` waits until every enqueued task
+    has been either dequeued with ``dequeue`` or reported done.
+
     Thread safety:
         NOT thread-safe (documented limitation).
         Suitable for single-process async use.
@@ -224,6 +243,8 @@ class InMemoryTaskQueue:
                     task = self._queue.get_nowait()
                 except asyncio.QueueEmpty:
                     return Ok(None)
+            # The caller owns the task from here; it no longer counts for join()
+            self._queue.task_done()
             logger.debug(f"Dequeued task {task.id}")
             return Ok(task)
         except asyncio.TimeoutError:
@@ -239,25 +260,42 @@ class InMemoryTaskQueue:
             Result[Task | None]: Ok with task, None if empty, Err on failure.
         """
         try:
-            # asyncio.Queue doesn't have peek, so we get and put back
-            try:
-                task = self._queue.get_nowait()
-                # Put it back at the front
-                temp_queue: asyncio.Queue[Task] = asyncio.Queue()
-                await temp_queue.put(task)
-                # Drain remaining to temp
-                while not self._queue.empty():
-                    await temp_queue.put(self._queue.get_nowait())
-                # Move all back to main queue
-                while not temp_queue.empty():
-                    await self._queue.put(temp_queue.get_nowait())
-                return Ok(task)
-            except asyncio.QueueEmpty:
+            # asyncio.Queue doesn't have peek, so rotate every task once,
+            # keeping the unfinished-task count (used by join) unchanged
+            if self._queue.empty():
                 return Ok(None)
+            task = None
+            for _ in range(self._queue.qsize()):
+                item = self._queue.get_nowait()
+                if task is None:
+                    task = item
+                self._queue.put_nowait(item)
+                self._queue.task_done()
+            return Ok(task)
         except Exception as e:
             logger.error(f"Failed to peek task: {e}")
             return Err(f"Failed to peek task: {e}", code="PEEK_ERROR")
 
+    async def get(self) -> Task:
+        """Wait for and remove the next task.
+
+        The caller must call ``task_done`` once the task is processed.
+
+        Returns:
+            Next task.
+        """
+        task = await self._queue.get()
+        logger.debug(f"Dequeued task {task.id}")
+        return task
+
+    def task_done(self) -> None:
+        """Report that a task taken with ``get`` has been processed."""
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every enqueued task has been dequeued or processed."""
+        await self._queue.join()
+
     async def size(self) -> Result[int]:
         """Return the number of tasks in the queue.
 
@@ -279,6 +317,20 @@ class InMemoryTaskQueue:
             task = self._tasks.get(task_id)
             return Ok(task)
 
+    async def remove_task(self, task_id: str) -> Result[Task | None]:
+        """Stop tracking a task that is no longer needed.
+
+        Long-lived queues call this so finished tasks do not accumulate.
+
+        Args:
+            task_id: ID of the task to forget.
+
+        Returns:
+            Result[Task | None]: Ok with the removed task, None if not found.
+        """
+        async with self._lock:
+            return Ok(self._tasks.pop(task_id, None))
+
     async def update_status(self, task_id: str, status: TaskStatus) -> Result[Task]:
         """Update the status of a task.
 
@@ -305,8 +357,8 @@ class InMemoryTaskQueue:
 class AsyncWorker:
     """Async worker that processes tasks from a queue.
 
-    Continuously polls the queue for tasks and processes them
-    using the provided processor function.
+    Waits on the queue for tasks and processes them using the provided
+    processor function.
 
     Example:
         async def my_processor(task: Task) -> Result[dict]:
@@ -334,13 +386,17 @@ class AsyncWorker:
             queue: Task queue to consume from.
             processor: Async function to process each task.
             worker_id: Optional worker identifier (auto-generated if None).
-            poll_interval: Time to wait between polling for tasks.
+            poll_interval: Time to wait between polling for tasks, for queues
+                that cannot block until a task arrives (no ``get`` method).
         """
         self._queue = queue
         self._processor = processor
         self._worker_id = worker_id or str(uuid.uuid4())[:8]
         self._poll_interval = poll_interval
+        # Block on the queue when it supports it, otherwise poll
+        self._blocking = hasattr(queue, "get") and hasattr(queue, "task_done")
         self._running = False
+        self._busy = False
         self._task: asyncio.Task[None] | None = None
         self._stats: dict[str, Any] = {
             "processed_count": 0,
@@ -371,9 +427,12 @@ class AsyncWorker:
         logger.info(f"Worker {self._worker_id} started")
         return Ok(None)
 
-    async def stop(self) -> Result[None]:
+    async def stop(self, drain: bool = False) -> Result[None]:
         """Stop the worker.
 
+        Args:
+            drain: Let the task in progress finish instead of cancelling it.
+
         Returns:
             Result[None]: Ok on success.
         """
@@ -383,7 +442,8 @@ class AsyncWorker:
         self._running = False
 
         if self._task is not None:
-            self._task.cancel()
+            if not (drain and self._busy):
+                self._task.cancel()
             try:
                 await self._task
             except asyncio.CancelledError:
@@ -393,43 +453,38 @@ class AsyncWorker:
         logger.info(f"Worker {self._worker_id} stopped")
         return Ok(None)
 
+    async def _next_task(self) -> Task | None:
+        """Wait for the next task (None if a polling queue had none)."""
+        if self._blocking:
+            return await self._queue.get()
+
+        result = await self._queue.dequeue(timeout=self._poll_interval)
+        if result.is_err():
+            logger.error(f"Worker {self._worker_id} dequeue error: {result.error}")
+            task = None
+        else:
+            task = result.unwrap()
+        if task is None:
+            # The queue may return at once when empty; don't spin
+            await asyncio.sleep(self._poll_interval)
+        return task
+
     async def _run_loop(self) -> None:
         """Main worker loop."""
         while self._running:
             try:
-                result = await self._queue.dequeue(timeout=self._poll_interval)
-
-                if result.is_err():
-                    logger.error(f"Worker {self._worker_id} dequeue error: {result.error}")
-                    continue
-
-                task = result.unwrap()
+                task = await self._next_task()
                 if task is None:
                     # No task available, continue polling
                     continue
 
-                # Update task status to RUNNING
-                await self._queue.update_status(task.id, TaskStatus.RUNNING)
-
-                # Process the task
+                self._busy = True
                 try:
-                    process_result = await self._processor(task)
-
-                    if process_result.is_ok():
-                        await self._queue.update_status(task.id, TaskStatus.COMPLETED)
-                        self._stats["processed_count"] += 1
-                        logger.debug(f"Worker {self._worker_id} completed task {task.id}")
-                    else:
-                        await self._queue.update_status(task.id, TaskStatus.FAILED)
-                        self._stats["error_count"] += 1
-                        logger.warning(
-                            f"Worker {self._worker_id} task {task.id} failed: "
-                            f"{process_result.error if hasattr(process_result, 'error') else 'unknown'}"
-                        )
-                except Exception as e:
-                    await self._queue.update_status(task.id, TaskStatus.FAILED)
-                    self._stats["error_count"] += 1
-                    logger.error(f"Worker {self._worker_id} task {task.id} error: {e}")
+                    await self._process_task(task)
+                finally:
+                    self._busy = False
+                    if self._blocking:
+                        self._queue.task_done()
 
             except asyncio.CancelledError:
                 logger.debug(f"Worker {self._worker_id} cancelled")
@@ -437,6 +492,33 @@ class AsyncWorker:
             except Exception as e:
                 logger.error(f"Worker {self._worker_id} error: {e}")
 
+    async def _process_task(self, task: Task) -> None:
+        """Run the processor on a task and record its outcome."""
+        # Update task status to RUNNING
+        await self._queue.update_status(task.id, TaskStatus.RUNNING)
+
+        # Process the task
+        try:
+            process_result = await self._processor(task)
+
+            if process_result.is_ok():
+                await self._queue.update_status(task.id, TaskStatus.COMPLETED)
+                self._stats["processed_count"] += 1
+                logger.debug(f"Worker {self._worker_id} completed task {task.id}")
+            else:
+                await self._queue.update_status(task.id, TaskStatus.FAILED)
+                self._stats["error_count"] += 1
+                logger.warning(
+                    f"Worker {self._worker_id} task {task.id} failed: "
+                    f"{process_result.error if hasattr(process_result, 'error') else 'unknown'}"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.update_status(task.id, TaskStatus.FAILED)
+            self._stats["error_count"] += 1
+            logger.error(f"Worker {self._worker_id} task {task.id} error: {e}")
+
     async def get_stats(self) -> dict[str, Any]:
         """Get worker statistics.
 
@@ -446,6 +528,88 @@ class AsyncWorker:
         return self._stats.copy()
 
 
+# =============================================================================
+# Process Execution
+# =============================================================================
+
+# "async": processor is a coroutine function run on the event loop
+# "process": processor is a plain function run in worker processes
+WorkerMode = Literal["async", "process"]
+
+
+def _run_in_process(function: Callable[[dict[str, Any]], Any], payload: bytes) -> bytes:
+    """Worker process entry point: decode the payload, run, encode the result."""
+    return json_codec.dumps_bytes(function(json_codec.loads(payload)))
+
+
+class ProcessTaskRunner:
+    """Runs a function on task payloads in a pool of worker processes.
+
+    Instances are processors: ``await runner(task)`` runs ``function`` on
+    ``task.payload`` in a worker process and returns its result as ``Ok``,
+    or ``Err`` if it raised. The event loop stays free while it runs.
+
+    ``function`` must be importable by module path (a module-level function)
+    and its payload and result JSON-serializable; both are sent as compact
+    JSON bytes. Processes are spawned on first use, and the pool is replaced
+    if a worker process dies.
+
+    Example:
+        def count_lines(payload: dict[str, Any]) -> int:
+            return payload["text"].count("\\n")
+
+        runner = ProcessTaskRunner(count_lines, max_processes=2)
+        result = await runner(Task(id="t1", type="lines", payload={"text": diff}))
+        await runner.close()
+    """
+
+    def __init__(
+        self,
+        function: Callable[[dict[str, Any]], Any],
+        max_processes: int | None = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            function: Function run on each task payload in a worker process.
+            max_processes: Number of worker processes (default: CPU count).
+        """
+        self._function = function
+        self._max_processes = max_processes
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process with a running event loop and threads is
+            # unsafe, so workers are always spawned
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def __call__(self, task: Task) -> Result[Any]:
+        executor = self._ensure_executor()
+        payload = json_codec.dumps_bytes(task.payload)
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(executor, _run_in_process, self._function, payload)
+        except BrokenProcessPool as e:
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            return Err(f"Worker process died: {e}", code="PROCESS_POOL_BROKEN", retryable=True)
+        except Exception as e:
+            return Err(f"{type(e).__name__}: {e}", code="PROCESS_TASK_FAILED")
+        return Ok(json_codec.loads(data))
+
+    async def close(self) -> None:
+        """Shut down the worker processes (restarted on next use)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
 # =============================================================================
 # WorkerPool Implementation
 # =============================================================================
@@ -456,6 +620,14 @@ class WorkerPool:
 
     Manages multiple AsyncWorker instances for parallel task processing.
 
+    In ``"process"`` mode the processor is a plain function of the task
+    payload, run in ``max_processes`` worker processes (see
+    ProcessTaskRunner); the workers only hand tasks to the processes and
+    wait on them. Resizing changes how many tasks are in flight, not the
+    number of processes.
+
+    ``submit`` enqueues a task and returns a future for its result.
+
     Example:
         async def my_processor(task: Task) -> Result[dict]:
             return Ok({"processed": True})
@@ -465,32 +637,61 @@ class WorkerPool:
         async with pool:
             # Workers are running and processing tasks
             await pool.wait_for_completion()
+
+        # CPU-bound work, with parse_diff a module-level function
+        pool = WorkerPool(queue=queue, processor=parse_diff, num_workers=4, mode="process")
+
+        async with pool:
+            result = await (await pool.submit({"diff": diff_text}))
     """
 
     def __init__(
         self,
         queue: InMemoryTaskQueue,
-        processor: Callable[[Task], Awaitable[Result[Any]]],
+        processor: Callable[[Task], Awaitable[Result[Any]]] | Callable[[dict[str, Any]], Any],
         num_workers: int = 1,
         poll_interval: float = 0.1,
+        mode: WorkerMode = "async",
+        max_processes: int | None = None,
     ):
         """Initialize the worker pool.
 
         Args:
             queue: Task queue to consume from.
-            processor: Async function to process each task.
+            processor: Async function to process each task, or in process
+                mode a module-level function of the task payload.
             num_workers: Number of workers to create.
-            poll_interval: Time to wait between polling for tasks.
+            poll_interval: Time to wait between polling for tasks, for queues
+                that cannot block until a task arrives (no ``get`` method).
+            mode: "async" to run the processor on the event loop, "process"
+                to run it in worker processes.
+            max_processes: Worker processes in process mode
+                (default: num_workers).
         """
+        if mode not in ("async", "process"):
+            raise ValueError(f"Unknown worker mode: {mode}")
         self._queue = queue
-        self._processor = processor
+        self._mode = mode
+        self._process_runner: ProcessTaskRunner | None = None
+        if mode == "process":
+            self._process_runner = ProcessTaskRunner(
+                cast(Callable[[dict[str, Any]], Any], processor),
+                max_processes=max_processes or num_workers,
+            )
+            self._processor: Callable[[Task], Awaitable[Result[Any]]] = self._process_runner
+        else:
+            self._processor = cast(Callable[[Task], Awaitable[Result[Any]]], processor)
         self._num_workers = num_workers
         self._poll_interval = poll_interval
         self._workers: list[AsyncWorker] = []
         self._running = False
-        # Track in-progress tasks to fix race condition in wait_for_completion
+        # Tasks currently inside the processor
         self._in_progress_count = 0
-        self._in_progress_lock = asyncio.Lock()
+        # Notified whenever a task finishes (used with queues that lack join)
+        self._task_finished = asyncio.Condition()
+        # Result futures of tasks added with submit, by task ID
+        self._result_futures: dict[str, asyncio.Future[Result[Any]]] = {}
+
     @property
     def is_running(self) -> bool:
         """Check if the pool is running."""
@@ -501,6 +702,36 @@ class WorkerPool:
         """Get the number of running workers."""
         return sum(1 for w in self._workers if w.is_running)
 
+    @property
+    def mode(self) -> WorkerMode:
+        """Get the execution mode ("async" or "process")."""
+        return self._mode
+
+    async def submit(
+        self, payload: dict[str, Any], task_type: str = "task", priority: int = 0
+    ) -> asyncio.Future[Result[Any]]:
+        """Enqueue a task and return a future for its result.
+
+        The future resolves to the processor's Result (Err if it raised) and
+        is cancelled if the pool stops before the task is processed.
+
+        Args:
+            payload: Task payload.
+            task_type: Task type.
+            priority: Task priority.
+
+        Returns:
+            Future resolving to the task's Result.
+        """
+        task = Task(id=str(uuid.uuid4()), type=task_type, payload=payload, priority=priority)
+        future: asyncio.Future[Result[Any]] = asyncio.get_running_loop().create_future()
+        self._result_futures[task.id] = future
+        enqueue_result = await self._queue.enqueue(task)
+        if enqueue_result.is_err():
+            self._result_futures.pop(task.id, None)
+            future.set_result(enqueue_result)
+        return future
+
     def _make_tracked_processor(self) -> Callable[[Task], Awaitable[Result[Any]]]:
         """Create a processor that tracks in-progress tasks.
 
@@ -511,13 +742,26 @@ class WorkerPool:
             Wrapped processor function.
         """
         async def tracked_processor(task: Task) -> Result[Any]:
-            async with self._in_progress_lock:
-                self._in_progress_count += 1
+            self._in_progress_count += 1
+            future = self._result_futures.pop(task.id, None)
             try:
-                return await self._processor(task)
+                result = await self._processor(task)
+            except asyncio.CancelledError:
+                if future is not None:
+                    future.cancel()
+                raise
+            except Exception as e:
+                if future is not None and not future.done():
+                    future.set_result(Err(str(e), code="PROCESSOR_ERROR"))
+                raise
+            else:
+                if future is not None and not future.done():
+                    future.set_result(result)
+                return result
             finally:
-                async with self._in_progress_lock:
-                    self._in_progress_count -= 1
+                self._in_progress_count -= 1
+                async with self._task_finished:
+                    self._task_finished.notify_all()
 
         return tracked_processor
     async def start(self) -> Result[None]:
@@ -532,14 +776,7 @@ class WorkerPool:
         self._workers = []
 
         # Create a wrapper processor that tracks in-progress tasks
-        async def tracked_processor(task: Task) -> Result[Any]:
-            async with self._in_progress_lock:
-                self._in_progress_count += 1
-            try:
-                return await self._processor(task)
-            finally:
-                async with self._in_progress_lock:
-                    self._in_progress_count -= 1
+        tracked_processor = self._make_tracked_processor()
 
         for i in range(self._num_workers):
             worker = AsyncWorker(
@@ -565,17 +802,25 @@ class WorkerPool:
 
         # Stop all workers concurrently
         await asyncio.gather(*[w.stop() for w in self._workers], return_exceptions=True)
+        if self._process_runner is not None:
+            await self._process_runner.close()
+
+        for future in self._result_futures.values():
+            future.cancel()
+        self._result_futures.clear()
 
         self._workers = []
         self._running = False
         logger.info("Worker pool stopped")
         return Ok(None)
 
-    async def resize(self, num_workers: int) -> Result[None]:
+    async def resize(self, num_workers: int, drain: bool = False) -> Result[None]:
         """Resize the worker pool.
 
         Args:
             num_workers: New number of workers.
+            drain: When shrinking, let removed workers finish their current
+                task instead of cancelling it.
 
         Returns:
             Result[None]: Ok on success.
@@ -600,7 +845,9 @@ class WorkerPool:
             # Remove workers
             workers_to_stop = self._workers[num_workers:]
             self._workers = self._workers[:num_workers]
-            await asyncio.gather(*[w.stop() for w in workers_to_stop], return_exceptions=True)
+            await asyncio.gather(
+                *[w.stop(drain=drain) for w in workers_to_stop], return_exceptions=True
+            )
 
         self._num_workers = num_workers
         logger.info(f"Worker pool resized to {num_workers} workers")
@@ -631,7 +878,9 @@ class WorkerPool:
 
         This method waits until:
         1. The queue is empty (no pending tasks)
-        2. No workers are actively processing tasks (in_progress_count == 0)
+        2. No workers are actively processing tasks
+
+        It wakes when the last task finishes rather than polling.
 
         Args:
             timeout: Maximum time to wait (None = no limit).
@@ -639,31 +888,37 @@ class WorkerPool:
         Returns:
             Result[None]: Ok when complete, Err on timeout.
         """
-        start_time = asyncio.get_event_loop().time()
-
-        while True:
-            # Check queue size
+        try:
+            await asyncio.wait_for(self._wait_idle(), timeout=timeout)
+            return Ok(None)
+        except asyncio.TimeoutError:
             size_result = await self._queue.size()
             queue_empty = size_result.is_ok() and size_result.unwrap() == 0
-
-            # Check in-progress tasks
-            async with self._in_progress_lock:
-                in_progress = self._in_progress_count
-
-            # Only complete when queue is empty AND no tasks in progress
-            if queue_empty and in_progress == 0:
-                return Ok(None)
-
-            if timeout is not None:
-                elapsed = asyncio.get_event_loop().time() - start_time
-                if elapsed >= timeout:
-                    logger.warning(
-                        f"wait_for_completion timeout: queue_empty={queue_empty}, "
-                        f"in_progress={in_progress}"
+            logger.warning(
+                f"wait_for_completion timeout: queue_empty={queue_empty}, "
+                f"in_progress={self._in_progress_count}"
+            )
+            return Err("Timeout waiting for completion", code="TIMEOUT")
+
+    async def _wait_idle(self) -> None:
+        if hasattr(self._queue, "join"):
+            await self._queue.join()
+            return
+
+        # Queues without join: re-check whenever a task finishes, and poll
+        # for tasks taken off the queue by other consumers
+        async with self._task_finished:
+            while True:
+                size_result = await self._queue.size()
+                queue_empty = size_result.is_ok() and size_result.unwrap() == 0
+                if queue_empty and self._in_progress_count == 0:
+                    return
+                try:
+                    await asyncio.wait_for(
+                        self._task_finished.wait(), timeout=self._poll_interval
                     )
-                    return Err("Timeout waiting for completion", code="TIMEOUT")
-
-            await asyncio.sleep(0.1)
+                except asyncio.TimeoutError:
+                    pass
 
     async def __aenter__(self) -> "WorkerPool":
         """Enter async context manager."""
@@ -682,9 +937,11 @@ class WorkerPool:
 __all__ = [
     "AsyncWorker",
     "InMemoryTaskQueue",
+    "ProcessTaskRunner",
     "Task",
     "TaskQueue",
     "TaskStatus",
     "Worker",
+    "WorkerMode",
     "WorkerPool",
 ]
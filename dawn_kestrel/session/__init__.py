@@ -1,20 +1,32 @@
 """OpenCode Python - Session Management"""
 
-from dawn_kestrel.session.compaction import is_overflow, process, prune
+from dawn_kestrel.session.compaction import (
+    BackgroundCompactor,
+    CompactedView,
+    CompactionCheckpoint,
+    is_overflow,
+    process,
+    prune,
+)
 from dawn_kestrel.session.processor import SessionProcessor
 from dawn_kestrel.session.revert import SessionRevert
 from dawn_kestrel.session.workspace import (
     Workspace,
     WorkspaceAllocator,
+    WorkspaceCheckoutError,
     WorkspaceLimitExceeded,
     WorkspaceNotFoundError,
 )
 from dawn_kestrel.snapshot import GitSnapshot
 
 __all__ = [
+    "BackgroundCompactor",
+    "CompactedView",
+    "CompactionCheckpoint",
     "SessionProcessor",
     "Workspace",
     "WorkspaceAllocator",
+    "WorkspaceCheckoutError",
     "WorkspaceLimitExceeded",
     "WorkspaceNotFoundError",
     "is_overflow",
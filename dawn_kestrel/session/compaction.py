@@ -1,11 +1,22 @@
 """OpenCode Python - Session Compaction"""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 from dawn_kestrel.core.settings import settings
+from dawn_kestrel.core.tokenizer import (
+    TOKEN_COUNT_KEY,
+    Tokenizer,
+    count_message_tokens,
+    count_tokens,
+    preload_tokenizer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +28,6 @@ PRUNE_PROTECTED_TOOLS = ["skill"]
 
 
 def _now() -> int:
-    import time
     return int(time.time())
 
 
@@ -112,7 +122,7 @@ async def prune(session_id: str) -> int:
                 if part.get("tool") in PRUNE_PROTECTED_TOOLS:
                     continue
 
-                estimate = len(output) // 4
+                estimate = count_tokens(output)
 
                 total += estimate
 
@@ -202,3 +212,360 @@ async def process(
     logger.info(f"Compaction would process {len(messages)} messages")
 
     return "continue"
+
+
+# =============================================================================
+# Background incremental compaction
+# =============================================================================
+
+
+Summarizer = Callable[[str | None, list[dict[str, Any]]], Awaitable[str]]
+
+SUMMARY_MAX_CHARS = 4000
+
+
+@dataclass
+class CompactionCheckpoint:
+    """A persisted summary of a session's messages up to a boundary
+
+    Checkpoints are versioned: each compaction pass folds the span after
+    the previous boundary into a new summary and writes version N+1.
+    """
+
+    session_id: str
+    version: int
+    summary: str
+    boundary_created: float
+    boundary_message_id: str
+    messages_compacted: int
+    tokens_compacted: int
+    created: float = field(default_factory=time.time)
+
+    def covers(self, message: dict[str, Any]) -> bool:
+        """Whether a message is folded into this checkpoint's summary"""
+        return _order_key(message) <= (self.boundary_created, self.boundary_message_id)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CompactionCheckpoint:
+        return cls(**data)
+
+
+@dataclass
+class CompactedView:
+    """What a context build needs: the latest summary plus newer messages"""
+
+    checkpoint: CompactionCheckpoint | None
+    messages: list[dict[str, Any]]
+
+    @property
+    def summary(self) -> str | None:
+        return self.checkpoint.summary if self.checkpoint else None
+
+
+def _order_key(message: dict[str, Any]) -> tuple[float, str]:
+    return float((message.get("time") or {}).get("created") or 0), str(message.get("id", ""))
+
+
+async def extractive_summary(previous: str | None, messages: list[dict[str, Any]]) -> str:
+    """Default summarizer: fold a span into the previous summary without an LLM
+
+    Keeps the last user request, tool usage and touched files of the span,
+    appended to the previous summary and capped at SUMMARY_MAX_CHARS
+    (oldest lines are dropped first).
+    """
+    tools: dict[str, int] = {}
+    files: list[str] = []
+    last_user = ""
+    for msg in messages:
+        for part in msg.get("parts", []):
+            if part.get("part_type") == "tool":
+                tools[part.get("tool", "?")] = tools.get(part.get("tool", "?"), 0) + 1
+            elif part.get("part_type") == "patch":
+                files.extend(f for f in part.get("files", []) if f not in files)
+        if msg.get("role") == "user":
+            text = msg.get("text") or next(
+                (p.get("text", "") for p in msg.get("parts", []) if p.get("part_type") == "text"),
+                "",
+            )
+            last_user = text or last_user
+
+    lines = [previous] if previous else []
+    lines.append(f"- {len(messages)} messages")
+    if last_user:
+        lines.append(f"  Request: {last_user[:200]}")
+    if tools:
+        lines.append("  Tools: " + ", ".join(f"{name} x{count}" for name, count in tools.items()))
+    if files:
+        lines.append("  Files: " + ", ".join(files[:20]))
+
+    summary = "\n".join(lines)
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[-SUMMARY_MAX_CHARS:]
+        summary = summary[summary.find("\n") + 1 :]
+    return summary
+
+
+class BackgroundCompactor:
+    """Compacts sessions incrementally, off the turn's critical path
+
+    After each turn, ``schedule(session_id)`` starts (or re-arms) a
+    background pass. A pass never re-reads messages already folded into a
+    checkpoint (only the bounded uncompacted tail is read), and once the
+    span between the latest checkpoint and the protected recent tail
+    exceeds ``threshold_tokens``, folds that span into a new versioned
+    checkpoint. The next context build calls ``get_view`` and reads the
+    stored summary plus the messages after its boundary instead of the
+    whole history. The summarizer runs outside the per-session lock, so
+    ``get_view`` never waits for it and returns the last published
+    checkpoint.
+
+    Checkpoints live under ``compaction/<session_id>/<version>``; the
+    checkpoint and the ``compaction_head`` pointer are written as one
+    journaled batch, so a crash never leaves the head pointing at a
+    missing summary. The last ``keep_checkpoints`` versions are retained.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        threshold_tokens: int | None = None,
+        protect_tokens: int | None = None,
+        summarizer: Summarizer | None = None,
+        tokenizer: Tokenizer | None = None,
+        keep_checkpoints: int = 5,
+    ) -> None:
+        """Initialize compactor
+
+        Args:
+            base_dir: Storage base directory (as for MessageStorage)
+            threshold_tokens: Uncompacted tokens that trigger a new checkpoint
+                (default: settings.session_compaction_tokens)
+            protect_tokens: Most recent tokens never compacted
+                (default: settings.session_compaction_protected_tokens)
+            summarizer: Async (previous_summary, span) -> summary; defaults
+                to extractive_summary
+            tokenizer: Tokenizer for counts (default: process-wide)
+            keep_checkpoints: Checkpoint versions retained per session
+        """
+        from dawn_kestrel.storage.store import MessageStorage
+
+        self.storage = MessageStorage(base_dir)
+        self.threshold_tokens = threshold_tokens or getattr(
+            settings, "session_compaction_tokens", PRUNE_MINIMUM
+        )
+        self.protect_tokens = (
+            protect_tokens
+            if protect_tokens is not None
+            else getattr(settings, "session_compaction_protected_tokens", PRUNE_PROTECT)
+        )
+        self.summarizer = summarizer or extractive_summary
+        self.tokenizer = tokenizer
+        self.keep_checkpoints = max(1, keep_checkpoints)
+
+        # Per session: keys folded into a checkpoint, and uncompacted messages
+        self._compacted: dict[str, set[tuple[str, ...]]] = {}
+        self._pending: dict[str, dict[tuple[str, ...], dict[str, Any]]] = {}
+        self._heads: dict[str, CompactionCheckpoint | None] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._rerun: set[str] = set()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    # -- checkpoints -------------------------------------------------------
+
+    async def latest_checkpoint(self, session_id: str) -> CompactionCheckpoint | None:
+        """Get the newest checkpoint for a session"""
+        if session_id not in self._heads:
+            head = await self.storage.read(["compaction_head", session_id])
+            checkpoint = None
+            if head:
+                data = await self.storage.read(
+                    ["compaction", session_id, f"{head['version']:08d}"]
+                )
+                checkpoint = CompactionCheckpoint.from_dict(data) if data else None
+            self._heads[session_id] = checkpoint
+        return self._heads[session_id]
+
+    async def _write_checkpoint(self, checkpoint: CompactionCheckpoint) -> None:
+        session_id = checkpoint.session_id
+        await self.storage.write_many(
+            [
+                (["compaction", session_id, f"{checkpoint.version:08d}"], checkpoint.to_dict()),
+                (["compaction_head", session_id], {"version": checkpoint.version}),
+            ]
+        )
+        self._heads[session_id] = checkpoint
+
+        stale = checkpoint.version - self.keep_checkpoints
+        if stale > 0:
+            for key in await self.storage.list(["compaction", session_id]):
+                if int(Path(key[-1]).stem) <= stale:
+                    await self.storage.remove(key)
+
+    # -- incremental reads -------------------------------------------------
+
+    async def _read_tail(
+        self,
+        session_id: str,
+        head: CompactionCheckpoint | None,
+        compacted: set[tuple[str, ...]],
+    ) -> dict[tuple[str, ...], dict[str, Any]]:
+        """Read the messages after head's boundary (they may still be updated)
+
+        Keys in compacted are skipped; compacted is updated in place with
+        the keys found to be covered by head.
+        """
+        tail: dict[tuple[str, ...], dict[str, Any]] = {}
+        keys = {tuple(key) for key in await self.storage.list(["message", session_id])}
+        compacted &= keys
+        for key in keys - compacted:
+            data = await self.storage.read(list(key))
+            if not data:
+                continue
+            if head and head.covers(data):
+                compacted.add(key)
+                continue
+            tail[key] = data
+        return tail
+
+    async def _refresh(self, session_id: str, head: CompactionCheckpoint | None) -> None:
+        """Re-read the uncompacted messages into the pass state"""
+        compacted = self._compacted.setdefault(session_id, set())
+        self._pending[session_id] = await self._read_tail(session_id, head, compacted)
+
+    async def _persist_token_counts(
+        self, counts: list[tuple[tuple[str, ...], dict[str, Any]]]
+    ) -> None:
+        """Store newly computed token counts with their messages
+
+        Only the count is written into the current record, so a concurrent
+        update of the message is kept (its count is then recomputed, as
+        the content signature no longer matches).
+        """
+        for key, count in counts:
+            data = await self.storage.read(list(key))
+            if data:
+                data.setdefault("metadata", {})[TOKEN_COUNT_KEY] = count
+                await self.storage.write(list(key), data)
+
+    # -- compaction --------------------------------------------------------
+
+    async def compact(self, session_id: str) -> CompactionCheckpoint | None:
+        """Run one compaction pass
+
+        Returns:
+            The new checkpoint, or None if the uncompacted span is still
+            below the threshold
+        """
+        if self.tokenizer is None:
+            # Load the vocabulary off the event loop before counting
+            await preload_tokenizer()
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            head = await self.latest_checkpoint(session_id)
+            await self._refresh(session_id, head)
+            pending = self._pending[session_id]
+
+            ordered = sorted(pending.items(), key=lambda item: _order_key(item[1]))
+            stored = [(msg.get("metadata") or {}).get(TOKEN_COUNT_KEY) for _, msg in ordered]
+            counts = [count_message_tokens(msg, self.tokenizer) for _, msg in ordered]
+            await self._persist_token_counts(
+                [
+                    (key, msg["metadata"][TOKEN_COUNT_KEY])
+                    for (key, msg), before in zip(ordered, stored)
+                    if msg["metadata"][TOKEN_COUNT_KEY] != before
+                ]
+            )
+
+        # Keep the newest protect_tokens out of the span
+        protected = 0
+        split = len(ordered)
+        while split > 0 and protected + counts[split - 1] <= self.protect_tokens:
+            split -= 1
+            protected += counts[split]
+        span_tokens = sum(counts[:split])
+        if split == 0 or span_tokens < self.threshold_tokens:
+            return None
+
+        span = [msg for _, msg in ordered[:split]]
+        summary = await self.summarizer(head.summary if head else None, span)
+        boundary_created, boundary_id = _order_key(span[-1])
+        checkpoint = CompactionCheckpoint(
+            session_id=session_id,
+            version=(head.version if head else 0) + 1,
+            summary=summary,
+            boundary_created=boundary_created,
+            boundary_message_id=boundary_id,
+            messages_compacted=(head.messages_compacted if head else 0) + len(span),
+            tokens_compacted=(head.tokens_compacted if head else 0) + span_tokens,
+        )
+
+        async with lock:
+            if self._heads.get(session_id) is not head:
+                # A concurrent pass published first; its checkpoint wins
+                return None
+            await self._write_checkpoint(checkpoint)
+            pending = self._pending[session_id]
+            for key, _ in ordered[:split]:
+                pending.pop(key, None)
+                self._compacted[session_id].add(key)
+
+        logger.info(
+            f"Compacted {len(span)} messages ({span_tokens} tokens) of session "
+            f"{session_id} into checkpoint v{checkpoint.version}"
+        )
+        return checkpoint
+
+    def schedule(self, session_id: str) -> asyncio.Task[None]:
+        """Start a background pass for a session (call after each turn)
+
+        If a pass is already running, it runs once more when done instead
+        of starting a second task.
+        """
+        task = self._tasks.get(session_id)
+        if task is not None and not task.done():
+            self._rerun.add(session_id)
+            return task
+        task = asyncio.create_task(self._run(session_id))
+        self._tasks[session_id] = task
+        return task
+
+    async def _run(self, session_id: str) -> None:
+        while True:
+            self._rerun.discard(session_id)
+            try:
+                await self.compact(session_id)
+            except Exception as e:
+                logger.error(f"Background compaction of session {session_id} failed: {e}")
+            if session_id not in self._rerun:
+                return
+
+    async def wait_idle(self) -> None:
+        """Wait for all scheduled passes to finish"""
+        while True:
+            tasks = [t for t in self._tasks.values() if not t.done()]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel running passes"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    async def get_view(self, session_id: str) -> CompactedView:
+        """Compacted view for a context build
+
+        Returns the latest published checkpoint and the messages after its
+        boundary, oldest first, without waiting for a running pass.
+        Compacted history is not read.
+        """
+        head = await self.latest_checkpoint(session_id)
+        compacted = set(self._compacted.get(session_id, ()))
+        tail = await self._read_tail(session_id, head, compacted)
+        messages = sorted(tail.values(), key=_order_key)
+        return CompactedView(checkpoint=head, messages=messages)
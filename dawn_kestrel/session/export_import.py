@@ -1,26 +1,285 @@
-"""OpenCode Python - Export/Import Session Management"""
+"""OpenCode Python - Export/Import Session Management
+
+Exports and imports stream: messages are read from storage a page at a time
+and written by a worker thread, and imports parse one record at a time and
+insert messages in batches, so memory use does not grow with session size.
+
+Formats:
+- ``json``: ``{"session": {...}, "messages": [...]}``, one message per line
+- ``jsonl``: one ``{"type": "session" | "message", "data": {...}}`` record per line
+- ``jsonl.gz``: gzip-compressed ``jsonl``
+"""
 
 from __future__ import annotations
 
+import asyncio
 import gzip
+import itertools
 import json
 import logging
+import re
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from dawn_kestrel.agents.review.utils.redaction import redact_dict
+from dawn_kestrel.core import json_codec
+from dawn_kestrel.core.models import Message, Session
 from dawn_kestrel.core.session import SessionManager
 from dawn_kestrel.snapshot.index import GitSnapshot
+from dawn_kestrel.storage.store import MessageStorage
 
 logger = logging.getLogger(__name__)
 
+EXPORT_FORMATS = ("json", "jsonl", "jsonl.gz")
+
+# Top-level arrays of a json export and the record type of their items
+_ARRAY_RECORD_TYPES = {"messages": "message", "parts": "part"}
+
+_READ_CHUNK = 64 * 1024
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def detect_format(path: Path) -> str:
+    """Export format of a file, from its name (default: json)"""
+    name = path.name.lower()
+    if name.endswith(".jsonl.gz"):
+        return "jsonl.gz"
+    if name.endswith(".jsonl"):
+        return "jsonl"
+    return "json"
+
+
+def _open(path: Path, mode: str, format: str) -> IO[Any]:
+    if format.endswith(".gz"):
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    if "b" in mode:
+        return open(path, mode)
+    return open(path, mode, encoding="utf-8")
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+
+
+class _ExportWriter:
+    """Redacts, encodes and writes export records
+
+    All methods block and are meant to run in a worker thread. Records are
+    redacted one at a time, just before they are written.
+    """
+
+    def __init__(self, path: Path, format: str):
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        self.path = path
+        self.format = format
+        self.message_count = 0
+        self._file = _open(path, "wb", format)
+
+    def write_session(self, session: dict[str, Any]) -> None:
+        data = json_codec.dumps_bytes(redact_dict(session))
+        if self.format == "json":
+            self._file.write(b'{"session":' + data + b',"messages":[')
+        else:
+            self._file.write(b'{"type":"session","data":' + data + b"}\n")
+
+    def write_messages(self, messages: list[dict[str, Any]]) -> None:
+        chunks = []
+        for message in messages:
+            data = json_codec.dumps_bytes(redact_dict(message))
+            if self.format == "json":
+                chunks.append((b",\n" if self.message_count else b"\n") + data)
+            else:
+                chunks.append(b'{"type":"message","data":' + data + b"}\n")
+            self.message_count += 1
+        self._file.write(b"".join(chunks))
+
+    def close(self) -> int:
+        """Finish the document and return the file size in bytes"""
+        if self.format == "json":
+            self._file.write(b"\n]}\n")
+        self._file.close()
+        return self.path.stat().st_size
+
+    def abort(self) -> None:
+        """Close and remove a partially written export"""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+
+class _JSONExportReader:
+    """Incremental reader for a json export document
+
+    Decodes one value at a time with ``JSONDecoder.raw_decode`` over a
+    sliding text buffer, so only the record being decoded is held in
+    memory. Accepts any layout (including pretty-printed exports).
+    """
+
+    def __init__(self, file: IO[str]):
+        self._file = file
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int | None = None) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(size or _READ_CHUNK)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            match = _WHITESPACE.match(self._buf, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Invalid export: expected {char!r}, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Incomplete value: read more, growing geometrically so huge
+                # records are not re-scanned once per chunk
+                if self._fill(max(_READ_CHUNK, len(self._buf))):
+                    continue
+                raise ValueError(f"Invalid export: {e}") from e
+            if end == len(self._buf) and self._fill():
+                continue  # a number or literal may continue in the next chunk
+            self._pos = end
+            return value
+
+    def records(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError(f"Invalid export: object key {key!r} is not a string")
+            self._expect(":")
+            record_type = _ARRAY_RECORD_TYPES.get(key)
+            if record_type is not None:
+                self._expect("[")
+                if self._peek() != "]":
+                    while True:
+                        item = self._value()
+                        if isinstance(item, dict):
+                            yield record_type, item
+                        if self._peek() != ",":
+                            break
+                        self._pos += 1
+                self._expect("]")
+            else:
+                value = self._value()
+                if key == "session" and isinstance(value, dict):
+                    yield "session", value
+            if self._peek() != ",":
+                break
+            self._pos += 1
+        self._expect("}")
+
+
+def iter_export_records(path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield ``(record_type, data)`` pairs from an export file, one at a time
+
+    Record types are "session", "message" and "part". Blocking; see
+    ``aiter_export_records`` for use from async code.
+
+    Raises:
+        ValueError: The file is not a valid export
+    """
+    format = detect_format(path)
+    if format == "json":
+        with _open(path, "r", format) as f:
+            yield from _JSONExportReader(f).records()
+        return
+
+    with _open(path, "rb", format) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json_codec.loads(line)
+            except json_codec.JSONDecodeError as e:
+                raise ValueError(f"Invalid export: line {line_number}: {e}") from e
+            if (
+                isinstance(record, dict)
+                and record.get("type") in ("session", "message", "part")
+                and isinstance(record.get("data"), dict)
+            ):
+                yield record["type"], record["data"]
+            else:
+                logger.debug(f"Skipping unrecognized record on line {line_number} of {path}")
+
+
+async def aiter_export_records(
+    path: Path, batch_size: int = 200
+) -> AsyncIterator[list[tuple[str, dict[str, Any]]]]:
+    """Yield batches of export records, parsing in a worker thread"""
+    records = iter_export_records(path)
+    try:
+        while True:
+            batch = await asyncio.to_thread(
+                lambda: list(itertools.islice(records, max(1, batch_size)))
+            )
+            if not batch:
+                return
+            yield batch
+    finally:
+        await asyncio.to_thread(records.close)
+
+
+# =============================================================================
+# Manager
+# =============================================================================
+
 
 class ExportImportManager:
     """Export session to file and import from file"""
 
-    def __init__(self, session_manager: SessionManager, git_snapshot: GitSnapshot):
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        git_snapshot: GitSnapshot,
+        page_size: int = 100,
+        batch_size: int = 200,
+    ):
+        """Initialize manager
+
+        Args:
+            session_manager: Sessions to export from and import into
+            git_snapshot: Snapshot store of the project
+            page_size: Messages read from storage per export page
+            batch_size: Messages inserted per import batch
+        """
         self.session_manager = session_manager
         self.git_snapshot = git_snapshot
+        self.page_size = page_size
+        self.batch_size = batch_size
 
     async def export_session(
         self,
@@ -31,14 +290,19 @@ class ExportImportManager:
         """
         Export a session to file
 
+        Messages are streamed from storage; each page is written while the
+        next one is read.
+
         Args:
             session_id: Session ID to export
-            output_path: Path to export to (default: {session_id}.json)
+            output_path: Path to export to (default: {session_id}.{format})
             format: Export format (json, jsonl, jsonl.gz)
 
         Returns:
             Export info (path, format, message_count, size)
         """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
         if not output_path:
             output_path = Path.cwd() / f"{session_id}.{format}"
 
@@ -47,52 +311,41 @@ class ExportImportManager:
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
-        # Get all messages and parts
-        messages = await self.session_manager.list_messages(session_id)
-
-        export_data = {
-            "session": {
-                "id": session.id,
-                "title": session.title,
-                "project_id": session.project_id,
-                "directory": session.directory,
-                "time_created": session.time_created,
-                "time_updated": session.time_updated,
-                "version": session.version,
-            },
-            "messages": messages,
+        session_data = {
+            "id": session.id,
+            "title": session.title,
+            "project_id": session.project_id,
+            "directory": session.directory,
+            "time_created": session.time_created,
+            "time_updated": session.time_updated,
+            "version": session.version,
         }
 
-        # Redact sensitive data before export to prevent secrets in files
-        export_data = redact_dict(export_data)
-
-        # Write to file
-        if format == "json":
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-                file_size = f.tell()
-        elif format == "jsonl":
-            with open(output_path, "w", encoding="utf-8") as f:
-                # Write each message as JSONL line
-                for msg in messages:
-                    msg_line = json.dumps({"role": msg.role, "content": msg.text})
-                    f.write(msg_line + "\n")
-                file_size = f.tell()
-        elif format == "jsonl.gz":
-            with gzip.open(output_path, "wt", encoding="utf-8") as f:
-                for msg in messages:
-                    msg_line = json.dumps({"role": msg.role, "content": msg.text})
-                    f.write(msg_line + "\n")
-                file_size = f.tell()
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+        message_storage = MessageStorage(self.session_manager.storage.base_dir)
+        writer = await asyncio.to_thread(_ExportWriter, output_path, format)
+        pending: asyncio.Future[None] | None = None
+        try:
+            # Redact sensitive data (per record) to prevent secrets in files
+            await asyncio.to_thread(writer.write_session, session_data)
+            async for page in message_storage.iter_message_pages(session_id, self.page_size):
+                if pending is not None:
+                    await pending
+                pending = asyncio.ensure_future(asyncio.to_thread(writer.write_messages, page))
+            if pending is not None:
+                await pending
+            file_size = await asyncio.to_thread(writer.close)
+        except BaseException:
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+            await asyncio.to_thread(writer.abort)
+            raise
 
         logger.info(f"Exported session to {output_path} ({file_size} bytes)")
 
         return {
             "path": str(output_path),
             "format": format,
-            "message_count": len(messages),
+            "message_count": writer.message_count,
             "size": file_size,
         }
 
@@ -104,82 +357,73 @@ class ExportImportManager:
         """
         Import session from file
 
+        Records are parsed one at a time and messages inserted in batches
+        of ``batch_size``. Messages are re-keyed to the imported session.
+
         Args:
             import_path: Path to import from
             project_id: Project ID (for multi-project repos)
 
         Returns:
-            Import info (session_id, message_count, imported)
+            Import info (session_id, message_count)
         """
         if not import_path.exists():
             raise FileNotFoundError(f"Import file not found: {import_path}")
 
-        # Determine format from extension
-        format = "json"
-        if import_path.suffix == ".jsonl.gz":
-            format = "jsonl.gz"
-        elif import_path.suffix == ".jsonl":
-            format = "jsonl"
-        elif import_path.suffix == ".json":
-            format = "json"
-
-        # Read and parse
-        export_data = {}
-
-        if format == "json" or format == "jsonl":
-            with open(import_path, encoding="utf-8") as f:
-                export_data = json.load(f)
-        elif format == "jsonl.gz":
-            with gzip.open(import_path, "rt", encoding="utf-8") as f:
-                export_data = json.loads(f.read())
+        session: Session | None = None
+        pending: list[dict[str, Any]] = []
+        message_count = 0
+
+        async for batch in aiter_export_records(import_path, self.batch_size):
+            for record_type, data in batch:
+                if record_type == "session" and session is None:
+                    session = await self._open_session(data, project_id)
+                elif record_type == "message":
+                    pending.append(data)
+            # Messages that precede the session record wait for it
+            if session is not None and pending:
+                await self._insert_messages(session, pending)
+                message_count += len(pending)
+                pending = []
+
+        if session is None:
+            raise ValueError(f"Invalid export (no session record): {import_path}")
 
-        session_data = export_data.get("session", {})
-
-        # Convert messages to Message objects
-        from dawn_kestrel.core.models import Message
-
-        messages_data = export_data.get("messages", [])
+        logger.info(f"Imported session: {session.id} ({message_count} messages)")
 
-        messages = []
-        for msg_data in messages_data:
-            if isinstance(msg_data, dict):
-                messages.append(Message(**msg_data))
-            elif isinstance(msg_data, Message):
-                messages.append(msg_data)
+        return {
+            "session_id": session.id,
+            "message_count": message_count,
+        }
 
-        # Get session_id from export data
+    async def _open_session(self, session_data: dict[str, Any], project_id: str | None) -> Session:
+        """Update the exported session if it exists here, else create a new one"""
         session_id = session_data.get("id")
-
-        # Create or update session
-        work_dir = Path.cwd()
-
-        # Check if session exists
-        existing = await self.session_manager.storage.get_session(session_id, work_dir.name)
+        existing = None
+        if session_id:
+            existing = await self.session_manager.storage.get_session(
+                session_id, project_id or self.session_manager.project_dir.name
+            )
 
         if existing:
-            # Update existing session
-            session = await self.session_manager.update_session(
+            return await self.session_manager.update_session(
                 session_id,
                 title=session_data.get("title"),
                 summary=session_data.get("summary"),
             )
-            message_count = len(messages)
-        else:
-            # Create new session
-            session = await self.session_manager.create(
-                title=session_data.get("title", "Imported Session"),
-                parent_id=None,
-                version=session_data.get("version", "1.0.0"),
-                summary=session_data.get("summary"),
-            )
-            message_count = len(messages)
-
-        # Import messages
+        return await self.session_manager.create(
+            title=session_data.get("title", "Imported Session"),
+            parent_id=None,
+            version=session_data.get("version", "1.0.0"),
+            summary=session_data.get("summary"),
+        )
+
+    async def _insert_messages(self, session: Session, batch: list[dict[str, Any]]) -> None:
+        messages = []
+        for data in batch:
+            parts = [
+                {**part, "session_id": session.id} if isinstance(part, dict) else part
+                for part in data.get("parts", [])
+            ]
+            messages.append(Message(**{**data, "session_id": session.id, "parts": parts}))
         await self.session_manager.create_messages(session.id, messages)
-
-        logger.info(f"Imported session: {session.id} ({message_count} messages)")
-
-        return {
-            "session_id": session.id,
-            "message_count": message_count,
-        }
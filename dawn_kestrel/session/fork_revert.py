@@ -84,9 +84,7 @@ async def list_child_sessions(session: Session) -> list[Session]:
     from ..storage.store import SessionStorage
 
     storage = SessionStorage(Path(session.directory))
-    sessions = await storage.list_sessions(session.project_id)
-
-    child_sessions = [s for s in sessions if s.parent_id == session.id]
+    child_sessions = await storage.list_child_sessions(session.id, session.project_id)
 
     logger.info(f"Found {len(child_sessions)} child sessions for session {session.id}")
 
@@ -109,8 +107,6 @@ async def revert_session(
         files = []
         logger.info("No files specified for revert, asking which files to revert")
 
-    git_manager = GitSnapshot(session.id, Path(session.directory))
-
     target_snapshot_id = None
     message_storage = MessageStorage(Path(session.directory))
     part_storage = PartStorage(Path(session.directory))
@@ -135,17 +131,22 @@ async def revert_session(
     logger.info(f"Reverting {len(files)} files to snapshot {target_snapshot_id}")
 
     reverted_files = []
-    for file_path in files:
-        try:
-            success = await git_manager.revert_file(file_path, target_snapshot_id)
-
-            if success:
-                reverted_files.append(file_path)
-                logger.info(f"Reverted {file_path} to snapshot {target_snapshot_id}")
-            else:
-                logger.warning(f"Failed to revert {file_path}")
-        except Exception as e:
-            logger.error(f"Error reverting {file_path}: {e}")
+    git_manager = GitSnapshot(session.id, Path(session.directory))
+    try:
+        for file_path in files:
+            try:
+                success = await git_manager.revert_file(file_path, target_snapshot_id)
+
+                if success:
+                    reverted_files.append(file_path)
+                    logger.info(f"Reverted {file_path} to snapshot {target_snapshot_id}")
+                else:
+                    logger.warning(f"Failed to revert {file_path}")
+            except Exception as e:
+                logger.error(f"Error reverting {file_path}: {e}")
+    finally:
+        # Stops the snapshot's persistent git cat-file processes
+        await git_manager.close()
 
     if not reverted_files:
         return False
@@ -190,33 +191,30 @@ async def revert_session(
 
 
 async def get_session_tree(session: Session) -> dict[str, Any]:
-    """Build session tree hierarchy"""
+    """Build session tree hierarchy
+
+    Children are resolved through the storage's parent -> children index,
+    so the cost is proportional to the size of the tree.
+    """
     from ..storage.store import SessionStorage
 
     storage = SessionStorage(Path(session.directory))
 
-    async def build_tree(session_id: str, max_depth: int = 10) -> dict[str, Any]:
+    async def build_tree(session_obj: Session, max_depth: int = 10) -> dict[str, Any]:
         if max_depth <= 0:
             return {}
 
-        project_id = Path(session.directory).name
-        session_obj = await storage.get_session(session_id, project_id)
-        if not session_obj:
-            return {}
-
-        tree: dict[str, Any] = {"id": session_id, "title": session_obj.title, "children": []}
-
-        sessions = await storage.list_sessions(session_obj.project_id)
-        children = [s for s in sessions if s.parent_id == session_id]
+        tree: dict[str, Any] = {"id": session_obj.id, "title": session_obj.title, "children": []}
 
+        children = await storage.list_child_sessions(session_obj.id, session_obj.project_id)
         for child_session in children:
-            child_tree = await build_tree(child_session.id, max_depth - 1)
+            child_tree = await build_tree(child_session, max_depth - 1)
             if child_tree:
                 tree["children"].append(child_tree)
 
         return tree
 
-    return await build_tree(session.id)
+    return await build_tree(session)
 
 
 async def export_session_tree(session: Session) -> str:
@@ -237,6 +235,8 @@ def _format_tree(sessions: list[dict[str, Any]], indent: str = "") -> str:
     for session in sessions:
         title = session.get("title", "")
         lines.append(f"{indent}• {title}")
-        lines.extend(_format_tree(session.get("children", []), indent + "  "))
+        subtree = _format_tree(session.get("children", []), indent + "  ")
+        if subtree:
+            lines.append(subtree)
 
     return "\n".join(lines)
@@ -2,11 +2,11 @@
 Session export and import functionality for OpenCode.
 
 Provides JSON export/import for sessions with all messages and parts.
+Imports are parsed incrementally rather than loaded whole.
 """
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
@@ -26,6 +26,7 @@ from dawn_kestrel.core.models import (
     ToolPart,
 )
 from dawn_kestrel.core.session import Session
+from dawn_kestrel.session.export_import import aiter_export_records
 
 logger = logging.getLogger(__name__)
 
@@ -76,17 +77,22 @@ class SessionImportExport:
         messages_data = []
         parts_data = []
 
-        for message_info in session_data.get("messages", []):
-            message_id = message_info["id"]
-            message_data = await self.session.manager.get_messages(session_id)
-            for msg in message_data:
-                if msg["id"] == message_id:
-                    message_dict = msg.to_dict()
-                    messages_data.append(message_dict)
+        message_infos = session_data.get("messages", [])
+        messages_by_id = {}
+        if message_infos:
+            # Fetch once and index, rather than re-reading every message per entry
+            for msg in await self.session.manager.get_messages(session_id):
+                messages_by_id[msg["id"]] = msg
 
-                    for part in msg.get("parts", []):
-                        part_dict = part.to_dict()
-                        parts_data.append(part_dict)
+        for message_info in message_infos:
+            msg = messages_by_id.get(message_info["id"])
+            if msg is not None:
+                message_dict = msg.to_dict()
+                messages_data.append(message_dict)
+
+                for part in msg.get("parts", []):
+                    part_dict = part.to_dict()
+                    parts_data.append(part_dict)
 
         export_data = {
             "session": session_data,
@@ -102,11 +108,15 @@ class SessionImportExport:
 
     async def import_session(self, file_path: str) -> Session:
         """
-        Import session from JSON file.
-        
+        Import session from a JSON (or JSONL) export file.
+
+        The file is parsed incrementally (see ``iter_export_records``), so
+        only one batch of records is in memory at a time. The session record
+        must precede the messages and parts.
+
         Args:
-            file_path: Path to JSON file
-        
+            file_path: Path to export file
+
         Returns:
             Imported Session object
         """
@@ -115,37 +125,41 @@ class SessionImportExport:
         if not path.exists():
             raise FileNotFoundError(f"Session file not found: {file_path}")
 
-        with open(path) as f:
-            import_data = json.load(f)
-
-        if "session" not in import_data:
+        session_obj = None
+        message_count = 0
+        part_count = 0
+
+        async for batch in aiter_export_records(path):
+            for record_type, data in batch:
+                if record_type == "session":
+                    session_obj = self.session.manager.from_dict(data)
+                    continue
+                if session_obj is None:
+                    raise ValueError("Invalid session export format")
+
+                if record_type == "message":
+                    message_obj = self.session.manager.from_dict({
+                        "session": session_obj,
+                        **data
+                    })
+                    await self.session.manager.add_message(message_obj)
+                    message_count += 1
+
+                    for part_dict in data.get("parts", []):
+                        part_obj = _deserialize_part(part_dict)
+                        part_obj.message_id = message_obj.id
+                        await self.session.manager.add_part(part_obj)
+                elif record_type == "part":
+                    part_obj = _deserialize_part(data)
+                    if "message_id" in data:
+                        part_obj.message_id = data["message_id"]
+                    await self.session.manager.add_part(part_obj)
+                    part_count += 1
+
+        if session_obj is None:
             raise ValueError("Invalid session export format")
 
-        session_data = import_data["session"]
-        messages_data = import_data.get("messages", [])
-        parts_data = import_data.get("parts", [])
-
-        session_obj = self.session.manager.from_dict(session_data)
-
-        for message_dict in messages_data:
-            message_obj = self.session.manager.from_dict({
-                "session": session_obj,
-                **message_dict
-            })
-            await self.session.manager.add_message(message_obj)
-
-            for part_dict in message_dict.get("parts", []):
-                part_obj = _deserialize_part(part_dict)
-                part_obj.message_id = message_obj.id
-                await self.session.manager.add_part(part_obj)
-
-        for part_dict in parts_data:
-            part_obj = _deserialize_part(part_dict)
-            if "message_id" in part_dict:
-                part_obj.message_id = part_dict["message_id"]
-            await self.session.manager.add_part(part_obj)
-
-        logger.info(f"Imported session {session_obj.id} with {len(messages_data)} messages, {len(parts_data)} parts")
+        logger.info(f"Imported session {session_obj.id} with {message_count} messages, {part_count} parts")
 
         return session_obj
 
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
 import shutil
+import subprocess
+import time
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterator
 
+logger = logging.getLogger(__name__)
+
 
 class WorkspaceLimitExceeded(Exception):
     """Raised when attempting to allocate more than max_concurrent workspaces."""
@@ -22,6 +28,12 @@ class WorkspaceNotFoundError(Exception):
     pass
 
 
+class WorkspaceCheckoutError(Exception):
+    """Raised when a repository checkout for a workspace cannot be prepared."""
+
+    pass
+
+
 @dataclass
 class Workspace:
     """Represents an isolated workspace directory."""
@@ -49,12 +61,27 @@ class WorkspaceAllocator:
     """Manages isolated workspace directories for sessions and repositories.
 
     Provides workspace isolation, allocation limits, and cleanup.
+
+    Workspaces allocated with ``checkout=True`` are git worktrees created
+    against a shared bare mirror of the repository. On release they are
+    reset to the branch head and kept in a warm pool (up to ``pool_size``
+    per repository and branch), so the next allocation for the same
+    repository is a pool hit instead of a fresh clone.
+
+    The mirror is fetched (``git fetch --prune``) before a new checkout is
+    created and before a released one is reset, at most once every
+    ``mirror_fetch_interval`` seconds, so checkouts follow the remote.
     """
 
+    MIRRORS_DIRNAME = ".mirrors"
+    POOL_DIRNAME = ".pool"
+
     def __init__(
         self,
         base_dir: Path | None = None,
         max_concurrent: int = 10,
+        pool_size: int = 0,
+        mirror_fetch_interval: float = 60.0,
     ):
         if base_dir is None:
             from dawn_kestrel.core.settings import get_cache_dir
@@ -63,7 +90,20 @@ class WorkspaceAllocator:
 
         self.base_dir = Path(base_dir)
         self.max_concurrent = max_concurrent
+        self.pool_size = pool_size
+        self.mirror_fetch_interval = mirror_fetch_interval
         self._workspaces: dict[str, Workspace] = {}
+        # Warm checkouts per (repo_url, branch), ready for reuse
+        self._pool: dict[tuple[str, str | None], list[Path]] = {}
+        # Allocated checkout workspaces: workspace_id -> (repo_url, branch)
+        self._checkouts: dict[str, tuple[str, str | None]] = {}
+        # Last mirror clone or fetch per repo_url (time.monotonic())
+        self._mirror_fetched_at: dict[str, float] = {}
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._allocations = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
 
     def allocate(
         self,
@@ -71,6 +111,7 @@ class WorkspaceAllocator:
         repo_url: str | None = None,
         branch: str | None = None,
         metadata: dict[str, Any] | None = None,
+        checkout: bool = False,
     ) -> Workspace:
         """Allocate a new isolated workspace.
 
@@ -79,13 +120,17 @@ class WorkspaceAllocator:
             repo_url: Optional repository URL this workspace is for.
             branch: Optional git branch name.
             metadata: Optional additional metadata.
+            checkout: If True, the workspace is a checkout of repo_url at
+                branch, taken from the warm pool when one is available.
 
         Returns:
             The allocated Workspace instance.
 
         Raises:
             WorkspaceLimitExceeded: If max_concurrent workspaces already allocated.
+            WorkspaceCheckoutError: If the repository checkout cannot be created.
         """
+        start = time.perf_counter()
         if len(self._workspaces) >= self.max_concurrent:
             raise WorkspaceLimitExceeded(
                 f"Maximum concurrent workspaces ({self.max_concurrent}) reached. "
@@ -93,9 +138,14 @@ class WorkspaceAllocator:
             )
 
         workspace_id = str(uuid.uuid4())
-        workspace_path = self.base_dir / workspace_id
-
-        workspace_path.mkdir(parents=True, exist_ok=True)
+        if checkout:
+            if not repo_url:
+                raise ValueError("checkout=True requires repo_url")
+            workspace_path = self._acquire_checkout(repo_url, branch)
+            self._checkouts[workspace_id] = (repo_url, branch)
+        else:
+            workspace_path = self.base_dir / workspace_id
+            workspace_path.mkdir(parents=True, exist_ok=True)
 
         workspace = Workspace(
             id=workspace_id,
@@ -107,11 +157,19 @@ class WorkspaceAllocator:
         )
 
         self._workspaces[workspace_id] = workspace
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._allocations += 1
+        self._wait_ms_total += wait_ms
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
         return workspace
 
     def release(self, workspace_id: str) -> bool:
         """Release a workspace and clean up its directory.
 
+        Checkout workspaces are reset and returned to the warm pool when
+        there is room; otherwise their worktree is removed.
+
         Args:
             workspace_id: The ID of the workspace to release.
 
@@ -122,11 +180,177 @@ class WorkspaceAllocator:
         if workspace is None:
             return False
 
-        if workspace.path.exists():
+        key = self._checkouts.pop(workspace_id, None)
+        if key is not None:
+            self._recycle_checkout(key, workspace.path)
+        elif workspace.path.exists():
             shutil.rmtree(workspace.path, ignore_errors=True)
 
         return True
 
+    def prewarm(self, repo_url: str, branch: str | None = None, count: int = 1) -> int:
+        """Create warm checkouts ahead of time.
+
+        Args:
+            repo_url: Repository URL or local path to check out.
+            branch: Optional git branch (defaults to the repository HEAD).
+            count: Number of warm checkouts wanted in the pool.
+
+        Returns:
+            Number of checkouts created (bounded by pool_size).
+
+        Raises:
+            WorkspaceCheckoutError: If the repository checkout cannot be created.
+        """
+        pool = self._pool.setdefault((repo_url, branch), [])
+        created = 0
+        while len(pool) < min(count, self.pool_size):
+            pool.append(self._create_checkout(repo_url, branch))
+            created += 1
+        return created
+
+    def drain_pool(self) -> int:
+        """Remove all warm checkouts from the pool.
+
+        Returns:
+            Number of checkouts removed.
+        """
+        removed = 0
+        for (repo_url, _branch), paths in self._pool.items():
+            for path in paths:
+                self._remove_checkout(repo_url, path)
+                removed += 1
+        self._pool.clear()
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get allocation and pool statistics.
+
+        Returns:
+            Dict with allocations, pool hits/misses, hit_rate, warm count
+            and allocation wait times in milliseconds.
+        """
+        lookups = self._pool_hits + self._pool_misses
+        return {
+            "allocated": len(self._workspaces),
+            "allocations": self._allocations,
+            "pool_hits": self._pool_hits,
+            "pool_misses": self._pool_misses,
+            "hit_rate": self._pool_hits / lookups if lookups > 0 else 0.0,
+            "warm": sum(len(paths) for paths in self._pool.values()),
+            "wait_ms_avg": self._wait_ms_total / self._allocations if self._allocations else 0.0,
+            "wait_ms_max": self._wait_ms_max,
+        }
+
+    def _acquire_checkout(self, repo_url: str, branch: str | None) -> Path:
+        """Take a warm checkout from the pool, creating one on a miss."""
+        pool = self._pool.get((repo_url, branch))
+        if pool:
+            self._pool_hits += 1
+            return pool.pop()
+        self._pool_misses += 1
+        return self._create_checkout(repo_url, branch)
+
+    def _mirror_path(self, repo_url: str) -> Path:
+        digest = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16]
+        return self.base_dir / self.MIRRORS_DIRNAME / f"{digest}.git"
+
+    def _ensure_mirror(self, repo_url: str) -> Path:
+        """Return the shared bare mirror for repo_url, cloning it on first use
+        and fetching it when the last fetch is older than mirror_fetch_interval."""
+        mirror = self._mirror_path(repo_url)
+        if not mirror.exists():
+            mirror.parent.mkdir(parents=True, exist_ok=True)
+            self._git(["clone", "--mirror", "--quiet", repo_url, str(mirror)])
+            self._mirror_fetched_at[repo_url] = time.monotonic()
+        else:
+            self._refresh_mirror(repo_url, mirror)
+        return mirror
+
+    def _refresh_mirror(self, repo_url: str, mirror: Path) -> None:
+        """Fetch the mirror unless it was fetched recently.
+
+        A failed fetch (e.g. offline) is logged and the mirror used as is.
+        """
+        last = self._mirror_fetched_at.get(repo_url)
+        now = time.monotonic()
+        if last is not None and now - last < self.mirror_fetch_interval:
+            return
+        try:
+            self._git(["--git-dir", str(mirror), "fetch", "--prune", "--quiet"])
+        except WorkspaceCheckoutError as e:
+            logger.warning(f"Could not fetch mirror of {repo_url}, using it as is: {e}")
+        self._mirror_fetched_at[repo_url] = now
+
+    def _create_checkout(self, repo_url: str, branch: str | None) -> Path:
+        """Create a detached worktree of the mirror at branch."""
+        mirror = self._ensure_mirror(repo_url)
+        path = self.base_dir / self.POOL_DIRNAME / str(uuid.uuid4())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._git(
+            [
+                "--git-dir",
+                str(mirror),
+                "worktree",
+                "add",
+                "--detach",
+                "--quiet",
+                str(path),
+                branch or "HEAD",
+            ]
+        )
+        return path
+
+    def _recycle_checkout(self, key: tuple[str, str | None], path: Path) -> None:
+        """Reset a released checkout into the pool, or remove it if the pool is full."""
+        repo_url, branch = key
+        pool = self._pool.setdefault(key, [])
+        if len(pool) < self.pool_size and path.exists():
+            try:
+                self._ensure_mirror(repo_url)
+                ref = branch or self._default_ref(repo_url)
+                self._git(["-C", str(path), "checkout", "--detach", "--force", "--quiet", ref])
+                self._git(["-C", str(path), "clean", "-ffdxq"])
+            except WorkspaceCheckoutError:
+                self._remove_checkout(repo_url, path)
+                return
+            pool.append(path)
+            return
+        self._remove_checkout(repo_url, path)
+
+    def _default_ref(self, repo_url: str) -> str:
+        """Resolve the mirror's default branch (worktree HEAD is per-worktree)."""
+        mirror = self._mirror_path(repo_url)
+        return self._git(["--git-dir", str(mirror), "symbolic-ref", "--short", "HEAD"])
+
+    def _remove_checkout(self, repo_url: str, path: Path) -> None:
+        mirror = self._mirror_path(repo_url)
+        try:
+            self._git(["--git-dir", str(mirror), "worktree", "remove", "--force", str(path)])
+        except WorkspaceCheckoutError:
+            shutil.rmtree(path, ignore_errors=True)
+            if mirror.exists():
+                subprocess.run(
+                    ["git", "--git-dir", str(mirror), "worktree", "prune"],
+                    capture_output=True,
+                )
+
+    @staticmethod
+    def _git(args: list[str]) -> str:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", "") or ""
+            raise WorkspaceCheckoutError(
+                f"git {' '.join(args[:4])} failed: {stderr.strip() or e}"
+            ) from e
+        return result.stdout.strip()
+
     def get_workspace(self, workspace_id: str) -> Workspace | None:
         """Get a workspace by its ID.
 
@@ -187,6 +411,8 @@ class WorkspaceAllocator:
         tracked_ids = set(self._workspaces.keys())
 
         for path in self.base_dir.iterdir():
+            if path.name in (self.MIRRORS_DIRNAME, self.POOL_DIRNAME):
+                continue
             if path.is_dir() and path.name not in tracked_ids:
                 shutil.rmtree(path, ignore_errors=True)
                 removed.append(path)
@@ -200,6 +426,7 @@ class WorkspaceAllocator:
         repo_url: str | None = None,
         branch: str | None = None,
         metadata: dict[str, Any] | None = None,
+        checkout: bool = False,
     ) -> Iterator[Workspace]:
         """Context manager for allocating and automatically releasing a workspace.
 
@@ -208,6 +435,7 @@ class WorkspaceAllocator:
             repo_url: Optional repository URL.
             branch: Optional git branch.
             metadata: Optional metadata.
+            checkout: If True, allocate a checkout of repo_url.
 
         Yields:
             The allocated Workspace.
@@ -217,6 +445,7 @@ class WorkspaceAllocator:
             repo_url=repo_url,
             branch=branch,
             metadata=metadata,
+            checkout=checkout,
         )
         try:
             yield workspace
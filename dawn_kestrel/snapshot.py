@@ -11,59 +11,54 @@ import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from git import Repo
-
-try:
-    from git import InvalidGitRepositoryError, Repo
-except ImportError:
-    logging.error("gitpython not installed")
-    Repo = None  # type: ignore
 
 from dawn_kestrel.core.models import PatchPart, SnapshotPart
+from dawn_kestrel.git.service import GitError, GitService
 
 logger = logging.getLogger(__name__)
 
+# Lines of an added or removed file shown in a diff summary
+DIFF_PREVIEW_LINES = 100
+
 
 class GitSnapshot:
-    """Git snapshot manager for session files"""
+    """Git snapshot manager for session files
+
+    Snapshots capture the working tree (including uncommitted changes) as a
+    tree written from a private index, so the project's staging area is left
+    alone. File contents are read through a persistent cat-file process.
+    """
 
     def __init__(self, session_id: str, project_root: Path):
         self.session_id = session_id
         self.project_root = project_root
-        self.repo = None
-
-        if Repo is not None:
-            try:
-                self.repo = Repo(project_root)
-                logger.info(f"Initialized git repo for session {session_id}")
-            except Exception as e:
-                logger.warning(f"Failed to initialize git repo: {e}")
-
-    async def create_snapshot(self) -> str | None:
-        """Create a git snapshot of current state"""
-        if self.repo is None:
-            logger.error("Git repo not initialized")
-            return None
+        self.git = GitService(project_root)
 
+    async def create_snapshot(self, paths: list[str] | None = None) -> str | None:
+        """Create a git snapshot of current state
+
+        Args:
+            paths: Paths changed since the previous snapshot, if known
+        """
         try:
-            tree = self.repo.head.commit.tree
-            snapshot_hash = tree.hexsha
+            snapshot_hash = await self.git.write_snapshot_tree(paths)
 
             logger.info(f"Created snapshot: {snapshot_hash}")
             return snapshot_hash
-        except Exception as e:
+        except (GitError, OSError) as e:
             logger.error(f"Failed to create snapshot: {e}")
             return None
 
+    def _preview(self, marker: str, file_path: str, content: bytes) -> list[str]:
+        lines = content.decode(errors="replace").splitlines()
+        output = [f"{marker} {file_path}"]
+        output.extend(f"  {line}" for line in lines[:DIFF_PREVIEW_LINES])
+        if len(lines) > DIFF_PREVIEW_LINES:
+            output.append(f"  +... ({len(lines) - DIFF_PREVIEW_LINES} more lines)")
+        return output
+
     async def save_diff(self, before_hash: str, after_hash: str, changes: list[str]) -> str:
         """Calculate and save diff between snapshots"""
-        if self.repo is None:
-            logger.error("Git repo not initialized")
-            return ""
-
         try:
             if before_hash == after_hash:
                 logger.info("No changes between snapshots")
@@ -71,46 +66,32 @@ class GitSnapshot:
 
             diff_output = []
 
-            for i in range(0, len(changes), 2):
-                file_path = changes[i]
-                before_commit = self.repo.commit(before_hash) if before_hash else None
-                after_commit = self.repo.commit(after_hash) if after_hash else None
-
-                before_content = before_commit.tree[file_path] if before_commit and file_path in before_commit.tree else None
-                after_content = after_commit.tree[file_path] if after_commit and file_path in after_commit.tree else None
+            for file_path in changes:
+                before_content = (
+                    await self.git.read_blob(before_hash, file_path) if before_hash else None
+                )
+                after_content = (
+                    await self.git.read_blob(after_hash, file_path) if after_hash else None
+                )
 
                 if before_content is None:
                     if after_content is not None:
-                        added_lines = after_content.data.decode().splitlines()
-                        diff_output.append(f"+ {file_path}")
-                        diff_output.extend(f"  {line}" for line in added_lines[:100])
-                        if len(added_lines) > 100:
-                            diff_output.append(f"  +... ({len(added_lines) - 100} more lines)")
-                else:
-                    if after_content is None:
-                        diff_output.append(f"- {file_path}")
-                        removed_lines = before_content.data.decode().splitlines()
-                        diff_output.extend(f"  {line}" for line in removed_lines[:100])
-                        if len(removed_lines) > 100:
-                            diff_output.append(f"  +... ({len(removed_lines) - 100} more lines)")
-                    else:
-                        assert before_commit is not None
-                        assert after_commit is not None
-                        diff = before_commit.diff(after_commit, create_patch=True, context_lines=0)
-                        diff_output.append(str(diff))
+                        diff_output.extend(self._preview("+", file_path, after_content))
+                elif after_content is None:
+                    diff_output.extend(self._preview("-", file_path, before_content))
+                elif before_content != after_content:
+                    diff_output.append(
+                        await self.git.run("diff", "-U0", before_hash, after_hash, "--", file_path)
+                    )
 
             logger.info(f"Calculated diff with {len(diff_output)} lines")
             return "\n".join(diff_output)
-        except Exception as e:
+        except (GitError, OSError) as e:
             logger.error(f"Failed to calculate diff: {e}")
             return ""
 
     async def revert_file(self, file_path: str, snapshot_hash: str) -> bool:
         """Revert single file to snapshot state"""
-        if self.repo is None:
-            logger.error("Git repo not initialized")
-            return False
-
         try:
             full_path = self.project_root / file_path
 
@@ -118,33 +99,34 @@ class GitSnapshot:
                 logger.error(f"File not found: {full_path}")
                 return False
 
-            try:
-                commit = self.repo.commit(snapshot_hash)
-            except ValueError:
+            obj = await self.git.object_info(snapshot_hash)
+            if obj is None:
                 logger.error(f"Snapshot not found: {snapshot_hash}")
                 return False
 
-            tree = commit.tree
-            if file_path not in tree:
+            result = await self.git.read_object(f"{snapshot_hash}:{file_path}")
+            if result is None:
                 logger.error(f"File not found in snapshot: {file_path}")
                 return False
 
-            blob = tree[file_path]
-
+            blob, content = result
             if blob.type != "blob":
                 logger.error(f"Target is not a file: {file_path}")
                 return False
 
-            with open(full_path, "wb") as f:
-                f.write(blob.data)
+            await asyncio.to_thread(full_path.write_bytes, content)
 
-            self.repo.index.add([str(full_path)])
+            await self.git.run("add", "--", file_path)
             logger.info(f"Reverted file: {file_path}")
             return True
-        except Exception as e:
+        except (GitError, OSError, ValueError) as e:
             logger.error(f"Failed to revert file: {e}")
             return False
 
+    async def close(self) -> None:
+        """Stop the persistent git processes"""
+        await self.git.close()
+
     async def create_snapshot_part(self, snapshot_hash: str) -> SnapshotPart:
         """Create snapshot part for session"""
         return SnapshotPart(
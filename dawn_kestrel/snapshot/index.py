@@ -1,51 +1,61 @@
 """OpenCode Python - Git Snapshot System"""
 from __future__ import annotations
 
-import json
 import logging
-import subprocess
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
+from dawn_kestrel.core import json_codec
+from dawn_kestrel.git.service import GitError, GitService
+
 logger = logging.getLogger(__name__)
 
 
 class GitSnapshot:
-    """Git snapshot manager for tracking changes"""
+    """Git snapshot manager for tracking changes
+
+    Snapshots are trees written from a private index (see GitService), so
+    they never touch the user's staging area and only re-hash files that
+    changed since the previous snapshot.
+
+    Without ``work_tree`` git runs inside the snapshot directory, as before.
+    With ``work_tree`` the snapshot directory is a separate git directory
+    tracking that work tree, leaving the project's own repository alone.
+    """
 
-    def __init__(self, snapshot_dir: Path, project_id: str):
+    def __init__(self, snapshot_dir: Path, project_id: str, work_tree: Path | None = None):
         self.snapshot_dir = snapshot_dir / project_id
         self.snapshot_dir.mkdir(parents=True, exist_ok=True)
-
-    async def track(self) -> str:
+        self.work_tree = Path(work_tree) if work_tree else None
+        if self.work_tree is not None:
+            self.git = GitService(self.work_tree, git_dir=self.snapshot_dir, work_tree=self.work_tree)
+        else:
+            self.git = GitService(self.snapshot_dir)
+        self._initialized = self.work_tree is None
+
+    async def _ensure_repo(self) -> None:
+        if self._initialized:
+            return
+        if not (self.snapshot_dir / "HEAD").exists():
+            await self.git.run("init", "--quiet")
+            await self.git.run("config", "core.autocrlf", "false")
+        self._initialized = True
+
+    async def track(self, paths: Iterable[str] | None = None) -> str:
         """
         Take a snapshot of current changes
-        
+
+        Args:
+            paths: Paths changed since the last snapshot, if known; only
+                these are re-indexed (default: scan the whole tree)
+
         Returns:
             Snapshot hash
         """
         try:
-            # Stage all changes
-            subprocess.run(
-                ["git", "add", "."],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True
-            )
-
-            # Write tree to get hash
-            result = subprocess.run(
-                ["git", "write-tree", "--porcelain"],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"git write-tree failed: {result.stderr}")
-
-            hash_value = result.stdout.strip()
+            await self._ensure_repo()
+            hash_value = await self.git.write_snapshot_tree(paths)
 
             # Store hash
             await self._store_hash(hash_value)
@@ -53,34 +63,25 @@ class GitSnapshot:
             logger.info(f"Snapshot tracked: {hash_value}")
             return hash_value
 
-        except subprocess.CalledProcessError as e:
+        except GitError as e:
             raise RuntimeError(f"Failed to track snapshot: {e}")
 
     async def patch(self, hash_value: str) -> list[str]:
         """
         Get list of changed files for a snapshot
-        
+
         Returns:
             List of changed files
         """
         try:
-            result = subprocess.run(
-                ["git", "diff", "--name-only", hash_value],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True,
-                text=True
+            await self._ensure_repo()
+            await self.git.update_snapshot_index()
+            output = await self.git.run(
+                "diff-index", "--cached", "--name-only", hash_value, env=await self.git.index_env()
             )
+            return [f for f in output.split("\n") if f]
 
-            if result.returncode != 0:
-                raise RuntimeError(f"git diff failed: {result.stderr}")
-
-            files = result.stdout.strip().split("\n")
-            files = [f for f in files if f]
-
-            return files
-
-        except subprocess.CalledProcessError as e:
+        except GitError as e:
             raise RuntimeError(f"Failed to get patch: {e}")
 
     async def diff(
@@ -90,25 +91,13 @@ class GitSnapshot:
     ) -> str:
         """
         Get full diff between two snapshots
-        
+
         Returns:
             Diff output
         """
         try:
-            result = subprocess.run(
-                ["git", "diff", from_hash, to_hash],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"git diff failed: {result.stderr}")
-
-            return result.stdout
-
-        except subprocess.CalledProcessError as e:
+            return await self.git.run("diff", from_hash, to_hash)
+        except GitError as e:
             raise RuntimeError(f"Failed to get diff: {e}")
 
     async def diff_full(
@@ -118,97 +107,71 @@ class GitSnapshot:
     ) -> str:
         """
         Get full diff with before/after content
-        
+
         Returns:
             Full diff output
         """
         try:
-            result = subprocess.run(
-                ["git", "diff", from_hash, to_hash],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"git diff failed: {result.stderr}")
+            return await self.git.run("diff", from_hash, to_hash)
+        except GitError as e:
+            raise RuntimeError(f"Failed to get full diff: {e}")
 
-            return result.stdout
+    async def read_file(self, hash_value: str, path: str) -> bytes | None:
+        """
+        Read a file's content in a snapshot
 
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to get full diff: {e}")
+        Returns:
+            File content, or None if the path is not a file in the snapshot
+        """
+        return await self.git.read_blob(hash_value, path)
 
     async def restore(self, hash_value: str) -> None:
         """
         Restore to a specific snapshot
-        
+
         Args:
             hash_value: Snapshot hash to restore
         """
         try:
-            # Checkout files from snapshot
-            result = subprocess.run(
-                ["git", "read-tree", hash_value, "--checkout-index", "-a", "-f"],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"git read-tree failed: {result.stderr}")
-
-            # Update index
-            subprocess.run(
-                ["git", "checkout-index", "-f"],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True
-            )
-
+            await self._ensure_repo()
+            await self.git.checkout_tree(hash_value)
             logger.info(f"Restored to snapshot: {hash_value}")
 
-        except subprocess.CalledProcessError as e:
+        except GitError as e:
             raise RuntimeError(f"Failed to restore snapshot: {e}")
 
     async def cleanup(self, days: int = 7) -> None:
         """
         Clean up old snapshots
-        
+
         Args:
             days: Number of days to keep
         """
         try:
-            result = subprocess.run(
-                ["git", "gc", "--prune", f"--expire={days}d"],
-                check=True,
-                cwd=self.snapshot_dir,
-                capture_output=True
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"git gc failed: {result.stderr}")
-
+            await self.git.run("gc", f"--prune={days}.days.ago")
             logger.info(f"Cleaned up snapshots older than {days} days")
 
-        except subprocess.CalledProcessError as e:
+        except GitError as e:
             raise RuntimeError(f"Failed to cleanup: {e}")
 
+    async def close(self) -> None:
+        """Stop the persistent git processes"""
+        await self.git.close()
+
     async def _store_hash(self, hash_value: str) -> None:
         """Store snapshot hash mapping"""
         hash_file = self.snapshot_dir / "hashes.json"
 
         hashes = {}
         if hash_file.exists():
-            hashes = json.loads(hash_file.read_text())
+            hashes = json_codec.loads(hash_file.read_bytes())
 
         hashes[hash_value] = {
             "timestamp": self._now(),
             "hash": hash_value,
         }
 
-        hash_file.write_text(json.dumps(hashes, indent=2))
+        hash_file.write_bytes(json_codec.dumps_bytes(hashes))
 
     async def _get_hash(self, hash_value: str) -> dict[str, Any] | None:
         """Get stored hash information"""
@@ -217,7 +180,7 @@ class GitSnapshot:
         if not hash_file.exists():
             return None
 
-        hashes = json.loads(hash_file.read_text())
+        hashes = json_codec.loads(hash_file.read_bytes())
         return hashes.get(hash_value)
 
     def _now(self) -> int:
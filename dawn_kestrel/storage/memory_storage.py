@@ -28,9 +28,9 @@ class MemoryStorage(Storage):
         keys = await self.list(["memory", session_id])
         memories = []
         for key in keys:
-            memory_id = key[-1]
-            # List returns stem (without .json), need to add it back for reading
-            data = await self.read(["memory", session_id, f"{memory_id}.json"])
+            # List returns file names; read adds the .json extension back
+            memory_id = key[-1].removesuffix(".json")
+            data = await self.read(["memory", session_id, memory_id])
             if data:
                 memories.append(Memory(**data))
         # Sort by created timestamp descending
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import builtins
-import json
-from collections.abc import Callable
+import os
+import threading
+import uuid
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -12,8 +15,60 @@ from typing import Any
 import aiofiles
 from pydantic import ValidationError
 
+from dawn_kestrel.core import json_codec
 from dawn_kestrel.core.models import Message, Part, Session
 from dawn_kestrel.core.security import SecurityError
+from dawn_kestrel.core.tokenizer import count_message_tokens
+
+
+def _write_file(path: Path, content: bytes, durable: bool, atomic: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    target = path.with_name(path.name + ".tmp") if atomic else path
+    with open(target, "wb") as f:
+        f.write(content)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    if atomic:
+        os.replace(target, path)
+
+
+def _apply_journal(journal_path: Path) -> None:
+    """Rename every temporary file of a committed batch into place (idempotent)"""
+    try:
+        journal = json_codec.loads(journal_path.read_bytes())
+    except (OSError, json_codec.JSONDecodeError):
+        # Torn journal: the batch never committed, so its temp files are garbage
+        journal_path.unlink(missing_ok=True)
+        return
+    for tmp, target in journal.get("renames", []):
+        try:
+            os.replace(tmp, target)
+        except FileNotFoundError:
+            pass  # already renamed by an earlier replay
+    journal_path.unlink(missing_ok=True)
+
+
+# Storage directories whose journals were replayed by this process
+_recovered_dirs: set[Path] = set()
+_recovery_lock = threading.RLock()
+
+
+def _recover_dir(storage_dir: Path) -> int:
+    """Replay every journal under a storage directory (blocking)"""
+    with _recovery_lock:
+        journal_dir = storage_dir / ".journal"
+        journals = sorted(journal_dir.glob("*.json")) if journal_dir.exists() else []
+        for journal_path in journals:
+            _apply_journal(journal_path)
+        _recovered_dirs.add(storage_dir)
+        return len(journals)
+
+
+def _recover_dir_once(storage_dir: Path) -> None:
+    with _recovery_lock:
+        if storage_dir not in _recovered_dirs:
+            _recover_dir(storage_dir)
 
 
 class Storage:
@@ -50,11 +105,11 @@ class Storage:
             if not key_with_ext[-1].endswith(".json"):
                 key_with_ext[-1] = key_with_ext[-1] + ".json"
             path = await self._get_path(*key_with_ext)
-            async with aiofiles.open(path) as f:
+            async with aiofiles.open(path, mode="rb") as f:
                 content = await f.read()
-                data: dict[str, Any] = json.loads(content)
+                data: dict[str, Any] = json_codec.loads(content)
                 return data
-        except (FileNotFoundError, json.JSONDecodeError, ValidationError):
+        except (FileNotFoundError, json_codec.JSONDecodeError, ValidationError):
             return None
 
     async def write(self, key: builtins.list[str], data: dict[str, Any]) -> None:
@@ -64,9 +119,80 @@ class Storage:
             key_with_ext[-1] = key_with_ext[-1] + ".json"
         path = await self._get_path(*key_with_ext)
         await self._ensure_dir(path)
-        async with aiofiles.open(path, mode="w") as f:
-            content = json.dumps(data, indent=2, ensure_ascii=False)
-            await f.write(content)
+        async with aiofiles.open(path, mode="wb") as f:
+            await f.write(json_codec.dumps_bytes(data))
+
+    async def write_many(
+        self,
+        entries: builtins.list[tuple[builtins.list[str], dict[str, Any]]],
+        concurrency: int = 8,
+        durable: bool = False,
+    ) -> None:
+        """Write several JSON records as one all-or-nothing batch
+
+        Every record is first written to a temporary file next to its
+        target (up to ``concurrency`` at a time, off the event loop). A
+        journal listing the renames is then written as the commit point,
+        after which the temporary files are renamed into place. If anything
+        fails before the journal is written, the temporary files are removed
+        and no target is touched; a journal left behind by a crash is
+        replayed by ``recover``, which the first batch on a storage
+        directory runs once per process.
+
+        Args:
+            entries: (key, data) pairs to write
+            concurrency: Maximum number of files written in parallel
+            durable: fsync temporary files and the journal before renaming.
+                Off by default like ``write``: without it the batch is
+                still all-or-nothing for the process, but a power loss may
+                lose it. Each fsync typically costs milliseconds.
+        """
+        if not entries:
+            return
+        if self.storage_dir not in _recovered_dirs:
+            await asyncio.to_thread(_recover_dir_once, self.storage_dir)
+
+        tx_id = uuid.uuid4().hex
+        writes: builtins.list[tuple[Path, Path, bytes]] = []
+        for key, data in entries:
+            key_with_ext = list(key)
+            if not key_with_ext[-1].endswith(".json"):
+                key_with_ext[-1] = key_with_ext[-1] + ".json"
+            path = await self._get_path(*key_with_ext)
+            tmp_path = path.with_name(f"{path.name}.{tx_id}.tmp")
+            writes.append((tmp_path, path, json_codec.dumps_bytes(data)))
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def write_tmp(tmp_path: Path, content: bytes) -> None:
+            async with semaphore:
+                await asyncio.to_thread(_write_file, tmp_path, content, durable)
+
+        journal_path = self.storage_dir / ".journal" / f"{tx_id}.json"
+        try:
+            await asyncio.gather(*(write_tmp(tmp, content) for tmp, _, content in writes))
+            journal = {"renames": [[str(tmp), str(path)] for tmp, path, _ in writes]}
+            await asyncio.to_thread(
+                _write_file, journal_path, json_codec.dumps_bytes(journal), durable, True
+            )
+        except BaseException:
+            for tmp_path, _, _ in writes:
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+        await asyncio.to_thread(_apply_journal, journal_path)
+
+    async def recover(self) -> int:
+        """Replay journals of batches interrupted after their commit point
+
+        Meant for startup: journals of batches still committing are replayed
+        too (harmlessly, renames are idempotent). ``write_many`` calls this
+        once per storage directory and process, not per batch.
+
+        Returns:
+            Number of journals replayed
+        """
+        return await asyncio.to_thread(_recover_dir, self.storage_dir)
 
     async def update(self, key: builtins.list[str], fn: Callable[[dict[str, Any]], None]) -> dict[str, Any]:
         """Update JSON data by key with update function"""
@@ -102,10 +228,25 @@ class Storage:
 
 
 class SessionStorage(Storage):
-    """Session-specific storage operations"""
+    """Session-specific storage operations
+
+    Maintains a parent -> children adjacency index next to the session
+    records (one file per child at
+    ``session_children/<project_id>/<parent_id>/<child_id>``) so fork trees
+    can be walked without scanning every session. Adding or removing a
+    child touches only its own file, so concurrent forks of one parent
+    never overwrite each other.
+    """
 
     async def get_session(self, session_id: str, project_id: str) -> Session | None:
         """Get session by ID"""
+        try:
+            data = await self.read(["session", project_id, session_id])
+        except SecurityError:
+            data = None
+        if data and data.get("id") == session_id:
+            return Session(**data)
+
         keys = await self.list(["session", project_id])
         for key in keys:
             data = await self.read(key)
@@ -125,11 +266,28 @@ class SessionStorage(Storage):
         sessions.sort(key=lambda s: s.time_updated, reverse=True)
         return sessions
 
+    @staticmethod
+    def session_entry(session: Session) -> tuple[list[str], dict[str, Any]]:
+        """Storage (key, data) pair for a session record"""
+        return ["session", session.project_id, session.id], session.model_dump(mode="json")
+
+    @staticmethod
+    def child_index_entries(sessions: list[Session]) -> list[tuple[list[str], dict[str, Any]]]:
+        """Storage (key, data) pairs that add sessions to their parents' index"""
+        return [
+            (
+                ["session_children", session.project_id, session.parent_id, session.id],
+                {"parent_id": session.parent_id, "child_id": session.id},
+            )
+            for session in sessions
+            if session.parent_id
+        ]
+
     async def create_session(self, session: Session) -> Session:
         """Create a new session"""
-        await self.write(
-            ["session", session.project_id, session.id], session.model_dump(mode="json")
-        )
+        await self.write(*self.session_entry(session))
+        for key, data in self.child_index_entries([session]):
+            await self.write(key, data)
         return session
 
     async def update_session(self, session: Session) -> Session:
@@ -142,8 +300,50 @@ class SessionStorage(Storage):
 
     async def delete_session(self, session_id: str, project_id: str) -> bool:
         """Delete session"""
+        try:
+            data = await self.read(["session", project_id, session_id])
+        except SecurityError:
+            data = None
         key = session_id + ".json"
-        return await self.remove(["session", project_id, key])
+        removed = await self.remove(["session", project_id, key])
+        if removed and data and data.get("parent_id"):
+            await self.remove(["session_children", project_id, data["parent_id"], session_id])
+        return removed
+
+    async def list_child_ids(self, parent_id: str, project_id: str) -> list[str]:
+        """List IDs of direct child sessions from the adjacency index"""
+        keys = await self.list(["session_children", project_id, parent_id])
+        return [Path(key[-1]).stem for key in keys]
+
+    async def list_child_sessions(self, parent_id: str, project_id: str) -> list[Session]:
+        """List direct child sessions, sorted by updated timestamp descending"""
+        children = []
+        for child_id in await self.list_child_ids(parent_id, project_id):
+            data = await self.read(["session", project_id, child_id])
+            if data:
+                children.append(Session(**data))
+        children.sort(key=lambda s: s.time_updated, reverse=True)
+        return children
+
+    async def rebuild_child_index(self, project_id: str) -> int:
+        """Rebuild the parent -> children index from stored sessions
+
+        Returns:
+            Number of parent entries written
+        """
+        for key in await self.list(["session_children", project_id]):
+            await self.remove(key)
+
+        parents = set()
+        for key in await self.list(["session", project_id]):
+            data = await self.read(key)
+            if data and data.get("parent_id") and data.get("id"):
+                parents.add(data["parent_id"])
+                await self.write(
+                    ["session_children", project_id, data["parent_id"], data["id"]],
+                    {"parent_id": data["parent_id"], "child_id": data["id"]},
+                )
+        return len(parents)
 
 
 class MessageStorage(Storage):
@@ -156,9 +356,20 @@ class MessageStorage(Storage):
             return data
         return None
 
+    @staticmethod
+    def message_entry(session_id: str, message: Message) -> tuple[list[str], dict[str, Any]]:
+        """Storage (key, data) pair for a message record
+
+        The message's token count is cached in its ``metadata`` (see
+        count_message_tokens) first, so it is stored with the message and
+        history is not re-tokenized on every turn.
+        """
+        count_message_tokens(message)
+        return ["message", session_id, message.id], message.model_dump(mode="json")
+
     async def create_message(self, session_id: str, message: Message) -> Message:
         """Create a new message"""
-        await self.write(["message", session_id, message.id], message.model_dump(mode="json"))
+        await self.write(*self.message_entry(session_id, message))
         return message
 
     async def list_messages(self, session_id: str, reverse: bool = True) -> list[dict[str, Any]]:
@@ -172,6 +383,20 @@ class MessageStorage(Storage):
         messages.sort(key=lambda m: (m.get("time") or {}).get("created") or 0, reverse=reverse)
         return messages
 
+    async def iter_message_pages(
+        self, session_id: str, page_size: int = 100
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield a session's messages a page at a time, in storage key order
+
+        Only one page of message data is held in memory, so exports of very
+        long sessions run in constant memory. Messages are not sorted by
+        creation time (that would require reading all of them first).
+        """
+        keys = await self.list(["message", session_id])
+        for start in range(0, len(keys), max(1, page_size)):
+            page = await asyncio.gather(*(self.read(key) for key in keys[start : start + page_size]))
+            yield [data for data in page if data]
+
 
 class PartStorage(Storage):
     """Part-specific storage operations"""
@@ -183,9 +408,14 @@ class PartStorage(Storage):
             return data
         return None
 
+    @staticmethod
+    def part_entry(message_id: str, part: Part) -> tuple[list[str], dict[str, Any]]:
+        """Storage (key, data) pair for a part record"""
+        return ["part", message_id, part.id], part.model_dump(mode="json")
+
     async def create_part(self, message_id: str, part: Part) -> Part:
         """Create a new part"""
-        await self.write(["part", message_id, part.id], part.model_dump(mode="json"))
+        await self.write(*self.part_entry(message_id, part))
         return part
 
     async def update_part(self, message_id: str, part: Part) -> Part:
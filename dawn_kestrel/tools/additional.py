@@ -22,7 +22,14 @@ from pydantic import BaseModel, Field
 from dawn_kestrel.core.models import CompactionPart
 from dawn_kestrel.core.session import SessionManager
 from dawn_kestrel.core.settings import settings
+from dawn_kestrel.core.tokenizer import count_message_tokens, preload_tokenizer
 from dawn_kestrel.tools.framework import Tool, ToolContext, ToolResult
+from dawn_kestrel.tools.http_cache import (
+    CachedResponse,
+    HTTPResponseCache,
+    get_http_client,
+    get_response_cache,
+)
 
 from .prompts import get_prompt
 
@@ -869,6 +876,7 @@ class CompactionTool(Tool):
         self, session_mgr, messages, token_limit, compact_all, compactor, session_id
     ) -> dict[str, Any]:
         """Compact session by creating compaction message and pruning old messages"""
+        await preload_tokenizer()
         messages_to_prune: list[dict[str, Any]] = []
         tokens_pruned = 0
         messages_kept: list[dict[str, Any]] = []
@@ -907,26 +915,8 @@ class CompactionTool(Tool):
 
 
 def _count_message_tokens(msg: dict[str, Any]) -> int:
-    """Count total tokens in message"""
-    total = 0
-
-    for part in msg.get("parts", []):
-        part_type = part.get("part_type", "")
-
-        if part_type in ["text", "reasoning"]:
-            total += len(part.get("text", ""))
-        elif part_type in ["tool", "snapshot", "patch"]:
-            total += 50
-        elif part_type in ["agent", "subtask", "retry"]:
-            total += 25
-        elif part_type in ["file", "multiedit"]:
-            total += 10
-        elif part_type in ["compaction"]:
-            total += 5
-        elif part_type == "invalid":
-            total += 0
-
-    return total
+    """Count total tokens in message (cached in the message's metadata)"""
+    return count_message_tokens(msg)
 
     async def register_compaction_tool(registry):
         compaction_tool = CompactionTool()
@@ -1545,9 +1535,59 @@ Enables web content fetching and real-time search capabilities.
 
 
 class WebFetchTool(Tool):
+    """Fetch a URL through the shared client and the HTTP response cache.
+
+    Responses are cached on disk with their converted output, honouring
+    Cache-Control, Expires, ETag and Last-Modified (see HTTPResponseCache):
+    fresh entries are served without a request and stale ones are
+    revalidated conditionally.
+    """
+
     id = "webfetch"
     description = "Fetch content from URL"
 
+    # Characters of a page returned before truncation
+    MAX_OUTPUT_CHARS = 10000
+
+    def __init__(
+        self,
+        cache: HTTPResponseCache | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """Initialize WebFetchTool
+
+        Args:
+            cache: Response cache (default: the process-wide cache)
+            client: HTTP client (default: the shared pooled client)
+        """
+        self.cache = cache
+        self.client = client
+
+    def _convert(self, url: str, format_type: str, text: str) -> tuple[str, dict[str, Any]]:
+        """Tool output and metadata for a fetched page"""
+        content = text
+        truncated = len(content) > self.MAX_OUTPUT_CHARS
+        if truncated:
+            truncated_length = len(content) - self.MAX_OUTPUT_CHARS
+            content = (
+                content[: self.MAX_OUTPUT_CHARS]
+                + f"\n\n[... Content truncated ({truncated_length} characters) ...]"
+            )
+        return content, {
+            "url": url,
+            "format": format_type,
+            "bytes_fetched": len(content),
+            "truncated": truncated,
+        }
+
+    def _cached_result(self, url: str, entry: CachedResponse, status: str) -> ToolResult:
+        logger.info(f"Served {url} from cache ({status})")
+        return ToolResult(
+            title=f"Fetched from {url}",
+            output=entry.output,
+            metadata={**entry.output_metadata, "cache": status},
+        )
+
     async def execute(self, args: dict[str, Any], ctx: ToolContext) -> ToolResult:
         url = args.get("url")
         format_type = args.get("format", "markdown")
@@ -1558,15 +1598,26 @@ class WebFetchTool(Tool):
             )
 
         try:
-            httpx_client = httpx.AsyncClient(timeout=30.0)
+            cache = self.cache or get_response_cache()
+            httpx_client = self.client or get_http_client()
+
+            entry = await asyncio.to_thread(cache.lookup, url, format_type)
+            if entry is not None and entry.is_fresh():
+                return self._cached_result(url, entry, "hit")
 
             if format_type == "markdown":
                 headers = {"Accept": "text/markdown, application/markdown"}
             else:
                 headers = {"Accept": "text/html, application/xhtml+xml"}
+            if entry is not None:
+                headers.update(entry.validators())
 
             response = await httpx_client.get(url, headers=headers)
 
+            if response.status_code == 304 and entry is not None:
+                entry = await asyncio.to_thread(cache.revalidated, entry, response)
+                return self._cached_result(url, entry, "revalidated")
+
             if response.status_code != 200:
                 return ToolResult(
                     title="Failed to fetch",
@@ -1574,26 +1625,15 @@ class WebFetchTool(Tool):
                     metadata={"error": "http_error", "status_code": response.status_code},
                 )
 
-            content = response.text
-
-            if len(content) > 10000:
-                truncated_length = len(content) - 10000
-                content = (
-                    content[:10000]
-                    + f"\n\n[... Content truncated ({truncated_length} characters) ...]"
-                )
+            content, metadata = self._convert(url, format_type, response.text)
+            await asyncio.to_thread(cache.store, url, format_type, response, content, metadata)
 
             logger.info(f"Fetched {len(content)} characters from {url}")
 
             return ToolResult(
                 title=f"Fetched from {url}",
                 output=content,
-                metadata={
-                    "url": url,
-                    "format": format_type,
-                    "bytes_fetched": len(content),
-                    "truncated": len(content) > 10000,
-                },
+                metadata={**metadata, "cache": "miss"},
             )
 
         except Exception as e:
@@ -4,15 +4,32 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import json
+import logging
+import os
+import re
+import threading
 import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Optional, Set as TypingSet
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Literal, Optional, Set as TypingSet
+
+from dawn_kestrel.core import json_codec
+
+logger = logging.getLogger(__name__)
 
 # Note: event_bus imports are done lazily to avoid circular imports
 
 
+def _loop_running() -> bool:
+    """Whether the calling thread is running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 @dataclass
 class CacheEntry:
     """A cached tool result with metadata."""
@@ -28,6 +45,365 @@ class CacheEntry:
     ttl_seconds: float = 300.0  # Default 5 minutes
 
 
+class ToolResultDiskCache:
+    """Persistent, content-addressed tier of the tool result cache.
+
+    Entries live at ``<cache_dir>/<tool>/<key>.json``, where the key hashes
+    the tool name, its normalized arguments and the repository root, so
+    results are shared by every session working on the same repository and
+    survive process restarts.
+
+    Each entry records a fingerprint of the files the tool reads, computed
+    before the tool runs:
+    - File tools (read): the target file's mtime and size, or its content
+      hash in ``"content"`` mode.
+    - Tree tools (grep, glob, ls, ...): path, mtime and size of every file
+      and directory under the search root (stat only, in either mode),
+      skipping dependency, build and VCS folders (``IgnoreRules.FOLDERS``).
+      Tree fingerprints are memoized per root for ``tree_fingerprint_ttl``
+      seconds, and ``forget_fingerprints`` drops them when a tool that may
+      write files runs, so external edits can go unnoticed for at most the
+      TTL.
+
+    A lookup recomputes the fingerprint and treats a mismatch as a miss, so
+    entries can live far longer than the in-memory TTL without going stale.
+    Total size is bounded; least recently used entries are evicted first.
+
+    Thread safety:
+        Safe to call from worker threads (the async cache paths use
+        ``asyncio.to_thread``).
+    """
+
+    FILE_TOOLS: TypingSet[str] = {"read", "file"}
+    TREE_TOOLS: TypingSet[str] = {
+        "glob",
+        "grep",
+        "rg",
+        "ripgrep",
+        "ast-grep",
+        "ast_grep_search",
+        "ls",
+        "list",
+        "tree",
+    }
+
+    FILE_ARG_KEYS = ("filePath", "file_path", "path", "file")
+    DIR_ARG_KEYS = ("path", "directory", "dir", "cwd")
+
+    # Not part of the working tree a tool reads (extended with
+    # IgnoreRules.FOLDERS, which search tools skip as well)
+    SKIP_DIRS: TypingSet[str] = {".git"}
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600.0,
+        root: Path | None = None,
+        fingerprint_mode: Literal["stat", "content"] = "stat",
+        max_tree_files: int = 200_000,
+        tree_fingerprint_ttl: float = 2.0,
+    ) -> None:
+        """Initialize the disk tier.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which entries are evicted
+            ttl_seconds: Upper bound on entry age, even if files are unchanged
+            root: Repository root relative paths resolve against (default: cwd)
+            fingerprint_mode: "stat" (mtime+size) or "content" (hash) for files
+            max_tree_files: Trees larger than this are not cached
+            tree_fingerprint_ttl: Seconds a tree fingerprint is reused for
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.root = (root or Path.cwd()).resolve()
+        self.fingerprint_mode = fingerprint_mode
+        self.max_tree_files = max_tree_files
+        self.tree_fingerprint_ttl = tree_fingerprint_ttl
+
+        # Lazy import: dawn_kestrel.context imports the tools package
+        from dawn_kestrel.context.pipeline import IgnoreRules
+
+        self._skip_dirs = self.SKIP_DIRS | IgnoreRules.FOLDERS
+
+        self._lock = threading.Lock()
+        # Tree root -> (computed at, fingerprint); guarded by _memo_lock so
+        # walks never hold the index lock
+        self._tree_memo: dict[Path, tuple[float, str | None]] = {}
+        self._memo_lock = threading.Lock()
+        # Entry path -> size, least recently used first; loaded lazily
+        self._index: OrderedDict[Path, int] | None = None
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    def handles(self, tool_name: str) -> bool:
+        """Whether results of a tool can be fingerprinted and persisted."""
+        return tool_name in self.FILE_TOOLS or tool_name in self.TREE_TOOLS
+
+    # -- keys and fingerprints ---------------------------------------------
+
+    def _entry_path(self, tool_name: str, normalized_args: dict[str, Any]) -> Path:
+        key_json = json_codec.dumps_bytes(
+            {"tool": tool_name, "args": normalized_args, "root": str(self.root)},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(key_json).hexdigest()
+        tool_dir = re.sub(r"[^A-Za-z0-9._-]+", "_", tool_name)
+        return self.cache_dir / tool_dir / f"{digest}.json"
+
+    def _resolve(self, value: Any) -> Path:
+        path = Path(str(value)).expanduser()
+        return path if path.is_absolute() else self.root / path
+
+    def fingerprint(
+        self, tool_name: str, tool_args: dict[str, Any], walk: bool = True
+    ) -> str | None:
+        """Fingerprint the files a tool call reads.
+
+        Args:
+            tool_name: Name of the tool
+            tool_args: Arguments passed to the tool
+            walk: Whether a tree may be walked; if False only a memoized
+                tree fingerprint is used (for callers on the event loop)
+
+        Returns:
+            Fingerprint digest, or None if the call cannot be fingerprinted
+        """
+        if tool_name in self.FILE_TOOLS:
+            for key in self.FILE_ARG_KEYS:
+                if tool_args.get(key):
+                    return self._file_fingerprint(self._resolve(tool_args[key]))
+            return None
+
+        if tool_name in self.TREE_TOOLS:
+            target = self.root
+            for key in self.DIR_ARG_KEYS:
+                if tool_args.get(key):
+                    target = self._resolve(tool_args[key])
+                    break
+            if target.is_file():
+                return self._file_fingerprint(target)
+            return self._memoized_tree_fingerprint(target, walk)
+
+        return None
+
+    def _file_fingerprint(self, path: Path) -> str:
+        try:
+            if self.fingerprint_mode == "content":
+                return "sha256:" + hashlib.sha256(path.read_bytes()).hexdigest()
+            st = path.stat()
+            return f"stat:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            return "missing"
+
+    def _memoized_tree_fingerprint(self, root: Path, walk: bool) -> str | None:
+        with self._memo_lock:
+            memo = self._tree_memo.get(root)
+        if memo is not None and time.monotonic() - memo[0] <= self.tree_fingerprint_ttl:
+            return memo[1]
+        if not walk:
+            return None
+        computed_at = time.monotonic()
+        fingerprint = self._tree_fingerprint(root)
+        with self._memo_lock:
+            self._tree_memo[root] = (computed_at, fingerprint)
+        return fingerprint
+
+    def forget_fingerprints(self) -> None:
+        """Drop memoized tree fingerprints, e.g. after files were written."""
+        with self._memo_lock:
+            self._tree_memo.clear()
+
+    def _tree_fingerprint(self, root: Path) -> str | None:
+        digest = hashlib.sha256()
+        count = 0
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                digest.update(f"{directory}\0missing\n".encode())
+                continue
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                digest.update(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+                count += 1
+                if count > self.max_tree_files:
+                    return None
+                if is_dir and entry.name not in self._skip_dirs:
+                    stack.append(Path(entry.path))
+        return "tree:" + digest.hexdigest()
+
+    # -- index and eviction ------------------------------------------------
+
+    def _load_index(self) -> OrderedDict[Path, int]:
+        if self._index is None:
+            found: list[tuple[float, Path, int]] = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*/*.json"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, path, st.st_size))
+            found.sort()
+            self._index = OrderedDict((path, size) for _, path, size in found)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _drop(self, path: Path) -> None:
+        index = self._load_index()
+        self._total_bytes -= index.pop(path, 0)
+        path.unlink(missing_ok=True)
+
+    def _evict_to_fit(self) -> None:
+        index = self._load_index()
+        while index and self._total_bytes > self.max_bytes:
+            oldest = next(iter(index))
+            self._drop(oldest)
+            self._evictions += 1
+
+    # -- get / put ---------------------------------------------------------
+
+    def lookup(
+        self,
+        tool_name: str,
+        normalized_args: dict[str, Any],
+        tool_args: dict[str, Any],
+        walk: bool = True,
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Look up a fresh entry.
+
+        Args:
+            tool_name: Name of the tool
+            normalized_args: Arguments as used in the cache key
+            tool_args: Arguments passed to the tool
+            walk: Passed to ``fingerprint``
+
+        Returns:
+            (record or None, current fingerprint). The fingerprint is reused
+            by ``store`` so it reflects the files as they were before the
+            tool ran.
+        """
+        fingerprint = self.fingerprint(tool_name, tool_args, walk)
+        if fingerprint is None:
+            return None, None
+
+        path = self._entry_path(tool_name, normalized_args)
+        with self._lock:
+            try:
+                record = json_codec.loads(path.read_bytes())
+            except (OSError, ValueError):
+                self._misses += 1
+                return None, fingerprint
+
+            if (
+                record.get("fingerprint") != fingerprint
+                or time.time() - record.get("cached_at", 0) > self.ttl_seconds
+            ):
+                self._stale += 1
+                self._misses += 1
+                self._drop(path)
+                return None, fingerprint
+
+            index = self._load_index()
+            if path in index:
+                index.move_to_end(path)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._hits += 1
+            return record, fingerprint
+
+    def store(
+        self,
+        entry: CacheEntry,
+        normalized_args: dict[str, Any],
+        fingerprint: str | None,
+    ) -> None:
+        """Persist an entry under the fingerprint taken before execution."""
+        if fingerprint is None or entry.result_metadata.get("error"):
+            return
+        record = {
+            "tool_name": entry.tool_name,
+            "tool_args": entry.tool_args,
+            "result_output": entry.result_output,
+            "result_title": entry.result_title,
+            "result_metadata": entry.result_metadata,
+            "result_attachments": entry.result_attachments,
+            "cached_at": entry.cached_at,
+            "fingerprint": fingerprint,
+        }
+        try:
+            data = json_codec.dumps_bytes(record, default=str)
+        except (TypeError, ValueError):
+            return
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._entry_path(entry.tool_name, normalized_args)
+        with self._lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            except OSError as e:
+                logger.warning(f"Failed to persist tool result for {entry.tool_name}: {e}")
+                return
+            index = self._load_index()
+            self._total_bytes += len(data) - index.pop(path, 0)
+            index[path] = len(data)
+            self._evict_to_fit()
+
+    def invalidate(self, tool_name: str | None = None) -> int:
+        """Remove persisted entries, for one tool or all.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            index = self._load_index()
+            if tool_name is None:
+                paths = list(index)
+            else:
+                tool_dir = re.sub(r"[^A-Za-z0-9._-]+", "_", tool_name)
+                paths = [p for p in index if p.parent.name == tool_dir]
+            for path in paths:
+                self._drop(path)
+            return len(paths)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get disk tier statistics, prefixed ``disk_``."""
+        with self._lock:
+            index = self._load_index()
+            total = self._hits + self._misses
+            return {
+                "disk_hits": self._hits,
+                "disk_misses": self._misses,
+                "disk_stale": self._stale,
+                "disk_evictions": self._evictions,
+                "disk_entries": len(index),
+                "disk_bytes": self._total_bytes,
+                "disk_max_bytes": self.max_bytes,
+                "disk_hit_rate": self._hits / total if total > 0 else 0.0,
+            }
+
+
 class ToolResultCache:
     """LRU cache for tool execution results.
 
@@ -41,6 +417,8 @@ class ToolResultCache:
     - Access tracking for cache hit analytics
     - Configurable per-tool caching policies
     - Event bus integration for cache hit/miss events
+    - Optional persistent tier (``persist_dir``) validated by file
+      fingerprints, see ToolResultDiskCache
     """
 
     # Default tools that should be cached (read-only operations)
@@ -76,6 +454,11 @@ class ToolResultCache:
         default_ttl_seconds: float = 300.0,
         cacheable_tools: Optional[TypingSet[str]] = None,
         non_cacheable_tools: Optional[TypingSet[str]] = None,
+        persist_dir: Path | None = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        disk_ttl_seconds: float = 7 * 24 * 3600.0,
+        root: Path | None = None,
+        fingerprint_mode: Literal["stat", "content"] = "stat",
     ) -> None:
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._max_size = max_size
@@ -92,14 +475,27 @@ class ToolResultCache:
         self._hits = 0
         self._misses = 0
         self._evictions = 0
+
+        self._disk = (
+            ToolResultDiskCache(
+                persist_dir,
+                max_bytes=max_disk_bytes,
+                ttl_seconds=disk_ttl_seconds,
+                root=root,
+                fingerprint_mode=fingerprint_mode,
+            )
+            if persist_dir is not None
+            else None
+        )
+
     def _make_key(self, tool_name: str, tool_args: dict[str, Any]) -> str:
         """Generate a cache key from tool name and arguments.
 
         Uses SHA256 hash of normalized arguments for consistent keys.
         """
         normalized = self._normalize_args(tool_args)
-        args_json = json.dumps(normalized, sort_keys=True, default=str)
-        args_hash = hashlib.sha256(args_json.encode()).hexdigest()[:16]
+        args_json = json_codec.dumps_bytes(normalized, sort_keys=True, default=str)
+        args_hash = hashlib.sha256(args_json).hexdigest()[:16]
         return f"{tool_name}:{args_hash}"
 
     def _normalize_args(self, args: dict[str, Any]) -> dict[str, Any]:
@@ -155,18 +551,20 @@ class ToolResultCache:
 
         key = self._make_key(tool_name, tool_args)
 
-        if key not in self._cache:
-            self._misses += 1
-            return None
-
-        entry = self._cache[key]
-
-        # Check TTL expiration
-        age = time.time() - entry.cached_at
-        if age > entry.ttl_seconds:
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry.cached_at > entry.ttl_seconds:
+            # TTL expired
             self._evict(key)
-            self._misses += 1
-            return None
+            entry = None
+
+        if entry is None:
+            # Trees are only walked off the event loop; here a memoized
+            # fingerprint is used if there is one
+            record, _ = self._disk_lookup(tool_name, tool_args, walk=not _loop_running())
+            if record is None:
+                self._misses += 1
+                return None
+            entry = self._promote(key, tool_name, tool_args, record)
 
         # Move to end (most recently used)
         self._cache.move_to_end(key)
@@ -201,8 +599,13 @@ class ToolResultCache:
             - (entry, False) if result was just executed
         """
         if not self.is_cacheable(tool_name):
-            # Not cacheable - execute directly
-            output, title, metadata, attachments = await execute_fn()
+            # Not cacheable - execute directly. Such tools may write files,
+            # so memoized tree fingerprints no longer hold.
+            try:
+                output, title, metadata, attachments = await execute_fn()
+            finally:
+                if self._disk is not None:
+                    self._disk.forget_fingerprints()
             return CacheEntry(
                 tool_name=tool_name,
                 tool_args=tool_args,
@@ -273,8 +676,20 @@ class ToolResultCache:
             return entry, True
 
         # We're the executor
-        self._misses += 1
         try:
+            fingerprint = None
+            if self._disk is not None and self._disk.handles(tool_name):
+                record, fingerprint = await asyncio.to_thread(
+                    self._disk_lookup, tool_name, tool_args
+                )
+                if record is not None:
+                    async with self._lock:
+                        disk_entry = self._promote(key, tool_name, tool_args, record)
+                    self._hits += 1
+                    future.set_result(disk_entry)
+                    return disk_entry, True
+
+            self._misses += 1
             output, title, metadata, attachments = await execute_fn()
 
             # Store in cache
@@ -296,6 +711,9 @@ class ToolResultCache:
                 )
                 self._cache[key] = entry
 
+            if fingerprint is not None:
+                await asyncio.to_thread(self._disk_store, entry, fingerprint)
+
             # Complete the pending future
             future.set_result(entry)
             return entry, False
@@ -354,6 +772,7 @@ class ToolResultCache:
         )
 
         self._cache[key] = entry
+        self._disk_store(entry, walk=not _loop_running())
 
     async def aset(
         self,
@@ -399,6 +818,50 @@ class ToolResultCache:
             )
 
             self._cache[key] = entry
+
+        await asyncio.to_thread(self._disk_store, entry)
+
+    def _disk_lookup(
+        self, tool_name: str, tool_args: dict[str, Any], walk: bool = True
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Look up the disk tier (safe to run in a worker thread).
+
+        Returns:
+            (fresh record or None, fingerprint of the files the call reads)
+        """
+        if self._disk is None or not self._disk.handles(tool_name):
+            return None, None
+        return self._disk.lookup(tool_name, self._normalize_args(tool_args), tool_args, walk)
+
+    def _promote(
+        self, key: str, tool_name: str, tool_args: dict[str, Any], record: dict[str, Any]
+    ) -> CacheEntry:
+        """Load a disk record into the in-memory tier."""
+        while len(self._cache) >= self._max_size:
+            self._evict_oldest()
+        entry = CacheEntry(
+            tool_name=tool_name,
+            tool_args=tool_args,
+            result_output=record["result_output"],
+            result_title=record["result_title"],
+            result_metadata=record["result_metadata"] or {},
+            result_attachments=record["result_attachments"],
+            cached_at=time.time(),
+            ttl_seconds=self._default_ttl,
+        )
+        self._cache[key] = entry
+        return entry
+
+    def _disk_store(
+        self, entry: CacheEntry, fingerprint: str | None = None, walk: bool = True
+    ) -> None:
+        """Persist an entry to the disk tier, if enabled for its tool."""
+        if self._disk is None or not self._disk.handles(entry.tool_name):
+            return
+        if fingerprint is None:
+            fingerprint = self._disk.fingerprint(entry.tool_name, entry.tool_args, walk)
+        self._disk.store(entry, self._normalize_args(entry.tool_args), fingerprint)
+
     def _evict(self, key: str) -> None:
         """Remove a specific entry from the cache."""
         if key in self._cache:
@@ -439,6 +902,10 @@ class ToolResultCache:
         Returns:
             Number of entries invalidated
         """
+        if self._disk is not None:
+            self._disk.invalidate(tool_name)
+            self._disk.forget_fingerprints()
+
         if tool_name is None:
             count = len(self._cache)
             self._cache.clear()
@@ -454,12 +921,13 @@ class ToolResultCache:
         """Get cache statistics.
 
         Returns:
-            Dict with hits, misses, evictions, size, hit_rate
+            Dict with hits, misses, evictions, size, hit_rate, plus
+            ``disk_*`` counters when the persistent tier is enabled
         """
         total = self._hits + self._misses
         hit_rate = self._hits / total if total > 0 else 0.0
 
-        return {
+        stats = {
             "hits": self._hits,
             "misses": self._misses,
             "evictions": self._evictions,
@@ -467,6 +935,9 @@ class ToolResultCache:
             "max_size": self._max_size,
             "hit_rate": hit_rate,
         }
+        if self._disk is not None:
+            stats.update(self._disk.get_stats())
+        return stats
 
     def resize(self, new_max_size: int) -> int:
         """Resize the cache, evicting entries if necessary.
@@ -0,0 +1,457 @@
+"""HTTP response cache and shared client for web fetches.
+
+HTTPResponseCache is a private (single-user) HTTP cache on disk. Responses
+are kept while fresh according to Cache-Control (max-age, no-cache,
+no-store), Expires or, failing those, a heuristic based on Last-Modified.
+Stale entries are revalidated with If-None-Match / If-Modified-Since, and
+a 304 reply renews them without transferring or converting the body again.
+
+Each entry stores the raw body next to the tool's converted output, so a
+hit costs neither the transfer nor the conversion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from dawn_kestrel.core import json_codec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Response headers kept with an entry (and renewed by a 304)
+_STORED_HEADERS = (
+    "cache-control",
+    "content-type",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+)
+
+
+# =============================================================================
+# Shared client
+# =============================================================================
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared pooled client for outbound fetches.
+
+    Connections are kept alive and reused across calls. A client is bound to
+    the event loop it was created on, so a new one is made when called from
+    a different loop. Must be called from a running event loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client_loop is None:
+        _client_loop = loop  # installed with set_http_client
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _client_loop = loop
+    return _client
+
+
+def set_http_client(client: httpx.AsyncClient | None) -> None:
+    """Replace the shared client (None creates a default one on next use)."""
+    global _client, _client_loop
+    _client, _client_loop = client, None
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+# =============================================================================
+# Freshness
+# =============================================================================
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into lowercase directives and values."""
+    directives: dict[str, str | None] = {}
+    for item in (value or "").split(","):
+        name, _, arg = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _parse_seconds(value: str | None) -> float | None:
+    try:
+        return max(0.0, float(int(value))) if value is not None else None
+    except ValueError:
+        return None
+
+
+def freshness_lifetime(
+    headers: Mapping[str, str], max_heuristic_seconds: float = 24 * 3600.0
+) -> float:
+    """Seconds a response stays fresh, counted from when it was received.
+
+    Uses Cache-Control max-age, then Expires, then 10% of the time since
+    Last-Modified (capped at ``max_heuristic_seconds``), less the response's
+    Age. no-cache makes a response stale at once.
+    """
+    cache_control = parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0.0
+
+    date = _parse_date(headers.get("date")) or time.time()
+    lifetime = _parse_seconds(cache_control.get("max-age"))
+    if lifetime is None and "expires" in headers:
+        # An invalid Expires (e.g. "0") means already expired
+        expires = _parse_date(headers.get("expires"))
+        lifetime = max(0.0, expires - date) if expires is not None else 0.0
+    if lifetime is None:
+        last_modified = _parse_date(headers.get("last-modified"))
+        if last_modified is not None and "must-revalidate" not in cache_control:
+            lifetime = min(max(0.0, date - last_modified) * 0.1, max_heuristic_seconds)
+        else:
+            lifetime = 0.0
+
+    age = _parse_seconds(headers.get("age")) or 0.0
+    return max(0.0, lifetime - age)
+
+
+def is_storable(response: httpx.Response) -> bool:
+    """Whether a response may be cached at all."""
+    if response.status_code != 200 or response.request.method != "GET":
+        return False
+    if "no-store" in parse_cache_control(response.headers.get("cache-control")):
+        return False
+    return response.headers.get("vary", "").strip() != "*"
+
+
+# =============================================================================
+# Disk cache
+# =============================================================================
+
+
+@dataclass
+class CachedResponse:
+    """A stored response and the converted output derived from it."""
+
+    url: str
+    variant: str
+    headers: dict[str, str]
+    output: str
+    output_metadata: dict[str, Any]
+    stored_at: float
+    fresh_until: float
+    body_size: int = 0
+    key: str = field(default="", repr=False)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) < self.fresh_until
+
+    def validators(self) -> dict[str, str]:
+        """Request headers revalidating this entry."""
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+class HTTPResponseCache:
+    """Disk-backed private HTTP cache for fetched pages.
+
+    Entries are keyed by URL and a variant (the tool's output format, which
+    also selects the Accept header). Each is two files under ``cache_dir``:
+    ``<key>.body`` with the raw response body and ``<key>.json`` with the
+    response headers, freshness and converted output. Total size is
+    bounded; least recently used entries are evicted first.
+
+    Responses that are neither fresh nor revalidatable (no ETag or
+    Last-Modified) are not stored.
+
+    Thread safety:
+        Safe to call from worker threads (callers use ``asyncio.to_thread``).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 128 * 1024 * 1024,
+        max_heuristic_seconds: float = 24 * 3600.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which entries are evicted
+            max_heuristic_seconds: Cap on freshness inferred from Last-Modified
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_heuristic_seconds = max_heuristic_seconds
+
+        self._lock = threading.Lock()
+        # Entry key -> size of both files, least recently used first
+        self._index: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+    def _key(self, url: str, variant: str) -> str:
+        return hashlib.sha256(f"{variant}\0{url}".encode()).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    # -- index and eviction ------------------------------------------------
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            found: list[tuple[float, str, int]] = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.json"):
+                    body = path.with_suffix(".body")
+                    try:
+                        st = path.stat()
+                        size = st.st_size + (body.stat().st_size if body.exists() else 0)
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, path.stem, size))
+            found.sort()
+            self._index = OrderedDict((key, size) for _, key, size in found)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        self._total_bytes -= self._load_index().pop(key, 0)
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def _evict_to_fit(self) -> None:
+        index = self._load_index()
+        while index and self._total_bytes > self.max_bytes:
+            self._drop(next(iter(index)))
+            self._evictions += 1
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _write_record(self, entry: CachedResponse) -> int:
+        record = asdict(entry)
+        del record["key"]
+        data = json_codec.dumps_bytes(record)
+        self._write(self._paths(entry.key)[0], data)
+        return len(data)
+
+    # -- get / put ---------------------------------------------------------
+
+    def lookup(self, url: str, variant: str) -> CachedResponse | None:
+        """Get the stored entry for a URL, fresh or not (see ``is_fresh``)."""
+        key = self._key(url, variant)
+        meta_path, _ = self._paths(key)
+        with self._lock:
+            try:
+                record = json_codec.loads(meta_path.read_bytes())
+                entry = CachedResponse(**record, key=key)
+            except (OSError, ValueError, TypeError):
+                self._misses += 1
+                return None
+
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+            try:
+                os.utime(meta_path)
+            except OSError:
+                pass
+            if entry.is_fresh():
+                self._hits += 1
+            else:
+                self._stale += 1
+            return entry
+
+    def store(
+        self,
+        url: str,
+        variant: str,
+        response: httpx.Response,
+        output: str,
+        output_metadata: dict[str, Any],
+    ) -> CachedResponse | None:
+        """Store a response with its converted output.
+
+        Returns:
+            The new entry, or None if the response is not cacheable
+        """
+        if not is_storable(response):
+            return None
+        headers = {
+            name: response.headers[name] for name in _STORED_HEADERS if name in response.headers
+        }
+        lifetime = freshness_lifetime(response.headers, self.max_heuristic_seconds)
+        if lifetime <= 0 and "etag" not in headers and "last-modified" not in headers:
+            return None
+
+        now = time.time()
+        key = self._key(url, variant)
+        body = response.content
+        entry = CachedResponse(
+            url=url,
+            variant=variant,
+            headers=headers,
+            output=output,
+            output_metadata=output_metadata,
+            stored_at=now,
+            fresh_until=now + lifetime,
+            body_size=len(body),
+            key=key,
+        )
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # The record is written last, so a crash never leaves it
+                # pointing at a missing or partial body
+                self._write(body_path, body)
+                size = len(body) + self._write_record(entry)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to cache response for {url}: {e}")
+                return None
+            index = self._load_index()
+            self._total_bytes += size - index.pop(key, 0)
+            index[key] = size
+            self._evict_to_fit()
+        return entry
+
+    def revalidated(self, entry: CachedResponse, response: httpx.Response) -> CachedResponse:
+        """Renew an entry from a 304 Not Modified response."""
+        headers = dict(entry.headers)
+        for name in _STORED_HEADERS:
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        now = time.time()
+        entry.headers = headers
+        entry.stored_at = now
+        entry.fresh_until = now + freshness_lifetime(response.headers, self.max_heuristic_seconds)
+        with self._lock:
+            self._revalidations += 1
+            try:
+                self._write_record(entry)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to renew cached response for {entry.url}: {e}")
+        return entry
+
+    def read_body(self, entry: CachedResponse) -> bytes | None:
+        """Raw body of an entry (None if it was evicted)."""
+        try:
+            return self._paths(entry.key)[1].read_bytes()
+        except OSError:
+            return None
+
+    def invalidate(self, url: str | None = None) -> int:
+        """Remove stored entries, for one URL (all variants) or all.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            index = self._load_index()
+            if url is None:
+                keys = list(index)
+            else:
+                keys = []
+                for key in index:
+                    try:
+                        record = json_codec.loads(self._paths(key)[0].read_bytes())
+                    except (OSError, ValueError):
+                        continue
+                    if record.get("url") == url:
+                        keys.append(key)
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            index = self._load_index()
+            total = self._hits + self._misses + self._stale
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "revalidations": self._revalidations,
+                "evictions": self._evictions,
+                "entries": len(index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self._hits / total if total > 0 else 0.0,
+            }
+
+
+_response_cache: HTTPResponseCache | None = None
+
+
+def get_response_cache() -> HTTPResponseCache:
+    """Get the process-wide response cache (under the settings cache dir)."""
+    global _response_cache
+    if _response_cache is None:
+        from dawn_kestrel.core.settings import settings
+
+        _response_cache = HTTPResponseCache(settings.cache_dir_path() / "webfetch")
+    return _response_cache
+
+
+def set_response_cache(cache: HTTPResponseCache | None) -> None:
+    """Replace the process-wide response cache (None restores the default)."""
+    global _response_cache
+    _response_cache = cache
+
+
+__all__ = [
+    "CachedResponse",
+    "HTTPResponseCache",
+    "close_http_client",
+    "freshness_lifetime",
+    "get_http_client",
+    "get_response_cache",
+    "is_storable",
+    "parse_cache_control",
+    "set_http_client",
+    "set_response_cache",
+]
@@ -1,7 +1,11 @@
 """Utility functions for parsing and cleaning JSON from LLM responses."""
 from __future__ import annotations
 
+import json
 import re
+from typing import Any, cast
+
+import pydantic as pd
 
 
 def strip_json_code_blocks(text: str) -> str:
@@ -63,3 +67,216 @@ def strip_any_code_blocks(text: str) -> str:
 
     # No code blocks found, return original text
     return text.strip()
+
+
+class IncrementalJSONParser:
+    """Incrementally extract the first JSON object from streamed LLM text.
+
+    Text deltas are fed as they arrive. The parser skips leading prose and
+    markdown fences, tracks nesting of the first ``{`` it finds, and reports
+    completion as soon as the top-level object closes so the caller can stop
+    the stream instead of paying for trailing prose tokens.
+
+    When a pydantic model is supplied, each top-level member is validated
+    against the matching model field as soon as the member is complete, so
+    schema violations surface mid-stream rather than after the full response.
+
+    Only newly appended characters are scanned on each ``feed`` call.
+
+    Example:
+        parser = IncrementalJSONParser(model=ReasonOutput)
+        async for delta in deltas:
+            if parser.feed(delta):
+                break
+        data = parser.result
+    """
+
+    def __init__(self, model: type[pd.BaseModel] | None = None) -> None:
+        """Initialize parser.
+
+        Args:
+            model: Optional pydantic model used to validate fields incrementally.
+        """
+        self.model = model
+        self.result: dict[str, Any] | None = None
+        self.errors: list[str] = []
+        self.done = False
+        self._chunks: list[str] = []
+        self._object: list[str] = []
+        self._member: list[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._adapters: dict[str, pd.TypeAdapter[Any]] = {}
+        self._keys: dict[str, str] | None = None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    @property
+    def failed(self) -> bool:
+        """Whether parsing stopped because of a malformed member or schema violation."""
+        return bool(self.errors)
+
+    def feed(self, chunk: str) -> bool:
+        """Feed a text delta into the parser.
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            True once the top-level object has closed or a violation was found,
+            meaning no further input is needed.
+        """
+        if self.done or not chunk:
+            return self.done
+        self._chunks.append(chunk)
+        # Start offsets within this chunk of the open object and member;
+        # earlier pieces are buffered in self._object / self._member
+        object_start = member_start = 0
+        i = 0
+        end = len(chunk)
+
+        while i < end:
+            if not self._started:
+                i = chunk.find("{", i)
+                if i == -1:
+                    return self.done
+                self._started = True
+                self._object = []
+                self._member = []
+                object_start = i
+                member_start = i + 1
+                self._depth = 1
+                i += 1
+                continue
+
+            char = chunk[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    i += 1
+                    candidate = "".join(self._object) + chunk[object_start:i]
+                    member = "".join(self._member) + chunk[member_start : i - 1]
+                    if self._close_object(candidate, member):
+                        return self.done
+                    continue
+            elif char == "," and self._depth == 1:
+                member = "".join(self._member) + chunk[member_start:i]
+                if not self._check_member(member):
+                    return self.done
+                self._member = []
+                member_start = i + 1
+            i += 1
+
+        if self._started:
+            self._object.append(chunk[object_start:])
+            self._member.append(chunk[member_start:])
+        return self.done
+
+    def _close_object(self, candidate: str, member: str) -> bool:
+        """Handle the close of a candidate top-level object.
+
+        Args:
+            candidate: Text of the object from its opening brace
+            member: Text of the last top-level member
+
+        Returns:
+            True if parsing is finished; False if scanning should resume
+            after a non-JSON brace span in surrounding prose.
+        """
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            # Braces in prose such as "{placeholder}" - keep looking
+            self._started = False
+            self._in_string = False
+            self._escape = False
+            return False
+
+        if self._check_member(member):
+            self.result = cast(dict[str, Any], parsed)
+        self.done = True
+        return True
+
+    def _check_member(self, member: str) -> bool:
+        """Validate one complete top-level ``"key": value`` member.
+
+        Returns:
+            False if the member violates the schema, which finishes parsing.
+        """
+        if self.model is None or not member.strip():
+            return True
+        try:
+            key, value = next(iter(json.loads("{" + member + "}").items()))
+        except (json.JSONDecodeError, StopIteration):
+            # Not valid JSON (yet): the final json.loads decides
+            return True
+
+        field_name = self._field_names().get(key)
+        if field_name is None:
+            if self.model.model_config.get("extra") == "forbid":
+                self._fail(f"{key}: unexpected field for {self.model.__name__}")
+                return False
+            return True
+
+        field = self.model.model_fields[field_name]
+        adapter = self._adapters.get(key)
+        if adapter is None:
+            adapter = pd.TypeAdapter(field.annotation)
+            self._adapters[key] = adapter
+        try:
+            adapter.validate_python(value)
+        except pd.ValidationError as e:
+            self._fail(f"{key}: {e.errors()[0].get('msg', 'invalid value')}")
+            return False
+        return True
+
+    def _field_names(self) -> dict[str, str]:
+        """Map JSON keys (field aliases where set) to model field names."""
+        if self._keys is None:
+            assert self.model is not None
+            fields = self.model.model_fields
+            self._keys = {field.alias or name: name for name, field in fields.items()}
+            if self.model.model_config.get("populate_by_name"):
+                for name in fields:
+                    self._keys.setdefault(name, name)
+        return self._keys
+
+    def _fail(self, error: str) -> None:
+        self.errors.append(error)
+        self.result = None
+        self.done = True
+
+
+def extract_json_object(text: str) -> dict[str, Any] | None:
+    """Extract the first JSON object from complete LLM response text.
+
+    Handles markdown code blocks, leading and trailing prose, and brace
+    placeholders in prose that precede the actual object.
+
+    Args:
+        text: Response text that may contain a JSON object
+
+    Returns:
+        Parsed dict or None if no complete object was found
+    """
+    if not text:
+        return None
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.result
@@ -0,0 +1,234 @@
+"""Tests for InMemoryAgentExecutionQueue on its shared worker pool."""
+
+import asyncio
+
+import pytest
+
+from dawn_kestrel.agents.execution_queue import (
+    SHARED_POOL_DEFAULT_WORKERS,
+    AgentExecutionJob,
+    InMemoryAgentExecutionQueue,
+    get_shared_execution_queue,
+    set_shared_execution_queue,
+)
+
+
+def _jobs(count: int) -> list[AgentExecutionJob]:
+    return [AgentExecutionJob(index=i, task_id=f"task-{i}") for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_run_jobs_collects_results_and_errors() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=2)
+
+    async def execute(job: AgentExecutionJob) -> str:
+        if job.index == 1:
+            raise RuntimeError("boom")
+        return job.task_id
+
+    result = await executor.run_jobs(_jobs(4), execute)
+
+    assert result.completed_task_ids == ["task-0", "task-2", "task-3"]
+    assert result.errors_by_index == {1: "boom"}
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_batches_reuse_queue_and_pool() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=2)
+
+    async def execute(job: AgentExecutionJob) -> str:
+        return job.task_id
+
+    await executor.run_jobs(_jobs(3), execute)
+    queue, pool = executor._queue, executor._pool
+    await executor.run_jobs(_jobs(3), execute)
+
+    assert executor._queue is queue
+    assert executor._pool is pool
+    assert queue is not None and queue._tasks == {}
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited_to_max_workers() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=2)
+    active = 0
+    peak = 0
+
+    async def execute(job: AgentExecutionJob) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return job.task_id
+
+    results = await asyncio.gather(
+        executor.run_jobs(_jobs(4), execute), executor.run_jobs(_jobs(4), execute)
+    )
+
+    assert peak == 2
+    assert all(len(r.completed_task_ids) == 4 for r in results)
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_running_jobs() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=1, timeout_seconds=0.05)
+    cancelled = []
+
+    async def execute(job: AgentExecutionJob) -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(job.index)
+            raise
+        return job.task_id
+
+    result = await executor.run_jobs(_jobs(2), execute)
+    await asyncio.sleep(0)
+
+    assert result.completed_task_ids == []
+    assert result.errors_by_index == {
+        0: "Timeout waiting for completion",
+        1: "Timeout waiting for completion",
+    }
+    assert cancelled == [0]
+
+    # The pool is still usable after a timed-out batch
+    async def quick(job: AgentExecutionJob) -> str:
+        return job.task_id
+
+    executor.timeout_seconds = 5.0
+    assert (await executor.run_jobs(_jobs(2), quick)).completed_task_ids == ["task-0", "task-1"]
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_caller_quota_limits_each_caller() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=4)
+    active: dict[str, int] = {"a": 0, "b": 0}
+    peak: dict[str, int] = {"a": 0, "b": 0}
+    total_peak = 0
+
+    def make_execute(caller: str):
+        async def execute(job: AgentExecutionJob) -> str:
+            nonlocal total_peak
+            active[caller] += 1
+            peak[caller] = max(peak[caller], active[caller])
+            total_peak = max(total_peak, sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[caller] -= 1
+            return job.task_id
+
+        return execute
+
+    results = await asyncio.gather(
+        executor.run_jobs(_jobs(4), make_execute("a"), caller="a", quota=1),
+        executor.run_jobs(_jobs(4), make_execute("a"), caller="a", quota=1),
+        executor.run_jobs(_jobs(6), make_execute("b"), caller="b", quota=3),
+    )
+
+    assert peak == {"a": 1, "b": 3}
+    assert total_peak <= 4
+    assert [len(r.completed_task_ids) for r in results] == [4, 4, 6]
+    assert executor.get_stats()["active_callers"] == 0
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_resize_changes_concurrency() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=1)
+    active = 0
+    peak = 0
+
+    async def execute(job: AgentExecutionJob) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return job.task_id
+
+    await executor.run_jobs(_jobs(3), execute)
+    assert peak == 1
+
+    await executor.resize(3)
+    await executor.run_jobs(_jobs(6), execute)
+    assert peak == 3
+
+    # Shrinking while busy lets the removed workers finish their job
+    batch = asyncio.ensure_future(executor.run_jobs(_jobs(6), execute))
+    await asyncio.sleep(0.005)
+    await executor.resize(1)
+    result = await batch
+
+    assert len(result.completed_task_ids) == 6
+    assert executor.get_stats()["max_workers"] == 1
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_nested_fan_out_does_not_deadlock() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=2, timeout_seconds=2.0)
+    active = 0
+    peak = 0
+
+    async def leaf(job: AgentExecutionJob) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return job.task_id
+
+    async def parent(job: AgentExecutionJob) -> str:
+        # Each parent fans out again on the same (full) pool
+        children = [AgentExecutionJob(index=i, task_id=f"{job.task_id}.{i}") for i in range(3)]
+        result = await executor.run_jobs(children, leaf)
+        assert result.errors_by_index == {}
+        return ",".join(result.completed_task_ids)
+
+    result = await asyncio.wait_for(executor.run_jobs(_jobs(2), parent), timeout=5)
+
+    assert result.errors_by_index == {}
+    assert result.completed_task_ids == [
+        "task-0.0,task-0.1,task-0.2",
+        "task-1.0,task-1.1,task-1.2",
+    ]
+    # Waiting parents give up their slot; leaves stay within max_workers
+    assert peak == 2
+    assert executor.get_stats()["running_jobs"] == 0
+    await executor.close()
+
+
+@pytest.mark.asyncio
+async def test_nested_batch_timeout() -> None:
+    executor = InMemoryAgentExecutionQueue(max_workers=1)
+
+    async def slow(job: AgentExecutionJob) -> str:
+        await asyncio.sleep(10)
+        return job.task_id
+
+    async def parent(job: AgentExecutionJob) -> str:
+        result = await executor.run_jobs(_jobs(2), slow, timeout_seconds=0.05)
+        return str(sorted(result.errors_by_index))
+
+    result = await executor.run_jobs(_jobs(1), parent)
+
+    assert result.completed_task_ids == ["[0, 1]"]
+    assert executor.get_stats()["running_jobs"] == 0
+    await executor.close()
+
+
+def test_shared_execution_queue_singleton() -> None:
+    custom = InMemoryAgentExecutionQueue(max_workers=2)
+    try:
+        set_shared_execution_queue(custom)
+        assert get_shared_execution_queue() is custom
+        set_shared_execution_queue(None)
+        assert get_shared_execution_queue() is not custom
+        assert get_shared_execution_queue().max_workers == SHARED_POOL_DEFAULT_WORKERS
+    finally:
+        set_shared_execution_queue(None)
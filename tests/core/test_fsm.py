@@ -1565,6 +1565,132 @@ class TestFSMStateRepository:
         assert get_result.unwrap() == "completed"
 
 
+class TestBufferedFSMStateRepository:
+    """Test write-behind FSM state repository."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create real SessionStorage in a temporary directory."""
+        from dawn_kestrel.storage.store import SessionStorage
+
+        return SessionStorage(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_coalesces_transitions_into_one_write(self, storage):
+        """Rapid transitions of one FSM are written once, with the last state."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        repo = BufferedFSMStateRepository(storage, flush_interval=60)
+        for state in ("idle", "running", "completed"):
+            assert (await repo.set_state("fsm-1", state)).is_ok()
+        await repo.set_state("fsm-2", "idle")
+
+        assert await storage.read(["fsm_state", "fsm-1"]) is None
+        assert repo.pending_count == 2
+
+        assert (await repo.close()).is_ok()
+
+        assert await storage.read(["fsm_state", "fsm-1"]) == {"state": "completed"}
+        assert await storage.read(["fsm_state", "fsm-2"]) == {"state": "idle"}
+        assert repo.stats["flushes"] == 1
+        assert repo.stats["states_written"] == 2
+        assert repo.stats["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_state_reads_through_buffer(self, storage):
+        """get_state returns buffered state before it is written."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        await storage.write(["fsm_state", "fsm-1"], {"state": "idle"})
+        repo = BufferedFSMStateRepository(storage, flush_interval=60)
+
+        assert (await repo.get_state("fsm-1")).unwrap() == "idle"
+        await repo.set_state("fsm-1", "running")
+        assert (await repo.get_state("fsm-1")).unwrap() == "running"
+        assert (await repo.get_state("missing")).code == "NOT_FOUND"
+        await repo.close()
+
+    @pytest.mark.asyncio
+    async def test_background_flush(self, storage):
+        """Buffered states are written after flush_interval."""
+        import asyncio
+
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        repo = BufferedFSMStateRepository(storage, flush_interval=0.01)
+        await repo.set_state("fsm-1", "running")
+
+        for _ in range(100):
+            if repo.pending_count == 0 and repo.stats["flushes"]:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await storage.read(["fsm_state", "fsm-1"]) == {"state": "running"}
+        await repo.close()
+
+    @pytest.mark.asyncio
+    async def test_max_pending_triggers_flush(self, storage):
+        """Reaching max_pending dirty FSMs flushes immediately."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        repo = BufferedFSMStateRepository(storage, flush_interval=60, max_pending=3)
+        for i in range(3):
+            await repo.set_state(f"fsm-{i}", "running")
+
+        assert repo.pending_count == 0
+        assert await storage.read(["fsm_state", "fsm-2"]) == {"state": "running"}
+        await repo.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_durability_waits_for_write(self, storage):
+        """durability="flush" persists before set_state returns."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        repo = BufferedFSMStateRepository(storage, durability="flush")
+        await repo.set_state("fsm-1", "running")
+
+        assert await storage.read(["fsm_state", "fsm-1"]) == {"state": "running"}
+        await repo.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_states_buffered(self, storage):
+        """States stay buffered and readable when the batch write fails."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        repo = BufferedFSMStateRepository(storage, flush_interval=60)
+        await repo.set_state("fsm-1", "running")
+
+        with patch.object(storage, "write_many", side_effect=OSError("disk full")):
+            result = await repo.flush()
+
+        assert result.is_err()
+        assert result.code == "STORAGE_ERROR"
+        assert (await repo.get_state("fsm-1")).unwrap() == "running"
+
+        assert (await repo.close()).is_ok()
+        assert await storage.read(["fsm_state", "fsm-1"]) == {"state": "running"}
+
+    @pytest.mark.asyncio
+    async def test_set_state_after_close_fails(self, storage):
+        """set_state on a closed repository returns Err."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        async with BufferedFSMStateRepository(storage) as repo:
+            await repo.set_state("fsm-1", "idle")
+
+        result = await repo.set_state("fsm-1", "running")
+        assert result.is_err()
+        assert result.code == "CLOSED"
+        assert await storage.read(["fsm_state", "fsm-1"]) == {"state": "idle"}
+
+    def test_invalid_durability_raises(self, storage):
+        """Unknown durability mode raises ValueError."""
+        from dawn_kestrel.core.fsm_state_repository import BufferedFSMStateRepository
+
+        with pytest.raises(ValueError):
+            BufferedFSMStateRepository(storage, durability="sometimes")
+
+
 class TestFSMGuards:
     """Test FSM guard condition storage in builder."""
 
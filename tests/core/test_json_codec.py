@@ -0,0 +1,111 @@
+"""Tests for the pluggable JSON codec.
+
+Tests cover:
+- Compact, sorted and indented encoding with both backends
+- Fallback for values orjson cannot encode
+- Storage writing compact records and reading pretty-printed ones
+- Swapping the process-wide codec
+"""
+
+import json
+
+import pytest
+
+from dawn_kestrel.core import json_codec
+from dawn_kestrel.core.json_codec import (
+    ORJSON_AVAILABLE,
+    JSONCodec,
+    OrjsonCodec,
+    StdlibCodec,
+    load_codec,
+    set_codec,
+)
+from dawn_kestrel.storage.store import Storage
+
+CODECS = [StdlibCodec] + ([OrjsonCodec] if ORJSON_AVAILABLE else [])
+
+
+@pytest.fixture
+def restore_codec():
+    yield
+    set_codec(None)
+
+
+@pytest.mark.parametrize("codec_cls", CODECS)
+class TestCodecs:
+    def test_compact_utf8(self, codec_cls):
+        codec = codec_cls()
+
+        data = codec.dumps({"b": 1, "a": ["é", None, 1.5]})
+
+        assert data == '{"b":1,"a":["é",null,1.5]}'.encode()
+        assert codec.loads(data) == {"b": 1, "a": ["é", None, 1.5]}
+        assert codec.loads(data.decode()) == codec.loads(bytearray(data))
+
+    def test_sorted_and_indented(self, codec_cls):
+        codec = codec_cls()
+
+        assert codec.dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+        assert codec.loads(codec.dumps({"a": [1]}, indent=True)) == {"a": [1]}
+        assert b"\n" in codec.dumps({"a": [1]}, indent=True)
+
+    def test_default_and_non_str_keys(self, codec_cls):
+        codec = codec_cls()
+
+        assert codec.loads(codec.dumps({1: {1, 2} - {2}}, default=list)) == {"1": [1]}
+
+    def test_decode_error_type(self, codec_cls):
+        with pytest.raises(json.JSONDecodeError):
+            codec_cls().loads(b"{not json")
+
+
+@pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")
+def test_orjson_falls_back_for_big_ints():
+    assert OrjsonCodec().loads(OrjsonCodec().dumps({"n": 2**70})) == {"n": 2**70}
+
+
+def test_load_codec():
+    assert isinstance(load_codec("stdlib"), StdlibCodec)
+    assert isinstance(load_codec(), JSONCodec)
+    with pytest.raises(ValueError):
+        load_codec("yaml")
+
+
+@pytest.mark.parametrize("codec_name", ["stdlib", "auto"])
+async def test_storage_round_trip(tmp_path, restore_codec, codec_name):
+    set_codec(load_codec(codec_name))
+    storage = Storage(tmp_path)
+
+    await storage.write(["session", "p1", "s1"], {"id": "s1", "title": "héllo"})
+
+    path = tmp_path / "storage" / "session" / "p1" / "s1.json"
+    assert path.read_text(encoding="utf-8") == '{"id":"s1","title":"héllo"}'
+    assert await storage.read(["session", "p1", "s1"]) == {"id": "s1", "title": "héllo"}
+
+
+async def test_storage_reads_pretty_printed_records(tmp_path):
+    storage = Storage(tmp_path)
+    path = tmp_path / "storage" / "session" / "p1" / "old.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"id": "old", "n": [1, 2]}, indent=2))
+
+    assert await storage.read(["session", "p1", "old"]) == {"id": "old", "n": [1, 2]}
+
+    path.write_text("{torn")
+    assert await storage.read(["session", "p1", "old"]) is None
+
+
+def test_module_helpers_use_process_codec(restore_codec):
+    class Recording(StdlibCodec):
+        name = "recording"
+        calls = 0
+
+        def dumps(self, obj, **kwargs):
+            Recording.calls += 1
+            return super().dumps(obj, **kwargs)
+
+    set_codec(Recording())
+
+    assert json_codec.dumps({"a": 1}) == '{"a":1}'
+    assert json_codec.loads(json_codec.dumps_bytes([1])) == [1]
+    assert Recording.calls == 2
@@ -0,0 +1,112 @@
+"""Tests for compact message and part records.
+
+Tests cover:
+- Records for every part type carrying exactly the model's fields
+- Loading stored messages without validation
+"""
+
+from dataclasses import asdict
+
+import pytest
+
+from dawn_kestrel.core.models import (
+    AgentPart,
+    CompactionPart,
+    FilePart,
+    Message,
+    PatchPart,
+    ReasoningPart,
+    RetryPart,
+    SnapshotPart,
+    SubtaskPart,
+    TextPart,
+    TokenUsage,
+    ToolPart,
+    ToolState,
+)
+from dawn_kestrel.core.part_records import (
+    PART_RECORD_TYPES,
+    MessageRecord,
+    TextPartRecord,
+    ToolPartRecord,
+    ToolStateRecord,
+    part_record_from_dict,
+)
+
+IDS = {"session_id": "s1", "message_id": "m1"}
+
+PARTS = [
+    TextPart(id="p1", part_type="text", text="héllo", time={"start": 1.0}, **IDS),
+    FilePart(id="p2", part_type="file", url="file:///a", mime="text/plain", **IDS),
+    ToolPart(
+        id="p3",
+        part_type="tool",
+        tool="read",
+        call_id="c1",
+        state=ToolState(status="completed", input={"filePath": "a"}, output="x", time_start=1.0),
+        **IDS,
+    ),
+    ReasoningPart(id="p4", part_type="reasoning", text="hmm", **IDS),
+    SnapshotPart(id="p5", part_type="snapshot", snapshot="abc", **IDS),
+    PatchPart(id="p6", part_type="patch", hash="h", files=["a", "b"], **IDS),
+    AgentPart(id="p7", part_type="agent", name="explore", **IDS),
+    SubtaskPart(id="p8", part_type="subtask", category="c", **IDS),
+    RetryPart(id="p9", part_type="retry", attempt=2, **IDS),
+    CompactionPart(id="p10", part_type="compaction", auto=True, **IDS),
+]
+
+
+def _message() -> Message:
+    return Message(
+        id="m1",
+        session_id="s1",
+        role="assistant",
+        time={"created": 1.0},
+        text="done",
+        parts=PARTS,
+        token_usage=TokenUsage(input=3, output=4),
+        metadata={"k": "v"},
+    )
+
+
+def test_every_part_type_has_a_record():
+    assert set(PART_RECORD_TYPES) == {part.part_type for part in PARTS}
+
+
+@pytest.mark.parametrize("part", PARTS, ids=lambda p: p.part_type)
+def test_part_fields_match_model(part):
+    dumped = part.model_dump(mode="json")
+
+    record = part_record_from_dict(dumped)
+
+    assert asdict(record) == dumped
+    assert list(asdict(record)) == list(dumped)
+
+
+def test_records_are_slotted():
+    record = part_record_from_dict(PARTS[2].model_dump(mode="json"))
+
+    assert isinstance(record, ToolPartRecord)
+    assert isinstance(record.state, ToolStateRecord)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unknown = 1
+
+
+def test_from_dict_ignores_extra_keys_and_requires_fields():
+    record = TextPartRecord.from_dict({"id": "p", "text": "t", "extra": 1, **IDS})
+    assert record.part_type == "text"
+
+    with pytest.raises(TypeError):
+        TextPartRecord.from_dict({"id": "p", **IDS})
+    with pytest.raises(ValueError):
+        part_record_from_dict({"part_type": "bogus"})
+
+
+def test_message_record_from_stored_dict():
+    dumped = _message().model_dump(mode="json")
+
+    record = MessageRecord.from_dict(dumped)
+
+    assert asdict(record) == dumped
+    assert [part.part_type for part in record.parts] == [part.part_type for part in PARTS]
@@ -0,0 +1,214 @@
+"""Tests for token counting.
+
+Tests cover:
+- TiktokenTokenizer with a locally built BPE vocabulary (no network)
+- EstimatingTokenizer offline estimates
+- Loading the process-wide tokenizer off the event loop
+- count_message_tokens caching in message metadata
+- SessionCompactor using the pluggable tokenizer
+"""
+
+import threading
+
+import pytest
+
+from dawn_kestrel.compaction import SessionCompactor
+from dawn_kestrel.core.models import Message, TextPart, ToolPart, ToolState
+from dawn_kestrel.core import tokenizer as tokenizer_module
+from dawn_kestrel.core.tokenizer import (
+    EstimatingTokenizer,
+    TiktokenTokenizer,
+    Tokenizer,
+    count_message_tokens,
+    get_tokenizer,
+    load_tokenizer,
+    preload_tokenizer,
+    set_tokenizer,
+)
+
+tiktoken = pytest.importorskip("tiktoken")
+
+
+def _local_encoding():
+    """Byte-level BPE with a handful of merges, built without downloads."""
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in (b"he", b"ll", b"llo", b"hello", b" w", b"or", b" wor", b"ld", b" world"):
+        ranks[merge] = len(ranks)
+    return tiktoken.Encoding(
+        name="test_bpe",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+
+
+class CountingTokenizer:
+    """Counts words and records calls."""
+
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+def _message(text: str, *parts) -> Message:
+    return Message(id="m1", session_id="s1", role="user", text=text, parts=list(parts))
+
+
+def _text_part(text: str) -> TextPart:
+    return TextPart(id="p1", session_id="s1", message_id="m1", part_type="text", text=text)
+
+
+class TestTokenizers:
+    def test_tiktoken_counts_bpe_tokens(self):
+        tokenizer = TiktokenTokenizer(_local_encoding())
+
+        assert tokenizer.name == "tiktoken:test_bpe"
+        assert tokenizer.count("hello world") == 2
+        assert tokenizer.count("hellx") == 3  # he + ll + x
+        assert tokenizer.count("") == 0
+
+    def test_estimator_is_close_to_bpe_scale(self):
+        tokenizer = EstimatingTokenizer()
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+
+        # cl100k encodes this sentence in 10 tokens
+        assert 180 <= tokenizer.count(text) <= 220
+        assert tokenizer.count("") == 0
+
+    def test_estimator_splits_digits_and_long_words(self):
+        tokenizer = EstimatingTokenizer()
+
+        assert tokenizer.count("123456789") == 3
+        assert tokenizer.count("internationalization") > 1
+
+    def test_load_tokenizer_estimate(self):
+        assert isinstance(load_tokenizer("estimate"), EstimatingTokenizer)
+        assert isinstance(EstimatingTokenizer(), Tokenizer)
+
+
+class TestDefaultTokenizer:
+    @pytest.fixture
+    def slow_load(self, monkeypatch):
+        """Make loading block until the returned event is set."""
+        release = threading.Event()
+        loaded = CountingTokenizer()
+
+        def load(encoding_name):
+            release.wait(5)
+            return loaded
+
+        monkeypatch.setattr(tokenizer_module, "load_tokenizer", load)
+        set_tokenizer(None)
+        yield release, loaded
+        release.set()
+        set_tokenizer(None)
+
+    async def test_loads_off_the_event_loop(self, slow_load):
+        release, loaded = slow_load
+
+        # Neither call blocks the loop on the pending load
+        assert isinstance(get_tokenizer(), EstimatingTokenizer)
+        assert isinstance(await preload_tokenizer(timeout_seconds=0.05), EstimatingTokenizer)
+
+        release.set()
+        assert await preload_tokenizer() is loaded
+        assert get_tokenizer() is loaded
+
+    def test_loads_synchronously_without_event_loop(self, slow_load):
+        release, loaded = slow_load
+        release.set()
+
+        assert get_tokenizer() is loaded
+
+
+class TestMessageCounting:
+    def test_counts_text_parts_and_overhead(self):
+        tokenizer = CountingTokenizer()
+        message = _message("one two", _text_part("three four five"))
+
+        assert count_message_tokens(message, tokenizer) == 4 + 2 + 3
+
+    def test_count_is_cached_in_metadata(self):
+        tokenizer = CountingTokenizer()
+        message = _message("one two", _text_part("three"))
+
+        first = count_message_tokens(message, tokenizer)
+        calls = tokenizer.calls
+        second = count_message_tokens(message, tokenizer)
+
+        assert first == second
+        assert tokenizer.calls == calls
+        assert message.metadata["token_count"]["tokenizer"] == "words"
+
+        # Survives serialization, so it is stored with the message
+        restored = Message(**message.model_dump(mode="json"))
+        count_message_tokens(restored, tokenizer)
+        assert tokenizer.calls == calls
+
+    def test_cache_invalidated_by_change_or_other_tokenizer(self):
+        tokenizer = CountingTokenizer()
+        message = _message("one two")
+        count_message_tokens(message, tokenizer)
+
+        message.parts.append(_text_part("three"))
+        assert count_message_tokens(message, tokenizer) == 4 + 3
+
+        estimator = EstimatingTokenizer()
+        count_message_tokens(message, estimator)
+        assert message.metadata["token_count"]["tokenizer"] == "estimate"
+
+    def test_cache_invalidated_by_same_length_edit(self):
+        tokenizer = CountingTokenizer()
+        message = _message("one two", _text_part("aaaa bbbb"))
+        assert count_message_tokens(message, tokenizer) == 4 + 2 + 2
+
+        message.parts[0].text = "aaaabbbbb"
+        assert count_message_tokens(message, tokenizer) == 4 + 2 + 1
+
+    def test_dict_messages_and_compacted_tool_output(self):
+        tokenizer = CountingTokenizer()
+        msg = {
+            "text": "",
+            "parts": [
+                {
+                    "part_type": "tool",
+                    "tool": "read",
+                    "state": {"status": "completed", "output": "a b c d"},
+                }
+            ],
+        }
+
+        full = count_message_tokens(msg, tokenizer)
+        msg["parts"][0]["state"]["time_compacted"] = 1
+        msg["parts"][0]["state"]["output"] = ""
+
+        assert count_message_tokens(msg, tokenizer) == full - 4
+        assert "token_count" in msg["metadata"]
+
+
+class TestSessionCompactorTokens:
+    def test_counts_with_pluggable_tokenizer(self):
+        compactor = SessionCompactor("s1", model_limit=100, tokenizer=CountingTokenizer())
+        tool = ToolPart(
+            id="t1",
+            session_id="s1",
+            message_id="m1",
+            part_type="tool",
+            tool="grep",
+            state=ToolState(status="completed", input={"pattern": "x"}, output="x y z"),
+        )
+
+        count = compactor._count_message_tokens(_message("hello there", tool))
+
+        assert count == 4 + 2 + 1 + 2 + 3
+
+    async def test_overflow_uses_token_counts_not_message_count(self):
+        compactor = SessionCompactor("s1", model_limit=1000, tokenizer=CountingTokenizer())
+        messages = [_message("short")] * 3
+
+        assert await compactor.compact(None, messages) is None
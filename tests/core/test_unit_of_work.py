@@ -4,6 +4,7 @@ Tests cover transaction lifecycle, entity registration, commit/rollback behavior
 and error handling.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -441,3 +442,139 @@ async def test_multiple_messages_in_transaction(uow, mock_message_repo, sample_m
     await uow.register_message(message2)
     await uow.commit()
     assert mock_message_repo.create.call_count == 2
+
+
+# ============================================================================
+# Batched Commit Tests
+# ============================================================================
+
+
+@pytest.fixture
+def batch_storage(tmp_path):
+    """SessionStorage rooted in a temporary directory."""
+    from dawn_kestrel.storage.store import SessionStorage
+
+    return SessionStorage(tmp_path)
+
+
+@pytest.fixture
+def batch_uow(batch_storage, mock_session_repo, mock_message_repo, mock_part_repo):
+    """UnitOfWork using the single-batch storage commit path."""
+    return UnitOfWorkImpl(
+        mock_session_repo, mock_message_repo, mock_part_repo, storage=batch_storage
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_commit_writes_all_entities(
+    batch_uow, batch_storage, mock_part_repo, sample_session, sample_message, sample_part
+):
+    """Batched commit persists every entity without per-entity repository calls."""
+    from dawn_kestrel.storage.store import MessageStorage, PartStorage
+
+    child = sample_session.model_copy(update={"id": "child", "parent_id": sample_session.id})
+    await batch_uow.begin()
+    await batch_uow.register_session(sample_session)
+    await batch_uow.register_session(child)
+    await batch_uow.register_message(sample_message)
+    await batch_uow.register_part("test_message", sample_part)
+
+    result = await batch_uow.commit()
+
+    assert result.is_ok()
+    mock_part_repo.create.assert_not_called()
+    base_dir = batch_storage.base_dir
+    assert await batch_storage.get_session("test_session", "test_project") is not None
+    assert await MessageStorage(base_dir).get_message("test_session", "test_message")
+    assert await PartStorage(base_dir).get_part("test_message", "test_part")
+    assert await batch_storage.list_child_ids("test_session", "test_project") == ["child"]
+    assert not any((base_dir / "storage" / ".journal").glob("*"))
+
+
+@pytest.mark.asyncio
+async def test_batch_commit_is_all_or_nothing(
+    batch_uow, batch_storage, sample_session, sample_message, sample_part, monkeypatch
+):
+    """A failure while writing the batch leaves no records or temp files behind."""
+    import dawn_kestrel.storage.store as store
+
+    real_write = store._write_file
+    calls = {"n": 0}
+
+    def flaky_write(path, content, durable, atomic=False):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise OSError("disk full")
+        real_write(path, content, durable, atomic)
+
+    monkeypatch.setattr(store, "_write_file", flaky_write)
+    await batch_uow.begin()
+    await batch_uow.register_session(sample_session)
+    await batch_uow.register_message(sample_message)
+    await batch_uow.register_part("test_message", sample_part)
+
+    result = await batch_uow.commit()
+
+    assert result.is_err()
+    assert result.code == "STORAGE_ERROR"
+    written = [p for p in batch_storage.storage_dir.rglob("*") if p.is_file()]
+    assert written == []
+    assert (await batch_uow.rollback()).is_ok()
+
+
+@pytest.mark.asyncio
+async def test_storage_recover_replays_committed_journal(batch_storage):
+    """A journal left by a crash after the commit point is replayed on recover."""
+    import json
+
+    target = batch_storage.storage_dir / "message" / "s1" / "m1.json"
+    tmp = target.with_name("m1.json.abc.tmp")
+    tmp.parent.mkdir(parents=True)
+    tmp.write_text(json.dumps({"id": "m1"}))
+    journal = batch_storage.storage_dir / ".journal" / "abc.json"
+    journal.parent.mkdir(parents=True)
+    journal.write_text(json.dumps({"renames": [[str(tmp), str(target)]]}))
+
+    assert await batch_storage.recover() == 1
+    assert json.loads(target.read_text()) == {"id": "m1"}
+    assert not tmp.exists()
+    assert not journal.exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_recover_once(batch_storage, monkeypatch):
+    """Concurrent write_many calls never replay each other's journals."""
+    from dawn_kestrel.storage import store
+
+    replays = []
+    real_recover = store._recover_dir
+    real_apply = store._apply_journal
+
+    def counting_recover(storage_dir):
+        replays.append(storage_dir)
+        return real_recover(storage_dir)
+
+    applied = []
+
+    def recording_apply(journal_path):
+        applied.append(journal_path.name)
+        real_apply(journal_path)
+
+    monkeypatch.setattr(store, "_recover_dir", counting_recover)
+    monkeypatch.setattr(store, "_apply_journal", recording_apply)
+
+    await asyncio.gather(
+        *(
+            batch_storage.write_many(
+                [(["item", f"b{i}", f"r{j}"], {"i": i, "j": j}) for j in range(5)]
+            )
+            for i in range(20)
+        )
+    )
+
+    assert replays == [batch_storage.storage_dir]
+    # Each batch applied its own journal exactly once
+    assert len(applied) == len(set(applied)) == 20
+    for i in range(20):
+        assert await batch_storage.read(["item", f"b{i}", "r4"]) == {"i": i, "j": 4}
+    assert not list((batch_storage.storage_dir / ".journal").glob("*.json"))
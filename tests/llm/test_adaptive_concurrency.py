@@ -0,0 +1,160 @@
+"""Tests for adaptive (AIMD) concurrency control."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from dawn_kestrel.core.exceptions import ProviderRateLimitError
+from dawn_kestrel.core.http_client import HTTPClientError
+from dawn_kestrel.llm.adaptive_concurrency import (
+    AIMDConcurrencyLimiter,
+    ProviderSignal,
+    classify_provider_error,
+    retry_after_of,
+)
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.test/v1/chat")
+    response = httpx.Response(status, request=request, headers=headers)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestClassifyProviderError:
+    """Tests for mapping exceptions to structured signals."""
+
+    @pytest.mark.parametrize(
+        ("error", "signal"),
+        [
+            (ProviderRateLimitError("slow down", provider="zai"), ProviderSignal.RATE_LIMITED),
+            (_status_error(429), ProviderSignal.RATE_LIMITED),
+            (_status_error(503), ProviderSignal.RATE_LIMITED),
+            (_status_error(500), ProviderSignal.ERROR),
+            (TimeoutError(), ProviderSignal.TIMEOUT),
+            (httpx.ReadTimeout("read timed out"), ProviderSignal.TIMEOUT),
+            (HTTPClientError("Rate limit exceeded", status_code=429), ProviderSignal.RATE_LIMITED),
+            (HTTPClientError("Server error: 500", status_code=500), ProviderSignal.ERROR),
+            (HTTPClientError("Authentication failed", status_code=401), ProviderSignal.ERROR),
+            (Exception("Rate limit exceeded"), ProviderSignal.RATE_LIMITED),
+            (Exception("request was rate-limited"), ProviderSignal.RATE_LIMITED),
+            # Untyped numbers are not rate limit codes
+            (Exception("timeout after 14290ms"), ProviderSignal.ERROR),
+            (Exception("Z.AI API error (code=1302): busy"), ProviderSignal.ERROR),
+            (Exception("accelerate limits"), ProviderSignal.ERROR),
+            (ValueError("bad request"), ProviderSignal.ERROR),
+        ],
+    )
+    def test_classification(self, error, signal):
+        assert classify_provider_error(error) == signal
+
+    def test_retry_after_from_error_and_header(self):
+        assert retry_after_of(ProviderRateLimitError("x", retry_after=12.0)) == 12.0
+        assert retry_after_of(_status_error(429, {"retry-after": "7"})) == 7.0
+        assert retry_after_of(ValueError("x")) is None
+
+
+class TestAIMDConcurrencyLimiter:
+    """Tests for the AIMD controller and slot limiting."""
+
+    def test_additive_increase_after_full_window(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+        limiter.record(ProviderSignal.SUCCESS)
+        assert limiter.limit == 2
+        limiter.record(ProviderSignal.SUCCESS)
+        assert limiter.limit == 3
+
+        for _ in range(3):
+            limiter.record(ProviderSignal.SUCCESS)
+        assert limiter.limit == 4
+
+        for _ in range(10):
+            limiter.record(ProviderSignal.SUCCESS)
+        assert limiter.limit == 4
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=8, decrease_cooldown=60)
+
+        limiter.record(ProviderSignal.RATE_LIMITED)
+        assert limiter.limit == 4
+        # Same burst of failures only counts once
+        limiter.record(ProviderSignal.TIMEOUT)
+        assert limiter.limit == 4
+        assert limiter.get_stats()["decreases"] == 1
+
+    def test_decrease_respects_floor(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=4, min_limit=2, decrease_cooldown=0)
+
+        for _ in range(5):
+            limiter.record(ProviderSignal.RATE_LIMITED)
+
+        assert limiter.limit == 2
+
+    def test_plain_errors_do_not_change_limit(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=4)
+
+        limiter.record(ProviderSignal.ERROR)
+
+        assert limiter.limit == 4
+        assert limiter.get_stats()["errors"] == 1
+
+    def test_latency_spike_cuts_limit(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=8, warmup_samples=3)
+
+        for _ in range(4):
+            limiter.record(ProviderSignal.SUCCESS, latency=0.1)
+        limiter.record(ProviderSignal.SUCCESS, latency=1.0)
+
+        assert limiter.limit == 4
+        stats = limiter.get_stats()
+        assert stats["latency_spikes"] == 1
+        assert stats["latency_ewma_ms"] == pytest.approx(100, abs=1)
+
+    async def test_limits_in_flight_calls_fifo(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=2)
+        active = 0
+        peak = 0
+        order: list[int] = []
+
+        async def call(i: int) -> None:
+            nonlocal active, peak
+            async with limiter:
+                order.append(i)
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[call(i) for i in range(6)])
+
+        assert peak == 2
+        assert order == list(range(6))
+        assert limiter.in_flight == 0
+
+    async def test_increase_admits_waiters(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=1, max_limit=3)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.record(ProviderSignal.SUCCESS)
+        await asyncio.sleep(0)
+
+        assert waiter.done()
+        assert limiter.in_flight == 2
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        limiter = AIMDConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        assert limiter.get_stats()["queued"] == 0
@@ -0,0 +1,125 @@
+"""Tests for the Redis distributed limiter's lease mode.
+
+Runs against fakeredis (with Lua support) so no Redis server is needed.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("lupa")
+fakeredis = pytest.importorskip("fakeredis")
+
+from dawn_kestrel.llm.distributed_limiter import RedisRateLimitTracker  # noqa: E402
+from dawn_kestrel.llm.provider_limits import ProviderRateLimit  # noqa: E402
+
+LIMIT = ProviderRateLimit(requests_per_minute=60, jitter_range=(0.0, 0.0))
+
+
+def _tracker(server, **kwargs) -> RedisRateLimitTracker:
+    tracker = RedisRateLimitTracker(
+        provider_limits={"fake": LIMIT},
+        default_limit=LIMIT,
+        **kwargs,
+    )
+    tracker._redis = fakeredis.FakeAsyncRedis(server=server)
+    return tracker
+
+
+async def _bucket_tokens(server) -> float:
+    client = fakeredis.FakeAsyncRedis(server=server)
+    return float(await client.hget("dk:ratelimit:fake", "tokens"))
+
+
+async def test_lease_mode_batches_redis_round_trips():
+    """Requests are served locally from a leased block."""
+    server = fakeredis.FakeServer()
+    tracker = _tracker(server, lease_size=10)
+
+    results = [(await tracker.check_allowed("fake")).unwrap() for _ in range(50)]
+
+    assert all(allowed for allowed, _ in results)
+    stats = tracker.get_lease_stats()
+    assert stats["redis_calls"] == 5
+    assert stats["local_grants"] == 45
+    await tracker.close()
+
+
+async def test_lease_mode_enforces_global_limit_across_processes():
+    """Two processes sharing a bucket cannot exceed it between them."""
+    server = fakeredis.FakeServer()
+    first = _tracker(server, lease_size=8)
+    second = _tracker(server, lease_size=8)
+
+    allowed = 0
+    for _ in range(40):
+        for tracker in (first, second):
+            ok, wait = (await tracker.check_allowed("fake")).unwrap()
+            if ok:
+                allowed += 1
+            else:
+                assert wait > 0
+
+    # 60 tokens in the bucket plus at most a token or two of refill
+    assert 60 <= allowed <= 62
+    await first.close()
+    await second.close()
+
+
+async def test_partial_lease_when_bucket_nearly_empty():
+    """A lease shrinks to what is left instead of refusing outright."""
+    server = fakeredis.FakeServer()
+    tracker = _tracker(server, lease_size=50)
+
+    await tracker.check_allowed("fake", cost=1)  # leases 50
+    tracker_b = _tracker(server, lease_size=50)
+    ok, _ = (await tracker_b.check_allowed("fake", cost=1)).unwrap()
+
+    assert ok
+    assert tracker_b.get_lease_stats()["tokens_leased"] == 10
+    await tracker.close()
+    await tracker_b.close()
+
+
+async def test_unused_tokens_returned_on_lease_expiry():
+    """Expired leases hand their unused tokens back to the shared bucket."""
+    server = fakeredis.FakeServer()
+    tracker = _tracker(server, lease_size=20, lease_ttl=0.05)
+
+    await tracker.check_allowed("fake")
+    assert await _bucket_tokens(server) == pytest.approx(40, abs=0.5)
+
+    for _ in range(100):
+        await asyncio.sleep(0.05)
+        if tracker.get_lease_stats()["tokens_returned"]:
+            break
+
+    assert await _bucket_tokens(server) == pytest.approx(59, abs=1.5)
+    stats = tracker.get_lease_stats()
+    assert stats["tokens_returned"] == 19
+    assert stats["active_leases"] == 0
+    await tracker.close()
+
+
+async def test_close_returns_leased_tokens():
+    server = fakeredis.FakeServer()
+    tracker = _tracker(server, lease_size=20, lease_ttl=60)
+
+    for _ in range(5):
+        await tracker.check_allowed("fake")
+    await tracker.close()
+
+    assert await _bucket_tokens(server) == pytest.approx(55, abs=0.5)
+
+
+async def test_per_request_mode_unchanged():
+    """Without a lease size every request consults Redis."""
+    server = fakeredis.FakeServer()
+    tracker = _tracker(server)
+
+    for _ in range(3):
+        assert (await tracker.check_allowed("fake")).unwrap()[0]
+
+    assert tracker.get_lease_stats()["redis_calls"] == 0
+    assert await _bucket_tokens(server) == pytest.approx(57, abs=0.5)
+    await tracker.close()
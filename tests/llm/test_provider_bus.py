@@ -0,0 +1,367 @@
+"""Tests for ProviderBus tokens-per-minute budgeting and adaptive concurrency.
+
+Uses fake providers that enforce their own quotas the way a real API does,
+rejecting calls with a 429 once a quota is exceeded.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from dawn_kestrel.core.exceptions import ProviderRateLimitError
+from dawn_kestrel.core.result import Err, Ok
+from dawn_kestrel.llm.provider_bus import (
+    ProviderBus,
+    estimate_request_tokens,
+    usage_total_tokens,
+)
+from dawn_kestrel.llm.provider_limits import LocalRateLimitTracker, ProviderRateLimit
+from dawn_kestrel.llm.rate_limiter import TokenBucket
+from dawn_kestrel.providers.base import StreamEvent
+
+FAKE_QUOTA_TPM = 60_000
+
+
+class FakeTPMProvider:
+    """Fake provider enforcing a tokens-per-minute quota server-side."""
+
+    def __init__(self, tokens_per_minute: int):
+        self._quota = TokenBucket(
+            capacity=tokens_per_minute,
+            refill_rate=tokens_per_minute / 60.0,
+            window_seconds=60,
+        )
+        self.rejections = 0
+
+    async def complete(self, prompt_tokens: int, completion_tokens: int) -> list[StreamEvent]:
+        await asyncio.sleep(0)
+        result = await self._quota.try_acquire("fake", prompt_tokens + completion_tokens)
+        if result.is_err():
+            self.rejections += 1
+            raise Exception("429 rate limit: tokens per minute exceeded")
+        return [
+            StreamEvent(event_type="text-delta", data={"delta": "ok"}),
+            StreamEvent(
+                event_type="finish",
+                data={
+                    "finish_reason": "stop",
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                    },
+                },
+            ),
+        ]
+
+    async def stream(self, prompt_tokens: int, completion_tokens: int):
+        for event in await self.complete(prompt_tokens, completion_tokens):
+            yield event
+
+
+class FakeConcurrencyProvider:
+    """Fake provider that rejects calls beyond a concurrency quota."""
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.rejections = 0
+
+    async def complete(self) -> str:
+        if self.active >= self.max_concurrent:
+            self.rejections += 1
+            raise ProviderRateLimitError("too many concurrent requests", provider="fake")
+        self.active += 1
+        try:
+            await asyncio.sleep(0.002)
+            return "ok"
+        finally:
+            self.active -= 1
+
+
+def _bus(
+    tokens_per_minute: int = 0,
+    concurrent_requests: int = 20,
+    max_concurrent_requests: int = 0,
+) -> ProviderBus:
+    limit = ProviderRateLimit(
+        requests_per_minute=100_000,
+        tokens_per_minute=tokens_per_minute,
+        concurrent_requests=concurrent_requests,
+        max_concurrent_requests=max_concurrent_requests,
+        backoff_base=0.001,
+        backoff_max=0.001,
+        jitter_range=(0.0, 0.0),
+    )
+    limits = {"fake": limit}
+    return ProviderBus(
+        rate_tracker=LocalRateLimitTracker(provider_limits=limits, default_limit=limit),
+        provider_limits=limits,
+    )
+
+
+def test_usage_total_tokens():
+    assert usage_total_tokens({"prompt_tokens": 10, "completion_tokens": 5}) == 15
+    assert usage_total_tokens({"input_tokens": 7, "output_tokens": 3}) == 10
+    assert usage_total_tokens({"total_tokens": 42}) == 42
+    assert usage_total_tokens({}) is None
+    assert usage_total_tokens(None) is None
+
+
+def test_estimate_request_tokens_counts_prompt_and_output():
+    messages = [{"role": "user", "content": "x" * 4000}]
+
+    estimate = estimate_request_tokens(messages, max_output_tokens=500)
+
+    assert 1400 < estimate < 1600
+
+
+async def test_fake_provider_rejects_over_quota_without_budgeting():
+    """Request-count limiting alone lets a burst of large calls hit 429s."""
+    provider = FakeTPMProvider(FAKE_QUOTA_TPM)
+    bus = _bus(tokens_per_minute=0)
+
+    results = await asyncio.gather(
+        *[
+            bus.execute("fake", lambda: provider.complete(7_500, 2_000), max_429_retries=0)
+            for _ in range(7)
+        ]
+    )
+
+    assert sum(isinstance(r, Err) for r in results) == 1
+    assert provider.rejections == 1
+
+
+async def _budgeted_call(
+    bus: ProviderBus,
+    provider: FakeTPMProvider,
+    prompt_tokens: int,
+    completion_tokens: int,
+    estimated_tokens: int,
+):
+    """Call the fake provider the way providers budget: reserve, call, reconcile."""
+    reservation = (await bus.reserve_tokens("fake", estimated_tokens)).unwrap()
+    result = await bus.execute(
+        "fake", lambda: provider.complete(prompt_tokens, completion_tokens), max_429_retries=0
+    )
+    used = usage_total_tokens(result.unwrap()[-1].data["usage"]) if isinstance(result, Ok) else 0
+    await bus.reconcile_tokens(reservation, used)
+    return result
+
+
+async def test_token_budget_keeps_burst_under_quota():
+    """Reserving estimates holds the overflow call until the budget refills."""
+    provider = FakeTPMProvider(FAKE_QUOTA_TPM)
+    # Configured slightly below the provider quota, like the defaults.
+    bus = _bus(tokens_per_minute=57_000)
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *[_budgeted_call(bus, provider, 7_500, 2_000, 9_500) for _ in range(6)],
+        _budgeted_call(bus, provider, 400, 100, 500),
+    )
+    elapsed = time.monotonic() - start
+
+    assert all(isinstance(r, Ok) for r in results)
+    assert provider.rejections == 0
+    # 500 tokens at 950 tokens/s
+    assert 0.4 < elapsed < 2.0
+
+    stats = await bus.get_stats()
+    assert stats["tokens_reserved"] == 57_500
+    assert stats["tokens_used"] == 57_500
+    assert stats["token_wait_time_ms"] > 0
+
+
+async def test_reconcile_returns_overestimate():
+    """Unused reserved tokens are returned as soon as usage is reported."""
+    provider = FakeTPMProvider(FAKE_QUOTA_TPM)
+    bus = _bus(tokens_per_minute=10_000)
+
+    first = await _budgeted_call(bus, provider, 1_000, 1_000, 9_000)
+    assert isinstance(first, Ok)
+
+    # Only 2,000 tokens were used, so another 7,000-token call fits at once.
+    start = time.monotonic()
+    second = await _budgeted_call(bus, provider, 5_000, 2_000, 7_000)
+    assert isinstance(second, Ok)
+    assert time.monotonic() - start < 0.2
+
+    stats = await bus.get_stats()
+    assert stats["tokens_used"] == 9_000
+
+
+def _zai_chunks(*chunks: str):
+    """Patch target for ZAIBaseProvider.http_client.stream serving SSE chunks."""
+
+    class Response:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def aiter_bytes(self):
+            for chunk in chunks:
+                yield f"data: {chunk}\n".encode()
+
+    async def stream(*args, **kwargs):
+        yield Response()
+
+    return stream
+
+
+@pytest.fixture
+def zai(monkeypatch):
+    """Z.AI provider wired to a fresh bus with a tokens-per-minute budget."""
+    from dawn_kestrel.providers.base import (
+        ModelCapabilities,
+        ModelCost,
+        ModelInfo,
+        ModelLimits,
+        ProviderID,
+    )
+    from dawn_kestrel.providers.zai_base import ZAIBaseProvider
+
+    class Provider(ZAIBaseProvider):
+        async def get_models(self) -> list[ModelInfo]:
+            return []
+
+    # Room for one request estimate (~1,000 tokens) per minute
+    limit = ProviderRateLimit(requests_per_minute=100_000, tokens_per_minute=1_500)
+    limits = {"zai": limit}
+    bus = ProviderBus(
+        rate_tracker=LocalRateLimitTracker(provider_limits=limits, default_limit=limit),
+        provider_limits=limits,
+    )
+    monkeypatch.setattr(ProviderBus, "_instance", bus)
+
+    provider = Provider(api_key="test-key")
+    provider.base_url = "https://test.api"
+    model = ModelInfo(
+        id="test-model",
+        provider_id=ProviderID.Z_AI,
+        api_id="test-model",
+        api_url="https://test.api",
+        name="Test Model",
+        family="test",
+        capabilities=ModelCapabilities(
+            temperature=True, reasoning=True, toolcall=True, input={"text": True}
+        ),
+        cost=ModelCost(input=0.01, output=0.03, cache=None),
+        limit=ModelLimits(context=128000, input=128000, output=8192),
+        status="active",
+        options={},
+        headers={},
+    )
+    return provider, model, bus
+
+
+async def test_zai_stream_refunds_reservation_on_api_error(zai):
+    """A stream that fails before producing output consumed no tokens."""
+    provider, model, bus = zai
+    provider.http_client.stream = AsyncMock(
+        side_effect=_zai_chunks('{"error": {"code": 1214, "message": "bad request"}}')
+    )
+
+    with pytest.raises(Exception, match="code=1214"):
+        async for _ in provider.stream(model, [{"role": "user", "content": "hi"}], []):
+            pass
+
+    stats = await bus.get_stats()
+    assert stats["tokens_reserved"] > 0
+    assert stats["tokens_used"] == 0
+    # The reservation was returned, so the budget has room again
+    assert (await bus.reserve_tokens("zai", 1_000, timeout=0.05)).is_ok()
+
+
+async def test_zai_stream_settles_reservation_on_early_close(zai):
+    """Closing the stream mid-response keeps the estimate as the usage."""
+    provider, model, bus = zai
+    provider.http_client.stream = AsyncMock(
+        side_effect=_zai_chunks(
+            '{"choices": [{"delta": {"content": "partial"}}]}',
+            '{"choices": [{"delta": {"content": " more"}}]}',
+        )
+    )
+
+    events = provider.stream(model, [{"role": "user", "content": "hi"}], [])
+    async for event in events:
+        if event.event_type == "text-delta":
+            break
+    await events.aclose()
+
+    stats = await bus.get_stats()
+    assert stats["tokens_used"] == stats["tokens_reserved"] > 0
+
+
+async def test_zai_stream_reconciles_with_reported_usage(zai):
+    provider, model, bus = zai
+    provider.http_client.stream = AsyncMock(
+        side_effect=_zai_chunks(
+            '{"choices": [{"delta": {"content": "ok"}, "finish_reason": "stop"}],'
+            ' "usage": {"prompt_tokens": 30, "completion_tokens": 12}}'
+        )
+    )
+
+    events = [e async for e in provider.stream(model, [{"role": "user", "content": "hi"}], [])]
+
+    assert events[-1].event_type == "finish"
+    assert (await bus.get_stats())["tokens_used"] == 42
+
+
+@pytest.mark.parametrize("tokens_per_minute", [0, -1])
+async def test_reserve_without_budget_is_noop(tokens_per_minute):
+    bus = _bus(tokens_per_minute=tokens_per_minute)
+
+    result = await bus.reserve_tokens("fake", 1_000_000)
+
+    assert isinstance(result, Ok)
+    assert result.unwrap() is None
+
+
+async def test_concurrency_grows_while_healthy():
+    """The limit climbs additively when the provider keeps up."""
+    provider = FakeConcurrencyProvider(max_concurrent=100)
+    bus = _bus(concurrent_requests=2, max_concurrent_requests=6)
+
+    for _ in range(10):
+        await asyncio.gather(*[bus.execute("fake", provider.complete) for _ in range(8)])
+
+    stats = await bus.get_provider_stats("fake")
+    assert stats["concurrent_limit"] == 6
+    assert stats["configured_concurrent_limit"] == 2
+    assert (await bus.get_stats())["concurrency_limits"] == {"fake": 6}
+
+
+async def test_concurrency_backs_off_on_rate_limits():
+    """429s cut an over-eager limit down toward what the provider accepts."""
+    provider = FakeConcurrencyProvider(max_concurrent=3)
+    bus = _bus(concurrent_requests=16)
+    bus._get_limiter("fake")._decrease_cooldown = 0
+
+    results = await asyncio.gather(
+        *[bus.execute("fake", provider.complete, max_429_retries=5) for _ in range(32)]
+    )
+
+    assert all(isinstance(r, Ok) for r in results)
+    stats = await bus.get_provider_stats("fake")
+    assert stats["concurrent_limit"] < 16
+    assert stats["concurrency"]["rate_limited"] == provider.rejections > 0
+
+
+async def test_zai_stream_uses_the_configured_token_budget(zai):
+    """Usage is charged to the provider_limits entry for Z.AI."""
+    provider, model, bus = zai
+    provider.http_client.stream = AsyncMock(
+        side_effect=_zai_chunks(
+            '{"choices": [{"delta": {"content": "ok"}, "finish_reason": "stop"}],'
+            ' "usage": {"prompt_tokens": 1000, "completion_tokens": 400}}'
+        )
+    )
+
+    async for _ in provider.stream(model, [{"role": "user", "content": "hi"}], []):
+        pass
+
+    assert (await bus.reserve_tokens("zai", 1_000, timeout=0.05)).is_err()
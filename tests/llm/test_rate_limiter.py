@@ -4,7 +4,9 @@ Tests follow TDD workflow: RED -> GREEN -> REFACTOR
 """
 
 import asyncio
-from datetime import datetime, timedelta
+import time
+
+import pytest
 
 from dawn_kestrel.core.result import Err, Ok
 
@@ -28,8 +30,8 @@ class TestTokenBucket:
         from dawn_kestrel.llm.rate_limiter import TokenBucket
 
         bucket = TokenBucket(capacity=10, refill_rate=1, window_seconds=60)
-        now = datetime.now()
-        time_diff = abs((now - bucket._last_refill_time).total_seconds())
+        now = time.monotonic()
+        time_diff = abs(now - bucket._last_refill_time)
         assert time_diff < 1.0  # Should be within 1 second
 
     async def test_refill_tokens_increments_up_to_capacity(self):
@@ -38,11 +40,11 @@ class TestTokenBucket:
 
         bucket = TokenBucket(capacity=10, refill_rate=2, window_seconds=60)
         bucket._tokens = 5
-        bucket._last_refill_time = datetime.now() - timedelta(seconds=2)
+        bucket._last_refill_time = time.monotonic() - 2
 
         await bucket._refill_tokens()
 
-        assert bucket._tokens == 9  # 5 + (2 * 2) = 9
+        assert bucket._tokens == pytest.approx(9, abs=0.01)  # 5 + (2 * 2) = 9
 
     async def test_refill_tokens_respects_capacity(self):
         """Test that refill respects capacity limit."""
@@ -50,7 +52,7 @@ class TestTokenBucket:
 
         bucket = TokenBucket(capacity=10, refill_rate=5, window_seconds=60)
         bucket._tokens = 8
-        bucket._last_refill_time = datetime.now() - timedelta(seconds=2)
+        bucket._last_refill_time = time.monotonic() - 2
 
         await bucket._refill_tokens()
 
@@ -75,8 +77,8 @@ class TestTokenBucket:
         bucket = TokenBucket(capacity=10, refill_rate=1, window_seconds=60)
 
         # Add an old request
-        old_time = datetime.now() - timedelta(seconds=70)
-        bucket._request_times = [old_time]
+        old_time = time.monotonic() - 70
+        bucket._request_times.append(old_time)
 
         await bucket._refill_tokens()
 
@@ -100,7 +102,7 @@ class TestTokenBucket:
 
         bucket = TokenBucket(capacity=10, refill_rate=5, window_seconds=60)
         bucket._tokens = 0
-        bucket._last_refill_time = datetime.now() - timedelta(seconds=2)
+        bucket._last_refill_time = time.monotonic() - 2
 
         result = await bucket.try_acquire("test_resource", tokens=1)
 
@@ -135,12 +137,12 @@ class TestTokenBucket:
         from dawn_kestrel.llm.rate_limiter import TokenBucket
 
         bucket = TokenBucket(capacity=10, refill_rate=1, window_seconds=60)
-        now = datetime.now()
+        now = time.monotonic()
 
         await bucket.try_acquire("test_resource", tokens=1)
 
         assert len(bucket._request_times) == 1
-        time_diff = abs((now - bucket._request_times[0]).total_seconds())
+        time_diff = abs(now - bucket._request_times[0])
         assert time_diff < 1.0
 
     async def test_release_is_noop(self):
@@ -157,6 +159,118 @@ class TestTokenBucket:
         assert bucket._tokens == 5  # Unchanged
 
 
+    async def test_refill_accumulates_fractional_tokens(self):
+        """Test that frequent refills do not lose sub-token progress."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        now = [100.0]
+        bucket = TokenBucket(capacity=10, refill_rate=1, window_seconds=60, clock=lambda: now[0])
+        bucket._tokens = 0
+
+        for _ in range(10):
+            now[0] += 0.09
+            result = await bucket.try_acquire("test_resource", tokens=1)
+            assert isinstance(result, Err)
+
+        now[0] += 0.1
+        result = await bucket.try_acquire("test_resource", tokens=1)
+        assert isinstance(result, Ok)
+
+    async def test_refill_history_is_bounded(self):
+        """Test that the refill history is a fixed-size ring."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        now = [0.0]
+        bucket = TokenBucket(capacity=10, refill_rate=1, window_seconds=60, clock=lambda: now[0])
+
+        for _ in range(TokenBucket.REFILL_HISTORY_SIZE * 3):
+            now[0] += 0.01
+            await bucket._refill_tokens()
+
+        assert len(bucket._refills) == TokenBucket.REFILL_HISTORY_SIZE
+
+    async def test_acquire_waits_for_exact_refill(self):
+        """Test that acquire wakes when the token is due, without polling."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(capacity=1, refill_rate=20, window_seconds=60)
+        bucket._tokens = 0
+
+        start = time.monotonic()
+        result = await bucket.acquire("test_resource", tokens=1)
+        elapsed = time.monotonic() - start
+
+        assert isinstance(result, Ok)
+        assert 0.04 <= elapsed < 0.3
+
+    async def test_acquire_serves_waiters_fifo(self):
+        """Test that a queued large request is not starved by later small ones."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(capacity=5, refill_rate=100, window_seconds=60)
+        bucket._tokens = 0
+        order: list[str] = []
+
+        async def take(name: str, tokens: int) -> None:
+            result = await bucket.acquire("test_resource", tokens=tokens)
+            assert isinstance(result, Ok)
+            order.append(name)
+
+        big = asyncio.create_task(take("big", 5))
+        await asyncio.sleep(0)
+        small = [asyncio.create_task(take(f"small{i}", 1)) for i in range(3)]
+        await asyncio.sleep(0)
+
+        # Non-blocking callers cannot jump the queue either.
+        assert isinstance(await bucket.try_acquire("test_resource"), Err)
+
+        await asyncio.gather(big, *small)
+        assert order == ["big", "small0", "small1", "small2"]
+
+    async def test_acquire_timeout_returns_err_and_frees_queue(self):
+        """Test that a timed-out waiter leaves the queue for those behind it."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(capacity=10, refill_rate=50, window_seconds=60)
+        bucket._tokens = 0
+
+        big = asyncio.create_task(bucket.acquire("test_resource", tokens=10, timeout=0.02))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(bucket.acquire("test_resource", tokens=1))
+
+        big_result = await big
+        assert isinstance(big_result, Err)
+        assert big_result.code == "RATE_LIMIT_EXCEEDED"
+        assert isinstance(await asyncio.wait_for(small, 1.0), Ok)
+        assert not bucket._waiters
+
+    async def test_acquire_cancelled_waiter_is_removed(self):
+        """Test that cancelling a waiter does not block the queue."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(capacity=10, refill_rate=50, window_seconds=60)
+        bucket._tokens = 0
+
+        big = asyncio.create_task(bucket.acquire("test_resource", tokens=10))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(bucket.acquire("test_resource", tokens=1))
+        await asyncio.sleep(0)
+        big.cancel()
+
+        assert isinstance(await asyncio.wait_for(small, 1.0), Ok)
+
+    async def test_acquire_more_than_capacity_fails_immediately(self):
+        """Test that an unsatisfiable request is rejected instead of queued."""
+        from dawn_kestrel.llm.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(capacity=2, refill_rate=1, window_seconds=60)
+
+        result = await bucket.acquire("test_resource", tokens=3)
+
+        assert isinstance(result, Err)
+        assert not bucket._waiters
+
+
 # =============================================================================
 # RateLimiterImpl Tests
 # =============================================================================
@@ -265,8 +379,8 @@ class TestRateLimiterImpl:
 
         # Manually add an old request
         bucket = limiter._buckets["test_resource"]
-        old_time = datetime.now() - timedelta(seconds=70)
-        bucket._request_times.append(old_time)
+        old_time = time.monotonic() - 70
+        bucket._request_times.appendleft(old_time)
 
         # Get available should clear expired requests
         result = await limiter.get_available("test_resource")
@@ -306,6 +420,54 @@ class TestRateLimiterImpl:
         assert "test_resource" in limiter._buckets
 
 
+class TestTokenReservation:
+    """Tests for reserve-then-reconcile token budgeting."""
+
+    async def test_reconcile_returns_unused_tokens(self):
+        """Test that reconciling below the estimate refunds the difference."""
+        from dawn_kestrel.llm.rate_limiter import RateLimiterImpl
+
+        limiter = RateLimiterImpl()
+        limiter.set_limit("tpm", capacity=1000, refill_rate=0.001, window_seconds=60)
+
+        reservation = (await limiter.reserve("tpm", 800)).unwrap()
+        assert limiter._buckets["tpm"]._tokens == pytest.approx(200, abs=1)
+
+        await limiter.reconcile(reservation, 300)
+        assert limiter._buckets["tpm"]._tokens == pytest.approx(700, abs=1)
+
+        # Settling twice is a no-op
+        await limiter.reconcile(reservation, 0)
+        assert limiter._buckets["tpm"]._tokens == pytest.approx(700, abs=1)
+
+    async def test_reconcile_overrun_leaves_deficit(self):
+        """Test that usage above the estimate is debited from later callers."""
+        from dawn_kestrel.llm.rate_limiter import RateLimiterImpl
+
+        limiter = RateLimiterImpl()
+        limiter.set_limit("tpm", capacity=100, refill_rate=0.001, window_seconds=60)
+
+        reservation = (await limiter.reserve("tpm", 50)).unwrap()
+        await limiter.reconcile(reservation, 120)
+
+        assert limiter._buckets["tpm"]._tokens == pytest.approx(-20, abs=1)
+        result = await limiter.reserve("tpm", 1, timeout=0.01)
+        assert isinstance(result, Err)
+
+    async def test_reserve_larger_than_capacity_is_admitted_when_full(self):
+        """Test that an oversized estimate waits for a full bucket, not forever."""
+        from dawn_kestrel.llm.rate_limiter import RateLimiterImpl
+
+        limiter = RateLimiterImpl()
+        limiter.set_limit("tpm", capacity=100, refill_rate=0.001, window_seconds=60)
+
+        result = await limiter.reserve("tpm", 150, timeout=0.1)
+
+        assert isinstance(result, Ok)
+        assert result.unwrap().estimated == 150
+        assert limiter._buckets["tpm"]._tokens == pytest.approx(-50, abs=1)
+
+
 # =============================================================================
 # RateLimiter Protocol Tests
 # =============================================================================
@@ -250,9 +250,9 @@ class TestZAIBaseProviderStreamingRateLimit:
             async def __aexit__(self, *args):
                 pass
 
-            async def aiter_lines(self):
+            async def aiter_bytes(self):
                 async for line in mock_stream_generator():
-                    yield f"data: {line}"
+                    yield f"data: {line}\n".encode()
 
         async def mock_stream(*args, **kwargs):
             """Mock async generator that yields context managers."""
@@ -316,9 +316,9 @@ class TestZAIBaseProviderStreamingRateLimit:
             async def __aexit__(self, *args):
                 pass
 
-            async def aiter_lines(self):
+            async def aiter_bytes(self):
                 async for line in mock_stream_generator():
-                    yield f"data: {line}"
+                    yield f"data: {line}\n".encode()
 
         async def mock_stream(*args, **kwargs):
             yield MockResponse()
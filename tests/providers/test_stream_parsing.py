@@ -0,0 +1,107 @@
+"""Tests for incremental stream chunk parsing.
+
+Tests cover:
+- ChunkSplitter across arbitrary read boundaries (separators, UTF-8)
+- iter_sse_data line handling
+- StreamChunkHandler using the splitter
+"""
+
+from __future__ import annotations
+
+from dawn_kestrel.provider import AnthropicProvider, OpenAIProvider
+from dawn_kestrel.provider.handler import StreamChunkHandler
+from dawn_kestrel.provider.sse import ChunkSplitter, iter_chunks, iter_sse_data
+
+
+async def _stream(*pieces: bytes):
+    for piece in pieces:
+        yield piece
+
+
+def _split_every(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+async def _collect(aiter) -> list:
+    return [item async for item in aiter]
+
+
+class TestChunkSplitter:
+    def test_multibyte_characters_across_reads(self):
+        text = "héllo wörld 日本語 🎉\n\nsecond ✓\n\n"
+        data = text.encode()
+
+        for size in range(1, 8):
+            splitter = ChunkSplitter("\n\n")
+            chunks = [c for piece in _split_every(data, size) for c in splitter.feed(piece)]
+            assert chunks == ["héllo wörld 日本語 🎉", "second ✓"]
+            assert splitter.flush() is None
+
+    def test_separator_straddles_reads(self):
+        splitter = ChunkSplitter("\n\n")
+
+        assert splitter.feed(b"a\n") == []
+        assert splitter.feed(b"\nb\n") == ["a"]
+        assert splitter.feed(b"\nc") == ["b"]
+        assert splitter.flush() == "c"
+
+    def test_large_chunk_scanned_incrementally(self):
+        splitter = ChunkSplitter(b"\n")
+        for _ in range(1000):
+            assert splitter.feed(b"x" * 100) == []
+
+        assert splitter.pending == 100_000
+        assert splitter.feed(b"\n") == ["x" * 100_000]
+        assert splitter.pending == 0
+
+    async def test_iter_chunks_yields_trailing_chunk(self):
+        chunks = await _collect(iter_chunks(_stream(b"a\nb", b"\nc")))
+
+        assert chunks == ["a", "b", "c"]
+
+
+class TestSSEData:
+    async def test_data_lines(self):
+        body = b'event: x\r\ndata: {"a": 1}\r\n\r\n: ping\n\ndata:{"b": 2}\n\ndata: [DONE]\n\n'
+
+        payloads = await _collect(iter_sse_data(_stream(*_split_every(body, 3))))
+
+        assert payloads == ['{"a": 1}', '{"b": 2}']
+
+    async def test_raw_json_lines(self):
+        body = b'{"error": "x"}\ndata: {"a": 1}\n'
+
+        assert await _collect(iter_sse_data(_stream(body))) == ['{"a": 1}']
+        assert await _collect(iter_sse_data(_stream(body), allow_raw_json=True)) == [
+            '{"error": "x"}',
+            '{"a": 1}',
+        ]
+
+
+class TestStreamChunkHandler:
+    async def test_chunks_and_usage(self):
+        provider = AnthropicProvider("req", "model")
+        handler = StreamChunkHandler(provider)
+        body = (
+            'event: message_start\ndata: {"type":"message_start","message":{"usage":'
+            '{"input_tokens":10,"output_tokens":1}}}\n\n'
+            'event: content_block_delta\ndata: {"type":"content_block_delta","delta":{"text":"é"}}\n\n'
+        ).encode()
+
+        chunks = await _collect(handler.process_stream(_stream(*_split_every(body, 5))))
+
+        assert len(chunks) == 2
+        assert '"text":"é"' in chunks[1]
+        assert handler.get_final_usage().input_tokens == 10
+
+    async def test_format_converter_and_binary_decoder(self):
+        handler = StreamChunkHandler(
+            OpenAIProvider(),
+            format_converter=str.upper,
+            binary_decoder=lambda b: b or None,
+        )
+
+        chunks = await _collect(handler.process_stream(_stream(b"a\nb", b"", b"\nrest")))
+
+        assert chunks == ["A\n", "B\n"]
+        assert handler.buffer == "rest"
@@ -7,6 +7,8 @@ These tests verify concrete implementations of queue/worker patterns:
 """
 
 import asyncio
+import os
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any
 from unittest.mock import AsyncMock
@@ -17,12 +19,23 @@ from dawn_kestrel.core.result import Err, Ok, Result
 from dawn_kestrel.reliability.queue_worker import (
     AsyncWorker,
     InMemoryTaskQueue,
+    ProcessTaskRunner,
     Task,
     TaskStatus,
     WorkerPool,
 )
 
 
+# Process-mode processors must be importable from worker processes
+def _square_in_process(payload: dict[str, Any]) -> dict[str, Any]:
+    time.sleep(payload.get("sleep", 0))
+    return {"square": payload["n"] ** 2, "pid": os.getpid()}
+
+
+def _fail_in_process(payload: dict[str, Any]) -> None:
+    raise ValueError(f"bad payload {payload['n']}")
+
+
 class TestInMemoryTaskQueue:
     """Tests for InMemoryTaskQueue implementation."""
 
@@ -697,3 +710,239 @@ class TestCancellationHandling:
         await pool.stop()
 
         assert pool.running_count == 0
+
+
+class TestEventDrivenWakeups:
+    """Workers and waiters wake on notification, not on a poll interval."""
+
+    @pytest.mark.asyncio
+    async def test_worker_wakes_on_enqueue(self) -> None:
+        """An idle worker picks up a new task without waiting for poll_interval."""
+        queue = InMemoryTaskQueue()
+        processed = asyncio.Event()
+
+        async def processor(task: Task) -> Result[Any]:
+            processed.set()
+            return Ok(None)
+
+        worker = AsyncWorker(queue=queue, processor=processor, poll_interval=60)
+        await worker.start()
+        await asyncio.sleep(0.01)  # Let the worker block on the empty queue
+
+        await queue.enqueue(Task(id="t1", type="test", payload={}))
+        await asyncio.wait_for(processed.wait(), timeout=1.0)
+
+        await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_completion_wakes_on_last_task(self) -> None:
+        """wait_for_completion returns as soon as the last task finishes."""
+        queue = InMemoryTaskQueue()
+        release = asyncio.Event()
+
+        async def processor(task: Task) -> Result[Any]:
+            await release.wait()
+            return Ok(None)
+
+        pool = WorkerPool(queue=queue, processor=processor, num_workers=2, poll_interval=60)
+        for i in range(3):
+            await queue.enqueue(Task(id=f"t{i}", type="test", payload={}))
+        await pool.start()
+
+        waiter = asyncio.create_task(pool.wait_for_completion(timeout=5.0))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        result = await asyncio.wait_for(waiter, timeout=1.0)
+        assert result.is_ok()
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_completion_counts_dequeued_tasks_in_progress(self) -> None:
+        """A task taken by a worker but not yet processed keeps the pool busy."""
+        queue = InMemoryTaskQueue()
+        await queue.enqueue(Task(id="t1", type="test", payload={}))
+
+        task = await queue.get()
+        pool = WorkerPool(queue=queue, processor=AsyncMock(return_value=Ok(None)))
+
+        result = await pool.wait_for_completion(timeout=0.05)
+        assert result.is_err()
+        assert result.code == "TIMEOUT"
+
+        queue.task_done()
+        assert (await pool.wait_for_completion(timeout=1.0)).is_ok()
+        assert task.id == "t1"
+
+    @pytest.mark.asyncio
+    async def test_dequeue_and_peek_do_not_block_join(self) -> None:
+        """Tasks taken with dequeue() and peek() leave join() consistent."""
+        queue = InMemoryTaskQueue()
+        for i in range(3):
+            await queue.enqueue(Task(id=f"t{i}", type="test", payload={}))
+
+        peeked = await queue.peek()
+        assert peeked.unwrap().id == "t0"
+        assert (await queue.size()).unwrap() == 3
+
+        for _ in range(3):
+            await queue.dequeue()
+
+        await asyncio.wait_for(queue.join(), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_polling_fallback_for_queues_without_get(self) -> None:
+        """Queues that cannot block are still served by polling."""
+
+        class PollingQueue:
+            def __init__(self) -> None:
+                self.inner = InMemoryTaskQueue()
+
+            async def dequeue(self, timeout: float | None = None) -> Result[Task | None]:
+                return await self.inner.dequeue()
+
+            async def size(self) -> Result[int]:
+                return await self.inner.size()
+
+            async def update_status(self, task_id: str, status: TaskStatus) -> Result[Task]:
+                return await self.inner.update_status(task_id, status)
+
+        queue = PollingQueue()
+        await queue.inner.enqueue(Task(id="t1", type="test", payload={}))
+        processor = AsyncMock(return_value=Ok(None))
+
+        pool = WorkerPool(queue=queue, processor=processor, poll_interval=0.01)  # type: ignore[arg-type]
+        async with pool:
+            assert (await pool.wait_for_completion(timeout=2.0)).is_ok()
+
+        processor.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stop_with_drain_finishes_current_task(self) -> None:
+        """A worker stopped with drain=True finishes the task it is running."""
+        queue = InMemoryTaskQueue()
+        started = asyncio.Event()
+        release = asyncio.Event()
+        finished = []
+
+        async def processor(task: Task) -> Result[Any]:
+            started.set()
+            await release.wait()
+            finished.append(task.id)
+            return Ok(None)
+
+        worker = AsyncWorker(queue=queue, processor=processor)
+        await worker.start()
+        await queue.enqueue(Task(id="t1", type="test", payload={}))
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+
+        stopping = asyncio.create_task(worker.stop(drain=True))
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+
+        release.set()
+        assert (await asyncio.wait_for(stopping, timeout=1.0)).is_ok()
+        assert finished == ["t1"]
+        assert queue._tasks["t1"].status == TaskStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_stop_with_drain_cancels_idle_worker(self) -> None:
+        """An idle worker stops at once even with drain=True."""
+        worker = AsyncWorker(queue=InMemoryTaskQueue(), processor=AsyncMock(), poll_interval=60)
+        await worker.start()
+        await asyncio.sleep(0.01)
+
+        assert (await asyncio.wait_for(worker.stop(drain=True), timeout=1.0)).is_ok()
+
+
+class TestSubmitAndProcessMode:
+    """Awaitable results and the process-pool execution mode."""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_future_for_result(self) -> None:
+        """submit() resolves to the processor's result or error."""
+
+        async def processor(task: Task) -> Result[Any]:
+            if task.payload["n"] < 0:
+                raise RuntimeError("negative")
+            return Ok(task.payload["n"] * 2)
+
+        async with WorkerPool(queue=InMemoryTaskQueue(), processor=processor, num_workers=2) as pool:
+            futures = [await pool.submit({"n": n}) for n in (1, 2, -1)]
+            results = await asyncio.wait_for(asyncio.gather(*futures), timeout=1.0)
+
+        assert [r.unwrap() for r in results[:2]] == [2, 4]
+        assert results[2].is_err()
+        assert results[2].code == "PROCESSOR_ERROR"
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_unprocessed_futures(self) -> None:
+        """Futures of running and queued tasks are cancelled on stop."""
+        started = asyncio.Event()
+
+        async def processor(task: Task) -> Result[Any]:
+            started.set()
+            await asyncio.sleep(10)
+            return Ok(None)
+
+        pool = WorkerPool(queue=InMemoryTaskQueue(), processor=processor, num_workers=1)
+        await pool.start()
+        running = await pool.submit({"n": 1})
+        queued = await pool.submit({"n": 2})
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+        await pool.stop()
+
+        assert running.cancelled()
+        assert queued.cancelled()
+
+    def test_unknown_mode_rejected(self) -> None:
+        """Only "async" and "process" modes are accepted."""
+        with pytest.raises(ValueError, match="Unknown worker mode"):
+            WorkerPool(queue=InMemoryTaskQueue(), processor=AsyncMock(), mode="thread")  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_process_mode_runs_in_worker_processes(self) -> None:
+        """Process-mode tasks run outside this process without blocking the loop."""
+        ticks = 0
+        stop_ticking = asyncio.Event()
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while not stop_ticking.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        pool = WorkerPool(
+            queue=InMemoryTaskQueue(),
+            processor=_square_in_process,
+            num_workers=2,
+            mode="process",
+            max_processes=1,
+        )
+        assert pool.mode == "process"
+        async with pool:
+            tick_task = asyncio.create_task(ticker())
+            futures = [await pool.submit({"n": n, "sleep": 0.1}) for n in range(3)]
+            results = await asyncio.wait_for(asyncio.gather(*futures), timeout=30.0)
+            stop_ticking.set()
+            await tick_task
+
+        assert [r.unwrap()["square"] for r in results] == [0, 1, 4]
+        assert all(r.unwrap()["pid"] != os.getpid() for r in results)
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_process_runner_reports_errors(self) -> None:
+        """Exceptions raised in a worker process come back as Err."""
+        runner = ProcessTaskRunner(_fail_in_process, max_processes=1)
+        try:
+            result = await asyncio.wait_for(
+                runner(Task(id="t1", type="test", payload={"n": 7})), timeout=30.0
+            )
+        finally:
+            await runner.close()
+
+        assert result.is_err()
+        assert result.code == "PROCESS_TASK_FAILED"
+        assert "bad payload 7" in result.error
@@ -0,0 +1,225 @@
+"""Tests for background incremental session compaction.
+
+Tests cover:
+- Checkpoints created once the uncompacted span crosses the threshold
+- Protected recent tail never compacted
+- Versioned checkpoints folding previous summaries, with retention
+- Compacted history not re-read by later passes
+- Token counts stored with messages, so restarts do not re-tokenize
+- schedule() coalescing passes and get_view() returning summary + tail
+- get_view() not blocked by a running summarizer
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.core.models import Message
+from dawn_kestrel.session.compaction import BackgroundCompactor
+from dawn_kestrel.storage.store import MessageStorage
+
+
+class WordTokenizer:
+    name = "words"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+async def _add(storage: MessageStorage, index: int, words: int = 10, role: str = "user") -> None:
+    await storage.create_message(
+        "s1",
+        Message(
+            id=f"m{index:03d}",
+            session_id="s1",
+            role=role,
+            text=" ".join(["word"] * words),
+            time={"created": 1000.0 + index},
+        ),
+    )
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> MessageStorage:
+    return MessageStorage(tmp_path)
+
+
+def _compactor(tmp_path: Path, **kwargs) -> BackgroundCompactor:
+    # Each message is 4 overhead + 10 words = 14 tokens
+    kwargs.setdefault("threshold_tokens", 50)
+    kwargs.setdefault("protect_tokens", 30)
+    kwargs.setdefault("tokenizer", WordTokenizer())
+    return BackgroundCompactor(tmp_path, **kwargs)
+
+
+async def test_no_checkpoint_below_threshold(tmp_path: Path, storage: MessageStorage):
+    for i in range(5):
+        await _add(storage, i)
+
+    compactor = _compactor(tmp_path)
+
+    # 70 tokens total, 28 protected, 42 < 50
+    assert await compactor.compact("s1") is None
+    assert await compactor.latest_checkpoint("s1") is None
+
+
+async def test_checkpoint_covers_span_before_protected_tail(tmp_path: Path, storage: MessageStorage):
+    for i in range(6):
+        await _add(storage, i)
+
+    compactor = _compactor(tmp_path)
+    checkpoint = await compactor.compact("s1")
+
+    assert checkpoint is not None
+    assert checkpoint.version == 1
+    assert checkpoint.boundary_message_id == "m003"
+    assert checkpoint.messages_compacted == 4
+    assert checkpoint.tokens_compacted == 56
+
+    view = await compactor.get_view("s1")
+    assert view.summary == checkpoint.summary
+    assert [m["id"] for m in view.messages] == ["m004", "m005"]
+
+
+async def test_checkpoints_are_versioned_and_persisted(tmp_path: Path, storage: MessageStorage):
+    summaries = []
+
+    async def summarizer(previous, span):
+        summaries.append((previous, [m["id"] for m in span]))
+        return f"{previous or ''}+{len(span)}"
+
+    compactor = _compactor(tmp_path, summarizer=summarizer, keep_checkpoints=2)
+    index = 0
+    for _ in range(3):
+        for _ in range(6):
+            await _add(storage, index)
+            index += 1
+        assert await compactor.compact("s1") is not None
+
+    head = await compactor.latest_checkpoint("s1")
+    assert head.version == 3
+    assert head.summary == "+4+6+6"
+    assert summaries[1][0] == "+4"
+
+    versions = await storage.list(["compaction", "s1"])
+    assert len(versions) == 2
+
+    reloaded = await _compactor(tmp_path).latest_checkpoint("s1")
+    assert reloaded.version == 3
+    assert reloaded.messages_compacted == 16
+
+
+async def test_compacted_history_is_not_reread(
+    tmp_path: Path, storage: MessageStorage, monkeypatch: pytest.MonkeyPatch
+):
+    for i in range(10):
+        await _add(storage, i)
+    compactor = _compactor(tmp_path)
+    await compactor.compact("s1")
+
+    reads: list[list[str]] = []
+    original = compactor.storage.read
+
+    async def counting_read(key):
+        reads.append(list(key))
+        return await original(key)
+
+    monkeypatch.setattr(compactor.storage, "read", counting_read)
+    await _add(storage, 10)
+    view = await compactor.get_view("s1")
+
+    message_reads = [k for k in reads if k[0] == "message"]
+    assert len(message_reads) == len(view.messages) == 3
+
+
+async def test_token_counts_are_stored_with_messages(tmp_path: Path, storage: MessageStorage):
+    await _add(storage, 0)
+    stored = await storage.get_message("s1", "m000")
+    assert "token_count" in stored["metadata"]  # counted on create
+
+    tokenizer = WordTokenizer()
+    await _compactor(tmp_path, tokenizer=tokenizer).compact("s1")
+    stored = await storage.get_message("s1", "m000")
+    assert stored["metadata"]["token_count"]["tokenizer"] == "words"
+    assert stored["metadata"]["token_count"]["count"] == 14
+
+    # A new process reads the stored count instead of re-tokenizing
+    restarted = WordTokenizer()
+    await _compactor(tmp_path, tokenizer=restarted).compact("s1")
+    assert tokenizer.calls > 0
+    assert restarted.calls == 0
+
+
+async def test_deleted_messages_leave_the_view(tmp_path: Path, storage: MessageStorage):
+    for i in range(3):
+        await _add(storage, i)
+    compactor = _compactor(tmp_path)
+    await compactor.get_view("s1")
+
+    await storage.remove(["message", "s1", "m001"])
+
+    assert [m["id"] for m in (await compactor.get_view("s1")).messages] == ["m000", "m002"]
+
+
+async def test_schedule_runs_in_background_and_coalesces(tmp_path: Path, storage: MessageStorage):
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = 0
+
+    async def slow_summarizer(previous, span):
+        nonlocal calls
+        calls += 1
+        started.set()
+        await release.wait()
+        return "summary"
+
+    for i in range(6):
+        await _add(storage, i)
+    compactor = _compactor(tmp_path, summarizer=slow_summarizer)
+
+    task = compactor.schedule("s1")
+    await started.wait()
+    for i in range(6, 12):
+        await _add(storage, i)
+    assert compactor.schedule("s1") is task
+
+    release.set()
+    await compactor.wait_idle()
+
+    assert calls == 2
+    assert (await compactor.latest_checkpoint("s1")).version == 2
+    await compactor.close()
+
+
+async def test_get_view_does_not_wait_for_the_summarizer(tmp_path: Path, storage: MessageStorage):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_summarizer(previous, span):
+        started.set()
+        await release.wait()
+        return "summary"
+
+    for i in range(6):
+        await _add(storage, i)
+    compactor = _compactor(tmp_path, summarizer=slow_summarizer)
+
+    compactor.schedule("s1")
+    await started.wait()
+    view = await asyncio.wait_for(compactor.get_view("s1"), timeout=1)
+    assert view.checkpoint is None
+    assert len(view.messages) == 6
+
+    release.set()
+    await compactor.wait_idle()
+    view = await compactor.get_view("s1")
+    assert view.summary == "summary"
+    assert [m["id"] for m in view.messages] == ["m004", "m005"]
+    await compactor.close()
@@ -0,0 +1,213 @@
+"""Tests for streaming session export and import.
+
+Tests cover:
+- Round trips through json, jsonl and jsonl.gz
+- Paged reads from storage and batched inserts
+- Per-record redaction
+- Incremental parsing of pretty-printed and chunk-split json exports
+- Error handling for invalid files
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.core.models import Message, TextPart
+from dawn_kestrel.core.session import SessionManager
+from dawn_kestrel.session import export_import
+from dawn_kestrel.session.export_import import (
+    ExportImportManager,
+    detect_format,
+    iter_export_records,
+)
+from dawn_kestrel.storage.store import MessageStorage, SessionStorage
+
+
+async def _populate(manager: SessionManager, count: int, text: str = "hello") -> str:
+    session = await manager.create(title="Streaming")
+    messages = []
+    for i in range(count):
+        message_id = str(uuid.uuid4())
+        messages.append(
+            Message(
+                id=message_id,
+                session_id=session.id,
+                role="user" if i % 2 else "assistant",
+                text=f"{text} {i}",
+                time={"created": i},
+                parts=[
+                    TextPart(
+                        id=str(uuid.uuid4()),
+                        session_id=session.id,
+                        message_id=message_id,
+                        part_type="text",
+                        text=f"part {i}",
+                    )
+                ],
+            )
+        )
+    await manager.create_messages(session.id, messages)
+    return session.id
+
+
+@pytest.fixture
+def managers(tmp_path: Path):
+    def make(name: str) -> ExportImportManager:
+        project = tmp_path / name
+        project.mkdir()
+        session_manager = SessionManager(SessionStorage(project), project)
+        return ExportImportManager(session_manager, git_snapshot=None, page_size=7, batch_size=5)
+
+    return make
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "jsonl.gz"])
+async def test_round_trip(managers, tmp_path: Path, format: str):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 23)
+    output = tmp_path / f"export.{format}"
+
+    info = await source.export_session(session_id, output, format=format)
+
+    assert info["message_count"] == 23
+    assert info["size"] == output.stat().st_size
+
+    target = managers("target")
+    result = await target.import_session(output)
+
+    assert result["message_count"] == 23
+    assert result["session_id"] != session_id
+    imported = await target.session_manager.list_messages(result["session_id"])
+    assert sorted(m.text for m in imported) == sorted(f"hello {i}" for i in range(23))
+    for message in imported:
+        assert message.session_id == result["session_id"]
+        assert all(part.session_id == result["session_id"] for part in message.parts)
+
+
+async def test_export_reads_storage_in_pages(managers, tmp_path: Path, monkeypatch):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 20)
+    page_sizes = []
+    original = MessageStorage.iter_message_pages
+
+    async def recording(self, session_id, page_size=100):
+        async for page in original(self, session_id, page_size):
+            page_sizes.append(len(page))
+            yield page
+
+    monkeypatch.setattr(MessageStorage, "iter_message_pages", recording)
+
+    await source.export_session(session_id, tmp_path / "out.jsonl", format="jsonl")
+
+    assert page_sizes == [7, 7, 6]
+
+
+async def test_import_inserts_in_batches(managers, tmp_path: Path):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 12)
+    output = tmp_path / "out.jsonl"
+    await source.export_session(session_id, output, format="jsonl")
+
+    target = managers("target")
+    batches = []
+    original = target.session_manager.create_messages
+
+    async def recording(session_id, messages):
+        batches.append(len(messages))
+        await original(session_id, messages)
+
+    target.session_manager.create_messages = recording
+    await target.import_session(output)
+
+    assert sum(batches) == 12
+    assert max(batches) <= 5
+
+
+async def test_export_redacts_each_record(managers, tmp_path: Path):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 3, text="key sk-abcdefghijklmnopqrstuvwx")
+    output = tmp_path / "out.jsonl.gz"
+
+    await source.export_session(session_id, output, format="jsonl.gz")
+
+    content = gzip.open(output, "rt").read()
+    assert "sk-abcdefghijklmnopqrstuvwx" not in content
+    assert "[REDACTED]" in content
+
+
+async def test_json_export_is_a_single_document(managers, tmp_path: Path):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 4)
+    output = tmp_path / "out.json"
+
+    await source.export_session(session_id, output, format="json")
+
+    document = json.loads(output.read_text())
+    assert document["session"]["id"] == session_id
+    assert len(document["messages"]) == 4
+
+
+async def test_empty_session_exports(managers, tmp_path: Path):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 0)
+
+    for format in ("json", "jsonl"):
+        output = tmp_path / f"out.{format}"
+        info = await source.export_session(session_id, output, format=format)
+        assert info["message_count"] == 0
+        assert [t for t, _ in iter_export_records(output)] == ["session"]
+
+
+async def test_unsupported_format_leaves_no_file(managers, tmp_path: Path):
+    source = managers("source")
+    session_id = await _populate(source.session_manager, 1)
+
+    with pytest.raises(ValueError, match="Unsupported format"):
+        await source.export_session(session_id, tmp_path / "out.xml", format="xml")
+    assert not (tmp_path / "out.xml").exists()
+
+
+def test_reader_handles_pretty_json_split_across_chunks(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(export_import, "_READ_CHUNK", 3)
+    document = {
+        "version": 12345,
+        "session": {"id": "s1", "title": "T"},
+        "messages": [{"id": f"m{i}", "text": "x" * 50} for i in range(5)],
+        "parts": [{"id": "p1", "message_id": "m1"}],
+        "exported_at": "2026-01-01",
+    }
+    path = tmp_path / "pretty.json"
+    path.write_text(json.dumps(document, indent=4))
+
+    records = list(iter_export_records(path))
+
+    assert records[0] == ("session", document["session"])
+    assert [d["id"] for t, d in records if t == "message"] == [f"m{i}" for i in range(5)]
+    assert records[-1] == ("part", {"id": "p1", "message_id": "m1"})
+
+
+def test_reader_rejects_truncated_json(tmp_path: Path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"session": {"id": "s1"}, "messages": [{"id": "m1"')
+
+    with pytest.raises(ValueError, match="Invalid export"):
+        list(iter_export_records(path))
+
+
+async def test_import_without_session_fails(managers, tmp_path: Path):
+    path = tmp_path / "orphan.jsonl"
+    path.write_text('{"type": "message", "data": {"id": "m1"}}\n')
+
+    with pytest.raises(ValueError, match="no session record"):
+        await managers("target").import_session(path)
+
+
+def test_detect_format():
+    assert detect_format(Path("a.jsonl.gz")) == "jsonl.gz"
+    assert detect_format(Path("a.JSONL")) == "jsonl"
+    assert detect_format(Path("a.json")) == "json"
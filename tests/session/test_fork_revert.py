@@ -0,0 +1,118 @@
+"""Tests for session fork trees and the parent/child session index.
+
+Tests cover:
+- SessionStorage maintaining the index on create and delete
+- list_child_sessions / get_session_tree reading through the index
+- rebuild_child_index reconstructing the index from session records
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.core.models import Session
+from dawn_kestrel.session.fork_revert import (
+    export_session_tree,
+    fork_session,
+    get_session_tree,
+    list_child_sessions,
+)
+from dawn_kestrel.storage.store import SessionStorage
+
+
+def _session(session_id: str, directory: Path, parent_id: str | None = None) -> Session:
+    return Session(
+        id=session_id,
+        slug=session_id,
+        project_id="proj",
+        directory=str(directory),
+        parent_id=parent_id,
+        title=f"Title {session_id}",
+        version="1.0.0",
+    )
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> SessionStorage:
+    return SessionStorage(tmp_path)
+
+
+async def test_create_session_indexes_child(storage: SessionStorage, tmp_path: Path):
+    """Creating a session with a parent records it in the index."""
+    await storage.create_session(_session("root", tmp_path))
+    await storage.create_session(_session("child_a", tmp_path, parent_id="root"))
+    await storage.create_session(_session("child_b", tmp_path, parent_id="root"))
+
+    assert await storage.list_child_ids("root", "proj") == ["child_a", "child_b"]
+    assert await storage.list_child_ids("child_a", "proj") == []
+
+
+async def test_delete_session_removes_from_index(storage: SessionStorage, tmp_path: Path):
+    """Deleting a child removes it from its parent's entry."""
+    await storage.create_session(_session("root", tmp_path))
+    await storage.create_session(_session("child_a", tmp_path, parent_id="root"))
+    await storage.create_session(_session("child_b", tmp_path, parent_id="root"))
+
+    assert await storage.delete_session("child_a", "proj") is True
+    assert await storage.list_child_ids("root", "proj") == ["child_b"]
+
+    assert await storage.delete_session("child_b", "proj") is True
+    assert await storage.list_child_ids("root", "proj") == []
+    assert not list((tmp_path / "storage" / "session_children" / "proj").rglob("*.json"))
+
+
+async def test_concurrent_forks_keep_every_child(storage: SessionStorage, tmp_path: Path):
+    """Children created concurrently under one parent are all indexed."""
+    await storage.create_session(_session("root", tmp_path))
+
+    await asyncio.gather(
+        *(
+            storage.create_session(_session(f"child_{i:02d}", tmp_path, parent_id="root"))
+            for i in range(20)
+        )
+    )
+
+    assert await storage.list_child_ids("root", "proj") == [f"child_{i:02d}" for i in range(20)]
+
+
+async def test_rebuild_child_index(storage: SessionStorage, tmp_path: Path):
+    """Rebuilding reconstructs the index from stored sessions and drops stale entries."""
+    await storage.create_session(_session("root", tmp_path))
+    await storage.create_session(_session("child", tmp_path, parent_id="root"))
+    await storage.create_session(_session("grandchild", tmp_path, parent_id="child"))
+    await storage.write(
+        ["session_children", "proj", "gone", "x"], {"parent_id": "gone", "child_id": "x"}
+    )
+    await storage.remove(["session_children", "proj", "child", "grandchild"])
+
+    parents = await storage.rebuild_child_index("proj")
+
+    assert parents == 2
+    assert await storage.list_child_ids("child", "proj") == ["grandchild"]
+    assert await storage.list_child_ids("gone", "proj") == []
+
+
+async def test_fork_session_and_tree(tmp_path: Path):
+    """Forked sessions are listed as children and exported as a tree."""
+    storage = SessionStorage(tmp_path)
+    root = await storage.create_session(_session("root", tmp_path))
+    child = await storage.create_session(_session("child", tmp_path, parent_id="root"))
+    await storage.create_session(_session("grandchild", tmp_path, parent_id="child"))
+
+    fork_id = await fork_session(root, "message_12345678", title="Forked")
+
+    children = await list_child_sessions(root)
+    assert {s.id for s in children} == {"child", fork_id}
+
+    tree = await get_session_tree(root)
+    assert tree["id"] == "root"
+    child_tree = next(c for c in tree["children"] if c["id"] == "child")
+    assert [c["id"] for c in child_tree["children"]] == ["grandchild"]
+
+    text = await export_session_tree(root)
+    assert "  • Title child" in text
+    assert "    • Title grandchild" in text
+    assert child.id in {c["id"] for c in tree["children"]}
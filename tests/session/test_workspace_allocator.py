@@ -12,6 +12,7 @@ Tests the WorkspaceAllocator for managing isolated workspaces:
 from __future__ import annotations
 
 import shutil
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -23,6 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dawn_kestrel.session.workspace import (
     Workspace,
     WorkspaceAllocator,
+    WorkspaceCheckoutError,
     WorkspaceLimitExceeded,
     WorkspaceNotFoundError,
 )
@@ -489,3 +491,144 @@ def test_allocator_with_nested_base_dir(tmp_path: Path):
 
     assert nested_dir.exists()
     assert workspace.path.exists()
+
+
+# ===== Warm Checkout Pool Tests =====
+
+
+@pytest.fixture
+def source_repo(tmp_path: Path) -> Path:
+    """Create a local git repository with one commit on main."""
+    repo = tmp_path / "source"
+    repo.mkdir()
+    git = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "init", "--quiet", "--initial-branch=main"], check=True)
+    (repo / "README.md").write_text("hello\n")
+    subprocess.run([*git, "add", "README.md"], check=True)
+    subprocess.run([*git, "commit", "--quiet", "-m", "init"], check=True)
+    return repo
+
+
+def test_checkout_allocates_worktree(temp_base_dir: Path, source_repo: Path):
+    """Test checkout=True allocates a working copy of the repository."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=2)
+
+    workspace = allocator.allocate(repo_url=str(source_repo), checkout=True)
+
+    assert (workspace.path / "README.md").read_text() == "hello\n"
+    assert allocator.get_stats()["pool_misses"] == 1
+
+
+def test_checkout_release_resets_and_reuses(temp_base_dir: Path, source_repo: Path):
+    """Test released checkouts are reset and served from the pool."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=2)
+
+    ws1 = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+    (ws1.path / "README.md").write_text("modified\n")
+    (ws1.path / "scratch.txt").write_text("junk")
+    allocator.release(ws1.id)
+
+    assert ws1.path.exists()
+
+    ws2 = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+
+    assert ws2.id != ws1.id
+    assert ws2.path == ws1.path
+    assert (ws2.path / "README.md").read_text() == "hello\n"
+    assert not (ws2.path / "scratch.txt").exists()
+    stats = allocator.get_stats()
+    assert stats["pool_hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["allocations"] == 2
+    assert stats["wait_ms_max"] >= stats["wait_ms_avg"] > 0
+
+
+def _commit(repo: Path, name: str, content: str) -> None:
+    git = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    (repo / name).write_text(content)
+    subprocess.run([*git, "add", name], check=True)
+    subprocess.run([*git, "commit", "--quiet", "-m", f"update {name}"], check=True)
+
+
+def test_checkouts_follow_remote_updates(temp_base_dir: Path, source_repo: Path):
+    """Test new and recycled checkouts see commits pushed after the mirror was cloned."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=1, mirror_fetch_interval=0)
+
+    ws1 = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+    _commit(source_repo, "README.md", "updated\n")
+
+    # Pool miss: a new checkout is created from the fetched mirror
+    ws2 = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+    assert (ws2.path / "README.md").read_text() == "updated\n"
+
+    # Recycled checkout is reset to the fetched branch head
+    _commit(source_repo, "NEW.md", "new\n")
+    allocator.release(ws1.id)
+    ws3 = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+    assert ws3.path == ws1.path
+    assert (ws3.path / "NEW.md").read_text() == "new\n"
+
+
+def test_mirror_fetch_is_rate_limited(temp_base_dir: Path, source_repo: Path):
+    """Test the mirror is not fetched again within mirror_fetch_interval."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, mirror_fetch_interval=3600)
+
+    allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+    _commit(source_repo, "README.md", "updated\n")
+    workspace = allocator.allocate(repo_url=str(source_repo), branch="main", checkout=True)
+
+    assert (workspace.path / "README.md").read_text() == "hello\n"
+
+
+def test_checkout_pool_size_zero_removes_on_release(temp_base_dir: Path, source_repo: Path):
+    """Test checkouts are removed on release when pooling is disabled."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir)
+
+    workspace = allocator.allocate(repo_url=str(source_repo), checkout=True)
+    allocator.release(workspace.id)
+
+    assert not workspace.path.exists()
+    assert allocator.get_stats()["warm"] == 0
+
+
+def test_prewarm_fills_pool(temp_base_dir: Path, source_repo: Path):
+    """Test prewarm creates checkouts up to pool_size."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=2)
+
+    created = allocator.prewarm(str(source_repo), count=5)
+    workspace = allocator.allocate(repo_url=str(source_repo), checkout=True)
+
+    assert created == 2
+    assert allocator.get_stats()["pool_hits"] == 1
+    assert (workspace.path / "README.md").exists()
+
+    allocator.release(workspace.id)
+    assert allocator.drain_pool() == 2
+    assert allocator.get_stats()["warm"] == 0
+
+
+def test_cleanup_orphaned_preserves_pool(temp_base_dir: Path, source_repo: Path):
+    """Test orphan cleanup does not remove mirrors or warm checkouts."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=1)
+    allocator.prewarm(str(source_repo))
+
+    removed = allocator.cleanup_orphaned()
+
+    assert removed == []
+    assert (temp_base_dir / WorkspaceAllocator.MIRRORS_DIRNAME).exists()
+
+
+def test_checkout_requires_repo_url(allocator: WorkspaceAllocator):
+    """Test checkout without a repository is rejected."""
+    with pytest.raises(ValueError):
+        allocator.allocate(checkout=True)
+
+
+def test_checkout_invalid_repo_raises(temp_base_dir: Path, tmp_path: Path):
+    """Test an unreachable repository raises WorkspaceCheckoutError."""
+    allocator = WorkspaceAllocator(base_dir=temp_base_dir, pool_size=1)
+
+    with pytest.raises(WorkspaceCheckoutError):
+        allocator.allocate(repo_url=str(tmp_path / "missing"), checkout=True)
+
+    assert allocator.count == 0
@@ -394,6 +394,23 @@ class TestAgentOrchestrator:
         assert child2 in children
         assert unrelated not in children
 
+    @pytest.mark.asyncio
+    async def test_task_indexes_follow_status_and_removal(self, orchestrator):
+        """Test active and child indexes after tasks finish or are removed."""
+        parent = create_agent_task("parent", "Parent task")
+        child = create_agent_task("child", "Child", parent_id=parent.task_id)
+
+        with orchestrator._task_lock:
+            orchestrator._tasks[parent.task_id] = parent
+            orchestrator._tasks[child.task_id] = child
+
+        child.status = TaskStatus.COMPLETED
+        assert orchestrator.get_active_tasks() == [parent]
+
+        assert orchestrator.clear_completed_tasks() == 1
+        assert orchestrator.get_child_tasks(parent.task_id) == []
+        assert orchestrator.get_active_tasks() == [parent]
+
     @pytest.mark.asyncio
     async def test_list_tasks(self, orchestrator):
         """Test listing tasks."""
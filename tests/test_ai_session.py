@@ -0,0 +1,145 @@
+"""Tests for AISession: structured (JSON) output and background compaction."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from dawn_kestrel.ai_session import AISession
+from dawn_kestrel.core.models import Message, Session, TextPart
+from dawn_kestrel.core.tokenizer import count_tokens
+from dawn_kestrel.providers.base import StreamEvent
+from dawn_kestrel.session.compaction import BackgroundCompactor
+from dawn_kestrel.storage.store import MessageStorage
+from dawn_kestrel.tools.framework import ToolRegistry
+from dawn_kestrel.utils.json_parser import IncrementalJSONParser
+
+
+@pytest.fixture
+def ai_session() -> AISession:
+    session = Session(
+        id="test-session-123",
+        slug="test-session",
+        project_id="test-project",
+        directory="/tmp/test-project",
+        title="Test Session",
+        version="1.0.0",
+    )
+    return AISession(session=session, provider_id="anthropic", model="test-model", api_key="key")
+
+
+async def _events(*events: StreamEvent) -> AsyncIterator[StreamEvent]:
+    for event in events:
+        yield event
+
+
+@pytest.mark.asyncio
+async def test_structured_output_stop_closes_stream(ai_session: AISession) -> None:
+    consumed: list[str] = []
+    closed = False
+
+    async def events() -> AsyncIterator[StreamEvent]:
+        nonlocal closed
+        try:
+            for event in (
+                StreamEvent("text-delta", {"delta": '{"answer": '}),
+                StreamEvent("text-delta", {"delta": "42}"}),
+                StreamEvent("text-delta", {"delta": " trailing chatter"}),
+                StreamEvent("tool-call", {"tool": "bash", "input": {"command": "ls"}}),
+                StreamEvent(
+                    "finish",
+                    {
+                        "finish_reason": "stop",
+                        "usage": {"prompt_tokens": 120, "completion_tokens": 9},
+                    },
+                ),
+            ):
+                consumed.append(event.event_type)
+                yield event
+        finally:
+            closed = True
+
+    parts, usage = await ai_session.process_stream(
+        events(), json_parser=IncrementalJSONParser(), prompt_tokens=120
+    )
+
+    text_parts = [p for p in parts if isinstance(p, TextPart)]
+    assert [p.text for p in text_parts] == ['{"answer": 42}']
+    assert closed
+    assert consumed == ["text-delta", "text-delta"]
+    assert (usage.input, usage.output) == (120, count_tokens('{"answer": 42}'))
+
+
+class WordTokenizer:
+    name = "words"
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+class StorageSessionManager:
+    def __init__(self, storage: MessageStorage) -> None:
+        self.storage = storage
+
+    async def add_message(self, message: Message) -> str:
+        await self.storage.create_message(message.session_id, message)
+        return message.id
+
+    async def add_part(self, part: Any) -> str:
+        return part.id
+
+    async def list_messages(self, session_id: str) -> list[Message]:
+        return [Message(**m) for m in await self.storage.list_messages(session_id)]
+
+
+class EchoProvider:
+    """Replies with a fixed text and records the messages it was sent."""
+
+    def __init__(self) -> None:
+        self.requests: list[list[dict[str, Any]]] = []
+
+    def stream(self, model_info, messages, tools, options) -> AsyncIterator[StreamEvent]:
+        self.requests.append(messages)
+        return _events(
+            StreamEvent("text-delta", {"delta": "ok " * 10}),
+            StreamEvent("finish", {"finish_reason": "stop", "usage": {}}),
+        )
+
+    def calculate_cost(self, usage, model_info) -> Decimal:
+        return Decimal("0")
+
+
+@pytest.mark.asyncio
+async def test_turns_schedule_compaction_and_send_the_summary(
+    ai_session: AISession, tmp_path: Path
+) -> None:
+    compactor = BackgroundCompactor(
+        tmp_path, threshold_tokens=40, protect_tokens=30, tokenizer=WordTokenizer()
+    )
+    ai_session.session_manager = StorageSessionManager(MessageStorage(tmp_path))
+    ai_session.compactor = compactor
+    ai_session.provider = EchoProvider()
+    ai_session.model_info = SimpleNamespace(id="test-model")
+    ai_session.tool_manager.tool_registry = ToolRegistry()
+
+    for turn in range(3):
+        await ai_session.process_message(f"question {turn} " + "word " * 8)
+        await compactor.wait_idle()
+    checkpoint = await compactor.latest_checkpoint(ai_session.session.id)
+    assert checkpoint is not None
+
+    await ai_session.process_message("question 3 " + "word " * 8)
+
+    last_request = ai_session.provider.requests[-1]
+    assert last_request[0]["content"].startswith("Summary of the conversation so far:")
+    assert checkpoint.summary in last_request[0]["content"]
+    # Compacted messages are not sent again; the newest question is last
+    assert len(last_request) < 2 * 4
+    assert last_request[-1]["content"].startswith("question 3")
+    assert {"role": "assistant", "content": "ok " * 10} in last_request
+    await compactor.close()
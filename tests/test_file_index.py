@@ -0,0 +1,132 @@
+"""Tests for the incremental file index behind FileScanner.
+
+Tests cover:
+- IgnoreRules compiled matcher (globs, folders, nested paths)
+- Initial index honouring hidden entries, IgnoreRules and .gitignore
+- Incremental refresh on create/delete/rename with inotify and mtime backends
+- FileScanner.scan_files using the index
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.context.pipeline import FileIndex, FileScanner, IgnoreRules
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("x")
+    (tmp_path / "src" / "pkg" / "mod.py").write_text("x")
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib" / "index.js").write_text("x")
+    (tmp_path / ".hidden").write_text("x")
+    (tmp_path / "app.log").write_text("x")
+    (tmp_path / "README.md").write_text("x")
+    return tmp_path
+
+
+def _bump_dir_mtime(path: Path) -> None:
+    # Coarse filesystem timestamps can hide same-tick changes from polling
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestIgnoreRules:
+    @pytest.mark.parametrize(
+        "path",
+        ["a.swp", "deep/dir/b.pyc", ".DS_Store", "x/logs/today.txt", "logs/a", "node_modules/x.js",
+         "src/__pycache__/m.cpython.pyc", "debug.log"],
+    )
+    def test_ignored(self, path):
+        assert IgnoreRules.match_file(path)
+
+    @pytest.mark.parametrize("path", ["src/main.py", "logsfile.txt", "catalog.txt", "README.md"])
+    def test_not_ignored(self, path):
+        assert not IgnoreRules.match_file(path)
+
+    def test_matcher_compiled_once(self):
+        assert IgnoreRules.matcher() is IgnoreRules.matcher()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+class TestFileIndex:
+    def test_initial_build(self, repo, use_inotify):
+        index = FileIndex(repo, use_inotify=use_inotify)
+        index.build()
+
+        assert index.files == ["README.md", "src/main.py", "src/pkg/mod.py"]
+        assert "src/main.py" in index
+        assert "node_modules/lib/index.js" not in index
+        index.close()
+
+    def test_gitignore_patterns(self, repo, use_inotify):
+        (repo / ".gitignore").write_text("# comment\n*.md\n/src/pkg/\n!keep.md\n")
+        index = FileIndex(repo, use_inotify=use_inotify)
+        index.build()
+
+        assert index.files == ["src/main.py"]
+        index.close()
+
+    def test_refresh_applies_changes(self, repo, use_inotify):
+        index = FileIndex(repo, use_inotify=use_inotify)
+        index.build()
+
+        (repo / "src" / "new.py").write_text("x")
+        (repo / "src" / "pkg" / "mod.py").unlink()
+        (repo / "docs" / "guide").mkdir(parents=True)
+        (repo / "docs" / "guide" / "intro.md").write_text("x")
+        (repo / "README.md").rename(repo / "README.txt")
+        (repo / "build.swp").write_text("x")
+        for path in (repo, repo / "src", repo / "src" / "pkg"):
+            _bump_dir_mtime(path)
+        index.refresh()
+
+        assert index.files == ["README.txt", "docs/guide/intro.md", "src/main.py", "src/new.py"]
+        index.close()
+
+    def test_removed_directory_drops_files(self, repo, use_inotify):
+        index = FileIndex(repo, use_inotify=use_inotify)
+        index.build()
+
+        (repo / "src" / "pkg" / "mod.py").unlink()
+        (repo / "src" / "pkg").rmdir()
+        _bump_dir_mtime(repo / "src")
+        index.refresh()
+
+        assert index.files == ["README.md", "src/main.py"]
+        index.close()
+
+    def test_unchanged_tree_is_not_relisted(self, repo, use_inotify, monkeypatch):
+        index = FileIndex(repo, use_inotify=use_inotify)
+        index.build()
+
+        scanned = []
+        original = index._scan_dir
+        monkeypatch.setattr(index, "_scan_dir", lambda d: scanned.append(d) or original(d))
+        (repo / "src" / "pkg" / "other.py").write_text("x")
+        _bump_dir_mtime(repo / "src" / "pkg")
+        index.refresh()
+
+        assert scanned == ["src/pkg"]
+        assert "src/pkg/other.py" in index
+        index.close()
+
+
+async def test_scanner_uses_incremental_index(repo):
+    scanner = FileScanner(repo)
+
+    assert await scanner.scan_files() == ["README.md", "src/main.py", "src/pkg/mod.py"]
+
+    (repo / "src" / "extra.py").write_text("x")
+    _bump_dir_mtime(repo / "src")
+    assert "src/extra.py" in await scanner.scan_files()
+    assert await scanner.list_files("src/*.py") == ["src/extra.py", "src/main.py", "src/pkg/mod.py"]
+
+    (repo / "src" / "extra.py").unlink()
+    assert "src/extra.py" not in await scanner.scan_files(force_refresh=True)
+    scanner.close()
@@ -0,0 +1,202 @@
+"""Tests for the async git service and the snapshot managers built on it.
+
+Tests cover:
+- Persistent cat-file processes serving many reads
+- Snapshot trees from a private index, incremental by path
+- The user's staging area left untouched
+- GitSnapshot (snapshot/index.py) with a separate snapshot git dir
+- Session GitSnapshot revert/diff and GitCommands diff stats
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.core.models import Message, Session, SnapshotPart
+from dawn_kestrel.git.commands import GitCommands
+from dawn_kestrel.git.service import GitService
+from dawn_kestrel.session import fork_revert
+from dawn_kestrel.session.fork_revert import GitSnapshot as SessionGitSnapshot
+from dawn_kestrel.snapshot.index import GitSnapshot
+from dawn_kestrel.storage.store import MessageStorage, PartStorage
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("a = 1\n")
+    (root / "src" / "b.py").write_text("b = 1\n")
+    (root / "README").write_text("readme\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+def _tree_files(repo: Path, tree: str) -> list[str]:
+    return _git(repo, "ls-tree", "-r", "--name-only", tree).split()
+
+
+class TestGitService:
+    async def test_reads_share_one_cat_file_process(self, repo: Path):
+        git = GitService(repo)
+
+        for _ in range(20):
+            assert await git.read_blob("HEAD", "src/a.py") == b"a = 1\n"
+        assert await git.read_blob("HEAD", "missing.py") is None
+        assert await git.read_blob("HEAD", "src") is None
+        info = await git.object_info("HEAD:src")
+
+        assert info.type == "tree"
+        assert git.stats["processes_started"] == 2  # --batch and --batch-check
+        assert git.stats["commands"] == 0
+        await git.close()
+
+    async def test_cat_file_restarts_after_exit(self, repo: Path):
+        git = GitService(repo)
+        await git.read_blob("HEAD", "README")
+
+        git._batch._proc.kill()
+        await git._batch._proc.wait()
+
+        assert await git.read_blob("HEAD", "README") == b"readme\n"
+        await git.close()
+
+    async def test_snapshot_tree_incremental_and_private(self, repo: Path):
+        git = GitService(repo)
+        first = await git.write_snapshot_tree()
+        assert first == _git(repo, "rev-parse", "HEAD^{tree}").strip()
+
+        (repo / "src" / "a.py").write_text("a = 2\n")
+        (repo / "src" / "b.py").unlink()
+        (repo / "new").mkdir()
+        (repo / "new" / "c.py").write_text("c\n")
+        second = await git.write_snapshot_tree(["src/a.py", "src/b.py", "new"])
+
+        assert _tree_files(repo, second) == ["README", "new/c.py", "src/a.py"]
+        assert await git.read_blob(second, "src/a.py") == b"a = 2\n"
+        # Untouched paths are not rescanned when paths are given
+        (repo / "README").write_text("changed\n")
+        third = await git.write_snapshot_tree(["src/a.py"])
+        assert await git.read_blob(third, "README") == b"readme\n"
+        # A full update picks it up
+        fourth = await git.write_snapshot_tree()
+        assert await git.read_blob(fourth, "README") == b"changed\n"
+        # The user's index is untouched
+        assert _git(repo, "diff", "--cached", "--name-only") == ""
+        await git.close()
+
+    async def test_snapshot_tree_drops_deleted_directories(self, repo: Path):
+        git = GitService(repo)
+        await git.write_snapshot_tree()
+
+        shutil.rmtree(repo / "src")
+        (repo / "scratch.tmp").write_text("x\n")
+        (repo / "scratch.tmp").unlink()  # created and removed between snapshots
+        tree = await git.write_snapshot_tree(["src", "scratch.tmp"])
+
+        assert _tree_files(repo, tree) == ["README"]
+        await git.close()
+
+
+class TestIndexGitSnapshot:
+    async def test_track_patch_restore_with_separate_git_dir(self, repo: Path, tmp_path: Path):
+        snapshot = GitSnapshot(tmp_path / "snapshots", "proj", work_tree=repo)
+
+        first = await snapshot.track()
+        (repo / "src" / "a.py").write_text("a = 3\n")
+        (repo / "extra.txt").write_text("x\n")
+
+        assert sorted(await snapshot.patch(first)) == ["extra.txt", "src/a.py"]
+        second = await snapshot.track(["src/a.py", "extra.txt"])
+        assert await snapshot.read_file(second, "extra.txt") == b"x\n"
+        assert "a = 3" in await snapshot.diff(first, second)
+
+        await snapshot.restore(first)
+        assert (repo / "src" / "a.py").read_text() == "a = 1\n"
+        # Project repository is not used for snapshots
+        assert _git(repo, "status", "--porcelain") == "?? extra.txt\n"
+        assert await snapshot._get_hash(second) is not None
+        await snapshot.close()
+
+
+class TestSessionGitSnapshot:
+    async def test_revert_file_and_diff(self, repo: Path):
+        manager = SessionGitSnapshot("s1", repo)
+        before = await manager.create_snapshot()
+        (repo / "src" / "a.py").write_text("a = 5\n")
+        (repo / "added.py").write_text("new\n")
+        after = await manager.create_snapshot(["src/a.py", "added.py"])
+
+        diff = await manager.save_diff(before, after, ["src/a.py", "added.py"])
+        assert "+a = 5" in diff
+        assert "+ added.py" in diff
+
+        assert await manager.revert_file("src/a.py", before) is True
+        assert (repo / "src" / "a.py").read_text() == "a = 1\n"
+        assert await manager.revert_file("added.py", before) is False
+        assert await manager.revert_file("src/a.py", "0" * 40) is False
+        await manager.close()
+
+    async def test_revert_session_stops_git_processes(
+        self, repo: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        managers: list[SessionGitSnapshot] = []
+
+        class RecordingSnapshot(SessionGitSnapshot):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                managers.append(self)
+
+        monkeypatch.setattr(fork_revert, "GitSnapshot", RecordingSnapshot)
+        session = Session(
+            id="s1", slug="s1", project_id="p", directory=str(repo), title="t", version="1"
+        )
+        await MessageStorage(repo).create_message(
+            "s1", Message(id="m1", session_id="s1", role="assistant")
+        )
+        await PartStorage(repo).create_part(
+            "m1",
+            SnapshotPart(
+                id="snap1", session_id="s1", message_id="m1", part_type="snapshot", snapshot="abc"
+            ),
+        )
+
+        await fork_revert.revert_session(session, "abc", ["src/a.py"])
+
+        [manager] = managers
+        assert manager.git._batch._proc is None
+        assert manager.git._batch_check._proc is None
+
+
+async def test_git_commands_diff_stats(repo: Path):
+    commands = GitCommands(repo)
+    first = await commands.get_root_commit()
+    (repo / "src" / "a.py").write_text("a = 1\nb = 2\n")
+    _git(repo, "commit", "-q", "-am", "second")
+    second = await commands.get_root_commit()
+
+    stats = await commands.get_diff_stats(first, second)
+
+    assert stats == {"src/a.py": {"additions": 1, "deletions": 0}}
+    assert await commands.get_file(first, "src/a.py") == b"a = 1\n"
+    with pytest.raises(ValueError):
+        await commands.get_diff("../x", second)
+    await commands.close()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
 
 import pytest
 
@@ -144,6 +145,112 @@ class TestMemoryEmbedder:
         assert strategy in ["mock", "openai", "local"]
 
 
+class _FakeEmbeddings:
+    """Stands in for openai.AsyncOpenAI().embeddings"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, model, input, dimensions):
+        self.requests.append(list(input))
+        # Reply out of order; the embedder must sort by index
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text))] * dimensions)
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class _FakeSentenceTransformer:
+    def __init__(self):
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self):
+        return 384
+
+    def encode(self, texts, batch_size, convert_to_numpy):
+        import numpy as np
+
+        self.calls += 1
+        return np.ones((len(texts), 384), dtype=np.float32)
+
+
+def _openai_embedder(monkeypatch, **kwargs) -> tuple[MemoryEmbedder, _FakeEmbeddings]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("EMBEDDING_STRATEGY", "openai")
+    embedder = MemoryEmbedder(**kwargs)
+    embeddings = _FakeEmbeddings()
+    embedder._openai_client = SimpleNamespace(embeddings=embeddings)
+    return embedder, embeddings
+
+
+class TestBatchedCachedEmbedder:
+    """Test batching, caching and native-dimension embeddings"""
+
+    async def test_batch_is_one_request(self, monkeypatch):
+        embedder, api = _openai_embedder(monkeypatch)
+
+        result = await embedder.embed_batch(["a", "bb", "", "a", "ccc"])
+
+        assert api.requests == [["a", "bb", "ccc"]]
+        assert [v[0] for v in result] == [1.0, 2.0, 0.0, 1.0, 3.0]
+
+    async def test_batch_size_splits_requests(self, monkeypatch):
+        embedder, api = _openai_embedder(monkeypatch, batch_size=2)
+
+        await embedder.embed_batch(["a", "b", "c"])
+
+        assert api.requests == [["a", "b"], ["c"]]
+
+    async def test_disk_cache_skips_provider(self, monkeypatch, tmp_path):
+        embedder, api = _openai_embedder(monkeypatch, cache_dir=tmp_path)
+        first = await embedder.embed_batch(["hello", "world"])
+
+        embedder, api = _openai_embedder(monkeypatch, cache_dir=tmp_path)
+        second = await embedder.embed_batch(["hello", "new", "world"])
+
+        assert api.requests == [["new"]]
+        assert second[0] == first[0]
+        assert embedder.cache.hits == 2
+
+    async def test_cache_is_keyed_by_model(self, tmp_path):
+        mock = MemoryEmbedder(cache_dir=tmp_path)
+        await mock.embed("hello")
+
+        other = MemoryEmbedder(cache_dir=tmp_path)
+        other.EMBEDDING_DIMENSION = 8
+
+        assert len(await other.embed("hello")) == 8
+        assert other.cache.hits == 0
+
+    async def test_mock_embedding_values(self):
+        import hashlib
+
+        embedder = create_memory_embedder()
+        digest = hashlib.md5(b"hello").hexdigest()
+
+        embedding = await embedder.embed("hello")
+
+        assert embedding == [
+            (int(digest[i % 32], 16) / 15.0) * 2 - 1
+            for i in range(MemoryEmbedder.EMBEDDING_DIMENSION)
+        ]
+
+    async def test_local_embeddings_keep_native_dimension(self, monkeypatch):
+        pytest.importorskip("numpy")
+        monkeypatch.setenv("EMBEDDING_STRATEGY", "local")
+        embedder = MemoryEmbedder()
+        model = _FakeSentenceTransformer()
+        embedder._local_model = model
+
+        result = await embedder.embed_batch(["a", "b", ""])
+
+        assert [len(v) for v in result] == [384, 384, 384]
+        assert result[2] == [0.0] * 384
+        assert model.calls == 1
+        assert embedder.dimension == 384
+
+
 class TestMemorySummarizer:
     """Test MemorySummarizer functionality"""
 
@@ -0,0 +1,281 @@
+"""Tests for the memory vector index and semantic MemoryManager search"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dawn_kestrel.agents.memory_index import (  # noqa: E402
+    HNSWLIB_AVAILABLE,
+    MemoryVectorIndex,
+    SessionVectorIndex,
+)
+from dawn_kestrel.agents.memory_manager import MemoryManager  # noqa: E402
+
+VOCAB = ["python", "rust", "database", "memory", "network", "testing"]
+
+
+class KeywordEmbedder:
+    """Embeds text as keyword counts over a tiny vocabulary"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def embed(self, text: str) -> list[float]:
+        self.calls += 1
+        words = text.lower().split()
+        return [float(words.count(term)) for term in VOCAB]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [await self.embed(text) for text in texts]
+
+
+def _unit(i: int, dim: int = 4) -> list[float]:
+    v = [0.0] * dim
+    v[i] = 1.0
+    return v
+
+
+class TestSessionVectorIndex:
+    """Test SessionVectorIndex"""
+
+    def test_brute_force_ranking(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add_many([("a", [1.0, 0.0, 0.0]), ("b", [0.7, 0.7, 0.0]), ("c", [0.0, 0.0, 1.0])])
+
+        hits = index.search([1.0, 0.1, 0.0], k=2)
+
+        assert [memory_id for memory_id, _ in hits] == ["a", "b"]
+        assert hits[0][1] == pytest.approx(0.995, abs=1e-3)
+        assert not index.approximate
+
+    def test_k_larger_than_store(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add("a", _unit(0))
+
+        assert [m for m, _ in index.search(_unit(0), k=10)] == ["a"]
+        assert SessionVectorIndex(tmp_path / "empty").search(_unit(0), k=3) == []
+
+    def test_incremental_delete_and_replace(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add_many([("a", _unit(0)), ("b", _unit(1)), ("c", _unit(2))])
+
+        assert index.delete("a")
+        assert not index.delete("a")
+        index.add("b", _unit(3))
+
+        assert len(index) == 2
+        assert index.tombstones == 2
+        assert "a" not in index
+        assert [m for m, _ in index.search(_unit(0), k=3)] != ["a"]
+        assert index.search(_unit(3), k=1)[0][0] == "b"
+
+    def test_dimension_mismatch(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add("a", _unit(0))
+
+        with pytest.raises(ValueError):
+            index.add("b", [1.0, 0.0])
+        with pytest.raises(ValueError):
+            index.search([1.0, 0.0], k=1)
+
+    def test_persists_across_reopen(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add_many([("a", _unit(0)), ("b", _unit(1))])
+        index.delete("a")
+
+        reopened = SessionVectorIndex(tmp_path / "s")
+
+        assert len(reopened) == 1
+        assert reopened.dimension == 4
+        assert [m for m, _ in reopened.search(_unit(1), k=2)] == ["b"]
+
+    def test_torn_log_tail_is_ignored(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add_many([("a", _unit(0)), ("b", _unit(1))])
+        with (tmp_path / "s" / "rows.jsonl").open("a") as f:
+            f.write('{"op": "add", "id": "c", "ro')
+
+        reopened = SessionVectorIndex(tmp_path / "s")
+
+        assert len(reopened) == 2
+        reopened.add("c", _unit(2))
+        assert SessionVectorIndex(tmp_path / "s").search(_unit(2), k=1)[0][0] == "c"
+
+    def test_compact_drops_tombstones(self, tmp_path: Path):
+        index = SessionVectorIndex(tmp_path / "s")
+        index.add_many([(f"m{i}", _unit(i % 4)) for i in range(8)])
+        index.delete_many(["m0", "m1", "m2"])
+
+        assert index.compact() == 3
+        assert index.tombstones == 0
+        assert (tmp_path / "s" / "vectors.f32").stat().st_size == 5 * 4 * 4
+
+        rows = [json.loads(line) for line in (tmp_path / "s" / "rows.jsonl").read_text().splitlines()]
+        assert [r["id"] for r in rows] == ["m3", "m4", "m5", "m6", "m7"]
+        assert SessionVectorIndex(tmp_path / "s").search(_unit(3), k=2)[0][0] in {"m3", "m7"}
+
+    @pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason="hnswlib not installed")
+    def test_switches_to_hnsw_above_threshold(self, tmp_path: Path):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(200, 16)).astype(np.float32)
+        index = SessionVectorIndex(tmp_path / "s", ann_threshold=100)
+
+        index.add_many([(f"m{i}", vectors[i]) for i in range(50)])
+        assert not index.approximate
+        index.add_many([(f"m{i}", vectors[i]) for i in range(50, 200)])
+        assert index.approximate
+
+        assert index.search(vectors[123], k=1)[0][0] == "m123"
+        index.delete("m123")
+        assert "m123" not in [m for m, _ in index.search(vectors[123], k=5)]
+
+        reopened = SessionVectorIndex(tmp_path / "s", ann_threshold=100)
+        assert reopened.approximate
+        assert reopened.search(vectors[42], k=1)[0][0] == "m42"
+
+
+    @pytest.mark.skipif(not HNSWLIB_AVAILABLE, reason="hnswlib not installed")
+    def test_hnsw_is_saved_lazily(self, tmp_path: Path):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(120, 16)).astype(np.float32)
+        index = SessionVectorIndex(tmp_path / "s", ann_threshold=100, ann_save_interval=10)
+        index.add_many([(f"m{i}", vectors[i]) for i in range(100)])
+        hnsw_path = tmp_path / "s" / "hnsw.bin"
+        saved = hnsw_path.read_bytes()
+
+        index.add_many([(f"m{i}", vectors[i]) for i in range(100, 105)])
+        index.delete("m7")
+        assert hnsw_path.read_bytes() == saved
+        assert not index.ann_save_due
+
+        # Unsaved delete is replayed from the rows log on open
+        reopened = SessionVectorIndex(tmp_path / "s", ann_threshold=100)
+        assert "m7" not in [m for m, _ in reopened.search(vectors[7], k=3)]
+        assert reopened.search(vectors[103], k=1)[0][0] == "m103"
+
+        index.add_many([(f"m{i}", vectors[i]) for i in range(105, 110)])
+        assert index.ann_save_due
+        index.flush()
+        assert hnsw_path.read_bytes() != saved
+        assert not index.ann_save_due
+
+
+class TestMemoryVectorIndex:
+    """Test MemoryVectorIndex"""
+
+    def test_sessions_are_isolated(self, tmp_path: Path):
+        indexes = MemoryVectorIndex(tmp_path)
+        indexes.session("s1").add("a", _unit(0))
+        indexes.session("s2").add("b", _unit(0))
+
+        assert [m for m, _ in indexes.session("s1").search(_unit(0), k=5)] == ["a"]
+        assert indexes.exists("s1")
+
+        indexes.drop("s1")
+        assert not indexes.exists("s1")
+        assert indexes.exists("s2")
+
+
+class TestSemanticMemorySearch:
+    """Test MemoryManager search through the vector index"""
+
+    async def test_search_ranks_by_similarity(self, tmp_path: Path):
+        manager = MemoryManager(tmp_path, embedder=KeywordEmbedder())
+        await manager.store("s", "python testing python")
+        await manager.store("s", "rust network")
+        await manager.store("s", "database memory")
+
+        results = await manager.search("s", query="rust", limit=1)
+
+        assert [m.content for m in results] == ["rust network"]
+
+    async def test_store_embeds_content(self, tmp_path: Path):
+        manager = MemoryManager(tmp_path, embedder=KeywordEmbedder())
+        memory = await manager.store("s", "memory database")
+
+        assert memory.embedding == [0.0, 0.0, 1.0, 1.0, 0.0, 0.0]
+
+    async def test_search_offset_and_delete(self, tmp_path: Path):
+        manager = MemoryManager(tmp_path, embedder=KeywordEmbedder())
+        first = await manager.store("s", "python python python")
+        await manager.store("s", "python rust")
+
+        page = await manager.search("s", query="python", limit=1, offset=1)
+        assert [m.content for m in page] == ["python rust"]
+
+        await manager.delete("s", first.id)
+        results = await manager.search("s", query="python")
+        assert [m.content for m in results] == ["python rust"]
+
+    async def test_existing_memories_are_indexed_on_first_search(self, tmp_path: Path):
+        plain = MemoryManager(tmp_path)
+        await plain.store("s", "network network", embedding=[0.0, 0.0, 0.0, 0.0, 1.0, 0.0])
+        await plain.store("s", "python")
+
+        embedder = KeywordEmbedder()
+        manager = MemoryManager(tmp_path, embedder=embedder)
+        results = await manager.search("s", query="network", limit=1)
+
+        assert [m.content for m in results] == ["network network"]
+        # Stored embedding reused; only the unembedded memory and the query are embedded
+        assert embedder.calls == 2
+
+        # Index persists, so a fresh manager does not rebuild
+        embedder = KeywordEmbedder()
+        manager = MemoryManager(tmp_path, embedder=embedder)
+        await manager.search("s", query="python")
+        assert embedder.calls == 1
+
+    async def test_index_is_rebuilt_when_embedder_dimension_changes(self, tmp_path: Path):
+        class PaddedEmbedder(KeywordEmbedder):
+            async def embed(self, text: str) -> list[float]:
+                return await super().embed(text) + [0.0, 0.0]
+
+        padded = MemoryManager(tmp_path, embedder=PaddedEmbedder())
+        await padded.store("s", "rust network")
+        await padded.store("s", "python")
+        assert padded.index.session("s").dimension == 8
+
+        manager = MemoryManager(tmp_path, embedder=KeywordEmbedder())
+        results = await manager.search("s", query="rust", limit=1)
+
+        assert [m.content for m in results] == ["rust network"]
+        assert manager.index.session("s").dimension == 6
+
+    async def test_search_falls_back_to_substring_on_dimension_error(self, tmp_path: Path):
+        class ShortBatchEmbedder(KeywordEmbedder):
+            async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+                return [[1.0, 0.0] for _ in texts]
+
+        plain = MemoryManager(tmp_path)
+        await plain.store("s", "Rust network")
+        await plain.store("s", "python")
+
+        manager = MemoryManager(tmp_path, embedder=ShortBatchEmbedder())
+        results = await manager.search("s", query="rust")
+
+        assert [m.content for m in results] == ["Rust network"]
+
+    async def test_first_store_on_unindexed_session_is_not_indexed_twice(self, tmp_path: Path):
+        await MemoryManager(tmp_path).store("s", "python")
+
+        manager = MemoryManager(tmp_path, embedder=KeywordEmbedder())
+        await manager.store("s", "rust network")
+
+        index = manager.index.session("s")
+        assert len(index) == 2
+        assert index.tombstones == 0
+
+    async def test_without_embedder_uses_substring_match(self, tmp_path: Path):
+        manager = MemoryManager(tmp_path)
+        await manager.store("s", "Rust network")
+        await manager.store("s", "python")
+
+        results = await manager.search("s", query="rust")
+
+        assert [m.content for m in results] == ["Rust network"]
+        assert manager.index is None
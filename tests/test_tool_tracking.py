@@ -9,7 +9,11 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from dawn_kestrel.agents.tool_execution_tracker import ToolExecutionTracker, create_tool_tracker
+from dawn_kestrel.agents.tool_execution_tracker import (
+    AppendOnlyToolExecutionTracker,
+    ToolExecutionTracker,
+    create_tool_tracker,
+)
 from dawn_kestrel.core.event_bus import Events, bus
 from dawn_kestrel.core.models import Message, Session, ToolState
 from dawn_kestrel.core.session_lifecycle import (
@@ -250,6 +254,190 @@ class TestToolExecutionTracker:
         assert result is None
 
 
+class TestAppendOnlyToolExecutionTracker:
+    """Tests for the append-only segment log tracker backend"""
+
+    def test_factory_selects_backend(self, temp_dir):
+        """Test create_tool_tracker returns the append-only backend on request"""
+        tracker = create_tool_tracker(temp_dir, append_only=True)
+
+        assert isinstance(tracker, AppendOnlyToolExecutionTracker)
+        assert tracker.storage_dir == temp_dir / "storage" / "tool_execution_log"
+
+    def test_log_appends_compact_lines(self, temp_dir, sample_tool_state):
+        """Test records are appended as single JSON lines to one segment"""
+        tracker = AppendOnlyToolExecutionTracker(temp_dir)
+
+        async def run():
+            for i in range(3):
+                await tracker.log_execution(
+                    execution_id=f"exec-{i}",
+                    session_id="session-1",
+                    message_id="msg",
+                    tool_id="tool",
+                    state=sample_tool_state,
+                )
+            await tracker.close()
+
+        asyncio.run(run())
+
+        segments = list((tracker.storage_dir / "session-1").iterdir())
+        assert len(segments) == 1
+        lines = segments[0].read_bytes().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["exec-0", "exec-1", "exec-2"]
+        assert b"\n  " not in segments[0].read_bytes()
+
+    def test_update_and_get_execution(self, temp_dir):
+        """Test updates supersede earlier versions of a record"""
+        tracker = AppendOnlyToolExecutionTracker(temp_dir)
+
+        async def run():
+            await tracker.log_execution(
+                execution_id="exec-1",
+                session_id="session-1",
+                message_id="msg",
+                tool_id="tool",
+                state=ToolState(status="pending", input={}),
+            )
+            await tracker.update_execution(
+                execution_id="exec-1",
+                state=ToolState(status="completed", input={}, output="done"),
+                end_time=2000.0,
+            )
+            record = await tracker.get_execution("exec-1")
+            missing = await tracker.update_execution(
+                execution_id="missing", state=ToolState(status="completed", input={})
+            )
+            await tracker.close()
+            return record, missing
+
+        record, missing = asyncio.run(run())
+
+        assert record["state"]["output"] == "done"
+        assert record["end_time"] == 2000.0
+        assert missing is None
+
+    def test_history_survives_restart(self, temp_dir):
+        """Test a new tracker rebuilds its index from existing segments"""
+
+        async def write():
+            tracker = AppendOnlyToolExecutionTracker(temp_dir)
+            for i in range(4):
+                await tracker.log_execution(
+                    execution_id=f"exec-{i}",
+                    session_id="session-1",
+                    message_id="msg",
+                    tool_id=f"tool-{i % 2}",
+                    state=ToolState(status="pending", input={}),
+                    start_time=float(i),
+                )
+            await tracker.close()
+
+        async def read():
+            tracker = AppendOnlyToolExecutionTracker(temp_dir)
+            history = await tracker.get_execution_history("session-1", tool_id="tool-1")
+            await tracker.close()
+            return history
+
+        asyncio.run(write())
+        history = asyncio.run(read())
+
+        assert [r["id"] for r in history] == ["exec-3", "exec-1"]
+
+    def test_torn_tail_is_discarded(self, temp_dir):
+        """Test a partially written final line does not corrupt later appends"""
+
+        async def write(execution_id):
+            tracker = AppendOnlyToolExecutionTracker(temp_dir)
+            await tracker.log_execution(
+                execution_id=execution_id,
+                session_id="session-1",
+                message_id="msg",
+                tool_id="tool",
+                state=ToolState(status="pending", input={}),
+            )
+            await tracker.close()
+
+        asyncio.run(write("exec-1"))
+        segment = next((temp_dir / "storage" / "tool_execution_log" / "session-1").iterdir())
+        with open(segment, "ab") as f:
+            f.write(b'{"id": "torn"')
+        asyncio.run(write("exec-2"))
+
+        async def read():
+            tracker = AppendOnlyToolExecutionTracker(temp_dir)
+            history = await tracker.get_execution_history("session-1")
+            await tracker.close()
+            return history
+
+        assert {r["id"] for r in asyncio.run(read())} == {"exec-1", "exec-2"}
+
+    def test_compaction_drops_superseded_records(self, temp_dir):
+        """Test sealed segments are compacted once superseded bytes pile up"""
+        tracker = AppendOnlyToolExecutionTracker(
+            temp_dir, segment_max_bytes=400, compact_min_dead_bytes=200
+        )
+
+        async def run():
+            for i in range(10):
+                await tracker.log_execution(
+                    execution_id=f"exec-{i}",
+                    session_id="session-1",
+                    message_id="msg",
+                    tool_id="tool",
+                    state=ToolState(status="pending", input={}),
+                )
+            for i in range(10):
+                await tracker.update_execution(
+                    execution_id=f"exec-{i}",
+                    state=ToolState(status="completed", input={}, output="ok"),
+                )
+            await tracker.flush()
+            await asyncio.sleep(0.1)
+            history = await tracker.get_execution_history("session-1")
+            await tracker.close()
+            return history
+
+        history = asyncio.run(run())
+
+        assert len(history) == 10
+        assert all(r["state"]["status"] == "completed" for r in history)
+        session_dir = tracker.storage_dir / "session-1"
+        total_lines = sum(len(p.read_bytes().splitlines()) for p in session_dir.iterdir())
+        assert total_lines < 20
+
+
+    def test_close_waits_for_compaction_tasks(self, temp_dir):
+        """Test compaction tasks are referenced until done and awaited by close"""
+        tracker = AppendOnlyToolExecutionTracker(
+            temp_dir, segment_max_bytes=400, compact_min_dead_bytes=200
+        )
+
+        async def run():
+            for i in range(10):
+                await tracker.log_execution(
+                    execution_id=f"exec-{i}",
+                    session_id="session-1",
+                    message_id="msg",
+                    tool_id="tool",
+                    state=ToolState(status="pending", input={}),
+                )
+                await tracker.update_execution(
+                    execution_id=f"exec-{i}",
+                    state=ToolState(status="completed", input={}, output="ok"),
+                )
+            await tracker.flush()
+            started = set(tracker._compaction_tasks)
+            await tracker.close()
+            return started
+
+        started = asyncio.run(run())
+
+        assert started
+        assert all(task.done() for task in started)
+        assert not tracker._compaction_tasks
+        assert not tracker._compacting
+
 class TestSessionLifecycle:
     """Tests for SessionLifecycle"""
 
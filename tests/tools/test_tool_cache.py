@@ -0,0 +1,226 @@
+"""Tests for ToolResultCache and its persistent disk tier."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from dawn_kestrel.tools.cache import ToolResultCache, ToolResultDiskCache
+
+
+def _cache(tmp_path: Path, **kwargs) -> ToolResultCache:
+    return ToolResultCache(persist_dir=tmp_path / "cache", root=tmp_path / "repo", **kwargs)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("print('a')\n")
+    (root / "src" / "b.py").write_text("print('b')\n")
+    return root
+
+
+class Executor:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return f"output {self.calls}", "title", {"matches": 1}, None
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+async def test_results_survive_restart(tmp_path: Path, repo: Path):
+    run = Executor()
+    first = _cache(tmp_path)
+    entry, cached = await first.aget_or_execute("read", {"filePath": "src/a.py"}, run)
+    assert not cached
+
+    second = _cache(tmp_path)
+    entry, cached = await second.aget_or_execute("read", {"filePath": "src/a.py"}, run)
+
+    assert cached
+    assert entry.result_output == "output 1"
+    assert run.calls == 1
+    stats = second.get_stats()
+    assert stats["disk_hits"] == 1
+    assert stats["hits"] == 1
+
+
+async def test_file_change_invalidates_entry(tmp_path: Path, repo: Path):
+    run = Executor()
+    await _cache(tmp_path).aget_or_execute("read", {"filePath": "src/a.py"}, run)
+    _bump_mtime(repo / "src" / "a.py")
+
+    cache = _cache(tmp_path)
+    entry, cached = await cache.aget_or_execute("read", {"filePath": "src/a.py"}, run)
+
+    assert not cached
+    assert entry.result_output == "output 2"
+    assert cache.get_stats()["disk_stale"] == 1
+
+
+async def test_content_fingerprint_ignores_touch(tmp_path: Path, repo: Path):
+    run = Executor()
+    await _cache(tmp_path, fingerprint_mode="content").aget_or_execute(
+        "read", {"filePath": "src/a.py"}, run
+    )
+    _bump_mtime(repo / "src" / "a.py")
+
+    _, cached = await _cache(tmp_path, fingerprint_mode="content").aget_or_execute(
+        "read", {"filePath": "src/a.py"}, run
+    )
+    assert cached
+
+    (repo / "src" / "a.py").write_text("changed\n")
+    _, cached = await _cache(tmp_path, fingerprint_mode="content").aget_or_execute(
+        "read", {"filePath": "src/a.py"}, run
+    )
+    assert not cached
+
+
+async def test_tree_tools_see_changes_anywhere_under_root(tmp_path: Path, repo: Path):
+    run = Executor()
+    await _cache(tmp_path).aget_or_execute("grep", {"pattern": "print"}, run)
+
+    _, cached = await _cache(tmp_path).aget_or_execute("grep", {"pattern": "print"}, run)
+    assert cached
+
+    (repo / "src" / "c.py").write_text("print('c')\n")
+    _, cached = await _cache(tmp_path).aget_or_execute("grep", {"pattern": "print"}, run)
+    assert not cached
+    assert run.calls == 2
+
+
+async def test_key_includes_arguments_and_root(tmp_path: Path, repo: Path):
+    run = Executor()
+    await _cache(tmp_path).aget_or_execute("glob", {"pattern": "*.py"}, run)
+
+    await _cache(tmp_path).aget_or_execute("glob", {"pattern": "*.md"}, run)
+    other_root = ToolResultCache(persist_dir=tmp_path / "cache", root=repo / "src")
+    await other_root.aget_or_execute("glob", {"pattern": "*.py"}, run)
+
+    assert run.calls == 3
+
+
+async def test_unfingerprintable_tools_stay_in_memory(tmp_path: Path, repo: Path):
+    run = Executor()
+    await _cache(tmp_path).aget_or_execute("git", {"args": "status"}, run)
+    await _cache(tmp_path).aget_or_execute("git", {"args": "status"}, run)
+
+    assert run.calls == 2
+    assert not list((tmp_path / "cache").glob("*/*.json"))
+
+
+async def test_error_results_are_not_persisted(tmp_path: Path, repo: Path):
+    async def failing():
+        return "boom", "Error", {"error": "boom"}, None
+
+    await _cache(tmp_path).aget_or_execute("read", {"filePath": "src/a.py"}, failing)
+
+    assert _cache(tmp_path).get_stats()["disk_entries"] == 0
+
+
+def test_sync_set_and_get_use_disk(tmp_path: Path, repo: Path):
+    _cache(tmp_path).set("ls", {"path": "src"}, "a.py\nb.py", "ls")
+
+    entry = _cache(tmp_path).get("ls", {"path": "src"})
+
+    assert entry is not None
+    assert entry.result_output == "a.py\nb.py"
+
+
+def test_size_bounded_eviction(tmp_path: Path, repo: Path):
+    cache = _cache(tmp_path, max_disk_bytes=1500)
+    for i in range(10):
+        cache.set("read", {"filePath": "src/a.py", "offset": i}, "x" * 300, "read")
+
+    stats = cache.get_stats()
+    assert stats["disk_bytes"] <= 1500
+    assert stats["disk_evictions"] > 0
+    # Most recent entry survives, oldest is gone
+    fresh = _cache(tmp_path)
+    assert fresh.get("read", {"filePath": "src/a.py", "offset": 9}) is not None
+    assert fresh.get("read", {"filePath": "src/a.py", "offset": 0}) is None
+
+
+def test_invalidate_clears_disk(tmp_path: Path, repo: Path):
+    cache = _cache(tmp_path)
+    cache.set("read", {"filePath": "src/a.py"}, "a", "read")
+    cache.set("ls", {"path": "src"}, "ls", "ls")
+
+    cache.invalidate("read")
+
+    fresh = _cache(tmp_path)
+    assert fresh.get("read", {"filePath": "src/a.py"}) is None
+    assert fresh.get("ls", {"path": "src"}) is not None
+
+
+def test_tree_fingerprint_limit(tmp_path: Path, repo: Path):
+    disk = ToolResultDiskCache(tmp_path / "cache", root=repo, max_tree_files=2)
+
+    assert disk.fingerprint("grep", {"pattern": "x"}) is None
+    assert disk.fingerprint("read", {"filePath": "src/a.py"}).startswith("stat:")
+
+
+def test_tree_fingerprint_skips_ignored_folders(tmp_path: Path, repo: Path):
+    disk = ToolResultDiskCache(tmp_path / "cache", root=repo, tree_fingerprint_ttl=0)
+    before = disk.fingerprint("grep", {"pattern": "x"})
+
+    (repo / "node_modules" / "pkg").mkdir(parents=True)
+    _bump_mtime(repo / "node_modules")
+    before_dep = disk.fingerprint("grep", {"pattern": "x"})
+    (repo / "node_modules" / "pkg" / "index.js").write_text("x")
+
+    assert before_dep != before  # the folder itself is still listed
+    assert disk.fingerprint("grep", {"pattern": "x"}) == before_dep
+
+
+def test_tree_fingerprint_is_memoized(tmp_path: Path, repo: Path):
+    disk = ToolResultDiskCache(tmp_path / "cache", root=repo, tree_fingerprint_ttl=60)
+    assert disk.fingerprint("grep", {"pattern": "x"}, walk=False) is None
+    before = disk.fingerprint("grep", {"pattern": "x"})
+
+    (repo / "src" / "c.py").write_text("print('c')\n")
+    assert disk.fingerprint("grep", {"pattern": "x"}) == before
+    assert disk.fingerprint("grep", {"pattern": "x"}, walk=False) == before
+
+    disk.forget_fingerprints()
+    assert disk.fingerprint("grep", {"pattern": "x"}) != before
+
+
+async def test_write_tools_drop_memoized_fingerprints(tmp_path: Path, repo: Path):
+    # In-memory entries expire at once, so lookups go to the disk tier
+    cache = _cache(tmp_path, default_ttl_seconds=0)
+    run = Executor()
+    await cache.aget_or_execute("grep", {"pattern": "print"}, run)
+
+    async def write():
+        (repo / "src" / "c.py").write_text("print('c')\n")
+        return "ok", "write", {}, None
+
+    await cache.aget_or_execute("write", {"filePath": "src/c.py"}, write)
+    _, cached = await cache.aget_or_execute("grep", {"pattern": "print"}, run)
+
+    assert not cached
+    assert run.calls == 2
+
+
+async def test_sync_get_does_not_walk_on_event_loop(tmp_path: Path, repo: Path):
+    await _cache(tmp_path).aset("ls", {"path": "src"}, "a.py\nb.py", "ls")
+
+    cache = _cache(tmp_path, default_ttl_seconds=0)
+    assert cache.get("ls", {"path": "src"}) is None
+
+    # Once a worker thread has fingerprinted the tree, the memo is used
+    _, cached = await cache.aget_or_execute("ls", {"path": "src"}, Executor())
+    assert cached
+    assert cache.get("ls", {"path": "src"}) is not None
+    assert cache.get_stats()["disk_hits"] == 2
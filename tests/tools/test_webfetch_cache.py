@@ -0,0 +1,251 @@
+"""Tests for WebFetchTool's HTTP response cache, against a local server."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from dawn_kestrel.tools.additional import WebFetchTool
+from dawn_kestrel.tools.framework import ToolContext
+from dawn_kestrel.tools.http_cache import (
+    HTTPResponseCache,
+    close_http_client,
+    freshness_lifetime,
+    get_http_client,
+    parse_cache_control,
+)
+
+
+class Page:
+    """What the server returns for a path, and the requests it received."""
+
+    def __init__(self, body: str, headers: dict[str, str] | None = None) -> None:
+        self.body = body
+        self.headers = headers or {}
+        self.requests: list[dict[str, str]] = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    pages: dict[str, Page] = {}
+
+    def do_GET(self) -> None:
+        page = self.pages.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        page.requests.append(dict(self.headers))
+        etag = page.headers.get("ETag")
+        last_modified = page.headers.get("Last-Modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            for name, value in page.headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        body = page.body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in page.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    pages: dict[str, Page] = {}
+    handler = type("Handler", (_Handler,), {"pages": pages})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield base, pages
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+async def tool(tmp_path: Path):
+    yield WebFetchTool(cache=HTTPResponseCache(tmp_path / "webfetch"))
+    await close_http_client()
+
+
+def _ctx() -> ToolContext:
+    return ToolContext(
+        session_id="s1", message_id="m1", agent="build", abort=asyncio.Event(), messages=[]
+    )
+
+
+async def _fetch(tool: WebFetchTool, url: str, format: str = "html"):
+    return await tool.execute({"url": url, "format": format}, _ctx())
+
+
+async def test_fresh_response_served_without_request(server, tool, tmp_path: Path):
+    base, pages = server
+    pages["/doc"] = Page("<h1>Docs</h1>", {"Cache-Control": "max-age=60"})
+
+    first = await _fetch(tool, f"{base}/doc")
+    second = await _fetch(tool, f"{base}/doc")
+
+    assert first.metadata["cache"] == "miss"
+    assert second.metadata["cache"] == "hit"
+    assert second.output == first.output == "<h1>Docs</h1>"
+    assert len(pages["/doc"].requests) == 1
+
+    # Entries persist across cache instances (new sessions)
+    restarted = WebFetchTool(cache=HTTPResponseCache(tmp_path / "webfetch"))
+    assert (await _fetch(restarted, f"{base}/doc")).metadata["cache"] == "hit"
+    assert len(pages["/doc"].requests) == 1
+
+
+async def test_etag_revalidation(server, tool):
+    base, pages = server
+    pages["/etag"] = Page("v1", {"ETag": '"abc"', "Cache-Control": "no-cache"})
+
+    await _fetch(tool, f"{base}/etag")
+    result = await _fetch(tool, f"{base}/etag")
+
+    assert result.metadata["cache"] == "revalidated"
+    assert result.output == "v1"
+    assert pages["/etag"].requests[1].get("If-None-Match") == '"abc"'
+    assert tool.cache.get_stats()["revalidations"] == 1
+
+
+async def test_last_modified_revalidation(server, tool):
+    base, pages = server
+    last_modified = formatdate(time.time() - 3600, usegmt=True)
+    pages["/lm"] = Page("v1", {"Last-Modified": last_modified, "Cache-Control": "max-age=0"})
+
+    await _fetch(tool, f"{base}/lm")
+    result = await _fetch(tool, f"{base}/lm")
+
+    assert result.metadata["cache"] == "revalidated"
+    assert pages["/lm"].requests[1].get("If-Modified-Since") == last_modified
+
+
+async def test_changed_resource_replaces_entry(server, tool):
+    base, pages = server
+    pages["/page"] = Page("old", {"ETag": '"1"', "Cache-Control": "no-cache"})
+    await _fetch(tool, f"{base}/page")
+
+    pages["/page"].body = "new"
+    pages["/page"].headers["ETag"] = '"2"'
+    changed = await _fetch(tool, f"{base}/page")
+    again = await _fetch(tool, f"{base}/page")
+
+    assert changed.metadata["cache"] == "miss"
+    assert changed.output == "new"
+    assert again.metadata["cache"] == "revalidated"
+    assert again.output == "new"
+
+
+async def test_no_store_is_not_cached(server, tool):
+    base, pages = server
+    pages["/private"] = Page("secret", {"Cache-Control": "no-store", "ETag": '"x"'})
+
+    await _fetch(tool, f"{base}/private")
+    result = await _fetch(tool, f"{base}/private")
+
+    assert result.metadata["cache"] == "miss"
+    assert len(pages["/private"].requests) == 2
+    assert tool.cache.get_stats()["entries"] == 0
+
+
+async def test_raw_body_stored_with_converted_output(server, tool):
+    base, pages = server
+    body = "x" * (WebFetchTool.MAX_OUTPUT_CHARS + 50)
+    pages["/big"] = Page(body, {"Cache-Control": "max-age=60"})
+
+    await _fetch(tool, f"{base}/big")
+    entry = tool.cache.lookup(f"{base}/big", "html")
+
+    assert entry is not None
+    assert tool.cache.read_body(entry) == body.encode()
+    assert entry.output.endswith("[... Content truncated (50 characters) ...]")
+    assert entry.output_metadata["truncated"] is True
+
+
+async def test_formats_are_cached_separately(server, tool):
+    base, pages = server
+    pages["/doc"] = Page("page", {"Cache-Control": "max-age=60"})
+
+    await _fetch(tool, f"{base}/doc", format="html")
+    result = await _fetch(tool, f"{base}/doc", format="markdown")
+
+    assert result.metadata["cache"] == "miss"
+    assert [r["Accept"] for r in pages["/doc"].requests] == [
+        "text/html, application/xhtml+xml",
+        "text/markdown, application/markdown",
+    ]
+
+
+async def test_http_errors_are_not_cached(server, tool):
+    base, _ = server
+
+    result = await _fetch(tool, f"{base}/missing")
+
+    assert result.metadata["error"] == "http_error"
+    assert tool.cache.get_stats()["entries"] == 0
+
+
+async def test_eviction_bounds_disk_usage(server, tmp_path: Path):
+    base, pages = server
+    cache = HTTPResponseCache(tmp_path / "webfetch", max_bytes=3000)
+    tool = WebFetchTool(cache=cache)
+    for i in range(5):
+        pages[f"/p{i}"] = Page("y" * 1000, {"Cache-Control": "max-age=60"})
+        await _fetch(tool, f"{base}/p{i}")
+    await close_http_client()
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 3000
+    assert stats["evictions"] > 0
+    assert cache.lookup(f"{base}/p4", "html") is not None
+    assert cache.lookup(f"{base}/p0", "html") is None
+
+
+async def test_shared_client_is_reused():
+    client = get_http_client()
+    try:
+        assert get_http_client() is client
+    finally:
+        await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('public, Max-Age=60, no-cache="set-cookie"') == {
+        "public": None,
+        "max-age": "60",
+        "no-cache": "set-cookie",
+    }
+
+
+def test_freshness_lifetime():
+    now = time.time()
+    date = formatdate(now, usegmt=True)
+    assert freshness_lifetime({"cache-control": "max-age=100", "age": "30"}) == 70
+    assert freshness_lifetime({"cache-control": "no-cache, max-age=100"}) == 0
+    assert freshness_lifetime({"date": date, "expires": formatdate(now + 50, usegmt=True)}) == (
+        pytest.approx(50, abs=1)
+    )
+    assert freshness_lifetime({"expires": "0"}) == 0
+    heuristic = {"date": date, "last-modified": formatdate(now - 1000, usegmt=True)}
+    assert freshness_lifetime(heuristic) == pytest.approx(100, abs=1)
+    assert freshness_lifetime(heuristic, max_heuristic_seconds=10) == 10
+    assert freshness_lifetime({}) == 0
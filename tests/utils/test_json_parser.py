@@ -1,5 +1,13 @@
 """Tests for json_parser utility functions."""
-from dawn_kestrel.utils.json_parser import strip_any_code_blocks, strip_json_code_blocks
+import pydantic as pd
+
+from dawn_kestrel.agents.workflow import ReasonOutput
+from dawn_kestrel.utils.json_parser import (
+    IncrementalJSONParser,
+    extract_json_object,
+    strip_any_code_blocks,
+    strip_json_code_blocks,
+)
 
 
 def test_strip_json_code_blocks_no_code_blocks():
@@ -85,3 +93,89 @@ def test_strip_any_code_blocks_with_lang():
     text = '```typescript\nconst x = 5;\n```'
     result = strip_any_code_blocks(text)
     assert result == 'const x = 5;'
+
+
+def test_incremental_parser_stops_when_object_closes():
+    """Should report completion on the delta that closes the top-level object."""
+    text = 'Here you go:\n```json\n{"a": {"b": [1, "}"]}, "c": "x"}\n```\nTrailing prose'
+    close_index = text.index("}\n```") + 1
+    parser = IncrementalJSONParser()
+
+    for i, char in enumerate(text):
+        if parser.feed(char):
+            break
+
+    assert i == close_index - 1
+    assert parser.result == {"a": {"b": [1, "}"]}, "c": "x"}
+
+
+def test_incremental_parser_skips_braces_in_prose():
+    """Should ignore brace spans in prose that are not valid JSON."""
+    parser = IncrementalJSONParser()
+    assert parser.feed('Fill in {placeholder} then: {"key": "value"} done') is True
+    assert parser.result == {"key": "value"}
+
+
+def test_incremental_parser_waits_for_more_input():
+    """Should not finish on an incomplete object."""
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"key": "val') is False
+    assert parser.feed('ue", "n": 1') is False
+    assert parser.feed("}") is True
+    assert parser.result == {"key": "value", "n": 1}
+
+
+def test_incremental_parser_reports_schema_violation_mid_stream():
+    """Should stop as soon as a completed field violates the model."""
+    parser = IncrementalJSONParser(model=ReasonOutput)
+    assert parser.feed('{"todo_id": "1", "next_phase": "later",') is True
+    assert parser.result is None
+    assert parser.failed
+    assert parser.errors[0].startswith("next_phase")
+
+
+def test_incremental_parser_rejects_unknown_fields_for_strict_model():
+    """Should flag fields the model forbids."""
+    parser = IncrementalJSONParser(model=ReasonOutput)
+    assert parser.feed('{"bogus": 1, ') is True
+    assert parser.failed
+
+
+def test_incremental_parser_accepts_valid_model_payload():
+    """Should return the parsed dict when all fields validate."""
+    parser = IncrementalJSONParser(model=ReasonOutput)
+    parser.feed('{"todo_id": "1", "atomic_step": "read", "why_now": "needed", "risks": []}')
+    assert parser.result is not None
+    assert ReasonOutput(**parser.result).todo_id == "1"
+
+
+def test_incremental_parser_validates_aliased_fields():
+    """Should match members by field alias and validate them mid-stream."""
+
+    class Aliased(pd.BaseModel):
+        model_config = pd.ConfigDict(extra="forbid")
+
+        next_step: int = pd.Field(alias="nextStep")
+
+    parser = IncrementalJSONParser(model=Aliased)
+    assert parser.feed('{"nextStep": "soon", ') is True
+    assert parser.errors[0].startswith("nextStep")
+
+    parser = IncrementalJSONParser(model=Aliased)
+    parser.feed('{"nextStep": 2}')
+    assert parser.result == {"nextStep": 2}
+
+
+def test_incremental_parser_text_spans_chunks():
+    """Should keep members that span several deltas intact."""
+    parser = IncrementalJSONParser(model=ReasonOutput)
+    for chunk in ['noise {"todo', '_id": "1", "atomic', '_step": "read"', "}"]:
+        parser.feed(chunk)
+    assert parser.result == {"todo_id": "1", "atomic_step": "read"}
+    assert parser.text == 'noise {"todo_id": "1", "atomic_step": "read"}'
+
+
+def test_extract_json_object_no_object():
+    """Should return None when there is no JSON object."""
+    assert extract_json_object("no json here") is None
+    assert extract_json_object("") is None